@@ -13,9 +13,17 @@ class Action(StrEnum):
   """Actions that can be logged."""
 
   GET_MOVIES = "get_movies"
+  GET_MOVIE = "get_movie"
   GET_SEASONS = "get_seasons"
+  GET_SERIES = "get_series"
+  GET_HISTORY = "get_history"
+  GET_WANTED_MOVIES = "get_wanted_movies"
+  GET_WANTED_SEASONS = "get_wanted_seasons"
+  GET_SYSTEM_STATUS = "get_system_status"
   SEARCH_MOVIE = "search_movie"
+  SEARCH_MOVIES = "search_movies"
   SEARCH_SEASON = "search_season"
+  SEARCH_SERIES = "search_series"
 
 
 def log_item_action(
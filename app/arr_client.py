@@ -1,6 +1,11 @@
 """HTTP client for *arr APIs with retry logic."""
 
+import time
+from collections.abc import AsyncGenerator, Callable
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import TYPE_CHECKING, Any, Protocol, cast
+from urllib.parse import urlencode
 
 import httpx
 import structlog
@@ -11,16 +16,30 @@ from tenacity import (
   stop_after_attempt,
   wait_exponential,
 )
+from tenacity.wait import wait_base
 
 from app.action_logging import Action
+from app.circuit_breaker import CircuitBreaker, CircuitOpenError
 from app.config import ArrTarget, ArrType
 from app.metrics import request_errors_total, requests_total
+from app.projection import (
+  HISTORY_PROJECTIONS,
+  LIBRARY_PROJECTIONS,
+  WANTED_PROJECTIONS,
+  Projection,
+  project,
+)
+from app.rate_limiter import AdaptiveRateLimiter
 
 if TYPE_CHECKING:
   from app.handlers import MovieId, SeasonId
 
 logger = structlog.get_logger()
 
+# Records requested per page from the paged wanted/missing and wanted/cutoff endpoints.
+WANTED_PAGE_SIZE = 250
+_WANTED_PATHS = ("/api/v3/wanted/missing", "/api/v3/wanted/cutoff")
+
 
 class HttpClient(Protocol):
   """Protocol for HTTP client operations."""
@@ -35,6 +54,17 @@ class HttpClient(Protocol):
     """Make POST request."""
     ...
 
+  def stream_json_array(
+    self, url: str, headers: dict[str, str], timeout: float
+  ) -> AsyncGenerator[Any, None]:
+    """Make GET request and yield the elements of a JSON array body as they arrive."""
+    ...
+
+
+def _is_not_found_error(exception: BaseException) -> bool:
+  """Check if an exception is an HTTP 404 response (e.g. a deleted library record)."""
+  return isinstance(exception, httpx.HTTPStatusError) and exception.response.status_code == 404
+
 
 def _is_retryable_response_error(exception: BaseException) -> bool:
   """Check if HTTPStatusError is retryable (5xx or 429)."""
@@ -44,6 +74,67 @@ def _is_retryable_response_error(exception: BaseException) -> bool:
   return False
 
 
+def _is_rate_limited_error(exception: BaseException) -> bool:
+  """Check if an exception is an HTTP 429 Too Many Requests response."""
+  return isinstance(exception, httpx.HTTPStatusError) and exception.response.status_code == 429
+
+
+def _retry_after_s(
+  exception: BaseException, clock: Callable[[], float] = time.time
+) -> float | None:
+  """Return the delay a response's Retry-After header asks for (seconds or HTTP-date), if any."""
+  if not isinstance(exception, httpx.HTTPStatusError):
+    return None
+  retry_after: str | None = exception.response.headers.get("Retry-After")
+  if retry_after is None:
+    return None
+  try:
+    return max(0.0, float(retry_after))
+  except ValueError:
+    pass
+  try:
+    retry_at = parsedate_to_datetime(retry_after)
+  except TypeError, ValueError:
+    return None
+  if retry_at.tzinfo is None:
+    retry_at = retry_at.replace(tzinfo=timezone.utc)
+  return max(0.0, retry_at.timestamp() - clock())
+
+
+class _wait_retry_after(wait_base):
+  """Wait as long as the failed response's Retry-After asks (capped), else as `fallback` does."""
+
+  def __init__(self, fallback: wait_base, max_delay_s: float) -> None:
+    self.fallback = fallback
+    self.max_delay_s = max_delay_s
+
+  def __call__(self, retry_state: Any) -> float:
+    exception = retry_state.outcome.exception() if retry_state.outcome is not None else None
+    retry_after_s = _retry_after_s(exception) if exception is not None else None
+    if retry_after_s is None:
+      return float(self.fallback(retry_state))
+    return min(retry_after_s, self.max_delay_s)
+
+
+def _monitored_season_numbers(series: dict[str, Any]) -> list[int] | None:
+  """Return the numbers of a series' monitored seasons, or None when its seasons are unknown."""
+  season_entries = series.get("seasons")
+  if season_entries is None:
+    return None
+  return [
+    season["seasonNumber"]
+    for season in season_entries
+    if season.get("monitored") is True and season.get("seasonNumber") is not None
+  ]
+
+
+def _is_unavailable_error(exception: BaseException) -> bool:
+  """Check if an exception means the target is unavailable (the errors that are retried)."""
+  return isinstance(
+    exception, (httpx.RequestError, httpx.TimeoutException, TimeoutError)
+  ) or _is_retryable_response_error(exception)
+
+
 class ArrClient:
   """Client for interacting with *arr APIs."""
 
@@ -57,8 +148,14 @@ class ArrClient:
     retry_backoff_exponent: float | None = None,
     retry_max_delay_s: float | None = None,
     timeout_s: float | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
+    rate_limiter: AdaptiveRateLimiter | None = None,
   ) -> None:
-    """Initialize ArrClient. Retry and timeout params from target.settings when None."""
+    """Initialize ArrClient. Retry and timeout params from target.settings when None.
+
+    Unless given, a circuit_breaker that probes the target's system status endpoint and a
+    rate_limiter are created from target.settings.
+    """
     settings = target.settings
     self.target = target
     self.base_url = target.base_url.rstrip("/")
@@ -78,26 +175,82 @@ class ArrClient:
       retry_max_delay_s if retry_max_delay_s is not None else settings.http_retry_max_delay_s
     )
     self.timeout_s = timeout_s if timeout_s is not None else settings.http_timeout_s
+    self.library_projection = LIBRARY_PROJECTIONS[target.arr_type]
+    self.wanted_projection = WANTED_PROJECTIONS[target.arr_type]
+    self.history_projection = HISTORY_PROJECTIONS[target.arr_type]
+    self.circuit_breaker = (
+      circuit_breaker
+      if circuit_breaker is not None
+      else CircuitBreaker(target, self.get_system_status)
+    )
+    self.rate_limiter = rate_limiter if rate_limiter is not None else AdaptiveRateLimiter(target)
 
   def _get_headers(self) -> dict[str, str]:
     """Get HTTP headers for API requests."""
     return {"X-Api-Key": self.target.api_key, "Content-Type": "application/json"}
 
   def _make_retry_decorator(self) -> Any:
-    """Create a retry decorator with instance-specific configuration."""
+    """Create a retry decorator with instance-specific configuration.
+
+    Waits follow a response's Retry-After header when present, capped at retry_max_delay_s,
+    and back off exponentially otherwise.
+    """
     return retry(
       stop=stop_after_attempt(self.max_retries + 1),
-      wait=wait_exponential(
-        multiplier=self.retry_initial_delay_s,
-        min=self.retry_initial_delay_s,
-        max=self.retry_max_delay_s,
-        exp_base=self.retry_backoff_exponent,
+      wait=_wait_retry_after(
+        wait_exponential(
+          multiplier=self.retry_initial_delay_s,
+          min=self.retry_initial_delay_s,
+          max=self.retry_max_delay_s,
+          exp_base=self.retry_backoff_exponent,
+        ),
+        self.retry_max_delay_s,
       ),
       retry=retry_if_exception_type((httpx.RequestError, httpx.TimeoutException, TimeoutError))
       | retry_if_exception(_is_retryable_response_error),
       reraise=True,
     )
 
+  async def _before_request(self, url: str, logging_ids: dict[str, Any]) -> None:
+    """Raise CircuitOpenError instead of making a request while the circuit breaker is open."""
+    try:
+      await self.circuit_breaker.before_request()
+    except CircuitOpenError as e:
+      logger.debug(
+        "Circuit breaker open, failing request fast",
+        retry_in_s=e.retry_in_s,
+        **{"url": url, **self.target.logging_ids(), **logging_ids},
+      )
+      raise
+
+  def _throttle_if_rate_limited(self, exception: BaseException) -> None:
+    """Slow down sends to the target after a 429 response."""
+    if _is_rate_limited_error(exception):
+      self.rate_limiter.throttle(_retry_after_s(exception))
+
+  def _record_outcome(self, exception: Exception) -> None:
+    """Record a failed request with the circuit breaker; other errors mean the target is up."""
+    if _is_unavailable_error(exception):
+      self.circuit_breaker.record_failure()
+    else:
+      self.circuit_breaker.record_success()
+
+  async def get_system_status(self) -> Any:
+    """Get the target's system status in a single attempt, bypassing the circuit breaker.
+
+    This is the cheap request the circuit breaker probes the target with.
+    """
+    url = f"{self.base_url}/api/v3/system/status"
+    target_name = self.target.name
+    arr_type = self.target.arr_type.value
+    operation = Action.GET_SYSTEM_STATUS.value
+    requests_total.labels(target=target_name, type=arr_type, operation=operation).inc()
+    try:
+      return await self.http_client.get(url, self._get_headers(), self.timeout_s)
+    except Exception:
+      request_errors_total.labels(target=target_name, type=arr_type, operation=operation).inc()
+      raise
+
   async def _request(
     self,
     method: str,
@@ -106,7 +259,8 @@ class ArrClient:
     logging_ids: dict[str, Any],
     payload: dict[str, Any] | None = None,
   ) -> Any:
-    """Make HTTP request with retry logic using tenacity."""
+    """Make HTTP request with retry logic using tenacity, failing fast while the circuit is open."""
+    await self._before_request(url, logging_ids)
     target_name = self.target.name
     arr_type = self.target.arr_type.value
     requests_total.labels(target=target_name, type=arr_type, operation=operation.value).inc()
@@ -131,11 +285,16 @@ class ArrClient:
       attempt += 1
 
       headers = self._get_headers()
+      await self.rate_limiter.acquire()
       logger.debug("Executing HTTP request", attempt=attempt, **request_logging_ids)
-      if method == "GET":
-        result = await self.http_client.get(url, headers, self.timeout_s)
-      else:
-        result = await self.http_client.post(url, headers, self.timeout_s, payload)
+      try:
+        if method == "GET":
+          result = await self.http_client.get(url, headers, self.timeout_s)
+        else:
+          result = await self.http_client.post(url, headers, self.timeout_s, payload)
+      except httpx.HTTPStatusError as e:
+        self._throttle_if_rate_limited(e)
+        raise
       logger.debug(
         "HTTP request completed",
         attempt=attempt,
@@ -145,8 +304,9 @@ class ArrClient:
       return result
 
     try:
-      return await _do_request()
+      result = await _do_request()
     except Exception as e:
+      self._record_outcome(e)
       request_errors_total.labels(
         target=target_name, type=arr_type, operation=operation.value
       ).inc()
@@ -157,9 +317,85 @@ class ArrClient:
         **request_logging_ids,
       )
       raise
+    self.circuit_breaker.record_success()
+    return result
 
-  async def get_movies(self, logging_ids: dict[str, Any]) -> list[dict[str, Any]]:
-    """Get all movies from Radarr."""
+  async def _stream(
+    self,
+    url: str,
+    operation: Action,
+    logging_ids: dict[str, Any],
+    projection: Projection,
+  ) -> AsyncGenerator[Any, None]:
+    """Stream the projected elements of a JSON array response with retry logic using tenacity.
+
+    Each element is reduced to the projected fields as soon as it is decoded, so the full
+    objects are never retained. Retries cover the request up to its first element. Once
+    elements have been yielded, a failure is raised to the caller instead of replaying the
+    stream.
+    """
+    await self._before_request(url, logging_ids)
+    target_name = self.target.name
+    arr_type = self.target.arr_type.value
+    requests_total.labels(target=target_name, type=arr_type, operation=operation.value).inc()
+
+    request_logging_ids = {
+      "method": "GET",
+      "url": url,
+      "streamed": True,
+      "timeout_s": self.timeout_s,
+      "http_max_retries": self.max_retries,
+      **self.target.logging_ids(),
+      **logging_ids,
+    }
+    logger.debug("Making streamed HTTP request", **request_logging_ids)
+    retry_decorator = self._make_retry_decorator()
+
+    attempt = 0
+
+    @retry_decorator
+    async def _open_stream() -> tuple[AsyncGenerator[Any, None], list[Any]]:
+      nonlocal attempt
+      attempt += 1
+
+      await self.rate_limiter.acquire()
+      logger.debug("Executing streamed HTTP request", attempt=attempt, **request_logging_ids)
+      elements = self.http_client.stream_json_array(url, self._get_headers(), self.timeout_s)
+      try:
+        first_element = await anext(elements)
+      except StopAsyncIteration:
+        return elements, []
+      except BaseException as e:
+        self._throttle_if_rate_limited(e)
+        await elements.aclose()
+        raise
+      return elements, [first_element]
+
+    try:
+      elements, first_elements = await _open_stream()
+      self.circuit_breaker.record_success()
+      try:
+        for element in first_elements:
+          yield project(element, projection)
+        async for element in elements:
+          yield project(element, projection)
+      finally:
+        await elements.aclose()
+    except Exception as e:
+      self._record_outcome(e)
+      request_errors_total.labels(
+        target=target_name, type=arr_type, operation=operation.value
+      ).inc()
+      logger.exception(
+        "Exception while making streamed HTTP request",
+        exception=e,
+        total_attempts=attempt,
+        **request_logging_ids,
+      )
+      raise
+
+  async def iter_movies(self, logging_ids: dict[str, Any]) -> AsyncGenerator[dict[str, Any], None]:
+    """Stream all movies from Radarr, yielding each movie as soon as it is decoded."""
     if self.target.arr_type != ArrType.RADARR:
       raise ValueError(f"get_movies() only supported for radarr, got {self.target.arr_type}")
     url = f"{self.base_url}/api/v3/movie"
@@ -170,64 +406,253 @@ class ArrClient:
       **self.target.logging_ids(),
     }
     logger.debug("Fetching movies", **get_movies_logging_ids)
+    movie_count = 0
     try:
-      result = await self._request("GET", url, Action.GET_MOVIES, get_movies_logging_ids)
-      movies = cast(list[dict[str, Any]], result)
-      logger.debug("Fetched movies", movie_count=len(movies), **get_movies_logging_ids)
-      return movies
+      async for movie in self._stream(
+        url, Action.GET_MOVIES, get_movies_logging_ids, self.library_projection
+      ):
+        movie_count += 1
+        yield movie
     except Exception as e:
       logger.exception(
         "Exception while fetching movies",
         exception=e,
+        movie_count=movie_count,
         **get_movies_logging_ids,
       )
       raise
+    logger.debug("Fetched movies", movie_count=movie_count, **get_movies_logging_ids)
 
-  def _extract_seasons_from_series(
+  async def get_movies(self, logging_ids: dict[str, Any]) -> list[dict[str, Any]]:
+    """Get all movies from Radarr."""
+    return [movie async for movie in self.iter_movies(logging_ids)]
+
+  def _extract_seasons_from_series(self, series: dict[str, Any]) -> list[dict[str, Any]]:
+    """Flatten one Sonarr series payload into season-level items."""
+    series_id = series.get("id")
+    season_entries = series.get("seasons")
+    if series_id is None or season_entries is None:
+      return []
+
+    series_name = series.get("title")
+    series_monitored = series.get("monitored")
+    series_tags = series.get("tags")
+    series_statistics = series.get("statistics")
+    series_first_aired = series.get("firstAired")
+    monitored_seasons = _monitored_season_numbers(series)
+    seasons: list[dict[str, Any]] = []
+    for season in season_entries:
+      season_number = season.get("seasonNumber")
+      if season_number is None:
+        continue
+
+      season_monitored = season.get("monitored")
+      season_statistics = season.get("statistics")
+
+      seasons.append(
+        {
+          "seriesId": series_id,
+          "seriesTitle": series_name,
+          "seasonNumber": season_number,
+          "seriesMonitored": series_monitored,
+          "seriesTags": series_tags,
+          "seriesStatistics": series_statistics,
+          "seriesFirstAired": series_first_aired,
+          "seasonMonitored": season_monitored,
+          "seasonStatistics": season_statistics,
+          "seriesMonitoredSeasons": monitored_seasons,
+        }
+      )
+    return seasons
+
+  def _extract_seasons_from_episodes(
     self,
-    series_items: list[dict[str, Any]],
+    episodes: list[dict[str, Any]],
     logging_ids: dict[str, Any],
   ) -> list[dict[str, Any]]:
-    """Flatten Sonarr series payload into season-level items."""
-    seasons: list[dict[str, Any]] = []
-    for series in series_items:
-      series_id = series.get("id")
-      season_entries = series.get("seasons")
-      if series_id is None or season_entries is None:
+    """Aggregate Sonarr wanted episode records (with embedded series) into season-level items.
+
+    Season statistics come only from the embedded series. The wanted episodes are a subset
+    of the season, so counts derived from them would overstate what is missing; without
+    statistics the season item has none, exactly as in library mode.
+
+    The seasons of one series are yielded together, in season order, so that they can be
+    coalesced into a SeriesSearch. Their seriesMonitoredSeasons only lists the monitored
+    seasons with wanted episodes: the others have nothing missing or below cutoff, so a
+    SeriesSearch finds nothing to grab for them.
+    """
+    series_by_id: dict[int, dict[str, Any]] = {}
+    wanted_by_series: dict[int, dict[int, list[dict[str, Any]]]] = {}
+    for episode in episodes:
+      series_id = episode.get("seriesId")
+      season_number = episode.get("seasonNumber")
+      series = episode.get("series")
+      if series_id is None or season_number is None or series is None:
         continue
+      series_by_id.setdefault(series_id, series)
+      wanted_by_series.setdefault(series_id, {}).setdefault(season_number, []).append(episode)
 
-      series_name = series.get("title")
-      series_monitored = series.get("monitored")
-      series_tags = series.get("tags")
-      series_statistics = series.get("statistics")
-      series_first_aired = series.get("firstAired")
-      for season in season_entries:
-        season_number = season.get("seasonNumber")
-        if season_number is None:
-          continue
-
-        season_monitored = season.get("monitored")
-        season_statistics = season.get("statistics")
+    seasons: list[dict[str, Any]] = []
+    for series_id, wanted_by_season in wanted_by_series.items():
+      series = series_by_id[series_id]
+      monitored_seasons = _monitored_season_numbers(series)
+      wanted_monitored_seasons = (
+        [number for number in monitored_seasons if number in wanted_by_season]
+        if monitored_seasons is not None
+        else None
+      )
+      for season_number in sorted(wanted_by_season):
+        season_episodes = wanted_by_season[season_number]
+        season = next(
+          (
+            entry
+            for entry in series.get("seasons") or []
+            if entry.get("seasonNumber") == season_number
+          ),
+          None,
+        )
+        season_statistics = season.get("statistics") if season is not None else None
 
         seasons.append(
           {
             "seriesId": series_id,
-            "seriesTitle": series_name,
+            "seriesTitle": series.get("title"),
             "seasonNumber": season_number,
-            "seriesMonitored": series_monitored,
-            "seriesTags": series_tags,
-            "seriesStatistics": series_statistics,
-            "seriesFirstAired": series_first_aired,
-            "seasonMonitored": season_monitored,
+            "seriesMonitored": series.get("monitored"),
+            "seriesTags": series.get("tags"),
+            "seriesStatistics": series.get("statistics"),
+            "seriesFirstAired": series.get("firstAired"),
+            "seasonMonitored": season.get("monitored")
+            if season is not None
+            else any(episode.get("monitored") for episode in season_episodes),
             "seasonStatistics": season_statistics,
+            "seriesMonitoredSeasons": wanted_monitored_seasons,
           }
         )
 
-    logger.debug("Extracted seasons from series payload", season_count=len(seasons), **logging_ids)
+    logger.debug(
+      "Aggregated seasons from wanted episodes",
+      episode_count=len(episodes),
+      season_count=len(seasons),
+      **logging_ids,
+    )
     return seasons
 
-  async def get_seasons(self, logging_ids: dict[str, Any]) -> list[dict[str, Any]]:
-    """Get season-level search items from Sonarr series payloads."""
+  async def _iter_wanted_records(
+    self,
+    operation: Action,
+    params: dict[str, str],
+    logging_ids: dict[str, Any],
+  ) -> AsyncGenerator[dict[str, Any], None]:
+    """Yield every projected record from the paged wanted/missing and wanted/cutoff endpoints."""
+    for path in _WANTED_PATHS:
+      page = 1
+      while True:
+        query = urlencode({"page": page, "pageSize": WANTED_PAGE_SIZE, **params})
+        url = f"{self.base_url}{path}?{query}"
+        result = await self._request("GET", url, operation, {**logging_ids, "page": page})
+        page_records = cast(list[dict[str, Any]], result.get("records") or [])
+        total_records = result.get("totalRecords") or 0
+        logger.debug(
+          "Fetched wanted page",
+          path=path,
+          page=page,
+          record_count=len(page_records),
+          total_records=total_records,
+          **logging_ids,
+        )
+        for record in page_records:
+          yield project(record, self.wanted_projection)
+        if not page_records or page * WANTED_PAGE_SIZE >= total_records:
+          break
+        page += 1
+
+  async def iter_wanted_movies(
+    self, logging_ids: dict[str, Any]
+  ) -> AsyncGenerator[dict[str, Any], None]:
+    """Stream monitored movies that are missing or below cutoff from Radarr's wanted endpoints."""
+    if self.target.arr_type != ArrType.RADARR:
+      raise ValueError(f"get_wanted_movies() only supported for radarr, got {self.target.arr_type}")
+    get_movies_logging_ids = {
+      "action": Action.GET_WANTED_MOVIES,
+      **logging_ids,
+      **self.target.logging_ids(),
+    }
+    logger.debug("Fetching wanted movies", **get_movies_logging_ids)
+    # A movie may be listed by both endpoints; keep the first occurrence.
+    seen_movie_ids: set[Any] = set()
+    try:
+      async for movie in self._iter_wanted_records(
+        Action.GET_WANTED_MOVIES, {"monitored": "true"}, get_movies_logging_ids
+      ):
+        movie_id = movie.get("id")
+        if movie_id in seen_movie_ids:
+          continue
+        seen_movie_ids.add(movie_id)
+        yield movie
+    except Exception as e:
+      logger.exception(
+        "Exception while fetching wanted movies",
+        exception=e,
+        **get_movies_logging_ids,
+      )
+      raise
+    logger.debug("Fetched wanted movies", movie_count=len(seen_movie_ids), **get_movies_logging_ids)
+
+  async def get_wanted_movies(self, logging_ids: dict[str, Any]) -> list[dict[str, Any]]:
+    """Get monitored movies that are missing or below cutoff from Radarr's wanted endpoints."""
+    return [movie async for movie in self.iter_wanted_movies(logging_ids)]
+
+  async def iter_wanted_seasons(
+    self, logging_ids: dict[str, Any]
+  ) -> AsyncGenerator[dict[str, Any], None]:
+    """Stream season-level search items aggregated from Sonarr's wanted episode endpoints.
+
+    Episodes of one season may appear on any page of either endpoint, so all wanted
+    episodes are collected before the first season is yielded.
+    """
+    if self.target.arr_type != ArrType.SONARR:
+      raise ValueError(
+        f"get_wanted_seasons() only supported for sonarr, got {self.target.arr_type}"
+      )
+    get_seasons_logging_ids = {
+      "action": Action.GET_WANTED_SEASONS,
+      **logging_ids,
+      **self.target.logging_ids(),
+    }
+    logger.debug("Fetching wanted episodes for season aggregation", **get_seasons_logging_ids)
+    try:
+      episodes = [
+        episode
+        async for episode in self._iter_wanted_records(
+          Action.GET_WANTED_SEASONS,
+          {"monitored": "true", "includeSeries": "true"},
+          get_seasons_logging_ids,
+        )
+      ]
+      season_items = self._extract_seasons_from_episodes(episodes, get_seasons_logging_ids)
+    except Exception as e:
+      logger.exception(
+        "Exception while fetching wanted seasons",
+        exception=e,
+        **get_seasons_logging_ids,
+      )
+      raise
+    logger.debug(
+      "Fetched wanted seasons",
+      episode_count=len(episodes),
+      season_count=len(season_items),
+      **get_seasons_logging_ids,
+    )
+    for season_item in season_items:
+      yield season_item
+
+  async def get_wanted_seasons(self, logging_ids: dict[str, Any]) -> list[dict[str, Any]]:
+    """Get season-level search items from Sonarr's wanted episode endpoints."""
+    return [season async for season in self.iter_wanted_seasons(logging_ids)]
+
+  async def iter_seasons(self, logging_ids: dict[str, Any]) -> AsyncGenerator[dict[str, Any], None]:
+    """Stream season-level search items, flattening each Sonarr series as it is decoded."""
     if self.target.arr_type != ArrType.SONARR:
       raise ValueError(f"get_seasons() only supported for sonarr, got {self.target.arr_type}")
     url = f"{self.base_url}/api/v3/series"
@@ -239,25 +664,101 @@ class ArrClient:
       **self.target.logging_ids(),
     }
     logger.debug("Fetching series for season extraction", **get_seasons_logging_ids)
+    series_count = 0
+    season_count = 0
     try:
-      result = await self._request("GET", url, Action.GET_SEASONS, get_seasons_logging_ids)
-      series_items = cast(list[dict[str, Any]], result)
-      series_count = len(series_items)
-      season_items = self._extract_seasons_from_series(series_items, get_seasons_logging_ids)
-      logger.debug(
-        "Fetched seasons",
-        series_count=series_count,
-        season_count=len(season_items),
-        **get_seasons_logging_ids,
-      )
-      return season_items
+      async for series in self._stream(
+        url, Action.GET_SEASONS, get_seasons_logging_ids, self.library_projection
+      ):
+        series_count += 1
+        for season_item in self._extract_seasons_from_series(series):
+          season_count += 1
+          yield season_item
     except Exception as e:
       logger.exception(
         "Exception while fetching seasons",
         exception=e,
+        series_count=series_count,
         **get_seasons_logging_ids,
       )
       raise
+    logger.debug(
+      "Fetched seasons",
+      series_count=series_count,
+      season_count=season_count,
+      **get_seasons_logging_ids,
+    )
+
+  async def get_seasons(self, logging_ids: dict[str, Any]) -> list[dict[str, Any]]:
+    """Get season-level search items from Sonarr series payloads."""
+    return [season async for season in self.iter_seasons(logging_ids)]
+
+  async def get_movie(self, movie_id: int, logging_ids: dict[str, Any]) -> dict[str, Any] | None:
+    """Get one movie from Radarr, or None when it no longer exists."""
+    if self.target.arr_type != ArrType.RADARR:
+      raise ValueError(f"get_movie() only supported for radarr, got {self.target.arr_type}")
+    url = f"{self.base_url}/api/v3/movie/{movie_id}"
+    get_movie_logging_ids = {
+      "action": Action.GET_MOVIE,
+      "url": url,
+      "movie_id": movie_id,
+      **logging_ids,
+      **self.target.logging_ids(),
+    }
+    logger.debug("Fetching movie", **get_movie_logging_ids)
+    try:
+      result = await self._request("GET", url, Action.GET_MOVIE, get_movie_logging_ids)
+    except httpx.HTTPStatusError as e:
+      if _is_not_found_error(e):
+        logger.debug("Movie no longer exists", **get_movie_logging_ids)
+        return None
+      raise
+    return cast(dict[str, Any], project(result, self.library_projection))
+
+  async def get_series_seasons(
+    self, series_id: int, logging_ids: dict[str, Any]
+  ) -> list[dict[str, Any]]:
+    """Get the season-level search items of one Sonarr series; empty when it no longer exists."""
+    if self.target.arr_type != ArrType.SONARR:
+      raise ValueError(
+        f"get_series_seasons() only supported for sonarr, got {self.target.arr_type}"
+      )
+    url = f"{self.base_url}/api/v3/series/{series_id}"
+    get_series_logging_ids = {
+      "action": Action.GET_SERIES,
+      "url": url,
+      "series_id": series_id,
+      **logging_ids,
+      **self.target.logging_ids(),
+    }
+    logger.debug("Fetching series", **get_series_logging_ids)
+    try:
+      result = await self._request("GET", url, Action.GET_SERIES, get_series_logging_ids)
+    except httpx.HTTPStatusError as e:
+      if _is_not_found_error(e):
+        logger.debug("Series no longer exists", **get_series_logging_ids)
+        return []
+      raise
+    return self._extract_seasons_from_series(project(result, self.library_projection))
+
+  async def get_history_since(
+    self, since_timestamp: float, logging_ids: dict[str, Any]
+  ) -> list[dict[str, Any]]:
+    """Get history records (movieId or seriesId, date, eventType) dated after a timestamp."""
+    date = datetime.fromtimestamp(since_timestamp, tz=timezone.utc).isoformat()
+    url = f"{self.base_url}/api/v3/history/since?{urlencode({'date': date})}"
+    get_history_logging_ids = {
+      "action": Action.GET_HISTORY,
+      "url": url,
+      "since": date,
+      **logging_ids,
+      **self.target.logging_ids(),
+    }
+    logger.debug("Fetching history", **get_history_logging_ids)
+    result = await self._request("GET", url, Action.GET_HISTORY, get_history_logging_ids)
+    records = [project(record, self.history_projection) for record in result or []]
+    logger.debug("Fetched history", record_count=len(records), **get_history_logging_ids)
+    return records
 
   async def search_movie(self, movie_id: "MovieId", logging_ids: dict[str, Any]) -> dict[str, Any]:
     """Trigger search for a movie in Radarr."""
@@ -288,6 +789,38 @@ class ArrClient:
       )
       raise
 
+  async def search_movies(
+    self, movie_ids: list["MovieId"], logging_ids: dict[str, Any]
+  ) -> dict[str, Any]:
+    """Trigger one search covering several movies in Radarr."""
+    if self.target.arr_type != ArrType.RADARR:
+      raise ValueError(f"search_movies() only supported for radarr, got {self.target.arr_type}")
+    if not movie_ids:
+      raise ValueError("search_movies() requires at least one movie")
+    url = f"{self.base_url}/api/v3/command"
+    payload = {"name": "MoviesSearch", "movieIds": [movie_id.movie_id for movie_id in movie_ids]}
+
+    search_logging_ids = {
+      "action": Action.SEARCH_MOVIES,
+      "url": url,
+      "payload": payload,
+      "movie_count": len(movie_ids),
+      **logging_ids,
+      **self.target.logging_ids(),
+    }
+    logger.debug("Searching movies", **search_logging_ids)
+    try:
+      result = await self._request("POST", url, Action.SEARCH_MOVIES, search_logging_ids, payload)
+      logger.debug("Movies searched", **search_logging_ids)
+      return cast(dict[str, Any], result)
+    except Exception as e:
+      logger.exception(
+        "Exception while searching movies",
+        exception=e,
+        **search_logging_ids,
+      )
+      raise
+
   async def search_season(
     self, season_id: "SeasonId", logging_ids: dict[str, Any]
   ) -> dict[str, Any]:
@@ -323,3 +856,31 @@ class ArrClient:
         **search_logging_ids,
       )
       raise
+
+  async def search_series(self, series_id: int, logging_ids: dict[str, Any]) -> dict[str, Any]:
+    """Trigger search for every monitored season of a series in Sonarr."""
+    if self.target.arr_type != ArrType.SONARR:
+      raise ValueError(f"search_series() only supported for sonarr, got {self.target.arr_type}")
+
+    url = f"{self.base_url}/api/v3/command"
+    payload = {"name": "SeriesSearch", "seriesId": series_id}
+    search_logging_ids = {
+      "action": Action.SEARCH_SERIES,
+      "url": url,
+      "payload": payload,
+      "series_id": series_id,
+      **logging_ids,
+      **self.target.logging_ids(),
+    }
+    logger.debug("Searching series", **search_logging_ids)
+    try:
+      result = await self._request("POST", url, Action.SEARCH_SERIES, search_logging_ids, payload)
+      logger.debug("Series searched", **search_logging_ids)
+      return cast(dict[str, Any], result)
+    except Exception as e:
+      logger.exception(
+        "Exception while searching series",
+        exception=e,
+        **search_logging_ids,
+      )
+      raise
@@ -0,0 +1,142 @@
+"""Per-target circuit breaker that fails requests fast while an *arr instance is down."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from enum import StrEnum
+from typing import Any
+
+import structlog
+
+from app.config import ArrTarget
+from app.metrics import circuit_breaker_state
+
+logger = structlog.get_logger()
+
+
+class CircuitState(StrEnum):
+  """States of a circuit breaker."""
+
+  CLOSED = "closed"
+  HALF_OPEN = "half_open"
+  OPEN = "open"
+
+
+# Values of the gatherarr_circuit_breaker_state gauge.
+CIRCUIT_STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+  """Raised instead of making a request while a target's circuit breaker is open."""
+
+  def __init__(self, target_name: str, retry_in_s: float) -> None:
+    super().__init__(f"Circuit breaker for target {target_name} is open")
+    self.target_name = target_name
+    self.retry_in_s = retry_in_s
+
+
+class CircuitBreaker:
+  """Closed/open/half-open circuit breaker for the requests to one target.
+
+  Requests are reported with record_success() or record_failure() once their retries are
+  exhausted. After circuit_failure_threshold consecutive failures the breaker opens, and
+  before_request() raises CircuitOpenError for circuit_open_s. The first request after that
+  runs the probe (a cheap request, while concurrent requests wait for its outcome): if it
+  fails the breaker opens again, otherwise it is half-open and lets requests through. It
+  closes after circuit_close_successes consecutive successes (the probe included) and opens
+  on any failure. A circuit_failure_threshold of 0 disables the breaker.
+  """
+
+  def __init__(
+    self,
+    target: ArrTarget,
+    probe: Callable[[], Awaitable[Any]],
+    *,
+    clock: Callable[[], float] = time.monotonic,
+  ) -> None:
+    settings = target.settings
+    self.target = target
+    self.failure_threshold = settings.circuit_failure_threshold
+    self.open_s = settings.circuit_open_s
+    self.close_successes = settings.circuit_close_successes
+    self._probe = probe
+    self._clock = clock
+    self._probe_lock = asyncio.Lock()
+    self._state = CircuitState.CLOSED
+    self._failures = 0
+    self._successes = 0
+    self._opened_at = 0.0
+    self._set_state(CircuitState.CLOSED)
+
+  @property
+  def state(self) -> CircuitState:
+    """Current state of the breaker."""
+    return self._state
+
+  def _set_state(self, state: CircuitState) -> None:
+    if state != self._state:
+      logger.info(
+        "Circuit breaker state changed",
+        previous_state=self._state.value,
+        state=state.value,
+        consecutive_failures=self._failures,
+        **self.target.logging_ids(),
+      )
+    self._state = state
+    self._failures = 0
+    self._successes = 0
+    circuit_breaker_state.labels(target=self.target.name, type=self.target.arr_type.value).set(
+      CIRCUIT_STATE_VALUES[state]
+    )
+
+  def _open(self) -> None:
+    self._opened_at = self._clock()
+    self._set_state(CircuitState.OPEN)
+
+  async def before_request(self) -> None:
+    """Raise CircuitOpenError unless a request may be made now, probing the target if due."""
+    if self._state != CircuitState.OPEN:
+      return
+    async with self._probe_lock:
+      # Another request may have probed the target while this one waited for the lock.
+      if self._state != CircuitState.OPEN:
+        return
+      retry_in_s = self._opened_at + self.open_s - self._clock()
+      if retry_in_s > 0:
+        raise CircuitOpenError(self.target.name, retry_in_s)
+
+      # The breaker stays open during the probe, so concurrent requests wait for it above.
+      logger.debug("Probing target before letting requests through", **self.target.logging_ids())
+      try:
+        await self._probe()
+      except Exception as e:
+        logger.warning(
+          "Circuit breaker probe failed",
+          error=str(e),
+          open_s=self.open_s,
+          **self.target.logging_ids(),
+        )
+        self._open()
+        raise CircuitOpenError(self.target.name, self.open_s) from e
+      self._set_state(CircuitState.HALF_OPEN)
+      self.record_success()
+
+  def record_success(self) -> None:
+    """Record a request that reached the target."""
+    if self._state == CircuitState.HALF_OPEN:
+      self._successes += 1
+      if self._successes >= self.close_successes:
+        self._set_state(CircuitState.CLOSED)
+    elif self._state == CircuitState.CLOSED:
+      self._failures = 0
+
+  def record_failure(self) -> None:
+    """Record a request that failed to reach the target (after its retries)."""
+    if self.failure_threshold == 0:
+      return
+    if self._state == CircuitState.HALF_OPEN:
+      self._open()
+    elif self._state == CircuitState.CLOSED:
+      self._failures += 1
+      if self._failures >= self.failure_threshold:
+        self._open()
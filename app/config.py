@@ -35,10 +35,26 @@ _TARGET_OVERRIDE_ENV_MAP: tuple[tuple[str, str], ...] = (
   ("HTTP_RETRY_BACKOFF_EXPONENT", "http_retry_backoff_exponent"),
   ("HTTP_RETRY_MAX_DELAY_S", "http_retry_max_delay_s"),
   ("HTTP_TIMEOUT_S", "http_timeout_s"),
+  ("HTTP_THROTTLE_RECOVERY_S", "http_throttle_recovery_s"),
+  ("HTTP_CONNECT_TIMEOUT_S", "http_connect_timeout_s"),
+  ("HTTP_POOL_TIMEOUT_S", "http_pool_timeout_s"),
+  ("HTTP_MAX_CONNECTIONS", "http_max_connections"),
+  ("HTTP_KEEPALIVE_EXPIRY_S", "http_keepalive_expiry_s"),
+  ("HTTP2_ENABLED", "http2_enabled"),
+  ("HTTP_PREWARM_CONNECTIONS", "http_prewarm_connections"),
+  ("CIRCUIT_FAILURE_THRESHOLD", "circuit_failure_threshold"),
+  ("CIRCUIT_OPEN_S", "circuit_open_s"),
+  ("CIRCUIT_CLOSE_SUCCESSES", "circuit_close_successes"),
   ("SEARCH_RETRY_MAX_ATTEMPTS", "search_retry_max_attempts"),
   ("SEARCH_RETRY_INITIAL_DELAY_S", "search_retry_initial_delay_s"),
   ("SEARCH_RETRY_BACKOFF_EXPONENT", "search_retry_backoff_exponent"),
   ("SEARCH_RETRY_MAX_DELAY_S", "search_retry_max_delay_s"),
+  ("SEARCH_CONCURRENCY", "search_concurrency"),
+  ("SEARCH_BATCH_SIZE", "search_batch_size"),
+  ("SERIES_SEARCH_THRESHOLD", "series_search_threshold"),
+  ("FETCH_MODE", "fetch_mode"),
+  ("LIBRARY_REFRESH_S", "library_refresh_s"),
+  ("LIBRARY_RECONCILE_S", "library_reconcile_s"),
 )
 
 
@@ -49,6 +65,30 @@ def _resolve_override_value(
   return default_value if override_value is None else override_value
 
 
+class FetchMode(StrEnum):
+  """Strategies for fetching candidate items from a target."""
+
+  LIBRARY = "library"
+  WANTED = "wanted"
+
+
+class StateBackend(StrEnum):
+  """Storage formats for persisted state."""
+
+  YAML = "yaml"
+  SQLITE = "sqlite"
+  JOURNAL = "journal"
+  SHARDED = "sharded"
+
+
+class StateFormat(StrEnum):
+  """Encodings of the state files written by the `yaml`, `journal` and `sharded` state backends."""
+
+  YAML = "yaml"
+  JSON = "json"
+  BINARY = "binary"
+
+
 class TargetSettings(BaseModel):
   """Resolved settings for target-level behavior."""
 
@@ -68,10 +108,26 @@ class TargetSettings(BaseModel):
   http_retry_backoff_exponent: float = Field(default=2.0, gt=0)
   http_retry_max_delay_s: float = Field(default=30.0, gt=0)
   http_timeout_s: float = Field(default=30.0, ge=0.1)
+  http_throttle_recovery_s: float = Field(default=300.0, ge=0)
+  http_connect_timeout_s: float = Field(default=10.0, ge=0.1)
+  http_pool_timeout_s: float = Field(default=10.0, ge=0.1)
+  http_max_connections: int = Field(default=10, ge=1)
+  http_keepalive_expiry_s: float = Field(default=5.0, ge=0)
+  http2_enabled: bool = False
+  http_prewarm_connections: int = Field(default=1, ge=0)
+  circuit_failure_threshold: int = Field(default=5, ge=0)
+  circuit_open_s: float = Field(default=60.0, gt=0)
+  circuit_close_successes: int = Field(default=1, ge=1)
   search_retry_max_attempts: int = Field(default=5, ge=0)
   search_retry_initial_delay_s: float = Field(default=60.0, gt=0)
   search_retry_backoff_exponent: float = Field(default=2.0, gt=0)
   search_retry_max_delay_s: float = Field(default=86400.0, gt=0)
+  search_concurrency: int = Field(default=1, ge=1)
+  search_batch_size: int = Field(default=1, ge=1)
+  series_search_threshold: int = Field(default=0, ge=0)
+  fetch_mode: FetchMode = FetchMode.LIBRARY
+  library_refresh_s: int = Field(default=0, ge=0)
+  library_reconcile_s: int = Field(default=0, ge=0)
 
   @field_validator("include_tags", "exclude_tags", mode="before")
   @classmethod
@@ -124,6 +180,17 @@ def _parse_float_override(value: str | None, default: float) -> float:
     raise ValueError(f"Invalid float value: {value}") from e
 
 
+def _parse_fetch_mode_override(value: str | None, default: FetchMode) -> FetchMode:
+  """Parse a fetch mode override value."""
+  if value is None:
+    return default
+  try:
+    return FetchMode(value.lower().strip())
+  except ValueError as e:
+    allowed_modes = "', '".join(member.value for member in FetchMode)
+    raise ValueError(f"Invalid fetch mode: {value}. Must be one of: '{allowed_modes}'") from e
+
+
 def _build_target_settings(base_config: "Config", override_data: dict[str, str]) -> TargetSettings:
   """Build resolved target settings from defaults and per-target overrides."""
   include_tags_raw = (
@@ -177,6 +244,36 @@ def _build_target_settings(base_config: "Config", override_data: dict[str, str])
     http_timeout_s=_parse_float_override(
       override_data.get("http_timeout_s"), base_config.http_timeout_s
     ),
+    http_throttle_recovery_s=_parse_float_override(
+      override_data.get("http_throttle_recovery_s"), base_config.http_throttle_recovery_s
+    ),
+    http_connect_timeout_s=_parse_float_override(
+      override_data.get("http_connect_timeout_s"), base_config.http_connect_timeout_s
+    ),
+    http_pool_timeout_s=_parse_float_override(
+      override_data.get("http_pool_timeout_s"), base_config.http_pool_timeout_s
+    ),
+    http_max_connections=_parse_int_override(
+      override_data.get("http_max_connections"), base_config.http_max_connections
+    ),
+    http_keepalive_expiry_s=_parse_float_override(
+      override_data.get("http_keepalive_expiry_s"), base_config.http_keepalive_expiry_s
+    ),
+    http2_enabled=_parse_bool_override(
+      override_data.get("http2_enabled"), base_config.http2_enabled
+    ),
+    http_prewarm_connections=_parse_int_override(
+      override_data.get("http_prewarm_connections"), base_config.http_prewarm_connections
+    ),
+    circuit_failure_threshold=_parse_int_override(
+      override_data.get("circuit_failure_threshold"), base_config.circuit_failure_threshold
+    ),
+    circuit_open_s=_parse_float_override(
+      override_data.get("circuit_open_s"), base_config.circuit_open_s
+    ),
+    circuit_close_successes=_parse_int_override(
+      override_data.get("circuit_close_successes"), base_config.circuit_close_successes
+    ),
     search_retry_max_attempts=_parse_int_override(
       override_data.get("search_retry_max_attempts"), base_config.search_retry_max_attempts
     ),
@@ -189,6 +286,22 @@ def _build_target_settings(base_config: "Config", override_data: dict[str, str])
     search_retry_max_delay_s=_parse_float_override(
       override_data.get("search_retry_max_delay_s"), base_config.search_retry_max_delay_s
     ),
+    search_concurrency=_parse_int_override(
+      override_data.get("search_concurrency"), base_config.search_concurrency
+    ),
+    search_batch_size=_parse_int_override(
+      override_data.get("search_batch_size"), base_config.search_batch_size
+    ),
+    series_search_threshold=_parse_int_override(
+      override_data.get("series_search_threshold"), base_config.series_search_threshold
+    ),
+    fetch_mode=_parse_fetch_mode_override(override_data.get("fetch_mode"), base_config.fetch_mode),
+    library_refresh_s=_parse_int_override(
+      override_data.get("library_refresh_s"), base_config.library_refresh_s
+    ),
+    library_reconcile_s=_parse_int_override(
+      override_data.get("library_reconcile_s"), base_config.library_reconcile_s
+    ),
   )
 
 
@@ -207,6 +320,9 @@ class ArrTarget(BaseModel):
   base_url: str
   api_key: str
   settings: TargetSettings
+  # Unix domain socket to connect to instead of base_url's host; base_url still sets the
+  # Host header and URL base path.
+  unix_socket_path: str | None = None
   _logging_ids: dict[str, str] | None = None
 
   @field_validator("name")
@@ -236,13 +352,24 @@ class ArrTarget(BaseModel):
       raise ValueError(f"base_url must use http or https scheme, got: {parsed.scheme}")
     return v
 
+  @field_validator("unix_socket_path")
+  @classmethod
+  def validate_unix_socket_path(cls, v: str | None) -> str | None:
+    """Validate unix_socket_path is an absolute path, with or without a unix:// prefix."""
+    if v is None:
+      return None
+    path = v.removeprefix("unix://")
+    if not path.startswith("/"):
+      raise ValueError(f"unix_socket_path must be an absolute path, got: {v}")
+    return path
+
   def logging_ids(self) -> dict[str, str]:
     """Return logging identifiers for the target."""
     if self._logging_ids is None:
       self._logging_ids = {"target_name": self.name, "target_type": self.arr_type.value}
     return self._logging_ids
 
-  def config_logging_tags(self) -> dict[str, int | float | bool | list[str]]:
+  def config_logging_tags(self) -> dict[str, int | float | bool | str | list[str]]:
     """Return target configuration values suitable for logging."""
     tags = self.model_dump(mode="json", exclude={"api_key", "settings"})
     settings_attrs = [
@@ -262,10 +389,26 @@ class ArrTarget(BaseModel):
       ("http_retry_initial_delay_s", lambda v: v),
       ("http_retry_backoff_exponent", lambda v: v),
       ("http_retry_max_delay_s", lambda v: v),
+      ("http_throttle_recovery_s", lambda v: v),
+      ("http_connect_timeout_s", lambda v: v),
+      ("http_pool_timeout_s", lambda v: v),
+      ("http_max_connections", lambda v: v),
+      ("http_keepalive_expiry_s", lambda v: v),
+      ("http2_enabled", lambda v: v),
+      ("http_prewarm_connections", lambda v: v),
+      ("circuit_failure_threshold", lambda v: v),
+      ("circuit_open_s", lambda v: v),
+      ("circuit_close_successes", lambda v: v),
       ("search_retry_max_attempts", lambda v: v),
       ("search_retry_initial_delay_s", lambda v: v),
       ("search_retry_backoff_exponent", lambda v: v),
       ("search_retry_max_delay_s", lambda v: v),
+      ("search_concurrency", lambda v: v),
+      ("search_batch_size", lambda v: v),
+      ("series_search_threshold", lambda v: v),
+      ("fetch_mode", lambda v: v.value),
+      ("library_refresh_s", lambda v: v),
+      ("library_reconcile_s", lambda v: v),
     ]
 
     for attr, transformer in settings_attrs:
@@ -287,6 +430,9 @@ class Config(BaseSettings):
   listen_address: str = "0.0.0.0"
   listen_port: int = Field(default=9090, ge=1)
   state_file_path: str | None = "/data/state.yaml"
+  state_backend: StateBackend = StateBackend.YAML
+  state_format: StateFormat = StateFormat.YAML
+  state_save_coalesce_s: float = Field(default=1.0, ge=0.0)
   ops_per_interval: int = Field(default=1, ge=1)
   interval_s: int = Field(default=60, ge=1)
   item_revisit_s: int = Field(default=604800, ge=1)
@@ -303,11 +449,30 @@ class Config(BaseSettings):
   http_retry_backoff_exponent: float = Field(default=2.0, gt=0)
   http_retry_max_delay_s: float = Field(default=30.0, gt=0)
   http_timeout_s: float = Field(default=30.0, ge=0.1)
+  http_throttle_recovery_s: float = Field(default=300.0, ge=0)
+  http_connect_timeout_s: float = Field(default=10.0, ge=0.1)
+  http_pool_timeout_s: float = Field(default=10.0, ge=0.1)
+  http_max_connections: int = Field(default=10, ge=1)
+  http_keepalive_expiry_s: float = Field(default=5.0, ge=0)
+  http2_enabled: bool = False
+  http_prewarm_connections: int = Field(default=1, ge=0)
+  http_coalesce_ttl_s: float = Field(default=0.0, ge=0.0)
+  circuit_failure_threshold: int = Field(default=5, ge=0)
+  circuit_open_s: float = Field(default=60.0, gt=0)
+  circuit_close_successes: int = Field(default=1, ge=1)
   search_retry_max_attempts: int = Field(default=5, ge=0)
   search_retry_initial_delay_s: float = Field(default=60.0, gt=0)
   search_retry_backoff_exponent: float = Field(default=2.0, gt=0)
   search_retry_max_delay_s: float = Field(default=86400.0, gt=0)
+  search_concurrency: int = Field(default=1, ge=1)
+  search_batch_size: int = Field(default=1, ge=1)
+  series_search_threshold: int = Field(default=0, ge=0)
+  fetch_mode: FetchMode = FetchMode.LIBRARY
+  library_refresh_s: int = Field(default=0, ge=0)
+  library_reconcile_s: int = Field(default=0, ge=0)
   shutdown_timeout_s: float = Field(default=30.0, ge=0.0)
+  webhook_enabled: bool = False
+  webhook_token: str = ""
   targets: list[ArrTarget] = Field(default_factory=list, exclude=True)
 
   @field_validator("log_level")
@@ -326,6 +491,14 @@ class Config(BaseSettings):
     result = logging.getLevelName(logging.INFO)
     return str(result)
 
+  @field_validator("fetch_mode", "state_backend", "state_format", mode="before")
+  @classmethod
+  def normalize_enum_values(cls, v: object) -> object:
+    """Accept fetch mode, state backend and state format values case-insensitively."""
+    if isinstance(v, str):
+      return v.lower().strip()
+    return v
+
   @field_validator("listen_address")
   @classmethod
   def validate_listen_address(cls, v: str) -> str:
@@ -417,8 +590,10 @@ def load_config(env: dict[str, str] | None = None) -> Config:
     if apikey_key not in env_dict:
       raise ValueError(f"Missing required config: {apikey_key}")
 
+    unix_socket_key = f"GTH_ARR_{n}_UNIX_SOCKET_PATH"
+
     # Mark target keys as used
-    for key in (type_key, name_key, baseurl_key, apikey_key):
+    for key in (type_key, name_key, baseurl_key, apikey_key, unix_socket_key):
       unused_gth_keys.discard(key.upper())
     for env_suffix, _ in _TARGET_OVERRIDE_ENV_MAP:
       key = f"GTH_ARR_{n}_{env_suffix}"
@@ -442,9 +617,11 @@ def load_config(env: dict[str, str] | None = None) -> Config:
       base_url=env_dict[baseurl_key],
       api_key=env_dict[apikey_key],
       settings=resolved_settings,
+      unix_socket_path=env_dict.get(unix_socket_key) or None,
     )
     parsed_url = urlparse(target.base_url)
-    if parsed_url.scheme == "http":
+    # Requests over a Unix domain socket do not leave the host.
+    if parsed_url.scheme == "http" and target.unix_socket_path is None:
       logger.warning(
         "Target base_url uses HTTP; API key is transmitted in cleartext. Prefer HTTPS.",
         target_name=target.name,
@@ -0,0 +1,73 @@
+"""Min-heap of per-key deadlines used by the scheduler loop."""
+
+import heapq
+import itertools
+
+# Rebuild the heap once superseded entries outnumber live ones by this factor.
+_COMPACTION_FACTOR = 2
+
+
+class DeadlineQueue:
+  """Priority queue of next-due timestamps keyed by target name.
+
+  Each key has at most one live deadline. Re-scheduling a key pushes a new heap entry and
+  marks the previous one as superseded; superseded entries are discarded lazily when they
+  reach the top of the heap. Scheduling and popping are O(log n) in the number of keys.
+  """
+
+  def __init__(self) -> None:
+    self._heap: list[tuple[float, int, str]] = []
+    self._live: dict[str, tuple[float, int]] = {}
+    self._sequence = itertools.count()
+
+  def __len__(self) -> int:
+    return len(self._live)
+
+  def __contains__(self, key: object) -> bool:
+    return key in self._live
+
+  def schedule(self, key: str, deadline: float) -> None:
+    """Set (or replace) the deadline for a key."""
+    sequence = next(self._sequence)
+    self._live[key] = (deadline, sequence)
+    heapq.heappush(self._heap, (deadline, sequence, key))
+    if len(self._heap) > _COMPACTION_FACTOR * len(self._live) + 1:
+      self._compact()
+
+  def remove(self, key: str) -> None:
+    """Drop the deadline for a key, if any."""
+    self._live.pop(key, None)
+
+  def deadline(self, key: str) -> float | None:
+    """Return the live deadline for a key, or None when the key is not scheduled."""
+    entry = self._live.get(key)
+    return entry[0] if entry is not None else None
+
+  def next_deadline(self) -> float | None:
+    """Return the earliest live deadline, or None when the queue is empty."""
+    self._discard_superseded()
+    return self._heap[0][0] if self._heap else None
+
+  def pop_due(self, now: float) -> list[tuple[str, float]]:
+    """Remove and return (key, deadline) for every key due at or before now, earliest first."""
+    due: list[tuple[str, float]] = []
+    while True:
+      self._discard_superseded()
+      if not self._heap or self._heap[0][0] > now:
+        return due
+      deadline, _, key = heapq.heappop(self._heap)
+      del self._live[key]
+      due.append((key, deadline))
+
+  def _discard_superseded(self) -> None:
+    """Pop heap entries that no longer match the live deadline for their key."""
+    while self._heap:
+      deadline, sequence, key = self._heap[0]
+      if self._live.get(key) == (deadline, sequence):
+        return
+      heapq.heappop(self._heap)
+
+  def _compact(self) -> None:
+    """Rebuild the heap from live entries only."""
+    self._heap = [(deadline, sequence, key) for key, (deadline, sequence) in self._live.items()]
+    heapq.heapify(self._heap)
@@ -1,10 +1,11 @@
 """Item handlers for Radarr and Sonarr."""
 
-from app.handlers.base import ItemHandler, ItemId
+from app.handlers.base import BatchSearchHandler, ItemHandler, ItemId
 from app.handlers.movie import MovieHandler, MovieId
 from app.handlers.season import SeasonHandler, SeasonId
 
 __all__ = [
+  "BatchSearchHandler",
   "ItemHandler",
   "ItemId",
   "MovieHandler",
@@ -1,8 +1,9 @@
 """Base types and utilities for item handlers."""
 
+from collections.abc import Hashable
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Protocol
+from typing import Any, Protocol, runtime_checkable
 
 from dateutil import parser as dateutil_parser
 
@@ -85,3 +86,39 @@ class ItemHandler(Protocol):
   ) -> None:
     """Trigger search for the item and log the action."""
     ...
+
+
+@runtime_checkable
+class BatchSearchHandler(ItemHandler, Protocol):
+  """Optional ItemHandler capability: search several items with a single command.
+
+  The scheduler groups consecutive eligible items that share a batch_key, up to
+  max_batch_size items, and calls search_batch instead of calling search once per item.
+  Groups smaller than min_batch_size, or that can_search_batch rejects, are searched item
+  by item. State is still recorded per item.
+  """
+
+  def batch_key(self, item: dict[str, Any]) -> Hashable:
+    """Return a key; only items with equal keys may share a search command."""
+    ...
+
+  def max_batch_size(self) -> int:
+    """Return the maximum number of items in one search command."""
+    ...
+
+  def min_batch_size(self) -> int:
+    """Return the minimum number of items worth searching with one command."""
+    ...
+
+  def can_search_batch(self, items: list[dict[str, Any]]) -> bool:
+    """Return whether one search_batch command would search exactly these items."""
+    ...
+
+  async def search_batch(
+    self,
+    client: Any,
+    items: list[dict[str, Any]],
+    logging_ids: dict[str, Any],
+  ) -> None:
+    """Trigger one search covering all items and log the action for each item."""
+    ...
@@ -1,5 +1,6 @@
 """Handler for processing movies."""
 
+from collections.abc import Hashable
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
@@ -154,3 +155,44 @@ class MovieHandler:
       movie_id=item_id,
       **logging_ids,
     )
+
+  def batch_key(self, item: dict[str, Any]) -> Hashable:
+    """Movies can be batched together regardless of which movie they are."""
+    return None
+
+  def max_batch_size(self) -> int:
+    """Return the configured number of movies per MoviesSearch command."""
+    return self.target.settings.search_batch_size
+
+  def min_batch_size(self) -> int:
+    """A MoviesSearch command is worthwhile for any group of two or more movies."""
+    return 2
+
+  def can_search_batch(self, items: list[dict[str, Any]]) -> bool:
+    """MoviesSearch searches exactly the movies it lists."""
+    return True
+
+  async def search_batch(
+    self,
+    client: ArrClient,
+    items: list[dict[str, Any]],
+    logging_ids: dict[str, Any],
+  ) -> None:
+    """Trigger one MoviesSearch command for several movies and log the action per movie."""
+    movie_ids: list[MovieId] = []
+    for item in items:
+      item_id = self.extract_item_id(item)
+      if item_id is None:
+        raise ValueError("Movie ID is required")
+      movie_ids.append(item_id)
+
+    await client.search_movies(movie_ids, logging_ids=logging_ids)
+
+    for movie_id in movie_ids:
+      log_movie_action(
+        logger=logger,
+        action=Action.SEARCH_MOVIE,
+        movie_id=movie_id,
+        batch_size=len(movie_ids),
+        **logging_ids,
+      )
@@ -1,5 +1,6 @@
 """Handler for processing individual seasons."""
 
+from collections.abc import Hashable
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
@@ -295,3 +296,70 @@ class SeasonHandler:
       season_id=season_id,
       **logging_ids,
     )
+
+  def batch_key(self, item: dict[str, Any]) -> Hashable:
+    """Seasons are only coalesced with other seasons of the same series."""
+    return item.get("seriesId")
+
+  def max_batch_size(self) -> int:
+    """Coalesce the eligible seasons of a series when series searches are enabled.
+
+    A series only fits in one batch when its monitored seasons do not exceed
+    ops_per_interval; otherwise its seasons are searched one by one.
+    """
+    if self.target.settings.series_search_threshold <= 0:
+      return 1
+    return self.target.settings.ops_per_interval
+
+  def min_batch_size(self) -> int:
+    """Return the number of eligible seasons that triggers a SeriesSearch."""
+    if self.target.settings.series_search_threshold <= 0:
+      # Series searches are disabled; no batch ever reaches this size.
+      return 2
+    return self.target.settings.series_search_threshold
+
+  def can_search_batch(self, items: list[dict[str, Any]]) -> bool:
+    """Allow a SeriesSearch only when the batch holds exactly the series' monitored seasons.
+
+    SeriesSearch searches every monitored season, so a batch missing one (skipped for its
+    revisit timeout, cutoff, thresholds or retry limit, or split off by the ops limit) would
+    search seasons the scheduler chose not to, without recording their state. In wanted
+    mode the series' monitored seasons are those with wanted episodes.
+    """
+    monitored_seasons = items[0].get("seriesMonitoredSeasons")
+    if monitored_seasons is None:
+      return False
+    return sorted(item["seasonNumber"] for item in items) == sorted(monitored_seasons)
+
+  async def search_batch(
+    self,
+    client: ArrClient,
+    items: list[dict[str, Any]],
+    logging_ids: dict[str, Any],
+  ) -> None:
+    """Trigger one SeriesSearch covering several seasons and log the action per season."""
+    season_ids: list[SeasonId] = []
+    for item in items:
+      season_id = self.extract_item_id(item)
+      if season_id is None:
+        raise ValueError("Season ID is required")
+      season_ids.append(season_id)
+    series_ids = {season_id.series_id for season_id in season_ids}
+    if len(series_ids) != 1:
+      raise ValueError(f"Seasons from exactly one series are required, got {sorted(series_ids)}")
+
+    series_logging_ids = {
+      **logging_ids,
+      "series_id": str(season_ids[0].series_id),
+      "series_name": season_ids[0].series_name if season_ids[0].series_name is not None else "None",
+    }
+    await client.search_series(season_ids[0].series_id, logging_ids=series_logging_ids)
+
+    for season_id in season_ids:
+      log_season_action(
+        logger=logger,
+        action=Action.SEARCH_SERIES,
+        season_id=season_id,
+        batch_size=len(season_ids),
+        **logging_ids,
+      )
@@ -1,14 +1,37 @@
 """HTTP client implementation using httpx."""
 
+import asyncio
+import importlib.util
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import AbstractAsyncContextManager, aclosing
 from typing import Any, Protocol
 
 import httpx
 import structlog
 
 from app.arr_client import HttpClient
+from app.config import ArrTarget
+from app.json_stream import JsonArrayParser
+from app.metrics import (
+  http_connections_total,
+  http_pool_wait_seconds,
+  http_requests_coalesced_total,
+)
+from app.single_flight import CoalescedFrom, SingleFlight
 
 logger = structlog.get_logger()
 
+# httpcore trace events marking that a request got its connection: a new connection being
+# opened, or the request being sent on a pooled one.
+_NEW_CONNECTION_EVENTS = frozenset(
+  {"connection.connect_tcp.started", "connection.connect_unix_socket.started"}
+)
+_CONNECTION_ACQUIRED_EVENTS = _NEW_CONNECTION_EVENTS | {
+  "http11.send_request_headers.started",
+  "http2.send_request_headers.started",
+}
+
 
 class AsyncHttpClient(Protocol):
   """Protocol for async HTTP client interface."""
@@ -21,6 +44,16 @@ class AsyncHttpClient(Protocol):
     """Make POST request."""
     ...
 
+  def stream(
+    self, method: str, url: str, *args: Any, **kwargs: Any
+  ) -> AbstractAsyncContextManager["StreamingHttpResponse"]:
+    """Send a request and keep the response body unread until iterated."""
+    ...
+
+  async def aclose(self) -> None:
+    """Close the client."""
+    ...
+
 
 class HttpResponse(Protocol):
   """Protocol for HTTP response interface."""
@@ -36,16 +69,176 @@ class HttpResponse(Protocol):
     ...
 
 
+class StreamingHttpResponse(Protocol):
+  """Protocol for a response whose body is read incrementally."""
+
+  status_code: int
+
+  def raise_for_status(self) -> Any:
+    """Raise error for non-2xx status."""
+    ...
+
+  def aiter_bytes(self) -> AsyncIterator[bytes]:
+    """Iterate over the response body in chunks."""
+    ...
+
+
+class _ConnectionTrace:
+  """httpcore trace callback recording how long a request waited for a connection."""
+
+  def __init__(self) -> None:
+    self.started_at = time.perf_counter()
+    self.pool_wait_s: float | None = None
+    self.new_connection = False
+
+  async def __call__(self, event_name: str, info: dict[str, Any]) -> None:
+    if self.pool_wait_s is None and event_name in _CONNECTION_ACQUIRED_EVENTS:
+      self.pool_wait_s = time.perf_counter() - self.started_at
+      self.new_connection = event_name in _NEW_CONNECTION_EVENTS
+
+
 class HttpxClient(HttpClient):
-  """httpx-based HTTP client implementation."""
+  """httpx-based HTTP client implementation.
+
+  With metric_labels (target and type), each request's wait for a pooled connection and
+  whether it reused one are exported. connect_timeout_s and pool_timeout_s, when given,
+  replace the per-call timeout for connecting and for waiting on the pool. With single_flight
+  (which may be shared by the clients of several targets), identical concurrent GETs (same
+  URL and API key) share one request.
+  """
 
-  def __init__(self, client: AsyncHttpClient | httpx.AsyncClient) -> None:
+  def __init__(
+    self,
+    client: AsyncHttpClient | httpx.AsyncClient,
+    *,
+    metric_labels: dict[str, str] | None = None,
+    connect_timeout_s: float | None = None,
+    pool_timeout_s: float | None = None,
+    single_flight: SingleFlight | None = None,
+  ) -> None:
     self.client = client
+    self.metric_labels = metric_labels
+    self.connect_timeout_s = connect_timeout_s
+    self.pool_timeout_s = pool_timeout_s
+    self.single_flight = single_flight
+
+  @classmethod
+  def for_target(
+    cls,
+    target: ArrTarget,
+    transport: httpx.AsyncBaseTransport | None = None,
+    single_flight: SingleFlight | None = None,
+  ) -> "HttpxClient":
+    """Create a client with its own connection pool configured from target.settings.
+
+    The pool connects over target.unix_socket_path when set. A transport, when given,
+    replaces the pool altogether (e.g. an in-process ASGI app or a mock).
+    """
+    settings = target.settings
+    http2 = settings.http2_enabled
+    if http2 and importlib.util.find_spec("h2") is None:
+      logger.warning(
+        "HTTP/2 requires the h2 package (httpx[http2]), using HTTP/1.1",
+        **target.logging_ids(),
+      )
+      http2 = False
+    if transport is None:
+      # Pool limits and HTTP/2 are transport options once a transport is passed to the client.
+      transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+          max_connections=settings.http_max_connections,
+          max_keepalive_connections=settings.http_max_connections,
+          keepalive_expiry=settings.http_keepalive_expiry_s,
+        ),
+        http2=http2,
+        uds=target.unix_socket_path,
+      )
+    client = httpx.AsyncClient(transport=transport)
+    return cls(
+      client,
+      metric_labels={"target": target.name, "type": target.arr_type.value},
+      connect_timeout_s=settings.http_connect_timeout_s,
+      pool_timeout_s=settings.http_pool_timeout_s,
+      single_flight=single_flight,
+    )
+
+  def _timeout(self, timeout: float) -> float | httpx.Timeout:
+    if self.connect_timeout_s is None and self.pool_timeout_s is None:
+      return timeout
+    return httpx.Timeout(timeout, connect=self.connect_timeout_s, pool=self.pool_timeout_s)
+
+  def _trace_kwargs(self) -> tuple[dict[str, Any], _ConnectionTrace | None]:
+    """Return the request keyword arguments that trace the connection, and the trace."""
+    if self.metric_labels is None:
+      return {}, None
+    trace = _ConnectionTrace()
+    return {"extensions": {"trace": trace}}, trace
+
+  def _observe_connection(self, trace: _ConnectionTrace | None) -> None:
+    if trace is None or trace.pool_wait_s is None or self.metric_labels is None:
+      return
+    http_pool_wait_seconds.labels(**self.metric_labels).observe(trace.pool_wait_s)
+    http_connections_total.labels(
+      **self.metric_labels, connection="new" if trace.new_connection else "reused"
+    ).inc()
+
+  async def prewarm(self, base_url: str, connections: int, timeout: float) -> None:
+    """Open connections to a target ahead of its first run with concurrent `/ping` requests.
+
+    Any response leaves its connection in the pool, so only connection errors count as
+    failures; they are logged, not raised, and the run will connect as usual.
+    """
+    url = f"{base_url.rstrip('/')}/ping"
+    start = time.perf_counter()
+    results = await asyncio.gather(
+      *(self.client.get(url, timeout=self._timeout(timeout)) for _ in range(connections)),
+      return_exceptions=True,
+    )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+      logger.warning(
+        "Failed to pre-warm connections",
+        url=url,
+        error=str(errors[0]),
+        failed=len(errors),
+        connections=connections,
+      )
+      return
+    logger.debug(
+      "Pre-warmed connections",
+      url=url,
+      connections=connections,
+      duration_s=time.perf_counter() - start,
+    )
+
+  def _observe_coalesced(self, url: str, coalesced_from: CoalescedFrom | None) -> None:
+    if coalesced_from is None:
+      return
+    logger.debug("GET request coalesced", url=url, coalesced_from=coalesced_from.value)
+    if self.metric_labels is not None:
+      http_requests_coalesced_total.labels(**self.metric_labels, source=coalesced_from.value).inc()
+
+  async def aclose(self) -> None:
+    """Close the underlying client and its connections."""
+    await self.client.aclose()
 
   async def get(self, url: str, headers: dict[str, str], timeout: float) -> Any:
-    """Make GET request."""
+    """Make GET request, sharing the result of an identical one in flight."""
+    if self.single_flight is None:
+      return await self._get(url, headers, timeout)
+    result, coalesced_from = await self.single_flight.do(
+      ("GET", url, headers.get("X-Api-Key")), lambda: self._get(url, headers, timeout)
+    )
+    self._observe_coalesced(url, coalesced_from)
+    return result
+
+  async def _get(self, url: str, headers: dict[str, str], timeout: float) -> Any:
     logger.debug("Executing GET request", url=url, timeout=timeout, has_headers=bool(headers))
-    response = await self.client.get(url, headers=headers, timeout=timeout)
+    trace_kwargs, trace = self._trace_kwargs()
+    response = await self.client.get(
+      url, headers=headers, timeout=self._timeout(timeout), **trace_kwargs
+    )
+    self._observe_connection(trace)
     logger.debug("GET request completed", url=url, status_code=response.status_code)
     response.raise_for_status()
     result = response.json()
@@ -63,9 +256,53 @@ class HttpxClient(HttpClient):
       has_headers=bool(headers),
       has_payload=payload is not None,
     )
-    response = await self.client.post(url, headers=headers, json=payload, timeout=timeout)
+    trace_kwargs, trace = self._trace_kwargs()
+    response = await self.client.post(
+      url, headers=headers, json=payload, timeout=self._timeout(timeout), **trace_kwargs
+    )
+    self._observe_connection(trace)
     logger.debug("POST request completed", url=url, status_code=response.status_code)
     response.raise_for_status()
     result = response.json()
     logger.debug("POST request response parsed", url=url, has_result=result is not None)
     return result
+
+  async def stream_json_array(
+    self, url: str, headers: dict[str, str], timeout: float
+  ) -> AsyncGenerator[Any, None]:
+    """Make GET request and yield the elements of the JSON array body as they arrive.
+
+    An identical streamed request that has not received its first element yet is joined
+    instead of sending another.
+    """
+    if self.single_flight is None:
+      elements = self._stream_json_array(url, headers, timeout)
+    else:
+      elements, coalesced_from = self.single_flight.stream(
+        ("GET", url, headers.get("X-Api-Key")),
+        lambda: self._stream_json_array(url, headers, timeout),
+      )
+      self._observe_coalesced(url, coalesced_from)
+    async with aclosing(elements):
+      async for element in elements:
+        yield element
+
+  async def _stream_json_array(
+    self, url: str, headers: dict[str, str], timeout: float
+  ) -> AsyncGenerator[Any, None]:
+    logger.debug("Executing streamed GET request", url=url, timeout=timeout)
+    trace_kwargs, trace = self._trace_kwargs()
+    async with self.client.stream(
+      "GET", url, headers=headers, timeout=self._timeout(timeout), **trace_kwargs
+    ) as response:
+      self._observe_connection(trace)
+      logger.debug("Streamed GET request started", url=url, status_code=response.status_code)
+      response.raise_for_status()
+      parser = JsonArrayParser()
+      element_count = 0
+      async for chunk in response.aiter_bytes():
+        for element in parser.feed(chunk):
+          element_count += 1
+          yield element
+      parser.close()
+    logger.debug("Streamed GET request completed", url=url, element_count=element_count)
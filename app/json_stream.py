@@ -0,0 +1,180 @@
+"""Incremental parser for streamed top-level JSON arrays."""
+
+import codecs
+import json
+import re
+from enum import Enum
+from typing import Any
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters that change nesting or string state outside of a JSON string.
+_STRUCTURAL = re.compile(r'[\[\]{}"]')
+# Characters that end a string or escape the next character inside a JSON string.
+_STRING_SPECIAL = re.compile(r'["\\]')
+# Characters that end a scalar (number or literal) element.
+_SCALAR_END = re.compile(r"[,\] \t\n\r]")
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+  """Return the index of the first non-whitespace character at or after pos."""
+  match = _WHITESPACE.match(text, pos)
+  return match.end() if match is not None else pos
+
+
+class _ArrayPosition(Enum):
+  """Where the parser is between the brackets of the top-level array."""
+
+  BEFORE_ARRAY = "before_array"
+  FIRST_ELEMENT = "first_element"
+  NEXT_ELEMENT = "next_element"
+  SEPARATOR = "separator"
+  AFTER_ARRAY = "after_array"
+
+
+class JsonArrayParser:
+  """Parse the elements of a top-level JSON array from a sequence of byte chunks.
+
+  Each call to feed() returns the elements completed by that chunk. Complete elements are
+  decoded directly with the standard json module; an element split across chunks is
+  scanned for its end and decoded once it has fully arrived. Only the text of the element
+  currently being received is buffered, so memory is bounded by the largest element rather
+  than by the whole array.
+  """
+
+  def __init__(self) -> None:
+    self._decoder = json.JSONDecoder()
+    self._utf8 = codecs.getincrementaldecoder("utf-8")()
+    # Text from the start of the element being received (or unparsed array syntax).
+    self._buffer = ""
+    self._position = _ArrayPosition.BEFORE_ARRAY
+    # Scan state for an element split across chunks, relative to the buffer start.
+    self._scanning = False
+    self._scan_pos = 0
+    self._scan_depth = 0
+    self._scan_in_string = False
+
+  def feed(self, data: bytes) -> list[Any]:
+    """Consume a chunk and return every array element it completes, in order."""
+    buffer = self._buffer + self._utf8.decode(data)
+    elements: list[Any] = []
+    pos = 0
+
+    while True:
+      pos = _skip_whitespace(buffer, pos)
+      if pos == len(buffer):
+        break
+      char = buffer[pos]
+
+      if self._position == _ArrayPosition.AFTER_ARRAY:
+        raise ValueError("Unexpected data after the end of the JSON array")
+      if self._position == _ArrayPosition.BEFORE_ARRAY:
+        if char != "[":
+          raise ValueError("Expected a JSON array")
+        self._position = _ArrayPosition.FIRST_ELEMENT
+        pos += 1
+        continue
+      if self._position == _ArrayPosition.SEPARATOR:
+        if char == ",":
+          self._position = _ArrayPosition.NEXT_ELEMENT
+        elif char == "]":
+          self._position = _ArrayPosition.AFTER_ARRAY
+        else:
+          raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+        pos += 1
+        continue
+      if char == "]":
+        if self._position == _ArrayPosition.NEXT_ELEMENT:
+          raise ValueError("Trailing comma in JSON array")
+        self._position = _ArrayPosition.AFTER_ARRAY
+        pos += 1
+        continue
+      if char == ",":
+        raise ValueError("Empty element in JSON array")
+
+      element = self._next_element(buffer, pos)
+      if element is None:
+        break
+      value, pos = element
+      elements.append(value)
+      self._position = _ArrayPosition.SEPARATOR
+
+    self._buffer = buffer[pos:]
+    if self._scanning:
+      self._scan_pos -= pos
+    return elements
+
+  def close(self) -> None:
+    """Verify the array was complete; raise ValueError when the stream ended early."""
+    # Raises UnicodeDecodeError (a ValueError) on a truncated multi-byte character.
+    self._utf8.decode(b"", final=True)
+    if self._position != _ArrayPosition.AFTER_ARRAY:
+      raise ValueError("JSON array ended before its closing bracket")
+
+  def _next_element(self, buffer: str, start: int) -> tuple[Any, int] | None:
+    """Decode the element starting at start; return (value, end) or None if incomplete."""
+    if not self._scanning:
+      # Fast path: the whole element is usually already in the buffer.
+      try:
+        value, end = self._decoder.raw_decode(buffer, start)
+      except json.JSONDecodeError:
+        pass
+      else:
+        # A following separator proves a trailing number was not cut off mid-chunk.
+        next_pos = _skip_whitespace(buffer, end)
+        if next_pos < len(buffer) and buffer[next_pos] in ",]":
+          return value, end
+      self._scanning = True
+      self._scan_pos = start
+      self._scan_depth = 0
+      self._scan_in_string = False
+
+    end_or_none = self._scan_element(buffer, start)
+    if end_or_none is None:
+      return None
+    self._scanning = False
+    return json.loads(buffer[start:end_or_none]), end_or_none
+
+  def _scan_element(self, buffer: str, start: int) -> int | None:
+    """Resume scanning for the end of a split element, keeping state across chunks."""
+    pos = max(self._scan_pos, start)
+    if buffer[start] not in '[{"':
+      match = _SCALAR_END.search(buffer, pos)
+      self._scan_pos = len(buffer)
+      return match.start() if match is not None else None
+
+    while True:
+      if self._scan_in_string:
+        match = _STRING_SPECIAL.search(buffer, pos)
+        if match is None:
+          pos = len(buffer)
+          break
+        if buffer[match.start()] == "\\":
+          if match.end() >= len(buffer):
+            # Escaped character not received yet; rescan the backslash next time.
+            pos = match.start()
+            break
+          pos = match.end() + 1
+          continue
+        self._scan_in_string = False
+        pos = match.end()
+        if self._scan_depth == 0:
+          return pos
+        continue
+
+      match = _STRUCTURAL.search(buffer, pos)
+      if match is None:
+        pos = len(buffer)
+        break
+      char = buffer[match.start()]
+      pos = match.end()
+      if char == '"':
+        self._scan_in_string = True
+      elif char in "[{":
+        self._scan_depth += 1
+      else:
+        self._scan_depth -= 1
+        if self._scan_depth == 0:
+          return pos
+
+    self._scan_pos = pos
+    return None
@@ -0,0 +1,236 @@
+"""Per-target cache of library snapshots reused across scheduler runs."""
+
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable, Hashable
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+from app.arr_client import ArrClient
+from app.config import ArrTarget, ArrType
+from app.metrics import library_cache_lookups_total, library_snapshot_age_seconds
+from app.state import TargetState
+
+logger = structlog.get_logger()
+
+# History is queried from this long before the watermark, so events recorded while the
+# previous sync was running (or dated by a slightly skewed *arr clock) are not missed.
+# Refetching a record twice is harmless.
+HISTORY_OVERLAP_S = 60.0
+
+
+@dataclass(frozen=True)
+class LibrarySource:
+  """How to fetch a target's library in full and one record at a time.
+
+  A record is the unit the *arr API returns by id (a Radarr movie, a Sonarr series); it maps
+  to zero or more scheduler items (a movie, the seasons of a series).
+  """
+
+  fetch_all: Callable[[], AsyncGenerator[dict[str, Any], None]]
+  record_key: Callable[[dict[str, Any]], Hashable]
+  fetch_record: Callable[[Any], Awaitable[list[dict[str, Any]]]]
+  changed_keys: Callable[[float], Awaitable[set[Any]]]
+
+
+def arr_library_source(client: ArrClient, logging_ids: dict[str, Any]) -> LibrarySource:
+  """Return the LibrarySource for a client's target type."""
+
+  async def changed_keys(since_timestamp: float, key_field: str) -> set[Any]:
+    history = await client.get_history_since(since_timestamp, logging_ids)
+    return {record[key_field] for record in history if record.get(key_field) is not None}
+
+  if client.target.arr_type == ArrType.RADARR:
+
+    async def fetch_movie(movie_id: Any) -> list[dict[str, Any]]:
+      movie = await client.get_movie(movie_id, logging_ids)
+      return [] if movie is None else [movie]
+
+    return LibrarySource(
+      fetch_all=lambda: client.iter_movies(logging_ids),
+      record_key=lambda item: item.get("id"),
+      fetch_record=fetch_movie,
+      changed_keys=lambda since: changed_keys(since, "movieId"),
+    )
+  if client.target.arr_type == ArrType.SONARR:
+
+    async def fetch_series(series_id: Any) -> list[dict[str, Any]]:
+      return await client.get_series_seasons(series_id, logging_ids)
+
+    return LibrarySource(
+      fetch_all=lambda: client.iter_seasons(logging_ids),
+      record_key=lambda item: item.get("seriesId"),
+      fetch_record=fetch_series,
+      changed_keys=lambda since: changed_keys(since, "seriesId"),
+    )
+  raise ValueError(f"Unsupported target type: {client.target.arr_type}")
+
+
+@dataclass(frozen=True)
+class LibrarySnapshot:
+  """The library items of one target, grouped by the record they were fetched from."""
+
+  records: dict[Hashable, tuple[dict[str, Any], ...]]
+  reconciled_timestamp: float
+
+  @property
+  def items(self) -> tuple[dict[str, Any], ...]:
+    """All items in library order."""
+    return tuple(item for record_items in self.records.values() for item in record_items)
+
+
+class LibraryCache:
+  """Reuse each target's library across runs, refreshing it every `library_refresh_s` seconds.
+
+  Only the fetched items are cached; item state and eligibility are evaluated by the
+  scheduler on every run. With `library_refresh_s` at 0 the cache is bypassed and items are
+  streamed straight from the source.
+
+  A refresh is incremental while the snapshot's last full fetch is younger than
+  `library_reconcile_s`: the records touched in *arr history since the target's
+  `library_sync_watermark` are refetched by id and replaced (or dropped when deleted).
+  Otherwise the whole library is fetched again, which also picks up changes that leave no
+  history (new records, monitoring or tag edits). A full fetch completes before the first
+  item is yielded, so a run stopped early by `ops_per_interval` still leaves a complete
+  snapshot behind; a failed refresh leaves the previous snapshot and watermark untouched.
+
+  Records reported changed through mark_changed() (e.g. by webhooks) are refetched at the
+  start of the next run that uses the snapshot, even before `library_refresh_s` expires.
+  """
+
+  def __init__(self, clock: Callable[[], float] = time.time) -> None:
+    self._clock = clock
+    self._snapshots: dict[str, LibrarySnapshot] = {}
+    # Records reported changed (e.g. by webhooks), refetched at the start of the next run.
+    self._pending_keys: dict[str, set[Any]] = {}
+
+  def snapshot(self, target_name: str) -> LibrarySnapshot | None:
+    """Return the cached snapshot for a target, or None when there is none."""
+    return self._snapshots.get(target_name)
+
+  def invalidate(self, target_name: str) -> None:
+    """Drop a target's snapshot so the next run refetches the library."""
+    self._pending_keys.pop(target_name, None)
+    if self._snapshots.pop(target_name, None) is not None:
+      logger.debug("Library snapshot invalidated", target=target_name)
+
+  def mark_changed(self, target_name: str, record_key: Any) -> None:
+    """Refetch one record of a target's snapshot at the start of the next run."""
+    if target_name not in self._snapshots:
+      return
+    self._pending_keys.setdefault(target_name, set()).add(record_key)
+    logger.debug("Library record marked changed", target=target_name, record_key=record_key)
+
+  async def iter_items(
+    self,
+    target: ArrTarget,
+    target_state: TargetState,
+    source: LibrarySource,
+    logging_ids: dict[str, Any],
+  ) -> AsyncGenerator[dict[str, Any], None]:
+    """Yield a target's library items from the cached snapshot or from a refresh."""
+    settings = target.settings
+    if settings.library_refresh_s <= 0:
+      async with aclosing(source.fetch_all()) as items:
+        async for item in items:
+          yield item
+      return
+
+    labels = {"target": target.name, "type": target.arr_type.value}
+    now = self._clock()
+    snapshot = self._snapshots.get(target.name)
+    age_s = now - target_state.library_sync_watermark
+    pending_keys = set(self._pending_keys.get(target.name, ()))
+    if snapshot is not None and age_s < settings.library_refresh_s:
+      library_cache_lookups_total.labels(**labels, result="hit").inc()
+      library_snapshot_age_seconds.labels(**labels).set(age_s)
+      logger.debug(
+        "Using cached library snapshot",
+        snapshot_age_s=age_s,
+        record_count=len(snapshot.records),
+        pending_count=len(pending_keys),
+        **logging_ids,
+      )
+      if pending_keys:
+        snapshot = await self._refetch_records(snapshot, pending_keys, source, logging_ids)
+        self._snapshots[target.name] = snapshot
+        self._discard_pending(target.name, pending_keys)
+    elif (
+      snapshot is not None and now - snapshot.reconciled_timestamp < settings.library_reconcile_s
+    ):
+      library_cache_lookups_total.labels(**labels, result="sync").inc()
+      since = target_state.library_sync_watermark - HISTORY_OVERLAP_S
+      changed_keys = await source.changed_keys(since)
+      logger.debug(
+        "Syncing library snapshot from history",
+        since_timestamp=since,
+        changed_count=len(changed_keys),
+        pending_count=len(pending_keys),
+        **logging_ids,
+      )
+      snapshot = await self._refetch_records(
+        snapshot, changed_keys | pending_keys, source, logging_ids
+      )
+      self._snapshots[target.name] = snapshot
+      self._discard_pending(target.name, pending_keys)
+      target_state.library_sync_watermark = now
+      library_snapshot_age_seconds.labels(**labels).set(0.0)
+    else:
+      library_cache_lookups_total.labels(**labels, result="miss").inc()
+      logger.debug(
+        "Fetching full library snapshot",
+        library_refresh_s=settings.library_refresh_s,
+        library_reconcile_s=settings.library_reconcile_s,
+        **logging_ids,
+      )
+      records: dict[Hashable, list[dict[str, Any]]] = {}
+      async with aclosing(source.fetch_all()) as items:
+        async for item in items:
+          records.setdefault(source.record_key(item), []).append(item)
+      snapshot = LibrarySnapshot(
+        records={key: tuple(record_items) for key, record_items in records.items()},
+        reconciled_timestamp=now,
+      )
+      self._snapshots[target.name] = snapshot
+      self._discard_pending(target.name, pending_keys)
+      target_state.library_sync_watermark = now
+      library_snapshot_age_seconds.labels(**labels).set(0.0)
+
+    for item in snapshot.items:
+      yield item
+
+  def _discard_pending(self, target_name: str, keys: set[Any]) -> None:
+    """Forget pending records that have been refetched, keeping any marked since."""
+    remaining = self._pending_keys.get(target_name)
+    if remaining is None:
+      return
+    remaining -= keys
+    if not remaining:
+      del self._pending_keys[target_name]
+
+  async def _refetch_records(
+    self,
+    snapshot: LibrarySnapshot,
+    keys: set[Any],
+    source: LibrarySource,
+    logging_ids: dict[str, Any],
+  ) -> LibrarySnapshot:
+    """Return a copy of the snapshot with the given records refetched (or dropped if deleted)."""
+    records = dict(snapshot.records)
+    removed_count = 0
+    for key in keys:
+      record_items = await source.fetch_record(key)
+      if record_items:
+        records[key] = tuple(record_items)
+      elif records.pop(key, None) is not None:
+        removed_count += 1
+    logger.debug(
+      "Refetched library records",
+      refetched_count=len(keys),
+      removed_count=removed_count,
+      record_count=len(records),
+      **logging_ids,
+    )
+    return LibrarySnapshot(records=records, reconciled_timestamp=snapshot.reconciled_timestamp)
@@ -10,6 +10,7 @@ SENSITIVE_KEYS = frozenset(
     "apikey",
     "x-api-key",
     "x_api_key",
+    "webhook_token",
   }
 )
 
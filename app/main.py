@@ -5,19 +5,34 @@ import logging
 import signal
 import sys
 import threading
+import time
+from pathlib import Path
 
-import httpx
 import structlog
-from flask import Flask, Response
+from flask import Flask, Response, request
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from app.arr_client import ArrClient
-from app.config import load_config
+from app.config import StateBackend, load_config
 from app.http_client import HttpxClient
 from app.log_redaction import redact_sensitive_fields
+from app.metrics import startup_duration_seconds
 from app.scheduler import Scheduler
+from app.single_flight import SingleFlight
 from app.startup_banner import format_banner
-from app.state import FileStateStorage, InMemoryStateStorage, StateManager, StateStorage
+from app.state import (
+  STATE_SIZE_CAP_BYTES,
+  FileStateStorage,
+  InMemoryStateStorage,
+  JournalStateStorage,
+  ShardedFileStateStorage,
+  SqliteStateStorage,
+  StateManager,
+  StateStorage,
+)
+from app.state_codecs import CODECS
+from app.state_writer import StateWriter
+from app.webhooks import WebhookEvent, WebhookReceiver
 
 logger = structlog.get_logger()
 
@@ -44,8 +59,10 @@ def setup_logging(log_level: str) -> None:
   )
 
 
-def create_web_app(metrics_enabled: bool = True) -> Flask:
-  """Create and configure the Flask application for health and metrics endpoints."""
+def create_web_app(
+  metrics_enabled: bool = True, webhook_receiver: WebhookReceiver | None = None
+) -> Flask:
+  """Create and configure the Flask application for health, metrics and webhook endpoints."""
   app = Flask(__name__)
 
   @app.route("/health")
@@ -60,12 +77,26 @@ def create_web_app(metrics_enabled: bool = True) -> Flask:
       """Prometheus metrics endpoint."""
       return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
 
+  if webhook_receiver is not None:
+
+    @app.route("/webhook/<target_name>", methods=["POST"])
+    def webhook_handler(target_name: str) -> Response:
+      """Radarr/Sonarr webhook endpoint."""
+      token = request.headers.get("X-Gatherarr-Token") or request.args.get("token")
+      status, message = webhook_receiver.receive(target_name, request.get_json(silent=True), token)
+      return Response(message, status=status, mimetype="text/plain")
+
   return app
 
 
-def start_web_server(address: str, port: int, metrics_enabled: bool = True) -> threading.Thread:
-  """Start the Flask web server for health and metrics endpoints in a separate thread."""
-  app = create_web_app(metrics_enabled=metrics_enabled)
+def start_web_server(
+  address: str,
+  port: int,
+  metrics_enabled: bool = True,
+  webhook_receiver: WebhookReceiver | None = None,
+) -> threading.Thread:
+  """Start the Flask web server for health, metrics and webhook endpoints in a separate thread."""
+  app = create_web_app(metrics_enabled=metrics_enabled, webhook_receiver=webhook_receiver)
 
   def run_server() -> None:
     app.run(host=address, port=port, threaded=True, use_reloader=False)
@@ -77,17 +108,20 @@ def start_web_server(address: str, port: int, metrics_enabled: bool = True) -> t
     address=address,
     port=port,
     metrics_enabled=metrics_enabled,
+    webhook_enabled=webhook_receiver is not None,
   )
   return server_thread
 
 
 async def main() -> None:
   """Main entry point."""
+  config_start = time.perf_counter()
   try:
     config = load_config()
   except ValueError as e:
     print(f"Configuration error: {e}", file=sys.stderr)
     sys.exit(1)
+  startup_duration_seconds.labels(phase="config").set(time.perf_counter() - config_start)
 
   setup_logging(config.log_level)
   print(format_banner(config), flush=True)
@@ -105,34 +139,108 @@ async def main() -> None:
     metrics_enabled=config.metrics_enabled,
   )
 
-  logger.debug("Initializing state storage", state_file_path=config.state_file_path)
+  state_load_start = time.perf_counter()
+  logger.debug(
+    "Initializing state storage",
+    state_file_path=config.state_file_path,
+    state_backend=config.state_backend.value,
+  )
+  state_size_cap_bytes: int | None = STATE_SIZE_CAP_BYTES
   if config.state_file_path is None:
     storage: StateStorage = InMemoryStateStorage()
     logger.debug("Using in-memory state storage")
+  elif config.state_backend == StateBackend.SQLITE:
+    state_file_path = Path(config.state_file_path)
+    database_path = state_file_path.with_suffix(".sqlite")
+    storage = SqliteStateStorage(
+      database_path, import_path=state_file_path if state_file_path != database_path else None
+    )
+    # The size cap bounds the YAML file rewritten on every save; row-level writes do not need it.
+    state_size_cap_bytes = None
+    logger.debug("Using SQLite state storage", database_path=str(database_path))
+  elif config.state_backend == StateBackend.JOURNAL:
+    storage = JournalStateStorage(config.state_file_path, codec=CODECS[config.state_format.value])
+    logger.debug(
+      "Using journaled state storage",
+      state_file_path=config.state_file_path,
+      journal_path=str(storage.journal_path),
+      state_format=config.state_format.value,
+    )
+  elif config.state_backend == StateBackend.SHARDED:
+    state_file_path = Path(config.state_file_path)
+    shard_directory = state_file_path.with_suffix(".d")
+    storage = ShardedFileStateStorage(
+      shard_directory,
+      import_path=state_file_path if state_file_path != shard_directory else None,
+      codec=CODECS[config.state_format.value],
+    )
+    # The size cap applies to each target's shard.
+    logger.debug(
+      "Using sharded state storage",
+      directory=str(shard_directory),
+      state_format=config.state_format.value,
+    )
   else:
-    storage = FileStateStorage(config.state_file_path)
-    logger.debug("Using file-based state storage", state_file_path=config.state_file_path)
-  state_manager = StateManager(storage)
+    storage = FileStateStorage(config.state_file_path, CODECS[config.state_format.value])
+    logger.debug(
+      "Using file-based state storage",
+      state_file_path=config.state_file_path,
+      state_format=config.state_format.value,
+    )
+  state_manager = StateManager(storage, state_size_cap_bytes)
   logger.debug("Loading state")
   state_manager.load()
-  logger.debug("State loaded", targets=len(state_manager.state.targets))
-
-  http_client_instance = httpx.AsyncClient()
-  http_client = HttpxClient(http_client_instance)
+  state_load_s = time.perf_counter() - state_load_start
+  startup_duration_seconds.labels(phase="state_load").set(state_load_s)
+  logger.debug("State loaded", duration_s=state_load_s)
+
+  # Each target gets its own connection pool, sized and timed by its settings. Identical GETs
+  # are coalesced across targets, e.g. several targets pointing at one instance.
+  single_flight = SingleFlight(config.http_coalesce_ttl_s)
+  http_clients = {
+    target.name: HttpxClient.for_target(target, single_flight=single_flight)
+    for target in config.targets
+  }
 
   arr_clients: dict[str, ArrClient] = {}
   for target in config.targets:
     arr_clients[target.name] = ArrClient(
       target=target,
-      http_client=http_client,
+      http_client=http_clients[target.name],
       timeout_s=target.settings.http_timeout_s,
     )
 
-  scheduler = Scheduler(config.targets, state_manager, arr_clients)
+  prewarm_start = time.perf_counter()
+  await asyncio.gather(
+    *(
+      http_clients[target.name].prewarm(
+        target.base_url, target.settings.http_prewarm_connections, target.settings.http_timeout_s
+      )
+      for target in config.targets
+      if target.settings.http_prewarm_connections > 0
+    )
+  )
+  prewarm_s = time.perf_counter() - prewarm_start
+  startup_duration_seconds.labels(phase="prewarm").set(prewarm_s)
+  logger.debug("Connections pre-warmed", duration_s=prewarm_s)
+
+  state_writer = StateWriter(state_manager, config.state_save_coalesce_s)
+  scheduler = Scheduler(config.targets, state_manager, arr_clients, state_writer)
   logger.debug("Starting scheduler task")
   scheduler_task = asyncio.create_task(scheduler.start())
 
-  start_web_server(config.listen_address, config.listen_port, config.metrics_enabled)
+  webhook_receiver: WebhookReceiver | None = None
+  if config.webhook_enabled:
+    loop = asyncio.get_running_loop()
+
+    def deliver_webhook_event(target_name: str, event: WebhookEvent) -> None:
+      loop.call_soon_threadsafe(scheduler.apply_webhook_event, target_name, event)
+
+    webhook_receiver = WebhookReceiver(config.targets, config.webhook_token, deliver_webhook_event)
+
+  start_web_server(
+    config.listen_address, config.listen_port, config.metrics_enabled, webhook_receiver
+  )
 
   shutdown_event = asyncio.Event()
 
@@ -153,6 +261,7 @@ async def main() -> None:
       "Shutting down...",
       shutdown_timeout_s=config.shutdown_timeout_s,
     )
+    shutdown_deadline = loop.time() + config.shutdown_timeout_s
     logger.debug("Stopping scheduler")
     scheduler.stop()
     try:
@@ -171,9 +280,27 @@ async def main() -> None:
     except asyncio.CancelledError:
       logger.debug("Scheduler task cancelled")
 
-    logger.debug("Closing HTTP client")
-    await http_client_instance.aclose()
-    logger.debug("HTTP client closed")
+    logger.debug("Closing HTTP clients")
+    await asyncio.gather(*(http_client.aclose() for http_client in http_clients.values()))
+    logger.debug("HTTP clients closed")
+
+    logger.debug("Flushing state")
+    try:
+      await asyncio.wait_for(
+        state_writer.close(), timeout=max(shutdown_deadline - loop.time(), 0.0)
+      )
+    except asyncio.TimeoutError:
+      logger.warning(
+        "State was not flushed within shutdown timeout",
+        shutdown_timeout_s=config.shutdown_timeout_s,
+      )
+
+    if isinstance(storage, SqliteStateStorage):
+      # Closing the connection under the writer thread would fail its write.
+      if state_writer.writing:
+        logger.warning("State write still in progress, leaving state storage open")
+      else:
+        storage.close()
 
     logger.debug("Application shutdown complete")
 
@@ -45,7 +45,75 @@ last_success_timestamp_seconds = Gauge(
   ["target", "type"],
 )
 
+scheduling_lag_seconds = Histogram(
+  "gatherarr_scheduling_lag_seconds",
+  "Delay between a target becoming due and its run starting",
+  ["target", "type"],
+  buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+
 state_write_failures_total = Counter(
   "gatherarr_state_write_failures_total",
   "Total number of state write failures",
 )
+
+state_saves_total = Counter(
+  "gatherarr_state_saves_total",
+  "Total number of state saves, by whether state was written or skipped as unchanged",
+  ["result"],
+)
+
+startup_duration_seconds = Gauge(
+  "gatherarr_startup_duration_seconds",
+  "Duration of each startup phase in seconds",
+  ["phase"],
+)
+
+library_cache_lookups_total = Counter(
+  "gatherarr_library_cache_lookups_total",
+  "Total number of library snapshot cache lookups",
+  ["target", "type", "result"],
+)
+
+library_snapshot_age_seconds = Gauge(
+  "gatherarr_library_snapshot_age_seconds",
+  "Age of the library snapshot used by the latest run",
+  ["target", "type"],
+)
+
+webhook_events_total = Counter(
+  "gatherarr_webhook_events_total",
+  "Total number of webhook events received",
+  ["target", "type", "event"],
+)
+
+circuit_breaker_state = Gauge(
+  "gatherarr_circuit_breaker_state",
+  "Circuit breaker state per target (0 closed, 1 half-open, 2 open)",
+  ["target", "type"],
+)
+
+http_send_interval_seconds = Gauge(
+  "gatherarr_http_send_interval_seconds",
+  "Minimum interval between requests to a target imposed after rate limiting responses",
+  ["target", "type"],
+)
+
+http_pool_wait_seconds = Histogram(
+  "gatherarr_http_pool_wait_seconds",
+  "Time HTTP requests waited for a pooled connection",
+  ["target", "type"],
+  buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+http_connections_total = Counter(
+  "gatherarr_http_connections_total",
+  "Total number of HTTP requests by whether they reused a pooled connection or opened one",
+  ["target", "type", "connection"],
+)
+
+http_requests_coalesced_total = Counter(
+  "gatherarr_http_requests_coalesced_total",
+  "Total number of GET requests served by an identical request in flight or its cached result",
+  ["target", "type", "source"],
+)
@@ -0,0 +1,81 @@
+"""Field projections that keep only the parts of *arr payloads the handlers read."""
+
+from collections.abc import Mapping
+from typing import Any
+
+from app.config import ArrType
+
+# Maps a field name to None (keep the whole value) or to a nested projection. A nested
+# projection applies to an object value, or to each object in a list value.
+Projection = Mapping[str, "Projection | None"]
+
+# Fields read by MovieHandler and used for movie logging ids.
+MOVIE_PROJECTION: Projection = {
+  "id": None,
+  "title": None,
+  "monitored": None,
+  "hasFile": None,
+  "tags": None,
+  "movieFile": {"qualityCutoffNotMet": None},
+  "digitalRelease": None,
+  "physicalRelease": None,
+  "inCinemas": None,
+}
+
+# Fields ArrClient copies into season items for SeasonHandler.
+SERIES_PROJECTION: Projection = {
+  "id": None,
+  "title": None,
+  "monitored": None,
+  "tags": None,
+  "statistics": None,
+  "firstAired": None,
+  "seasons": {"seasonNumber": None, "monitored": None, "statistics": None},
+}
+
+# Fields ArrClient reads from wanted episode records when aggregating them into seasons.
+EPISODE_PROJECTION: Projection = {
+  "seriesId": None,
+  "seasonNumber": None,
+  "hasFile": None,
+  "monitored": None,
+  "airDateUtc": None,
+  "series": SERIES_PROJECTION,
+}
+
+# Fields ArrClient reads from history records to find the library records that changed.
+MOVIE_HISTORY_PROJECTION: Projection = {"movieId": None, "date": None, "eventType": None}
+EPISODE_HISTORY_PROJECTION: Projection = {"seriesId": None, "date": None, "eventType": None}
+
+LIBRARY_PROJECTIONS: dict[ArrType, Projection] = {
+  ArrType.RADARR: MOVIE_PROJECTION,
+  ArrType.SONARR: SERIES_PROJECTION,
+}
+
+WANTED_PROJECTIONS: dict[ArrType, Projection] = {
+  ArrType.RADARR: MOVIE_PROJECTION,
+  ArrType.SONARR: EPISODE_PROJECTION,
+}
+
+HISTORY_PROJECTIONS: dict[ArrType, Projection] = {
+  ArrType.RADARR: MOVIE_HISTORY_PROJECTION,
+  ArrType.SONARR: EPISODE_HISTORY_PROJECTION,
+}
+
+
+def project(value: Any, projection: Projection) -> Any:
+  """Return a copy of a decoded JSON value that keeps only the projected fields.
+
+  Fields missing from the value stay missing, so handlers see the same `.get()` results as
+  on the full payload. Values that are not objects (or lists of objects) are returned as is.
+  """
+  if isinstance(value, list):
+    return [project(element, projection) for element in value]
+  if not isinstance(value, dict):
+    return value
+  projected: dict[str, Any] = {}
+  for key, nested_projection in projection.items():
+    if key in value:
+      field = value[key]
+      projected[key] = field if nested_projection is None else project(field, nested_projection)
+  return projected
@@ -0,0 +1,82 @@
+"""Adaptive per-target send-rate limiter that backs off after rate limiting responses."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+import structlog
+
+from app.config import ArrTarget
+from app.metrics import http_send_interval_seconds
+
+logger = structlog.get_logger()
+
+
+class AdaptiveRateLimiter:
+  """Spaces the requests to one target apart after it answers 429 Too Many Requests.
+
+  The limiter starts out unlimited. Each throttle() doubles the minimum interval between
+  request sends (starting from http_retry_initial_delay_s, capped at http_retry_max_delay_s)
+  and, when the response carried Retry-After, holds every send until it has passed. The
+  interval then recovers linearly, reaching zero again http_throttle_recovery_s after the
+  last throttle. An http_throttle_recovery_s of 0 disables the limiter.
+  """
+
+  def __init__(
+    self,
+    target: ArrTarget,
+    *,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+  ) -> None:
+    settings = target.settings
+    self.target = target
+    self.initial_interval_s = settings.http_retry_initial_delay_s
+    self.max_interval_s = settings.http_retry_max_delay_s
+    self.recovery_s = settings.http_throttle_recovery_s
+    self._clock = clock
+    self._sleep = sleep
+    self._throttle_interval_s = 0.0
+    self._throttled_at = 0.0
+    self._next_send_at = 0.0
+    self._gauge = http_send_interval_seconds.labels(target=target.name, type=target.arr_type.value)
+    self._gauge.set(0.0)
+
+  def interval_s(self) -> float:
+    """Current minimum interval between request sends."""
+    if self._throttle_interval_s == 0.0:
+      return 0.0
+    recovered = (self._clock() - self._throttled_at) / self.recovery_s
+    if recovered >= 1.0:
+      self._throttle_interval_s = 0.0
+      return 0.0
+    return self._throttle_interval_s * (1.0 - recovered)
+
+  async def acquire(self) -> None:
+    """Wait until the next request may be sent."""
+    now = self._clock()
+    interval_s = self.interval_s()
+    self._gauge.set(interval_s)
+    send_at = max(now, self._next_send_at)
+    self._next_send_at = send_at + interval_s
+    if send_at > now:
+      await self._sleep(send_at - now)
+
+  def throttle(self, retry_after_s: float | None = None) -> None:
+    """Slow down after a rate limiting response, holding sends for retry_after_s if given."""
+    if self.recovery_s == 0:
+      return
+    now = self._clock()
+    self._throttle_interval_s = min(
+      max(self.interval_s() * 2, self.initial_interval_s), self.max_interval_s
+    )
+    self._throttled_at = now
+    if retry_after_s is not None:
+      self._next_send_at = max(self._next_send_at, now + min(retry_after_s, self.max_interval_s))
+    self._gauge.set(self._throttle_interval_s)
+    logger.info(
+      "Throttling requests after rate limiting response",
+      interval_s=self._throttle_interval_s,
+      retry_after_s=retry_after_s,
+      **self.target.logging_ids(),
+    )
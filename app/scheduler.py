@@ -2,23 +2,43 @@
 
 import asyncio
 import time
-from dataclasses import replace
+from collections.abc import AsyncGenerator, AsyncIterable, Hashable
+from contextlib import aclosing
+from dataclasses import dataclass, replace
 from typing import Any
 
 import structlog
 
 from app.arr_client import ArrClient
-from app.config import ArrTarget, ArrType
-from app.handlers import ItemHandler, MovieHandler, SeasonHandler
+from app.config import ArrTarget, ArrType, FetchMode
+from app.deadline_queue import DeadlineQueue
+from app.handlers import BatchSearchHandler, ItemHandler, MovieHandler, SeasonHandler
+from app.library_cache import LibraryCache, arr_library_source
 from app.metrics import (
   grabs_total,
   last_success_timestamp_seconds,
   request_duration_seconds,
   run_total,
+  scheduling_lag_seconds,
   skips_total,
+  startup_duration_seconds,
   state_write_failures_total,
 )
-from app.state import ItemState, ItemStatus, RunStatus, StateManager, TargetState
+from app.state import (
+  ItemResult,
+  ItemState,
+  ItemStatus,
+  RunStatus,
+  StateManager,
+  TargetState,
+)
+from app.state_writer import StateWriter
+from app.webhooks import (
+  ADDING_EVENTS,
+  SATISFYING_RESULTS,
+  WebhookEvent,
+  WebhookEventType,
+)
 
 logger = structlog.get_logger()
 
@@ -36,6 +56,43 @@ def _search_backoff_delay_s(
   return min(delay, max_s)
 
 
+def _updated_item_state(
+  item_state: ItemState | None,
+  item_id: str,
+  *,
+  timestamp: float,
+  result: str,
+  status: ItemStatus,
+  consecutive_failures: int,
+) -> ItemState:
+  """Return a new ItemState recording a processing outcome."""
+  if item_state is None:
+    return ItemState(
+      item_id=item_id,
+      last_processed_timestamp=timestamp,
+      last_result=result,
+      last_status=status,
+      consecutive_failures=consecutive_failures,
+    )
+  return replace(
+    item_state,
+    last_processed_timestamp=timestamp,
+    last_result=result,
+    last_status=status,
+    consecutive_failures=consecutive_failures,
+  )
+
+
+@dataclass
+class _PendingSearch:
+  """An eligible item waiting for (or undergoing) a search."""
+
+  item: dict[str, Any]
+  item_id_str: str
+  item_state: ItemState | None
+  logging_ids: dict[str, Any]
+
+
 class Scheduler:
   """Schedules and executes periodic search operations.
 
@@ -52,11 +109,22 @@ class Scheduler:
     config_targets: list[ArrTarget],
     state_manager: StateManager,
     arr_clients: dict[str, ArrClient],
+    state_writer: StateWriter | None = None,
   ) -> None:
+    """Create the scheduler; without a state_writer, state is saved inline after each run."""
     self.config_targets = config_targets
     self.state_manager = state_manager
     self.arr_clients = arr_clients
+    self.state_writer = state_writer
     self.running = False
+    self._targets_by_name = {target.name: target for target in config_targets}
+    self._deadlines = DeadlineQueue()
+    self._wake_event = asyncio.Event()
+    self._run_tasks: dict[str, asyncio.Task[None]] = {}
+    self._overlapped_deadlines: dict[str, float] = {}
+    self.library_cache = LibraryCache()
+    # Monotonic start time, until the first run completes and its latency is recorded.
+    self._first_run_start: float | None = None
 
   async def run_once(self, target: ArrTarget) -> None:
     """Execute a single run for a target."""
@@ -79,28 +147,36 @@ class Scheduler:
       logger.debug("Fetching items", **combined_logging_ids)
       handler: ItemHandler
       if target.arr_type == ArrType.RADARR:
-        items = await client.get_movies(combined_logging_ids)
         handler = MovieHandler(target)
       elif target.arr_type == ArrType.SONARR:
-        items = await client.get_seasons(combined_logging_ids)
         handler = SeasonHandler(target)
       else:
         raise ValueError(f"Unsupported target type: {target.arr_type}")
 
-      logger.debug(
-        "Items fetched",
-        item_count=len(items),
-        **combined_logging_ids,
-      )
-
-      processed = await self._process_items(
-        target,
-        client,
-        items,
-        target_state,
-        handler,
-        run_logging_ids,
-      )
+      items: AsyncGenerator[dict[str, Any], None]
+      if target.settings.fetch_mode == FetchMode.LIBRARY:
+        items = self.library_cache.iter_items(
+          target,
+          target_state,
+          arr_library_source(client, combined_logging_ids),
+          combined_logging_ids,
+        )
+      elif target.arr_type == ArrType.RADARR:
+        items = client.iter_wanted_movies(combined_logging_ids)
+      else:
+        items = client.iter_wanted_seasons(combined_logging_ids)
+
+      # Items are processed as they are fetched; closing the stream early (e.g. once
+      # ops_per_interval is reached) stops the download.
+      async with aclosing(items):
+        processed = await self._process_items(
+          target,
+          client,
+          items,
+          target_state,
+          handler,
+          run_logging_ids,
+        )
 
       run_end = time.time()
 
@@ -140,6 +216,13 @@ class Scheduler:
       )
 
     self.state_manager.state.total_runs += 1
+    self._save_state()
+
+  def _save_state(self) -> None:
+    """Request a save from the state writer, or save inline without one."""
+    if self.state_writer is not None:
+      self.state_writer.request_save()
+      return
     try:
       self.state_manager.save()
     except Exception as e:
@@ -147,42 +230,181 @@ class Scheduler:
       state_write_failures_total.inc()
 
   async def start(self) -> None:
-    """Start the scheduler loop."""
+    """Start the scheduler loop.
+
+    The loop keeps a min-heap of next-due timestamps and sleeps until the earliest one, or
+    until woken by rearm() or stop(). Each due target runs in its own task, so a slow target
+    never delays another target's schedule; a target is never run twice concurrently.
+    """
     self.running = True
+    self._first_run_start = time.perf_counter()
     logger.debug("Scheduler started", targets=len(self.config_targets))
 
-    while self.running:
-      tasks = []
-      for target in self.config_targets:
-        target_state = self.state_manager.get_target_state(target.name)
-        if time.time() - target_state.last_run_timestamp >= target.settings.interval_s:
-          tasks.append(self.run_once(target))
-
-      if tasks:
-        logger.debug("Executing scheduled tasks", task_count=len(tasks))
-        await asyncio.gather(*tasks, return_exceptions=True)
-      else:
-        logger.debug("No tasks to execute, sleeping..")
+    for target in self.config_targets:
+      self._deadlines.schedule(
+        target.name,
+        self.state_manager.last_run_timestamp(target.name) + target.settings.interval_s,
+      )
 
-      await asyncio.sleep(1)
+    try:
+      while self.running:
+        self._wake_event.clear()
+        now = time.time()
+        for target_name, due_timestamp in self._deadlines.pop_due(now):
+          self._dispatch(self._targets_by_name[target_name], due_timestamp)
+
+        next_deadline = self._deadlines.next_deadline()
+        sleep_s = None if next_deadline is None else max(next_deadline - now, 0.0)
+        logger.debug(
+          "Sleeping until next deadline",
+          sleep_s=sleep_s,
+          running_targets=len(self._run_tasks),
+        )
+        try:
+          await asyncio.wait_for(self._wake_event.wait(), timeout=sleep_s)
+        except TimeoutError:
+          pass
+
+      if self._run_tasks:
+        logger.debug("Waiting for in-flight runs", task_count=len(self._run_tasks))
+        await asyncio.gather(*self._run_tasks.values(), return_exceptions=True)
+    finally:
+      for task in self._run_tasks.values():
+        task.cancel()
+
+  def rearm(self, target_name: str, due_timestamp: float | None = None) -> None:
+    """Schedule a target's next run (immediately when due_timestamp is None) and wake the loop."""
+    if target_name not in self._targets_by_name:
+      raise ValueError(f"Unknown target: {target_name}")
+    deadline = time.time() if due_timestamp is None else due_timestamp
+    self._deadlines.schedule(target_name, deadline)
+    logger.debug("Target re-armed", target=target_name, due_timestamp=deadline)
+    self._wake_event.set()
+
+  def apply_webhook_event(self, target_name: str, event: WebhookEvent) -> None:
+    """Apply a webhook event to a target's cached library, item state and schedule.
+
+    Must be called on the scheduler's event loop. The event's record is refetched by the next
+    run; items named by Grab and Download events are recorded as searched successfully, so
+    they wait out `item_revisit_s`, and the state is saved like after a run; records added
+    by MovieAdded and SeriesAdd events trigger an immediate run.
+    """
+    if target_name not in self._targets_by_name:
+      raise ValueError(f"Unknown target: {target_name}")
+    if event.event_type == WebhookEventType.TEST:
+      logger.debug("Webhook test event received", target=target_name)
+      return
+
+    if event.record_key is not None:
+      self.library_cache.mark_changed(target_name, event.record_key)
+    result = SATISFYING_RESULTS.get(event.event_type)
+    if result is not None and event.item_ids:
+      target_state = self.state_manager.get_target_state(target_name)
+      timestamp = time.time()
+      for item_id in event.item_ids:
+        item_id_str = item_id.format_for_state()
+        target_state.items[item_id_str] = _updated_item_state(
+          target_state.items.get(item_id_str),
+          item_id_str,
+          timestamp=timestamp,
+          result=result,
+          status=ItemStatus.SUCCESS,
+          consecutive_failures=0,
+        )
+        logger.debug(
+          "Item satisfied by webhook event",
+          target=target_name,
+          event_type=event.event_type.value,
+          **item_id.logging_ids(),
+        )
+      self._save_state()
+    if event.event_type in ADDING_EVENTS:
+      self.rearm(target_name)
 
   def stop(self) -> None:
     """Stop the scheduler."""
     self.running = False
+    self._wake_event.set()
     logger.debug("Scheduler stopped")
 
+  def _dispatch(self, target: ArrTarget, due_timestamp: float) -> None:
+    """Start a run task for a due target, or defer it while a previous run is in flight."""
+    if target.name in self._run_tasks:
+      logger.debug(
+        "Target still running, deferring due run", **target.logging_ids(), due=due_timestamp
+      )
+      previous = self._overlapped_deadlines.get(target.name, due_timestamp)
+      self._overlapped_deadlines[target.name] = min(previous, due_timestamp)
+      return
+    task = asyncio.create_task(self._run_target(target, due_timestamp))
+    self._run_tasks[target.name] = task
+
+  async def _run_target(self, target: ArrTarget, due_timestamp: float) -> None:
+    """Run a target once, record scheduling lag, and re-arm its next deadline."""
+    lag_s = max(time.time() - due_timestamp, 0.0)
+    scheduling_lag_seconds.labels(target=target.name, type=target.arr_type.value).observe(lag_s)
+    try:
+      await self.run_once(target)
+    except Exception as e:
+      logger.exception("Unhandled exception in target run", exception=e, **target.logging_ids())
+    finally:
+      del self._run_tasks[target.name]
+      if self._first_run_start is not None:
+        first_run_s = time.perf_counter() - self._first_run_start
+        startup_duration_seconds.labels(phase="first_run").set(first_run_s)
+        logger.debug("First run completed", duration_s=first_run_s, **target.logging_ids())
+        self._first_run_start = None
+      self._rearm_after_run(target)
+      self._wake_event.set()
+
+  def _rearm_after_run(self, target: ArrTarget) -> None:
+    """Schedule a target's next run after a run completes.
+
+    A deadline that came due while the run was in flight takes effect now; a deadline set
+    by rearm() during the run is kept; otherwise the next interval is scheduled.
+    """
+    overlapped_deadline = self._overlapped_deadlines.pop(target.name, None)
+    if overlapped_deadline is not None:
+      self._deadlines.schedule(target.name, overlapped_deadline)
+      return
+    if target.name in self._deadlines:
+      return
+    target_state = self.state_manager.get_target_state(target.name)
+    self._deadlines.schedule(
+      target.name, target_state.last_run_timestamp + target.settings.interval_s
+    )
+
   async def _process_items(
     self,
     target: ArrTarget,
     client: ArrClient,
-    items: list[dict[str, Any]],
+    items: AsyncIterable[dict[str, Any]],
     target_state: TargetState,
     item_handler: ItemHandler,
     logging_ids: dict[str, Any],
   ) -> int:
-    """Process items and trigger searches using the provided handler."""
+    """Process items and trigger searches using the provided handler.
+
+    When the handler supports batch searches, consecutive eligible items sharing a batch key
+    are grouped into batches of up to the handler's max_batch_size, and batches are
+    dispatched through a pool of at most
+    `search_concurrency` tasks. An item only counts toward `ops_per_interval` once its search
+    succeeds, so dispatching pauses whenever completed, in-flight and batched items could
+    reach the limit.
+    """
     processed = 0
+    item_count = 0
     ops_count = 0
+    ops_limit = target.settings.ops_per_interval
+    concurrency = target.settings.search_concurrency
+    batch_handler = item_handler if isinstance(item_handler, BatchSearchHandler) else None
+    batch_size = batch_handler.max_batch_size() if batch_handler is not None else 1
+    min_batch_size = batch_handler.min_batch_size() if batch_handler is not None else 1
+    in_flight: dict[asyncio.Task[int], list[_PendingSearch]] = {}
+    in_flight_count = 0
+    claimed_ids: set[str] = set()
+    batch: list[_PendingSearch] = []
+    batch_key: Hashable = None
 
     # Combine all logging IDs for processing items
     process_logging_ids = {
@@ -193,191 +415,259 @@ class Scheduler:
 
     logger.debug(
       "Processing items",
-      total_items=len(items),
+      search_concurrency=concurrency,
+      search_batch_size=batch_size,
       **process_logging_ids,
     )
 
-    for item in items:
-      if ops_count >= target.settings.ops_per_interval:
-        logger.debug(
-          "Reached ops_per_interval limit",
-          ops_count=ops_count,
-          **process_logging_ids,
+    async def wait_for_searches(return_when: str) -> None:
+      nonlocal processed, ops_count, in_flight_count
+      done, _ = await asyncio.wait(in_flight, return_when=return_when)
+      for task in done:
+        searches = in_flight.pop(task)
+        in_flight_count -= len(searches)
+        claimed_ids.difference_update(search.item_id_str for search in searches)
+        succeeded = task.result()
+        processed += succeeded
+        ops_count += succeeded
+
+    async def dispatch_batch() -> None:
+      nonlocal batch, in_flight_count
+      searches, batch = batch, []
+      # Groups too small to be worth one combined command, or that one command would not
+      # search exactly, are searched item by item.
+      groups = (
+        [searches]
+        if batch_handler is not None
+        and len(searches) >= min_batch_size
+        and batch_handler.can_search_batch([search.item for search in searches])
+        else [[search] for search in searches]
+      )
+      for group in groups:
+        while len(in_flight) >= concurrency:
+          await wait_for_searches(asyncio.FIRST_COMPLETED)
+        task = asyncio.create_task(
+          self._search_batch(target, client, group, target_state, item_handler, process_logging_ids)
         )
-        break
-
-      item_logging_ids = {
-        **process_logging_ids,
-        **item_handler.extract_logging_id(item),
-      }
-      item_id = item_handler.extract_item_id(item)
-      if item_id is None:
-        logger.warning("Skipping item with no ID", **item_logging_ids)
-        continue
-
-      item_id_str = item_id.format_for_state()
-      item_state = target_state.items.get(item_id_str)
-
-      item_logging_ids.update(item_id.logging_ids())
-      if item_state is not None:
-        item_logging_ids.update(item_state.logging_ids())
-
-      if item_state is not None:
-        time_since_last = time.time() - item_state.last_processed_timestamp
-        if (
-          item_state.last_status == ItemStatus.SUCCESS
-          and time_since_last < target.settings.item_revisit_s
-        ):
+        in_flight[task] = group
+        in_flight_count += len(group)
+
+    try:
+      async for item in items:
+        item_count += 1
+        if ops_count + in_flight_count + len(batch) >= ops_limit:
+          if batch:
+            await dispatch_batch()
+          while in_flight and ops_count + in_flight_count >= ops_limit:
+            await wait_for_searches(asyncio.FIRST_COMPLETED)
+        if ops_count >= ops_limit:
           logger.debug(
-            "Skipping item (revisit timeout not met)",
-            time_since_last=time_since_last,
-            revisit_timeout=target.settings.item_revisit_s,
-            **item_logging_ids,
+            "Reached ops_per_interval limit",
+            ops_count=ops_count,
+            **process_logging_ids,
           )
+          break
+
+        item_logging_ids = {
+          **process_logging_ids,
+          **item_handler.extract_logging_id(item),
+        }
+        item_id = item_handler.extract_item_id(item)
+        if item_id is None:
+          logger.warning("Skipping item with no ID", **item_logging_ids)
+          continue
+
+        item_id_str = item_id.format_for_state()
+        if item_id_str in claimed_ids:
+          logger.debug("Skipping item (search already pending)", **item_logging_ids)
+          continue
+        item_state = target_state.items.get(item_id_str)
+
+        item_logging_ids.update(item_id.logging_ids())
+        if item_state is not None:
+          item_logging_ids.update(item_state.logging_ids())
+
+        if item_state is not None and self._should_skip_for_state(
+          target, item_state, item_logging_ids
+        ):
           skips_total.labels(target=target.name, type=target.arr_type.value).inc()
           continue
-        if item_state.last_status != ItemStatus.SUCCESS:
-          s = target.settings
-          if (
-            s.search_retry_max_attempts > 0
-            and item_state.consecutive_failures >= s.search_retry_max_attempts
-          ):
-            logger.debug(
-              "Skipping item (search retry max attempts exceeded)",
-              consecutive_failures=item_state.consecutive_failures,
-              search_retry_max_attempts=s.search_retry_max_attempts,
-              **item_logging_ids,
-            )
-            skips_total.labels(target=target.name, type=target.arr_type.value).inc()
-            continue
-          search_backoff_s = _search_backoff_delay_s(
-            item_state.consecutive_failures,
-            s.search_retry_initial_delay_s,
-            s.search_retry_backoff_exponent,
-            s.search_retry_max_delay_s,
-          )
-          if search_backoff_s > 0 and time_since_last < search_backoff_s:
-            logger.debug(
-              "Skipping item (search backoff not met)",
-              time_since_last=time_since_last,
-              search_backoff_s=search_backoff_s,
-              consecutive_failures=item_state.consecutive_failures,
-              **item_logging_ids,
-            )
-            skips_total.labels(target=target.name, type=target.arr_type.value).inc()
-            continue
-
-      if not item_handler.should_search(item, logging_ids=item_logging_ids):
-        skips_total.labels(target=target.name, type=target.arr_type.value).inc()
-        continue
-
-      if target.settings.dry_run:
-        dry_run_timestamp = time.time()
-        if item_state is None:
-          dry_run_state = ItemState(
-            item_id=item_id_str,
-            last_processed_timestamp=dry_run_timestamp,
-            last_result="dry_run_search_eligible",
-            last_status=ItemStatus.SUCCESS,
-            consecutive_failures=0,
-          )
-        else:
-          dry_run_state = replace(
+
+        if not item_handler.should_search(item, logging_ids=item_logging_ids):
+          skips_total.labels(target=target.name, type=target.arr_type.value).inc()
+          continue
+
+        if target.settings.dry_run:
+          dry_run_state = _updated_item_state(
             item_state,
-            last_processed_timestamp=dry_run_timestamp,
-            last_result="dry_run_search_eligible",
-            last_status=ItemStatus.SUCCESS,
+            item_id_str,
+            timestamp=time.time(),
+            result=ItemResult.DRY_RUN_SEARCH_ELIGIBLE,
+            status=ItemStatus.SUCCESS,
             consecutive_failures=0,
           )
-        target_state.items[item_id_str] = dry_run_state
-        item_state = dry_run_state
-        item_logging_ids.update(dry_run_state.logging_ids())
+          target_state.items[item_id_str] = dry_run_state
+          item_logging_ids.update(dry_run_state.logging_ids())
+
+          processed += 1
+          ops_count += 1
+          logger.debug(
+            "Item processed in dry run mode",
+            processed=processed,
+            ops_count=ops_count,
+            **item_logging_ids,
+          )
+          continue
+
+        if batch_handler is not None:
+          item_batch_key = batch_handler.batch_key(item)
+          if batch and item_batch_key != batch_key:
+            await dispatch_batch()
+          batch_key = item_batch_key
+        claimed_ids.add(item_id_str)
+        batch.append(_PendingSearch(item, item_id_str, item_state, item_logging_ids))
+        if len(batch) >= batch_size:
+          await dispatch_batch()
+
+      if batch:
+        await dispatch_batch()
+      if in_flight:
+        await wait_for_searches(asyncio.ALL_COMPLETED)
+    finally:
+      for task in in_flight:
+        task.cancel()
+
+    logger.debug(
+      "Finished processing items",
+      processed=processed,
+      total_items=item_count,
+      **process_logging_ids,
+    )
+    return processed
 
-        processed += 1
-        ops_count += 1
+  def _should_skip_for_state(
+    self,
+    target: ArrTarget,
+    item_state: ItemState,
+    item_logging_ids: dict[str, Any],
+  ) -> bool:
+    """Apply revisit timeout, max attempts, and failure backoff to a previously seen item."""
+    time_since_last = time.time() - item_state.last_processed_timestamp
+    if (
+      item_state.last_status == ItemStatus.SUCCESS
+      and time_since_last < target.settings.item_revisit_s
+    ):
+      logger.debug(
+        "Skipping item (revisit timeout not met)",
+        time_since_last=time_since_last,
+        revisit_timeout=target.settings.item_revisit_s,
+        **item_logging_ids,
+      )
+      return True
+    if item_state.last_status != ItemStatus.SUCCESS:
+      s = target.settings
+      if (
+        s.search_retry_max_attempts > 0
+        and item_state.consecutive_failures >= s.search_retry_max_attempts
+      ):
+        logger.debug(
+          "Skipping item (search retry max attempts exceeded)",
+          consecutive_failures=item_state.consecutive_failures,
+          search_retry_max_attempts=s.search_retry_max_attempts,
+          **item_logging_ids,
+        )
+        return True
+      search_backoff_s = _search_backoff_delay_s(
+        item_state.consecutive_failures,
+        s.search_retry_initial_delay_s,
+        s.search_retry_backoff_exponent,
+        s.search_retry_max_delay_s,
+      )
+      if search_backoff_s > 0 and time_since_last < search_backoff_s:
         logger.debug(
-          "Item processed in dry run mode",
-          processed=processed,
-          ops_count=ops_count,
+          "Skipping item (search backoff not met)",
+          time_since_last=time_since_last,
+          search_backoff_s=search_backoff_s,
+          consecutive_failures=item_state.consecutive_failures,
           **item_logging_ids,
         )
-        continue
+        return True
+    return False
+
+  async def _search_batch(
+    self,
+    target: ArrTarget,
+    client: ArrClient,
+    searches: list[_PendingSearch],
+    target_state: TargetState,
+    item_handler: ItemHandler,
+    process_logging_ids: dict[str, Any],
+  ) -> int:
+    """Search a batch of items with one command and record an ItemState for each item.
 
-      try:
-        request_start = time.time()
+    Batches of at least the handler's min_batch_size items that it can search together go
+    through BatchSearchHandler.search_batch; a single item is searched with ItemHandler.search.
+    Returns the number of items whose search succeeded.
+    """
+    try:
+      request_start = time.time()
+      if (
+        isinstance(item_handler, BatchSearchHandler)
+        and len(searches) >= item_handler.min_batch_size()
+        and item_handler.can_search_batch([search.item for search in searches])
+      ):
+        await item_handler.search_batch(
+          client=client,
+          items=[search.item for search in searches],
+          logging_ids=process_logging_ids,
+        )
+      else:
         await item_handler.search(
           client=client,
-          item=item,
+          item=searches[0].item,
           logging_ids=process_logging_ids,
         )
-        request_end = time.time()
-        request_duration = request_end - request_start
-        request_duration_seconds.labels(target=target.name, type=target.arr_type.value).observe(
-          request_duration
+      request_end = time.time()
+      request_duration_seconds.labels(target=target.name, type=target.arr_type.value).observe(
+        request_end - request_start
+      )
+    except Exception as e:
+      error_timestamp = time.time()
+      for search in searches:
+        new_failures = (
+          (search.item_state.consecutive_failures + 1) if search.item_state is not None else 1
         )
-
-        if item_state is None:
-          updated_state = ItemState(
-            item_id=item_id_str,
-            last_processed_timestamp=request_end,
-            last_result="search_triggered",
-            last_status=ItemStatus.SUCCESS,
-            consecutive_failures=0,
-          )
-        else:
-          updated_state = replace(
-            item_state,
-            last_processed_timestamp=request_end,
-            last_result="search_triggered",
-            last_status=ItemStatus.SUCCESS,
-            consecutive_failures=0,
-          )
-        target_state.items[item_id_str] = updated_state
-        item_state = updated_state
-        item_logging_ids.update(updated_state.logging_ids())
-
-        grabs_total.labels(target=target.name, type=target.arr_type.value).inc()
-        processed += 1
-        ops_count += 1
-        logger.debug(
-          "Item processed successfully",
-          processed=processed,
-          ops_count=ops_count,
-          **item_logging_ids,
+        failed_state = _updated_item_state(
+          search.item_state,
+          search.item_id_str,
+          timestamp=error_timestamp,
+          result=ItemResult.SEARCH_FAILED,
+          status=ItemStatus.ERROR,
+          consecutive_failures=new_failures,
         )
-      except Exception as e:
-        error_timestamp = time.time()
-        new_failures = (item_state.consecutive_failures + 1) if item_state is not None else 1
-        if item_state is None:
-          failed_state = ItemState(
-            item_id=item_id_str,
-            last_processed_timestamp=error_timestamp,
-            last_result="search_failed",
-            last_status=ItemStatus.ERROR,
-            consecutive_failures=new_failures,
-          )
-        else:
-          failed_state = replace(
-            item_state,
-            last_processed_timestamp=error_timestamp,
-            last_result="search_failed",
-            last_status=ItemStatus.ERROR,
-            consecutive_failures=new_failures,
-          )
-        target_state.items[item_id_str] = failed_state
-        item_state = failed_state
-        item_logging_ids.update(failed_state.logging_ids())
+        target_state.items[search.item_id_str] = failed_state
+        search.logging_ids.update(failed_state.logging_ids())
 
         logger.exception(
           "Exception while processing item",
           exception=e,
-          **item_logging_ids,
+          batch_size=len(searches),
+          **search.logging_ids,
         )
+      return 0
+
+    for search in searches:
+      updated_state = _updated_item_state(
+        search.item_state,
+        search.item_id_str,
+        timestamp=request_end,
+        result=ItemResult.SEARCH_TRIGGERED,
+        status=ItemStatus.SUCCESS,
+        consecutive_failures=0,
+      )
+      target_state.items[search.item_id_str] = updated_state
+      search.logging_ids.update(updated_state.logging_ids())
 
-    logger.debug(
-      "Finished processing items",
-      processed=processed,
-      total_items=len(items),
-      **process_logging_ids,
-    )
-    return processed
+      grabs_total.labels(target=target.name, type=target.arr_type.value).inc()
+      logger.debug("Item processed successfully", batch_size=len(searches), **search.logging_ids)
+    return len(searches)
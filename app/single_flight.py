@@ -0,0 +1,238 @@
+"""Coalescing of identical concurrent requests into a single request to the target."""
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable, Hashable
+from enum import StrEnum
+from typing import Any
+
+
+class CoalescedFrom(StrEnum):
+  """Where a coalesced request got its result from."""
+
+  IN_FLIGHT = "in_flight"
+  CACHE = "cache"
+
+
+class _StreamFlight:
+  """One streamed response read once and handed to each of its subscribers.
+
+  Subscribers may join until the first element has been read (typically while the target is
+  still preparing its response). They pull elements in turn: whichever needs an element the
+  others have not read yet reads it from the source, in a task the other subscribers wait on,
+  so a subscriber being cancelled does not break the stream for the rest. Elements are dropped
+  once every subscriber has read them, and a subscriber left on its own reads the source
+  directly. At most max_buffered elements are kept: a subscriber that falls that far behind
+  the others is detached onto a stream of its own from open_stream(), which skips the
+  elements it has already read, so a slow subscriber never holds up the others.
+  """
+
+  def __init__(
+    self,
+    open_stream: Callable[[], AsyncGenerator[Any, None]],
+    on_close: Callable[[], None],
+    max_buffered: int,
+  ) -> None:
+    self._open_stream = open_stream
+    self._source = open_stream()
+    self._on_close = on_close
+    self._max_buffered = max_buffered
+    self._elements: list[Any] = []
+    # Stream index of _elements[0].
+    self._offset = 0
+    self._positions: dict[object, int] = {}
+    # Stream index each detached subscriber continues from on its own stream.
+    self._detached: dict[object, int] = {}
+    self._pull: asyncio.Task[None] | None = None
+    self._done = False
+    self._error: Exception | None = None
+    self._closed = False
+
+  @property
+  def started(self) -> bool:
+    """Whether an element has been read, after which no subscriber may join."""
+    return self._offset > 0 or bool(self._elements) or self._done
+
+  def subscribe(self) -> AsyncGenerator[Any, None]:
+    """Return the stream's elements from the start."""
+    # Registered now rather than on first iteration, so no element is dropped before then.
+    token = object()
+    self._positions[token] = self._offset
+    return self._iterate(token)
+
+  async def _read_next(self) -> None:
+    try:
+      self._elements.append(await anext(self._source))
+    except StopAsyncIteration:
+      self._done = True
+    except Exception as e:
+      self._error = e
+      self._done = True
+
+  async def _pull_next(self) -> None:
+    try:
+      await self._read_next()
+    finally:
+      self._pull = None
+
+  def _trim(self) -> None:
+    if not self._positions:
+      return
+    read = min(self._positions.values()) - self._offset
+    if read > 0:
+      del self._elements[:read]
+      self._offset += read
+
+  def _detach_slowest(self) -> None:
+    """Detach the subscribers that have read the fewest elements, to drop what they hold."""
+    slowest = min(self._positions.values())
+    for token, position in list(self._positions.items()):
+      if position == slowest:
+        del self._positions[token]
+        self._detached[token] = position
+    self._trim()
+
+  async def _iterate(self, token: object) -> AsyncGenerator[Any, None]:
+    try:
+      while token in self._positions:
+        index = self._positions[token] - self._offset
+        if index < len(self._elements):
+          element = self._elements[index]
+          self._positions[token] += 1
+          self._trim()
+          yield element
+          continue
+        if self._error is not None:
+          raise self._error
+        if self._done:
+          return
+        if self._pull is not None:
+          await asyncio.shield(self._pull)
+        elif len(self._elements) >= self._max_buffered:
+          self._detach_slowest()
+        elif len(self._positions) == 1 and self.started:
+          await self._read_next()
+        else:
+          self._pull = asyncio.ensure_future(self._pull_next())
+          await asyncio.shield(self._pull)
+    finally:
+      self._positions.pop(token, None)
+      position = self._detached.pop(token, None)
+      self._trim()
+      if not self._positions:
+        await self._close()
+
+    # Detached: read a stream of its own, assuming the target returns the same elements again.
+    assert position is not None
+    source = self._open_stream()
+    try:
+      skipped = 0
+      async for element in source:
+        if skipped < position:
+          skipped += 1
+          continue
+        yield element
+    finally:
+      await source.aclose()
+
+  async def _close(self) -> None:
+    """Stop reading the source once the last subscriber is gone."""
+    if self._closed:
+      return
+    self._closed = True
+    self._on_close()
+    pull = self._pull
+    if pull is not None:
+      pull.cancel()
+      await asyncio.wait([pull])
+    await self._source.aclose()
+
+
+class SingleFlight:
+  """Shares one in-flight request, and its parsed result, among identical concurrent requests.
+
+  Requests are identified by a key (e.g. method, URL and API key). A request made while one
+  with the same key is in flight waits for that request's result or error instead of being
+  sent. With ttl_s above 0, a successful result is also reused by requests made within ttl_s
+  of it completing. Results are shared, so callers must not modify them. A shared stream
+  buffers at most max_stream_buffer elements; a subscriber falling further behind is detached
+  onto a request of its own.
+  """
+
+  def __init__(
+    self,
+    ttl_s: float = 0.0,
+    *,
+    max_stream_buffer: int = 1000,
+    clock: Callable[[], float] = time.monotonic,
+  ) -> None:
+    self.ttl_s = ttl_s
+    self.max_stream_buffer = max_stream_buffer
+    self._clock = clock
+    self._in_flight: dict[Hashable, asyncio.Future[Any]] = {}
+    self._cache: dict[Hashable, tuple[float, Any]] = {}
+    self._streams: dict[Hashable, _StreamFlight] = {}
+
+  def _cached(self, key: Hashable) -> tuple[bool, Any]:
+    cached = self._cache.get(key)
+    if cached is None:
+      return False, None
+    expires_at, result = cached
+    if expires_at <= self._clock():
+      del self._cache[key]
+      return False, None
+    return True, result
+
+  def _store(self, key: Hashable, future: asyncio.Future[Any]) -> None:
+    if self._in_flight.get(key) is future:
+      del self._in_flight[key]
+    if self.ttl_s <= 0 or future.cancelled() or future.exception() is not None:
+      return
+    now = self._clock()
+    # Expired entries are dropped here so keys that are never requested again do not pile up.
+    for expired_key in [k for k, (expires_at, _) in self._cache.items() if expires_at <= now]:
+      del self._cache[expired_key]
+    self._cache[key] = (now + self.ttl_s, future.result())
+
+  async def do(
+    self, key: Hashable, fetch: Callable[[], Awaitable[Any]]
+  ) -> tuple[Any, CoalescedFrom | None]:
+    """Return the result for key, and where it came from when not fetched by this call.
+
+    The fetch runs in its own task, so one caller being cancelled does not cancel it for the
+    callers sharing it.
+    """
+    is_cached, result = self._cached(key)
+    if is_cached:
+      return result, CoalescedFrom.CACHE
+    future = self._in_flight.get(key)
+    if future is not None:
+      return await asyncio.shield(future), CoalescedFrom.IN_FLIGHT
+
+    async def run() -> Any:
+      return await fetch()
+
+    future = asyncio.ensure_future(run())
+    self._in_flight[key] = future
+    future.add_done_callback(lambda done: self._store(key, done))
+    return await asyncio.shield(future), None
+
+  def stream(
+    self, key: Hashable, open_stream: Callable[[], AsyncGenerator[Any, None]]
+  ) -> tuple[AsyncGenerator[Any, None], CoalescedFrom | None]:
+    """Return the elements of the stream for key, and whether they come from a stream in flight.
+
+    A stream in flight is joined only until its first element has been read; after that
+    open_stream() starts a new one. Streams are not cached.
+    """
+    flight = self._streams.get(key)
+    if flight is not None and not flight.started:
+      return flight.subscribe(), CoalescedFrom.IN_FLIGHT
+
+    def on_close() -> None:
+      if self._streams.get(key) is new_flight:
+        del self._streams[key]
+
+    new_flight = _StreamFlight(open_stream, on_close, self.max_stream_buffer)
+    self._streams[key] = new_flight
+    return new_flight.subscribe(), None
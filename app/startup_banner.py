@@ -31,6 +31,8 @@ def _format_target(target: ArrTarget, index: int) -> str:
     "base_url": target.base_url,
     "api_key": REDACTED,
   }
+  if target.unix_socket_path is not None:
+    target_attrs["unix_socket_path"] = target.unix_socket_path
   settings_data = target.settings.model_dump(mode="json")
   target_attrs.update(settings_data)
   lines = [header] + _format_section(target_attrs, indent="    ")
@@ -46,6 +48,8 @@ def format_banner(config: Config) -> str:
     value = getattr(config, name)
     if name == "state_file_path" and (value is None or value == ""):
       value = "(in-memory)"
+    if name == "webhook_token":
+      value = REDACTED if value else "(none)"
     global_data[name] = value
   global_lines = [
     "=== Gatherarr Startup Configuration ===",
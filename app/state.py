@@ -1,14 +1,22 @@
 """State management with atomic writes and recovery."""
 
+import json
 import os
+import sqlite3
+import sys
 import time
-from dataclasses import asdict, dataclass, field
+from collections.abc import Callable, Iterator, Mapping, MutableMapping
+from dataclasses import dataclass, field
 from enum import StrEnum
+from functools import partial
 from pathlib import Path
-from typing import Protocol
+from typing import Any, Protocol, runtime_checkable
+from urllib.parse import quote, unquote
 
 import structlog
-import yaml
+
+from app.metrics import state_saves_total
+from app.state_codecs import YAML_CODEC, StateCodec, StateDecodeError, detect_codec
 
 logger = structlog.get_logger()
 
@@ -31,9 +39,34 @@ class ItemStatus(StrEnum):
   ERROR = "error"
 
 
-@dataclass
+class ItemResult(StrEnum):
+  """Outcomes the scheduler records for an item."""
+
+  SEARCH_TRIGGERED = "search_triggered"
+  SEARCH_FAILED = "search_failed"
+  DRY_RUN_SEARCH_ELIGIBLE = "dry_run_search_eligible"
+  WEBHOOK_GRAB = "webhook_grab"
+  WEBHOOK_DOWNLOAD = "webhook_download"
+
+
+def intern_result(result: str) -> str:
+  """Return the shared ItemResult member for a result, or the interned string if unknown."""
+  try:
+    return ItemResult(result)
+  except ValueError:
+    return sys.intern(result)
+
+
+@dataclass(frozen=True, slots=True)
 class ItemState:
-  """State for a single processed item."""
+  """State for a single processed item.
+
+  Item states are immutable values: record an outcome by storing a new ItemState (e.g. with
+  dataclasses.replace) in TargetState.items, which is how changes are tracked for saving.
+  To keep large states compact in memory they are slotted, item_id is the same string
+  object as the item's key in TargetState.items, and last_result is a shared ItemResult
+  member (or interned string).
+  """
 
   item_id: str
   last_processed_timestamp: float
@@ -46,12 +79,80 @@ class ItemState:
     return {
       "item_id": self.item_id,
       "item_last_processed_timestamp": str(self.last_processed_timestamp),
-      "item_last_result": self.last_result,
+      "item_last_result": str(self.last_result),
       "item_last_status": self.last_status.value,
       "item_consecutive_failures": str(self.consecutive_failures),
     }
 
 
+class ItemStates(dict[str, ItemState]):
+  """Item states of a target that record which item ids were set or removed since saving."""
+
+  def __init__(self, *args: Any, **kwargs: Any) -> None:
+    super().__init__(*args, **kwargs)
+    self.changed_ids: set[str] = set(self)
+    self.removed_ids: set[str] = set()
+
+  def __setitem__(self, item_id: str, item_state: ItemState) -> None:
+    super().__setitem__(item_id, item_state)
+    self.changed_ids.add(item_id)
+    self.removed_ids.discard(item_id)
+
+  def __delitem__(self, item_id: str) -> None:
+    super().__delitem__(item_id)
+    self.changed_ids.discard(item_id)
+    self.removed_ids.add(item_id)
+
+  def pop(self, item_id: str, *default: Any) -> Any:
+    if item_id in self:
+      self.changed_ids.discard(item_id)
+      self.removed_ids.add(item_id)
+    return super().pop(item_id, *default)
+
+  def popitem(self) -> tuple[str, ItemState]:
+    item_id, item_state = super().popitem()
+    self.changed_ids.discard(item_id)
+    self.removed_ids.add(item_id)
+    return item_id, item_state
+
+  def setdefault(self, item_id: str, default: ItemState) -> ItemState:
+    if item_id not in self:
+      self[item_id] = default
+    return self[item_id]
+
+  def update(self, *args: Any, **kwargs: Any) -> None:
+    for item_id, item_state in dict(*args, **kwargs).items():
+      self[item_id] = item_state
+
+  def __ior__(self, other: Any) -> "ItemStates":  # type: ignore[misc,override]
+    self.update(other)
+    return self
+
+  def clear(self) -> None:
+    self.removed_ids.update(self)
+    self.changed_ids.clear()
+    super().clear()
+
+  @property
+  def changed(self) -> bool:
+    """Whether any item was set or removed since the last save."""
+    return bool(self.changed_ids or self.removed_ids)
+
+  def mark_saved(self) -> None:
+    """Forget recorded changes once the items have been written."""
+    self.changed_ids.clear()
+    self.removed_ids.clear()
+
+  def discard_saved(self, item_id: str) -> None:
+    """Remove an item that storage no longer holds, without recording a change."""
+    super().__delitem__(item_id)
+
+
+# TargetState fields whose changes make a save necessary. The others are run bookkeeping that
+# advances on (nearly) every run; it is written along with the next change or a forced save.
+_TRACKED_TARGET_FIELDS = frozenset({"last_status", "consecutive_failures"})
+
+
 @dataclass
 class TargetState:
   """State for a single target."""
@@ -60,7 +161,26 @@ class TargetState:
   last_success_timestamp: float = 0.0
   last_status: RunStatus = RunStatus.UNKNOWN
   consecutive_failures: int = 0
-  items: dict[str, ItemState] = field(default_factory=dict)
+  # Time up to which the cached library snapshot reflects *arr changes (0 = never synced).
+  library_sync_watermark: float = 0.0
+  items: ItemStates = field(default_factory=ItemStates)
+
+  def __setattr__(self, name: str, value: Any) -> None:
+    if name == "items" and not isinstance(value, ItemStates):
+      value = ItemStates(value)
+    elif name in _TRACKED_TARGET_FIELDS and getattr(self, name, value) != value:
+      object.__setattr__(self, "_fields_changed", True)
+    object.__setattr__(self, name, value)
+
+  @property
+  def changed(self) -> bool:
+    """Whether the target's status or items changed since the last save."""
+    return self.__dict__.get("_fields_changed", False) or self.items.changed
+
+  def mark_saved(self) -> None:
+    """Forget recorded changes once the target has been written."""
+    object.__setattr__(self, "_fields_changed", False)
+    self.items.mark_saved()
 
   def logging_ids(self) -> dict[str, str]:
     """Logging identifiers for the item."""
@@ -72,20 +192,89 @@ class TargetState:
     }
 
 
+class TargetStates(MutableMapping[str, TargetState]):
+  """Target states by target name, of which stored targets may be loaded on first use.
+
+  StateManager.load() can leave targets indexed but not loaded. Looking up, setting or
+  deleting one target loads at most that target; iterating, len() and comparisons load every
+  target first, so the mapping reads like a plain dict of the stored targets. A target that
+  fails to load is dropped.
+  """
+
+  def __init__(self, targets: Mapping[str, TargetState] | None = None) -> None:
+    # Targets whose items have been loaded (or that were never stored).
+    self.loaded: dict[str, TargetState] = dict(targets or {})
+    self._sections: dict[str, "TargetSection"] = {}
+    self._load_section: Callable[[str, "TargetSection"], TargetState | None] | None = None
+
+  def defer(
+    self,
+    sections: dict[str, "TargetSection"],
+    load_section: Callable[[str, "TargetSection"], TargetState | None],
+  ) -> None:
+    """Add indexed targets, loaded by load_section() (None when corrupted) on first access."""
+    self._sections.update(sections)
+    self._load_section = load_section
+
+  def section(self, target_name: str) -> "TargetSection | None":
+    """Return the section of a target that has not been loaded yet."""
+    return self._sections.get(target_name)
+
+  def names(self) -> set[str]:
+    """Return the name of every target, loaded or not, without loading any."""
+    return self.loaded.keys() | self._sections.keys()
+
+  def load_all(self) -> None:
+    """Load every target that has not been loaded yet."""
+    for target_name in list(self._sections):
+      self._load(target_name)
+
+  def _load(self, target_name: str) -> None:
+    section = self._sections.pop(target_name)
+    assert self._load_section is not None
+    target_state = self._load_section(target_name, section)
+    if target_state is not None:
+      self.loaded[target_name] = target_state
+
+  def __getitem__(self, target_name: str) -> TargetState:
+    if target_name in self._sections:
+      self._load(target_name)
+    return self.loaded[target_name]
+
+  def __setitem__(self, target_name: str, target_state: TargetState) -> None:
+    self._sections.pop(target_name, None)
+    self.loaded[target_name] = target_state
+
+  def __delitem__(self, target_name: str) -> None:
+    if self._sections.pop(target_name, None) is None:
+      del self.loaded[target_name]
+
+  def __iter__(self) -> Iterator[str]:
+    self.load_all()
+    return iter(self.loaded)
+
+  def __len__(self) -> int:
+    self.load_all()
+    return len(self.loaded)
+
+  def __repr__(self) -> str:
+    return f"TargetStates({self.loaded!r}, unloaded={sorted(self._sections)!r})"
+
+
 @dataclass
 class State:
   """Application state."""
 
   process_start_timestamp: float = field(default_factory=time.time)
   total_runs: int = 0
-  targets: dict[str, TargetState] = field(default_factory=dict)
+  targets: TargetStates = field(default_factory=TargetStates)
 
   def logging_ids(self) -> dict[str, str]:
     """Logging identifiers for the state."""
     return {
       "process_start_timestamp": str(self.process_start_timestamp),
       "total_runs": str(self.total_runs),
-      "target_count": str(len(self.targets)),
+      "target_count": str(len(self.targets.names())),
     }
 
 
@@ -105,11 +294,85 @@ class StateStorage(Protocol):
     ...
 
 
+@runtime_checkable
+class IncrementalStateStorage(StateStorage, Protocol):
+  """State storage that can write only the items that changed since its last write."""
+
+  def write_changes(self, data: dict, removed_items: dict[str, set[str]]) -> None:
+    """Write a partial state atomically.
+
+    data holds the global fields and every target, but only the items set since the last
+    write; removed_items maps target names to the item ids removed since then. Targets
+    missing from data are removed.
+    """
+    ...
+
+  def needs_full_write(self) -> bool:
+    """Whether the next write should be a full write (e.g. to compact the storage)."""
+    ...
+
+
+@runtime_checkable
+class ShardedStateStorage(StateStorage, Protocol):
+  """State storage that keeps each target in its own shard."""
+
+  def write_targets(self, data: dict, target_names: set[str]) -> None:
+    """Write the global fields and the targets in data, keeping the other targets' shards.
+
+    data holds the global fields and the targets to write, each with all of its items;
+    target_names names every current target, and the shards of any other target are removed.
+    """
+    ...
+
+  def move_corrupted_target(self, target_name: str) -> None:
+    """Move one target's corrupted shard aside."""
+    ...
+
+
+@dataclass(frozen=True)
+class TargetSection:
+  """A target indexed by IndexedStateStorage.read_index() without parsing its items.
+
+  fields holds the target's fields other than items; load() parses and returns the
+  target's full data, raising StateDecodeError or ValueError when it is corrupted.
+  """
+
+  fields: dict
+  load: Callable[[], dict]
+
+
+@runtime_checkable
+class IndexedStateStorage(StateStorage, Protocol):
+  """State storage that can read target sections on demand."""
+
+  def read_index(self) -> dict | None:
+    """Read state like read(), but with a TargetSection for each target in data["targets"]."""
+    ...
+
+
 class FileStateStorage:
-  """File-based state storage with atomic writes."""
+  """File-based state storage with atomic writes.
 
-  def __init__(self, state_file_path: Path | str) -> None:
+  State is written with codec; on read, the codec is detected from the file header, so a
+  file written in another format is read as is and migrated by the next write.
+  """
+
+  def __init__(self, state_file_path: Path | str, codec: StateCodec = YAML_CODEC) -> None:
     self.state_file_path = Path(state_file_path)
+    self.codec = codec
+
+  def _read_payload(self) -> tuple[bytes, StateCodec]:
+    """Read the file and detect the codec it was written with."""
+    payload = self.state_file_path.read_bytes()
+    codec = detect_codec(payload)
+    if codec is not self.codec:
+      logger.info(
+        "State file will be migrated on next save",
+        state_file_path=str(self.state_file_path),
+        file_format=codec.name,
+        state_format=self.codec.name,
+      )
+    return payload, codec
 
   def read(self) -> dict | None:
     """Read state from file."""
@@ -118,20 +381,58 @@ class FileStateStorage:
       logger.debug("State file does not exist", state_file_path=str(self.state_file_path))
       return None
 
+    payload, codec = self._read_payload()
     try:
-      with open(self.state_file_path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-      result = data if data is not None else {}
-      logger.debug(
-        "State read successfully", state_file_path=str(self.state_file_path), has_data=bool(result)
-      )
-      return result
-    except yaml.YAMLError as e:
+      data = codec.decode(payload)
+    except StateDecodeError as e:
       logger.warning(
-        "YAML error while reading state", state_file_path=str(self.state_file_path), error=str(e)
+        "Error while decoding state",
+        state_file_path=str(self.state_file_path),
+        file_format=codec.name,
+        error=str(e),
       )
-      # Raise YAML errors to indicate corruption, caller will handle it
+      # Raise decode errors to indicate corruption, caller will handle it
       raise
+    result = data if data is not None else {}
+    logger.debug(
+      "State read successfully", state_file_path=str(self.state_file_path), has_data=bool(result)
+    )
+    return result
+
+  def read_index(self) -> dict | None:
+    """Read the global fields and index the target sections, parsing only their fields.
+
+    Only YAML files laid out as write() lays them out are indexed; JSON and binary files,
+    which decode quickly, and other YAML files are decoded whole instead.
+    """
+    logger.debug("Indexing state file", state_file_path=str(self.state_file_path))
+    if not self.state_file_path.exists():
+      logger.debug("State file does not exist", state_file_path=str(self.state_file_path))
+      return None
+    payload, codec = self._read_payload()
+    try:
+      data = _index_yaml_state(payload.decode("utf-8")) if codec is YAML_CODEC else None
+      if data is None:
+        logger.debug(
+          "State file not indexable, decoding it whole",
+          state_file_path=str(self.state_file_path),
+          file_format=codec.name,
+        )
+        data = _sections_from_data(codec.decode(payload))
+    except (StateDecodeError, UnicodeDecodeError) as e:
+      logger.warning(
+        "Error while decoding state",
+        state_file_path=str(self.state_file_path),
+        file_format=codec.name,
+        error=str(e),
+      )
+      raise StateDecodeError(str(e)) from e
+    logger.debug(
+      "State file indexed",
+      state_file_path=str(self.state_file_path),
+      target_count=len(data["targets"]),
+    )
+    return data
 
   def write(self, data: dict) -> None:
     """Write state to file using atomic write semantics."""
@@ -144,9 +445,10 @@ class FileStateStorage:
       temp_path=str(temp_path),
       state_file_path=str(self.state_file_path),
     )
+    payload = self.codec.encode(data)
     try:
-      with open(temp_path, "w", encoding="utf-8") as f:
-        yaml.safe_dump(data, f, default_flow_style=False, sort_keys=False)
+      with open(temp_path, "wb") as f:
+        f.write(payload)
         f.flush()
         os.fsync(f.fileno())
       logger.debug("Temporary file written and synced", temp_path=str(temp_path))
@@ -198,6 +500,813 @@ class FileStateStorage:
       )
       pass
 
+  def move_corrupted_shard(self) -> None:
+    """Move a corrupted state shard aside to `<name>.corrupt.<timestamp>` next to it."""
+    if not self.state_file_path.exists():
+      return
+    corrupt_path = self.state_file_path.with_name(
+      f"{self.state_file_path.name}.corrupt.{int(time.time())}"
+    )
+    logger.warning(
+      "Moving corrupted state shard",
+      state_file_path=str(self.state_file_path),
+      corrupt_path=str(corrupt_path),
+    )
+    try:
+      self.state_file_path.rename(corrupt_path)
+    except OSError as e:
+      logger.error(
+        "Failed to move corrupted state shard",
+        state_file_path=str(self.state_file_path),
+        error=str(e),
+      )
+
+
+# Top-level file of a sharded state directory holding the global fields.
+_GLOBAL_SHARD_NAME = "global.yaml"
+
+
+class ShardedFileStateStorage:
+  """State storage with one YAML file per target plus a small global file in a directory.
+
+  Target shards live in `<directory>/targets/`, named after the URL-quoted target name, and
+  the global fields in `<directory>/global.yaml`. Each shard is written atomically with
+  codec like FileStateStorage (whose codec detection also applies on read, whatever the
+  file names say); write_targets() rewrites only the shards of the targets passed to it.
+  YAML shards hold the target's fields and items; other codecs encode whole state
+  documents, so their shards hold a document with just the one target. A shard that fails
+  to parse is moved aside on read and only its target starts fresh.
+  """
+
+  def __init__(
+    self,
+    directory: Path | str,
+    import_path: Path | str | None = None,
+    codec: StateCodec = YAML_CODEC,
+  ) -> None:
+    self.directory = Path(directory)
+    self.targets_directory = self.directory / "targets"
+    self.import_path = Path(import_path) if import_path is not None else None
+    self.codec = codec
+    self.global_storage = FileStateStorage(self.directory / _GLOBAL_SHARD_NAME, codec)
+
+  def _target_path(self, target_name: str) -> Path:
+    return self.targets_directory / f"{quote(target_name, safe='')}.yaml"
+
+  def _target_paths(self) -> dict[str, Path]:
+    """Return the shard path of every stored target by target name."""
+    if not self.targets_directory.is_dir():
+      return {}
+    return {
+      unquote(path.name.removesuffix(".yaml")): path
+      for path in self.targets_directory.glob("*.yaml")
+    }
+
+  def read(self) -> dict | None:
+    """Read the global file and every target shard, importing the YAML state file on first use."""
+    logger.debug("Reading sharded state", directory=str(self.directory))
+    target_paths = self._target_paths()
+    if not target_paths and not self.global_storage.state_file_path.exists():
+      if self.import_path is not None and self.import_path.exists():
+        return self._import_yaml(self.import_path)
+      logger.debug("Sharded state does not exist", directory=str(self.directory))
+      return None
+
+    data = self._read_global()
+    targets: dict[str, dict] = {}
+    for target_name, path in target_paths.items():
+      shard = FileStateStorage(path, self.codec)
+      try:
+        target_data = _unwrapped_shard(target_name, shard.read())
+      except StateDecodeError:
+        shard.move_corrupted_shard()
+        continue
+      if not isinstance(target_data, dict):
+        logger.warning("Target state shard is not a mapping", target=target_name, path=str(path))
+        shard.move_corrupted_shard()
+        continue
+      targets[target_name] = target_data
+    logger.debug(
+      "Sharded state read successfully", directory=str(self.directory), target_count=len(targets)
+    )
+    return {**data, "targets": targets}
+
+  def read_index(self) -> dict | None:
+    """Read the global file and index the target shards, parsing only their fields.
+
+    Like FileStateStorage.read_index(), only YAML shards are indexed; JSON and binary shards
+    are decoded whole.
+    """
+    logger.debug("Indexing sharded state", directory=str(self.directory))
+    target_paths = self._target_paths()
+    if not target_paths and not self.global_storage.state_file_path.exists():
+      if self.import_path is not None and self.import_path.exists():
+        imported = self._import_yaml(self.import_path)
+        return _sections_from_data(imported) if imported is not None else None
+      logger.debug("Sharded state does not exist", directory=str(self.directory))
+      return None
+
+    data = self._read_global()
+    targets: dict[str, TargetSection] = {}
+    for target_name, path in target_paths.items():
+      try:
+        payload = path.read_bytes()
+        codec = detect_codec(payload)
+        if codec is YAML_CODEC:
+          targets[target_name] = TargetSection(
+            fields=_yaml_section_fields(payload.decode("utf-8").splitlines(True), 0),
+            load=partial(self._load_target_shard, target_name),
+          )
+        else:
+          target_data = _parsed_target_data(
+            target_name, _unwrapped_shard(target_name, codec.decode(payload))
+          )
+          targets[target_name] = TargetSection(
+            fields={key: value for key, value in target_data.items() if key != "items"},
+            load=partial(_parsed_target_data, target_name, target_data),
+          )
+      except ValueError as e:
+        logger.warning("Invalid target state shard", target=target_name, error=str(e))
+        FileStateStorage(path).move_corrupted_shard()
+        continue
+    logger.debug("Sharded state indexed", directory=str(self.directory), target_count=len(targets))
+    return {**data, "targets": targets}
+
+  def _read_global(self) -> dict:
+    """Read the global file, moving it aside and starting fresh when it is corrupted."""
+    try:
+      data = self.global_storage.read() or {}
+    except StateDecodeError:
+      self.global_storage.move_corrupted_shard()
+      return {}
+    if not isinstance(data, dict):
+      logger.warning("Global state shard is not a mapping", directory=str(self.directory))
+      self.global_storage.move_corrupted_shard()
+      return {}
+    return data
+
+  def _load_target_shard(self, target_name: str) -> dict:
+    """Read one target's shard."""
+    data = _unwrapped_shard(
+      target_name, FileStateStorage(self._target_path(target_name), self.codec).read()
+    )
+    if not isinstance(data, dict):
+      raise ValueError(f"State shard of target {target_name} is not a mapping")
+    return data
+
+  def _import_yaml(self, yaml_path: Path) -> dict | None:
+    """Split a YAML state file into shards once and move the file aside."""
+    logger.info("Importing YAML state into shards", import_path=str(yaml_path))
+    data = FileStateStorage(yaml_path).read()
+    if data is None:
+      return None
+    self.write(data)
+    imported_path = yaml_path.with_name(f"{yaml_path.name}.imported")
+    yaml_path.rename(imported_path)
+    logger.info(
+      "YAML state imported", directory=str(self.directory), imported_path=str(imported_path)
+    )
+    return data
+
+  def write(self, data: dict) -> None:
+    """Write every target shard and the global file."""
+    self.write_targets(data, set(data["targets"]))
+
+  def write_targets(self, data: dict, target_names: set[str]) -> None:
+    """Write the given target shards and the global file, and remove stale shards."""
+    targets = data["targets"]
+    logger.debug(
+      "Writing sharded state",
+      directory=str(self.directory),
+      written_target_count=len(targets),
+      target_count=len(target_names),
+    )
+    for target_name, target_data in targets.items():
+      if self.codec is not YAML_CODEC:
+        target_data = {"targets": {target_name: target_data}}
+      FileStateStorage(self._target_path(target_name), self.codec).write(target_data)
+    for target_name, path in self._target_paths().items():
+      if target_name not in target_names:
+        logger.debug("Removing state shard of removed target", target=target_name)
+        path.unlink(missing_ok=True)
+    self.global_storage.write({**data, "targets": {}})
+
+  def move_corrupted(self) -> None:
+    """Move the global file and every target shard aside."""
+    self.global_storage.move_corrupted_shard()
+    for target_name in self._target_paths():
+      self.move_corrupted_target(target_name)
+
+  def move_corrupted_target(self, target_name: str) -> None:
+    """Move one target's shard aside."""
+    FileStateStorage(self._target_path(target_name)).move_corrupted_shard()
+
+
+def _unwrapped_shard(target_name: str, data: Any) -> Any:
+  """Return the target data of a shard written as a one-target state document."""
+  if isinstance(data, dict) and data.keys() == {"targets"} and isinstance(data["targets"], dict):
+    return data["targets"].get(target_name)
+  return data
+
+
+def _indent(line: str) -> int:
+  return len(line) - len(line.lstrip(" "))
+
+
+def _yaml_section_fields(lines: list[str], indent: int) -> dict:
+  """Parse the fields of a target mapping laid out at indent, skipping its items block."""
+  field_lines: list[str] = []
+  in_items = False
+  for line in lines:
+    stripped = line.strip()
+    if stripped and not stripped.startswith("#") and _indent(line) == indent:
+      in_items = stripped == "items:"
+    if not in_items:
+      field_lines.append(line)
+  fields = YAML_CODEC.decode("".join(field_lines)) or {}
+  if not isinstance(fields, dict):
+    raise ValueError("Target state is not a mapping")
+  fields.pop("items", None)
+  return fields
+
+
+def _load_yaml_section(target_name: str, lines: list[str]) -> dict:
+  """Parse one target's section of a state document."""
+  section = YAML_CODEC.decode("".join(lines))
+  target_data = section.get(target_name) if isinstance(section, dict) else None
+  if not isinstance(target_data, dict):
+    raise ValueError(f"State section of target {target_name} is not a mapping")
+  return target_data
+
+
+def _index_yaml_state(text: str) -> dict | None:
+  """Split a state document into its global fields and TargetSections, parsing no items.
+
+  Returns None unless the document is laid out as FileStateStorage writes it: block style,
+  with each target name a plain key two columns in under `targets:`.
+  """
+  global_lines: list[str] = []
+  sections: list[list[str]] = []
+  in_targets = False
+  for line in text.splitlines(keepends=True):
+    stripped = line.strip()
+    if not stripped or stripped.startswith("#"):
+      (sections[-1] if in_targets and sections else global_lines).append(line)
+      continue
+    indent = _indent(line)
+    if indent == 0:
+      in_targets = stripped == "targets:"
+      if not in_targets:
+        global_lines.append(line)
+    elif not in_targets:
+      global_lines.append(line)
+    elif indent == 2:
+      # Long or complex keys are written as `? key`; leave those to a whole parse.
+      if stripped.startswith("?") or not stripped.endswith(":"):
+        return None
+      sections.append([line])
+    elif sections:
+      sections[-1].append(line)
+    else:
+      return None
+
+  data = YAML_CODEC.decode("".join(global_lines)) or {}
+  if not isinstance(data, dict):
+    return None
+  if data.get("targets"):
+    return None
+  targets: dict[str, TargetSection] = {}
+  for section in sections:
+    key = YAML_CODEC.decode(section[0])
+    if not isinstance(key, dict) or len(key) != 1:
+      return None
+    target_name, value = next(iter(key.items()))
+    if not isinstance(target_name, str) or value is not None:
+      return None
+    targets[target_name] = TargetSection(
+      fields=_yaml_section_fields(section[1:], 4),
+      load=partial(_load_yaml_section, target_name, section),
+    )
+  return {**data, "targets": targets}
+
+
+def _sections_from_data(data: Any) -> dict:
+  """Wrap already parsed state data in TargetSections."""
+  if data is None:
+    data = {}
+  if not isinstance(data, dict):
+    raise StateDecodeError("State document is not a mapping")
+  targets = data.get("targets") or {}
+  return {
+    **data,
+    "targets": {
+      target_name: TargetSection(
+        fields={key: value for key, value in target_data.items() if key != "items"}
+        if isinstance(target_data, dict)
+        else {},
+        load=partial(_parsed_target_data, target_name, target_data),
+      )
+      for target_name, target_data in targets.items()
+    },
+  }
+
+
+def _parsed_target_data(target_name: str, target_data: Any) -> dict:
+  if not isinstance(target_data, dict):
+    raise ValueError(f"State of target {target_name} is not a mapping")
+  return target_data
+
+
+# Columns of the items table after (target, item_id), in ItemState field order.
+_ITEM_COLUMNS = ("last_processed_timestamp", "last_result", "last_status", "consecutive_failures")
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS targets (name TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS items (
+  target TEXT NOT NULL,
+  item_id TEXT NOT NULL,
+  last_processed_timestamp REAL NOT NULL,
+  last_result TEXT NOT NULL,
+  last_status TEXT NOT NULL,
+  consecutive_failures INTEGER NOT NULL,
+  PRIMARY KEY (target, item_id)
+) WITHOUT ROWID;
+"""
+
+_ItemRow = tuple[float, str, str, int]
+
+
+class SqliteStateStorage:
+  """SQLite-based state storage that writes only the rows that changed.
+
+  Each item is one row of the items table; targets (without their items) and the global
+  fields are stored as small rows too. write() compares the state against the rows it last
+  wrote (or read) and upserts changed rows and deletes removed ones in a single transaction,
+  so the cost of a save scales with the number of items a run touched rather than with the
+  total state size.
+
+  When the database holds no state yet and a YAML state file exists at import_path, that
+  file is imported once and renamed to `<name>.imported`.
+  """
+
+  def __init__(self, database_path: Path | str, import_path: Path | str | None = None) -> None:
+    self.database_path = Path(database_path)
+    self.import_path = Path(import_path) if import_path is not None else None
+    self._connection: sqlite3.Connection | None = None
+    # Rows as last written to (or read from) the database, used to find changed rows.
+    self._written_meta: dict[str, str] | None = None
+    self._written_targets: dict[str, str] = {}
+    self._written_items: dict[str, dict[str, _ItemRow]] = {}
+
+  def _connect(self) -> sqlite3.Connection:
+    """Open the database on first use and create the schema."""
+    if self._connection is None:
+      self.database_path.parent.mkdir(parents=True, exist_ok=True)
+      # Saves may run on a persistence thread; access is never concurrent.
+      connection = sqlite3.connect(self.database_path, check_same_thread=False)
+      connection.execute("PRAGMA journal_mode=WAL")
+      connection.execute("PRAGMA synchronous=FULL")
+      connection.executescript(_SQLITE_SCHEMA)
+      self._connection = connection
+    return self._connection
+
+  def close(self) -> None:
+    """Close the database connection."""
+    if self._connection is not None:
+      self._connection.close()
+      self._connection = None
+
+  def read(self) -> dict | None:
+    """Read state from the database, importing the YAML state file on first use."""
+    logger.debug("Reading state from database", database_path=str(self.database_path))
+    try:
+      data = self._read_rows()
+    except sqlite3.DatabaseError as e:
+      logger.warning(
+        "Database error while reading state", database_path=str(self.database_path), error=str(e)
+      )
+      raise
+    if data is None and self.import_path is not None and self.import_path.exists():
+      return self._import_yaml(self.import_path)
+    return data
+
+  def _read_rows(self) -> dict | None:
+    """Rebuild the state dictionary from the database rows."""
+    connection = self._connect()
+    meta = dict(connection.execute("SELECT key, value FROM meta").fetchall())
+    self._written_meta = meta
+    self._written_targets = dict(connection.execute("SELECT name, data FROM targets").fetchall())
+    self._written_items = {name: {} for name in self._written_targets}
+    if not meta:
+      logger.debug("State database is empty", database_path=str(self.database_path))
+      return None
+
+    targets: dict[str, dict] = {
+      name: {**json.loads(target_data), "items": {}}
+      for name, target_data in self._written_targets.items()
+    }
+    item_count = 0
+    for target_name, item_id, *row in connection.execute(
+      f"SELECT target, item_id, {', '.join(_ITEM_COLUMNS)} FROM items"
+    ):
+      target = targets.get(target_name)
+      if target is None:
+        continue
+      target["items"][item_id] = {"item_id": item_id, **dict(zip(_ITEM_COLUMNS, row))}
+      self._written_items[target_name][item_id] = tuple(row)
+      item_count += 1
+    logger.debug(
+      "State read successfully",
+      database_path=str(self.database_path),
+      target_count=len(targets),
+      item_count=item_count,
+    )
+    return {**{key: json.loads(value) for key, value in meta.items()}, "targets": targets}
+
+  def _import_yaml(self, yaml_path: Path) -> dict | None:
+    """Import a YAML state file into the database once and move the file aside."""
+    logger.info("Importing YAML state into database", import_path=str(yaml_path))
+    data = FileStateStorage(yaml_path).read()
+    if data is None:
+      return None
+    self.write(data)
+    imported_path = yaml_path.with_name(f"{yaml_path.name}.imported")
+    yaml_path.rename(imported_path)
+    logger.info(
+      "YAML state imported",
+      database_path=str(self.database_path),
+      imported_path=str(imported_path),
+    )
+    return data
+
+  def write(self, data: dict) -> None:
+    """Upsert changed rows and delete removed ones in one transaction."""
+    self._write(data, removed_items=None)
+
+  def write_changes(self, data: dict, removed_items: dict[str, set[str]]) -> None:
+    """Upsert the items of a partial state and delete removed items in one transaction."""
+    self._write(data, removed_items)
+
+  def needs_full_write(self) -> bool:
+    """Row-level writes never need a full rewrite."""
+    return False
+
+  def _write(self, data: dict, removed_items: dict[str, set[str]] | None) -> None:
+    """Write a full state (removed_items None) or a partial one listing removed items."""
+    connection = self._connect()
+    if self._written_meta is None:
+      self._read_rows()
+    written_meta = self._written_meta or {}
+    targets_data: dict[str, dict] = data.get("targets", {})
+    meta = {key: json.dumps(value) for key, value in data.items() if key != "targets"}
+    changed_meta = [(key, value) for key, value in meta.items() if written_meta.get(key) != value]
+
+    written_targets: dict[str, str] = {}
+    changed_targets: list[tuple[str, str]] = []
+    changed_items: list[tuple[str, str, float, str, str, int]] = []
+    deleted_items: list[tuple[str, str]] = []
+    written_items: dict[str, dict[str, _ItemRow]] = {}
+    for target_name, target_data in targets_data.items():
+      target_json = json.dumps({k: v for k, v in target_data.items() if k != "items"})
+      written_targets[target_name] = target_json
+      if self._written_targets.get(target_name) != target_json:
+        changed_targets.append((target_name, target_json))
+
+      previous_rows = self._written_items.get(target_name, {})
+      # A partial write updates the cached rows in place rather than copying every row.
+      rows: dict[str, _ItemRow] = {} if removed_items is None else previous_rows
+      for item_id, item in target_data.get("items", {}).items():
+        row = (
+          item["last_processed_timestamp"],
+          item["last_result"],
+          item["last_status"],
+          item.get("consecutive_failures", 0),
+        )
+        if previous_rows.get(item_id) != row:
+          changed_items.append((target_name, item_id, *row))
+        rows[item_id] = row
+      if removed_items is None:
+        removed_ids = previous_rows.keys() - rows.keys()
+      else:
+        removed_ids = removed_items.get(target_name, set()) & rows.keys()
+        for item_id in removed_ids:
+          del rows[item_id]
+      deleted_items.extend((target_name, item_id) for item_id in removed_ids)
+      written_items[target_name] = rows
+    removed_targets = [(name,) for name in self._written_targets.keys() - targets_data.keys()]
+
+    logger.debug(
+      "Writing state to database",
+      database_path=str(self.database_path),
+      partial=removed_items is not None,
+      changed_targets=len(changed_targets),
+      removed_targets=len(removed_targets),
+      changed_items=len(changed_items),
+      removed_items=len(deleted_items),
+    )
+    try:
+      with connection:
+        connection.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", changed_meta)
+        connection.executemany("INSERT OR REPLACE INTO targets VALUES (?, ?)", changed_targets)
+        connection.executemany(
+          f"INSERT OR REPLACE INTO items VALUES (?, ?, {', '.join('?' for _ in _ITEM_COLUMNS)})",
+          changed_items,
+        )
+        connection.executemany("DELETE FROM items WHERE target = ? AND item_id = ?", deleted_items)
+        connection.executemany("DELETE FROM items WHERE target = ?", removed_targets)
+        connection.executemany("DELETE FROM targets WHERE name = ?", removed_targets)
+    except sqlite3.Error:
+      # The cached rows may no longer match the database; reread them on the next write.
+      self._written_meta = None
+      raise
+    self._written_meta = meta
+    self._written_targets = written_targets
+    self._written_items = written_items
+    logger.debug("State written to database", database_path=str(self.database_path))
+
+  def move_corrupted(self) -> None:
+    """Move a corrupted database (and its WAL files) aside."""
+    self.close()
+    self._written_meta = None
+    timestamp = int(time.time())
+    for suffix in ("", "-wal", "-shm"):
+      path = self.database_path.with_name(f"{self.database_path.name}{suffix}")
+      if not path.exists():
+        continue
+      corrupt_path = path.parent / f".corrupt.{timestamp}{suffix}"
+      logger.debug(
+        "Moving corrupted state database", path=str(path), corrupt_path=str(corrupt_path)
+      )
+      try:
+        path.rename(corrupt_path)
+      except OSError as e:
+        logger.error("Failed to move corrupted state database", path=str(path), error=str(e))
+
+
+# Journals larger than this are compacted into the snapshot by the next save.
+JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024  # 4 MB
+# Snapshot key holding the sequence number of the journal that continues the snapshot.
+_JOURNAL_SEQUENCE_KEY = "journal_sequence"
+
+
+class JournalStateStorage:
+  """State storage that appends item changes to a journal next to a snapshot file.
+
+  Incremental writes append one compact JSON record per changed item (plus changed target
+  and global fields) to `<state file>.journal` and fsync once per write, so their cost
+  scales with the number of items a run touched. Once the journal exceeds
+  compact_threshold_bytes, needs_full_write() asks for the next save to be a full one,
+  which rewrites the snapshot (like FileStateStorage, with codec) and starts an empty
+  journal; with StateWriter this happens on the writer thread. stored_bytes() lets
+  StateManager compact (and prune) once the snapshot and journal together pass its cap.
+
+  The journal starts with a header naming its sequence number, which the snapshot records
+  too; a journal left behind by a compaction interrupted after the snapshot was replaced
+  has an older sequence and is ignored. Replay stops at the first incomplete or invalid
+  record, such as one torn by a crash mid-append, keeping every change before it; the
+  journal is truncated there before the next append.
+  """
+
+  def __init__(
+    self,
+    state_file_path: Path | str,
+    compact_threshold_bytes: int = JOURNAL_COMPACT_BYTES,
+    codec: StateCodec = YAML_CODEC,
+  ) -> None:
+    self.snapshot_storage = FileStateStorage(state_file_path, codec)
+    self.codec = codec
+    self.journal_path = Path(f"{state_file_path}.journal")
+    self.compact_threshold_bytes = compact_threshold_bytes
+    self._sequence = 0
+    # Size of the snapshot file as last read or written.
+    self._snapshot_bytes = 0
+    # Size of the valid part of the journal; None when it must be recreated before appending.
+    self._journal_bytes: int | None = None
+    # Global and target fields as last written, to journal only the changed ones.
+    self._written_meta: str | None = None
+    self._written_targets: dict[str, str] = {}
+
+  def read(self) -> dict | None:
+    """Read the snapshot and replay the journal on top of it."""
+    snapshot = self.snapshot_storage.read()
+    data = dict(snapshot) if snapshot is not None else None
+    self._snapshot_bytes = self._snapshot_size()
+    self._sequence = int(data.pop(_JOURNAL_SEQUENCE_KEY, 0)) if data is not None else 0
+    self._journal_bytes = None
+    replayed = self._replay_journal(data if data is not None else {"targets": {}})
+    if replayed is not None:
+      data = replayed
+    if data is not None:
+      targets = data.get("targets") or {}
+      self._written_meta = _journal_json({k: v for k, v in data.items() if k != "targets"})
+      self._written_targets = {
+        name: _journal_json({k: v for k, v in target_data.items() if k != "items"})
+        for name, target_data in targets.items()
+      }
+    return data
+
+  def _replay_journal(self, data: dict) -> dict | None:
+    """Apply the journal records to data; return None when there is no current journal."""
+    if not self.journal_path.exists():
+      return None
+    content = self.journal_path.read_bytes()
+    header_end = content.find(b"\n")
+    try:
+      header = json.loads(content[:header_end]) if header_end >= 0 else None
+    except ValueError:
+      header = None
+    if not isinstance(header, dict) or header.get("sequence") != self._sequence:
+      logger.warning(
+        "Ignoring state journal that does not continue the snapshot",
+        journal_path=str(self.journal_path),
+        sequence=self._sequence,
+      )
+      return None
+
+    targets: dict[str, dict] = data.setdefault("targets", {})
+    offset = header_end + 1
+    record_count = 0
+    while offset < len(content):
+      line_end = content.find(b"\n", offset)
+      try:
+        if line_end < 0:
+          raise ValueError("record is not newline-terminated")
+        _apply_journal_record(data, targets, json.loads(content[offset:line_end]))
+      except (ValueError, KeyError, TypeError, AttributeError) as e:
+        logger.warning(
+          "Stopping state journal replay at incomplete or invalid record",
+          journal_path=str(self.journal_path),
+          offset=offset,
+          replayed_records=record_count,
+          error=str(e),
+        )
+        break
+      offset = line_end + 1
+      record_count += 1
+    self._journal_bytes = offset
+    logger.debug(
+      "State journal replayed",
+      journal_path=str(self.journal_path),
+      replayed_records=record_count,
+      journal_bytes=offset,
+    )
+    return data
+
+  def write(self, data: dict) -> None:
+    """Write a full snapshot and start an empty journal (compaction)."""
+    sequence = self._sequence + 1
+    self.snapshot_storage.write({**data, _JOURNAL_SEQUENCE_KEY: sequence})
+    self._snapshot_bytes = self._snapshot_size()
+    self._sequence = sequence
+    self._start_journal()
+    self._written_meta = _journal_json({k: v for k, v in data.items() if k != "targets"})
+    self._written_targets = {
+      name: _journal_json({k: v for k, v in target_data.items() if k != "items"})
+      for name, target_data in data.get("targets", {}).items()
+    }
+    logger.debug("State journal compacted", journal_path=str(self.journal_path), sequence=sequence)
+
+  def write_changes(self, data: dict, removed_items: dict[str, set[str]]) -> None:
+    """Append the changes in a partial state to the journal with a single fsync."""
+    records: list[str] = []
+    meta = _journal_json({k: v for k, v in data.items() if k != "targets"})
+    if meta != self._written_meta:
+      records.append(f'{{"m":{meta}}}')
+    targets_data: dict[str, dict] = data.get("targets", {})
+    written_targets: dict[str, str] = {}
+    for target_name, target_data in targets_data.items():
+      name = _journal_json(target_name)
+      header = _journal_json({k: v for k, v in target_data.items() if k != "items"})
+      written_targets[target_name] = header
+      if self._written_targets.get(target_name) != header:
+        records.append(f'{{"t":{name},"h":{header}}}')
+      for item_id, item in target_data.get("items", {}).items():
+        value = _journal_json(
+          [
+            item["last_processed_timestamp"],
+            item["last_result"],
+            item["last_status"],
+            item.get("consecutive_failures", 0),
+          ]
+        )
+        records.append(f'{{"t":{name},"i":{_journal_json(item_id)},"v":{value}}}')
+      for item_id in removed_items.get(target_name, ()):
+        records.append(f'{{"t":{name},"i":{_journal_json(item_id)}}}')
+    for target_name in self._written_targets.keys() - targets_data.keys():
+      records.append(f'{{"t":{_journal_json(target_name)},"x":1}}')
+    if not records:
+      return
+
+    journal_bytes = self._journal_bytes
+    if journal_bytes is None:
+      journal_bytes = self._start_journal()
+    payload = "".join(f"{record}\n" for record in records).encode("utf-8")
+    with open(self.journal_path, "r+b") as f:
+      # Drops a torn record left by an interrupted append before writing after it.
+      f.truncate(journal_bytes)
+      f.seek(journal_bytes)
+      f.write(payload)
+      f.flush()
+      os.fsync(f.fileno())
+    self._journal_bytes = journal_bytes + len(payload)
+    self._written_meta = meta
+    self._written_targets = written_targets
+    logger.debug(
+      "State changes appended to journal",
+      journal_path=str(self.journal_path),
+      record_count=len(records),
+      journal_bytes=self._journal_bytes,
+    )
+
+  def needs_full_write(self) -> bool:
+    """Whether the journal has grown past the compaction threshold."""
+    return self._journal_bytes is not None and self._journal_bytes > self.compact_threshold_bytes
+
+  def stored_bytes(self) -> int:
+    """Return the size of the snapshot and journal as last read or written."""
+    return self._snapshot_bytes + (self._journal_bytes or 0)
+
+  def _snapshot_size(self) -> int:
+    try:
+      return self.snapshot_storage.state_file_path.stat().st_size
+    except FileNotFoundError:
+      return 0
+
+  def _start_journal(self) -> int:
+    """Atomically replace the journal with an empty one for the current sequence.
+
+    Returns the size of the new journal.
+    """
+    header = f'{{"sequence":{self._sequence}}}\n'.encode("utf-8")
+    temp_path = self.journal_path.with_name(f"{self.journal_path.name}.tmp")
+    with open(temp_path, "wb") as f:
+      f.write(header)
+      f.flush()
+      os.fsync(f.fileno())
+    temp_path.replace(self.journal_path)
+    try:
+      with self.journal_path.parent.open("r") as parent_fd:
+        os.fsync(parent_fd.fileno())
+    except OSError, AttributeError:
+      pass
+    self._journal_bytes = len(header)
+    return self._journal_bytes
+
+  def move_corrupted(self) -> None:
+    """Move a corrupted snapshot aside and drop the journal that continued it."""
+    self.snapshot_storage.move_corrupted()
+    if self.journal_path.exists():
+      timestamp = int(time.time())
+      corrupt_path = self.journal_path.parent / f".corrupt.{timestamp}.journal"
+      logger.debug(
+        "Moving state journal of corrupted snapshot",
+        journal_path=str(self.journal_path),
+        corrupt_path=str(corrupt_path),
+      )
+      try:
+        self.journal_path.rename(corrupt_path)
+      except OSError as e:
+        logger.error(
+          "Failed to move state journal", journal_path=str(self.journal_path), error=str(e)
+        )
+    self._sequence = 0
+    self._journal_bytes = None
+    self._written_meta = None
+    self._written_targets = {}
+
+
+def _journal_json(value: Any) -> str:
+  """Encode a value compactly for a journal record."""
+  return json.dumps(value, separators=(",", ":"))
+
+
+def _apply_journal_record(data: dict, targets: dict[str, dict], record: dict) -> None:
+  """Apply one journal record to serialized state."""
+  if "m" in record:
+    data.update(record["m"])
+    return
+  target_name = record["t"]
+  if "x" in record:
+    targets.pop(target_name, None)
+    return
+  target = targets.setdefault(target_name, {"items": {}})
+  if "h" in record:
+    target.update(record["h"])
+    return
+  item_id = record["i"]
+  items = target.setdefault("items", {})
+  if "v" not in record:
+    items.pop(item_id, None)
+    return
+  timestamp, result, status, failures = record["v"]
+  items[item_id] = {
+    "item_id": item_id,
+    "last_processed_timestamp": timestamp,
+    "last_result": result,
+    "last_status": status,
+    "consecutive_failures": failures,
+  }
+
 
 class InMemoryStateStorage:
   """In-memory state storage for testing."""
@@ -218,30 +1327,94 @@ class InMemoryStateStorage:
     pass
 
 
+def _without_entries(data: dict, entries: list[tuple[str, str, float]]) -> dict:
+  """Return a shallow copy of serialized state without the given (target, item id) entries."""
+  removed_ids: dict[str, set[str]] = {}
+  for target_name, item_id, _ in entries:
+    removed_ids.setdefault(target_name, set()).add(item_id)
+  targets = dict(data["targets"])
+  for target_name, item_ids in removed_ids.items():
+    target_data = targets[target_name]
+    targets[target_name] = {
+      **target_data,
+      "items": {
+        item_id: item for item_id, item in target_data["items"].items() if item_id not in item_ids
+      },
+    }
+  return {**data, "targets": targets}
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+  """Serialized state captured by StateManager.snapshot() for writing.
+
+  removed_items is None for a full state; otherwise data holds only the items changed
+  since the previous snapshot and removed_items the ids removed since then. For a sharded
+  write, target_names names every target and data holds only the targets to write.
+  """
+
+  data: dict
+  removed_items: dict[str, set[str]] | None
+  target_names: set[str] | None = None
+
+
+def _serialize_item(item: ItemState) -> dict:
+  """Serialize an item state in field order."""
+  return {
+    "item_id": item.item_id,
+    "last_processed_timestamp": item.last_processed_timestamp,
+    "last_result": str(item.last_result),
+    "last_status": item.last_status.value,
+    "consecutive_failures": item.consecutive_failures,
+  }
+
+
 class StateManager:
   """Manages application state with atomic writes."""
 
   def __init__(
     self,
     storage: StateStorage,
-    state_size_cap_bytes: int = STATE_SIZE_CAP_BYTES,
+    state_size_cap_bytes: int | None = STATE_SIZE_CAP_BYTES,
   ) -> None:
+    """Initialize the manager; a state_size_cap_bytes of None disables size-cap pruning."""
     self.storage = storage
     self.state_size_cap_bytes = state_size_cap_bytes
     self.state = State()
+    # Target names as of the last load or save, to notice added and removed targets.
+    self._saved_target_names: set[str] = set()
+    # Whether storage holds the state as of the last load or save, so that an incremental
+    # storage can be sent only the changes made since.
+    self._storage_in_sync = False
 
   def load(self) -> None:
-    """Load state from storage, recovering from corruption if needed."""
+    """Load state from storage, recovering from corruption if needed.
+
+    With an IndexedStateStorage only the global and target fields are read; each target's
+    items are loaded when state.targets first looks the target up (e.g. get_target_state())
+    or goes over every target, or by the next full save. state.targets otherwise holds the
+    stored targets as if they had all been loaded; a corrupted target is dropped once loaded.
+    """
     logger.debug("Loading state from storage")
     try:
-      data = self.storage.read()
+      if isinstance(self.storage, IndexedStateStorage):
+        data = self.storage.read_index()
+      else:
+        data = self.storage.read()
       if data is None:
         logger.debug("No state data found, starting with fresh state")
+        self._mark_saved()
         return
 
       logger.debug("Deserializing state data", has_data=bool(data))
       try:
+        sections: dict[str, TargetSection] = {}
+        if isinstance(self.storage, IndexedStateStorage):
+          sections = data["targets"]
+          data = {key: value for key, value in data.items() if key != "targets"}
         self.state = self._deserialize(data)
+        self.state.targets.defer(sections, self._load_target)
+        self._mark_saved()
         logger.debug(
           "State loaded successfully",
           **self.state.logging_ids(),
@@ -249,9 +1422,12 @@ class StateManager:
       except (KeyError, ValueError, TypeError) as e:
         logger.error("State deserialization failed", error=str(e))
         self._handle_corrupted_state(e)
-    except yaml.YAMLError as e:
-      logger.error("YAML parsing error while loading state", error=str(e))
-      # YAML parsing error indicates corruption
+    except StateDecodeError as e:
+      logger.error("Decoding error while loading state", error=str(e))
+      # A decoding error indicates corruption
+      self._handle_corrupted_state(e)
+    except sqlite3.DatabaseError as e:
+      logger.error("Database error while loading state", error=str(e))
       self._handle_corrupted_state(e)
 
   def _deserialize(self, data: dict) -> State:
@@ -263,111 +1439,336 @@ class StateManager:
 
     targets_data = data.get("targets", {})
     for target_name, target_data in targets_data.items():
-      last_status_str = target_data.get("last_status", "unknown")
-      try:
-        last_status = RunStatus(last_status_str)
-      except ValueError:
-        last_status = RunStatus.UNKNOWN
+      state.targets[target_name] = self._deserialize_target(target_data)
 
-      target_state = TargetState(
-        last_run_timestamp=target_data.get("last_run_timestamp", 0.0),
-        last_success_timestamp=target_data.get("last_success_timestamp", 0.0),
-        last_status=last_status,
-        consecutive_failures=target_data.get("consecutive_failures", 0),
-      )
+    return state
 
-      items_data = target_data.get("items", {})
-      for item_id, item_data in items_data.items():
-        item_status_str = item_data.get("last_status", ItemStatus.UNKNOWN.value)
-        try:
-          item_status = ItemStatus(item_status_str)
-        except ValueError:
-          item_status = ItemStatus.UNKNOWN
-
-        target_state.items[item_id] = ItemState(
-          item_id=item_data["item_id"],
-          last_processed_timestamp=item_data["last_processed_timestamp"],
-          last_result=item_data["last_result"],
-          last_status=item_status,
-          consecutive_failures=item_data.get("consecutive_failures", 0),
-        )
+  def _deserialize_target(self, target_data: dict) -> TargetState:
+    """Deserialize one target's state from dictionary."""
+    last_status_str = target_data.get("last_status", "unknown")
+    try:
+      last_status = RunStatus(last_status_str)
+    except ValueError:
+      last_status = RunStatus.UNKNOWN
+
+    target_state = TargetState(
+      last_run_timestamp=target_data.get("last_run_timestamp", 0.0),
+      last_success_timestamp=target_data.get("last_success_timestamp", 0.0),
+      last_status=last_status,
+      consecutive_failures=target_data.get("consecutive_failures", 0),
+      library_sync_watermark=target_data.get("library_sync_watermark", 0.0),
+    )
 
-      state.targets[target_name] = target_state
+    items_data = target_data.get("items", {})
+    for item_id, item_data in items_data.items():
+      item_status_str = item_data.get("last_status", ItemStatus.UNKNOWN.value)
+      try:
+        item_status = ItemStatus(item_status_str)
+      except ValueError:
+        item_status = ItemStatus.UNKNOWN
+
+      stored_item_id = item_data["item_id"]
+      # The key and the item_id field share one string object.
+      target_state.items[item_id] = ItemState(
+        item_id=item_id if stored_item_id == item_id else stored_item_id,
+        last_processed_timestamp=item_data["last_processed_timestamp"],
+        last_result=intern_result(item_data["last_result"]),
+        last_status=item_status,
+        consecutive_failures=item_data.get("consecutive_failures", 0),
+      )
 
-    return state
+    return target_state
 
   def _handle_corrupted_state(self, error: Exception) -> None:
     """Handle corrupted state by moving it aside and starting fresh."""
     logger.warning("State corruption detected, resetting..", error=str(error))
     self.storage.move_corrupted()
     self.state = State()
+    self._mark_saved()
+
+  def _load_target(self, target_name: str, section: TargetSection) -> TargetState | None:
+    """Load the items of an indexed target, or return None when it is corrupted."""
+    logger.debug("Loading target state items", target=target_name)
+    try:
+      target_state = self._deserialize_target(section.load())
+    except (KeyError, ValueError, TypeError) as e:
+      logger.error(
+        "Target state corruption detected, resetting target", target=target_name, error=str(e)
+      )
+      if isinstance(self.storage, ShardedStateStorage):
+        self.storage.move_corrupted_target(target_name)
+      # Other targets may still be unloaded, so a single state file is not moved aside; the
+      # next save rewrites it without the corrupted section.
+      return None
+    target_state.mark_saved()
+    return target_state
+
+  def last_run_timestamp(self, target_name: str) -> float:
+    """Return a target's last run timestamp (0.0 for a new target) without loading its items."""
+    section = self.state.targets.section(target_name)
+    if section is not None:
+      return float(section.fields.get("last_run_timestamp", 0.0))
+    target_state = self.state.targets.loaded.get(target_name)
+    return target_state.last_run_timestamp if target_state is not None else 0.0
+
+  def has_changes(self) -> bool:
+    """Whether targets, target statuses or items changed since the last load or save."""
+    if not self._storage_in_sync:
+      return True
+    targets = self.state.targets
+    return targets.names() != self._saved_target_names or any(
+      target.changed for target in targets.loaded.values()
+    )
 
-  def save(self) -> None:
-    """Save state to storage using atomic write semantics."""
+  def save(self, force: bool = False) -> None:
+    """Save state to storage using atomic write semantics, if it changed since the last save.
+
+    Run bookkeeping (total runs, run timestamps, library sync watermarks) alone does not
+    count as a change; it is written with the next change, or by a forced save. Storages
+    that support it are sent only the items changed since the last save; sharded storages
+    are sent only the targets that changed (every target on a forced save).
+    """
+    snapshot = self.snapshot(force)
+    if snapshot is None:
+      return
+    try:
+      pruned_entries = self.write_snapshot(snapshot)
+    except Exception:
+      self.abandon_save()
+      raise
+    self.complete_save(pruned_entries)
+
+  def snapshot(self, force: bool = False) -> StateSnapshot | None:
+    """Capture the state to save, or return None when it is unchanged and force is not set.
+
+    The snapshot shares no mutable objects with the live state, so it can be written by
+    write_snapshot() on another thread while the event loop keeps changing the state. The
+    captured changes are considered saved; call complete_save() once the snapshot has
+    been written, or abandon_save() if writing it failed.
+    """
+    if not force and not self.has_changes():
+      logger.debug("State unchanged, skipping save", **self.state.logging_ids())
+      state_saves_total.labels(result="skipped").inc()
+      return None
     logger.debug(
-      "Saving state",
+      "Capturing state snapshot",
+      force=force,
       **self.state.logging_ids(),
     )
-    self._prune_if_over_cap()
-    data = self._serialize()
-    logger.debug("State serialized, writing to storage")
+    if self._storage_in_sync and isinstance(self.storage, ShardedStateStorage):
+      # Unloaded targets are unchanged, so their shards are already up to date.
+      targets = self.state.targets
+      snapshot = StateSnapshot(
+        data=self._serialize(
+          target_names={
+            target_name
+            for target_name, target in targets.loaded.items()
+            if force or target.changed or target_name not in self._saved_target_names
+          }
+        ),
+        removed_items=None,
+        target_names=targets.names(),
+      )
+    elif (
+      self._storage_in_sync
+      and isinstance(self.storage, IncrementalStateStorage)
+      and not self.storage.needs_full_write()
+      and not self._stored_over_cap()
+    ):
+      self.state.targets.load_all()
+      snapshot = StateSnapshot(
+        data=self._serialize(changed_items_only=True),
+        removed_items={
+          target_name: set(target.items.removed_ids)
+          for target_name, target in self.state.targets.items()
+          if target.items.removed_ids
+        },
+      )
+    else:
+      self.state.targets.load_all()
+      snapshot = StateSnapshot(data=self._serialize(), removed_items=None)
+    self._mark_saved()
+    return snapshot
+
+  def write_snapshot(self, snapshot: StateSnapshot) -> list[tuple[str, str, float]]:
+    """Write a snapshot to storage and return the entries pruned to fit the size cap.
+
+    Only the snapshot and the storage are used, so this may run off the event loop.
+    """
+    if isinstance(self.storage, ShardedStateStorage):
+      pruned_entries = self._shard_entries_over_cap(snapshot.data)
+      data = _without_entries(snapshot.data, pruned_entries) if pruned_entries else snapshot.data
+      if snapshot.target_names is not None:
+        logger.debug("Writing changed state shards to storage")
+        self.storage.write_targets(data, snapshot.target_names)
+      else:
+        logger.debug("Writing state shards to storage")
+        self.storage.write(data)
+      return pruned_entries
+    if snapshot.removed_items is not None and isinstance(self.storage, IncrementalStateStorage):
+      logger.debug("Writing changed state to storage")
+      self.storage.write_changes(snapshot.data, snapshot.removed_items)
+      return []
+    pruned_entries = self._entries_over_cap(snapshot.data)
+    data = _without_entries(snapshot.data, pruned_entries) if pruned_entries else snapshot.data
+    logger.debug("Writing state to storage")
     self.storage.write(data)
-    logger.debug("State saved successfully")
-
-  def _prune_if_over_cap(self) -> None:
-    """Prune oldest item state entries when state would exceed the size cap."""
-    data = self._serialize()
-    yaml_str = yaml.safe_dump(data, default_flow_style=False, sort_keys=False)
-    if len(yaml_str.encode("utf-8")) <= self.state_size_cap_bytes:
-      return
-
-    # Collect all items with (target_name, item_id, last_processed_timestamp)
-    items_to_sort: list[tuple[str, str, float]] = []
-    for target_name, target in self.state.targets.items():
-      for item_id, item in target.items.items():
-        items_to_sort.append((target_name, item_id, item.last_processed_timestamp))
-
-    # Sort by oldest first (ascending timestamp)
-    items_to_sort.sort(key=lambda x: x[2])
-
-    pruned_count = 0
-    for target_name, item_id, _ in items_to_sort:
-      target = self.state.targets[target_name]
-      del target.items[item_id]
-      pruned_count += 1
-
-      data = self._serialize()
-      yaml_str = yaml.safe_dump(data, default_flow_style=False, sort_keys=False)
-      if len(yaml_str.encode("utf-8")) <= self.state_size_cap_bytes:
-        break
-
-    if pruned_count > 0:
+    return pruned_entries
+
+  def complete_save(self, pruned_entries: list[tuple[str, str, float]]) -> None:
+    """Finish a save by dropping the entries pruned from the written state."""
+    for target_name, item_id, timestamp in pruned_entries:
+      target = self.state.targets.loaded.get(target_name)
+      if target is None:
+        continue
+      item = target.items.get(item_id)
+      # An item processed again since the snapshot is newer than what was pruned; keep it.
+      if item is not None and item.last_processed_timestamp == timestamp:
+        target.items.discard_saved(item_id)
+    if pruned_entries:
       logger.debug(
         "Pruned item state entries to stay within size cap",
-        pruned_count=pruned_count,
+        pruned_count=len(pruned_entries),
         cap_bytes=self.state_size_cap_bytes,
       )
+    state_saves_total.labels(result="written").inc()
+    logger.debug("State saved successfully")
 
-  def _serialize(self) -> dict:
-    """Serialize state to dictionary using dataclasses.asdict."""
-    data = asdict(self.state)
-    # Convert enum values to strings for YAML serialization
-    for target_data in data.get("targets", {}).values():
-      if "last_status" in target_data:
-        status = target_data["last_status"]
-        if isinstance(status, RunStatus):
-          target_data["last_status"] = status.value
-      for item_data in target_data.get("items", {}).values():
-        item_status = item_data.get("last_status")
-        if isinstance(item_status, ItemStatus):
-          item_data["last_status"] = item_status.value
-    return data
+  def abandon_save(self) -> None:
+    """Record that a snapshot was not written, so the next save writes the full state."""
+    self._storage_in_sync = False
+
+  def _mark_saved(self) -> None:
+    """Record the current state as the one held by storage."""
+    for target in self.state.targets.loaded.values():
+      target.mark_saved()
+    self._saved_target_names = self.state.targets.names()
+    self._storage_in_sync = True
+
+  def _codec(self) -> StateCodec:
+    """Return the codec whose encoded size the size cap bounds (YAML unless storage has one)."""
+    if isinstance(self.storage, (FileStateStorage, ShardedFileStateStorage, JournalStateStorage)):
+      return self.storage.codec
+    return YAML_CODEC
+
+  def _stored_over_cap(self) -> bool:
+    """Whether a journal has grown past the size cap, so a full save must compact and prune.
+
+    Near the cap, this makes journaled saves full ones, like with FileStateStorage.
+    """
+    return (
+      self.state_size_cap_bytes is not None
+      and isinstance(self.storage, JournalStateStorage)
+      and self.storage.stored_bytes() > self.state_size_cap_bytes
+    )
+
+  def _shard_entries_over_cap(self, data: dict) -> list[tuple[str, str, float]]:
+    """Return the oldest item entries to prune for each target shard to fit the size cap.
+
+    Each shard is measured as a one-target state document: what a JSON or binary shard holds,
+    and a few bytes more than a YAML shard.
+    """
+    return [
+      entry
+      for target_name, target_data in data["targets"].items()
+      for entry in self._entries_over_cap({"targets": {target_name: target_data}})
+    ]
+
+  def _entries_over_cap(self, data: dict) -> list[tuple[str, str, float]]:
+    """Return the oldest item entries to prune for serialized state to fit the size cap.
+
+    The fewest oldest entries (by `last_processed_timestamp`) whose removal brings the
+    encoded state within the cap are pruned. Their count is estimated from the entries' own
+    encoded sizes and then confirmed, or corrected by a binary search, with full encodings,
+    so a prune costs a few serializations rather than one per pruned entry.
+    """
+    if self.state_size_cap_bytes is None:
+      return []
+    size = len(self._codec().encode(data))
+    if size <= self.state_size_cap_bytes:
+      return []
+
+    # Oldest first; the sort is stable, so ties keep target and insertion order.
+    entries = sorted(
+      (
+        (target_name, item_id, item["last_processed_timestamp"])
+        for target_name, target_data in data["targets"].items()
+        for item_id, item in target_data["items"].items()
+      ),
+      key=lambda entry: entry[2],
+    )
+    pruned_count = self._find_prune_count(data, size, entries, self.state_size_cap_bytes)
+    return entries[:pruned_count]
+
+  def _find_prune_count(
+    self, data: dict, size: int, entries: list[tuple[str, str, float]], cap_bytes: int
+  ) -> int:
+    """Return the fewest leading entries to prune for data to fit within cap_bytes."""
+    if not entries:
+      return 0
+    codec = self._codec()
+    estimate = size
+    estimated_count = 0
+    for target_name, item_id, _ in entries:
+      if estimate <= cap_bytes:
+        break
+      estimate -= codec.entry_size(item_id, data["targets"][target_name]["items"][item_id])
+      estimated_count += 1
+
+    def fits(prune_count: int) -> bool:
+      return len(codec.encode(_without_entries(data, entries[:prune_count]))) <= cap_bytes
+
+    # Pruning more entries never makes the document larger, so the smallest count that
+    # fits can be bisected. No pruning (count 0) is already known not to fit.
+    if fits(estimated_count):
+      if not fits(estimated_count - 1):
+        return estimated_count
+      low, high = 1, estimated_count - 1
+    else:
+      low, high = estimated_count + 1, len(entries)
+    while low < high:
+      middle = (low + high) // 2
+      if fits(middle):
+        high = middle
+      else:
+        low = middle + 1
+    logger.debug("Prune count estimate corrected", estimated_count=estimated_count, prune_count=low)
+    return low
+
+  def _serialize(
+    self, changed_items_only: bool = False, target_names: set[str] | None = None
+  ) -> dict:
+    """Serialize state to a dictionary of YAML-safe values.
+
+    With changed_items_only, each target includes only the items set since the last save;
+    with target_names, only the named targets are included.
+    """
+    targets: dict[str, dict] = {}
+    for target_name, target in self.state.targets.loaded.items():
+      if target_names is not None and target_name not in target_names:
+        continue
+      items = target.items
+      item_ids = items.changed_ids if changed_items_only else items.keys()
+      targets[target_name] = {
+        "last_run_timestamp": target.last_run_timestamp,
+        "last_success_timestamp": target.last_success_timestamp,
+        "last_status": target.last_status.value,
+        "consecutive_failures": target.consecutive_failures,
+        "library_sync_watermark": target.library_sync_watermark,
+        "items": {item_id: _serialize_item(items[item_id]) for item_id in item_ids},
+      }
+    return {
+      "process_start_timestamp": self.state.process_start_timestamp,
+      "total_runs": self.state.total_runs,
+      "targets": targets,
+    }
 
   def get_target_state(self, target_name: str) -> TargetState:
-    """Get or create state for a target."""
-    if target_name not in self.state.targets:
+    """Get or create state for a target, loading its items if they were not loaded yet."""
+    target_state = self.state.targets.get(target_name)
+    if target_state is None:
       logger.debug("Creating new target state", target=target_name)
-      self.state.targets[target_name] = TargetState()
+      target_state = self.state.targets[target_name] = TargetState()
     else:
       logger.debug("Retrieving existing target state", target=target_name)
-    return self.state.targets[target_name]
+    return target_state
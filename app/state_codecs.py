@@ -0,0 +1,254 @@
+"""Encodings of serialized state for state files, detected from the file header."""
+
+import json
+import sys
+from array import array
+from typing import Any, Protocol
+
+import yaml
+
+try:
+  # libyaml's parser and emitter are several times faster than the pure-Python ones.
+  from yaml import CSafeDumper as YamlDumper
+  from yaml import CSafeLoader as YamlLoader
+except ImportError:
+  from yaml import SafeDumper as YamlDumper  # type: ignore[assignment]
+  from yaml import SafeLoader as YamlLoader  # type: ignore[assignment]
+
+
+class StateDecodeError(ValueError):
+  """Raised when a state file cannot be decoded, i.e. it is corrupted."""
+
+
+class StateCodec(Protocol):
+  """Encoding of serialized state (global fields and targets with their items) as bytes."""
+
+  name: str
+
+  def encode(self, data: dict) -> bytes:
+    """Encode serialized state."""
+    ...
+
+  def decode(self, payload: bytes) -> Any:
+    """Decode a payload written by encode(), raising StateDecodeError when it is invalid."""
+    ...
+
+  def entry_size(self, item_id: str, item: dict) -> int:
+    """Approximate number of bytes an item entry adds to an encoded state."""
+    ...
+
+
+# Item entries are nested three mappings deep (targets, target name, items), so each of their
+# lines is indented this many columns further than when an entry is dumped on its own.
+_YAML_ITEM_ENTRY_INDENT = 6
+
+
+class YamlCodec:
+  """Block-style YAML, as state files have always been written."""
+
+  name = "yaml"
+
+  def encode(self, data: dict) -> bytes:
+    return self.dump(data).encode("utf-8")
+
+  def dump(self, data: Any) -> str:
+    """Dump data to YAML text."""
+    return yaml.dump(data, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
+
+  def decode(self, payload: bytes | str) -> Any:
+    """Decode YAML bytes or text."""
+    try:
+      return yaml.load(payload, Loader=YamlLoader)
+    except yaml.YAMLError as e:
+      raise StateDecodeError(f"Invalid YAML state: {e}") from e
+
+  def entry_size(self, item_id: str, item: dict) -> int:
+    entry_yaml = self.dump({item_id: item})
+    return len(entry_yaml.encode("utf-8")) + _YAML_ITEM_ENTRY_INDENT * entry_yaml.count("\n")
+
+
+class JsonCodec:
+  """Compact JSON."""
+
+  name = "json"
+
+  def encode(self, data: dict) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+  def decode(self, payload: bytes) -> Any:
+    try:
+      return json.loads(payload)
+    except ValueError as e:
+      raise StateDecodeError(f"Invalid JSON state: {e}") from e
+
+  def entry_size(self, item_id: str, item: dict) -> int:
+    # The entry without its enclosing braces, plus the separating comma.
+    return len(json.dumps({item_id: item}, separators=(",", ":")).encode("utf-8")) - 1
+
+
+BINARY_MAGIC = b"\x93GTHS"
+_BINARY_VERSION = 1
+_BINARY_HEADER_SIZE = len(BINARY_MAGIC) + 1 + 4
+# Array type code with 4-byte items for the integer columns.
+_U32 = next(code for code in "IL" if array(code).itemsize == 4)
+_U32_MAX = 2**32 - 1
+
+
+def _column_bytes(column: array) -> bytes:
+  """Return a column's items as little-endian bytes."""
+  if sys.byteorder == "big":
+    column = array(column.typecode, column)
+    column.byteswap()
+  return column.tobytes()
+
+
+class BinaryCodec:
+  """Compact binary encoding of the item columns under a JSON header.
+
+  Layout: magic, version byte, little-endian u32 header length, the JSON header (global
+  fields, a string table, and per target its fields and item ids), then per target its
+  item columns: f64 timestamps, u32 result and status string indexes and u32 failure counts.
+  encode() raises ValueError for a failure count that is not an integer in the u32 range.
+  """
+
+  name = "binary"
+
+  def encode(self, data: dict) -> bytes:
+    strings: dict[str, int] = {}
+    header_targets: list[dict] = []
+    columns: list[bytes] = []
+    for target_name, target_data in data["targets"].items():
+      items = target_data["items"]
+      values = list(items.values())
+      header_targets.append(
+        {
+          "name": target_name,
+          "fields": {key: value for key, value in target_data.items() if key != "items"},
+          "ids": list(items),
+          # item_id fields that differ from their key, by item index.
+          "item_ids": {
+            str(index): item["item_id"]
+            for index, (item_id, item) in enumerate(items.items())
+            if item["item_id"] != item_id
+          },
+        }
+      )
+      columns.append(
+        _column_bytes(array("d", [item["last_processed_timestamp"] for item in values]))
+      )
+      results = [item["last_result"] for item in values]
+      statuses = [item.get("last_status", "unknown") for item in values]
+      for column in (results, statuses):
+        column_indexes = [strings.setdefault(value, len(strings)) for value in column]
+        columns.append(_column_bytes(array(_U32, column_indexes)))
+      failure_counts = [item.get("consecutive_failures", 0) for item in values]
+      for failure_count in failure_counts:
+        if isinstance(failure_count, bool) or not isinstance(failure_count, int):
+          raise ValueError(
+            f"Item consecutive_failures of target {target_name} is not an integer: "
+            f"{failure_count!r}"
+          )
+        if not 0 <= failure_count <= _U32_MAX:
+          raise ValueError(
+            f"Item consecutive_failures of target {target_name} is outside the binary "
+            f"codec's range 0..{_U32_MAX}: {failure_count}"
+          )
+      columns.append(_column_bytes(array(_U32, failure_counts)))
+    header = json.dumps(
+      {
+        "globals": {key: value for key, value in data.items() if key != "targets"},
+        "strings": list(strings),
+        "targets": header_targets,
+      },
+      separators=(",", ":"),
+    ).encode("utf-8")
+    return b"".join(
+      [
+        BINARY_MAGIC,
+        bytes([_BINARY_VERSION]),
+        len(header).to_bytes(4, "little"),
+        header,
+        *columns,
+      ]
+    )
+
+  def decode(self, payload: bytes) -> Any:
+    try:
+      return self._decode(memoryview(payload))
+    except (ValueError, KeyError, TypeError, IndexError) as e:
+      raise StateDecodeError(f"Invalid binary state: {e}") from e
+
+  def _decode(self, payload: memoryview) -> dict:
+    if payload[: len(BINARY_MAGIC)] != BINARY_MAGIC:
+      raise ValueError("missing magic")
+    version = payload[len(BINARY_MAGIC)]
+    if version != _BINARY_VERSION:
+      raise ValueError(f"unsupported version {version}")
+    header_size = int.from_bytes(payload[len(BINARY_MAGIC) + 1 : _BINARY_HEADER_SIZE], "little")
+    offset = _BINARY_HEADER_SIZE + header_size
+    header = json.loads(bytes(payload[_BINARY_HEADER_SIZE:offset]))
+    strings = header["strings"]
+
+    def read_column(typecode: str, count: int) -> array:
+      nonlocal offset
+      column = array(typecode)
+      end = offset + column.itemsize * count
+      if end > len(payload):
+        raise ValueError("truncated item columns")
+      column.frombytes(payload[offset:end])
+      if sys.byteorder == "big":
+        column.byteswap()
+      offset = end
+      return column
+
+    targets: dict[str, dict] = {}
+    for target in header["targets"]:
+      ids = target["ids"]
+      count = len(ids)
+      timestamps = read_column("d", count)
+      results = read_column(_U32, count)
+      statuses = read_column(_U32, count)
+      failures = read_column(_U32, count)
+      items = {
+        item_id: {
+          "item_id": item_id,
+          "last_processed_timestamp": timestamp,
+          "last_result": strings[result],
+          "last_status": strings[status],
+          "consecutive_failures": failure_count,
+        }
+        for item_id, timestamp, result, status, failure_count in zip(
+          ids, timestamps, results, statuses, failures
+        )
+      }
+      for index, stored_item_id in target["item_ids"].items():
+        items[ids[int(index)]]["item_id"] = stored_item_id
+      targets[target["name"]] = {**target["fields"], "items": items}
+    if offset != len(payload):
+      raise ValueError("trailing data after item columns")
+    return {**header["globals"], "targets": targets}
+
+  def entry_size(self, item_id: str, item: dict) -> int:
+    # Four columns plus the quoted id and its comma in the header.
+    return 8 + 3 * 4 + len(json.dumps(item_id).encode("utf-8")) + 1
+
+
+YAML_CODEC = YamlCodec()
+JSON_CODEC = JsonCodec()
+BINARY_CODEC = BinaryCodec()
+CODECS: dict[str, StateCodec] = {
+  codec.name: codec for codec in (YAML_CODEC, JSON_CODEC, BINARY_CODEC)
+}
+
+
+def detect_codec(payload: bytes) -> StateCodec:
+  """Return the codec a state file was written with, judging by its first bytes.
+
+  Binary state starts with BINARY_MAGIC and JSON state with `{`; anything else is YAML,
+  which FileStateStorage always writes in block style.
+  """
+  if payload.startswith(BINARY_MAGIC):
+    return BINARY_CODEC
+  if payload[:64].lstrip().startswith(b"{"):
+    return JSON_CODEC
+  return YAML_CODEC
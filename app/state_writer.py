@@ -0,0 +1,90 @@
+"""Background state persistence that keeps serialization and fsync off the event loop."""
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import structlog
+
+from app.metrics import state_write_failures_total
+from app.state import StateManager
+
+logger = structlog.get_logger()
+
+
+class StateWriter:
+  """Write state on a dedicated thread, coalescing save requests into single writes.
+
+  request_save() returns immediately. The first request starts a window of
+  `coalesce_window_s` seconds; every request made before the window ends is covered by one
+  write. The state is snapshotted on the event loop when the write starts, and the
+  snapshot is dumped and written (with its fsyncs) on the writer thread. Requests made
+  while a write is in progress start another window once it finishes, so at most one
+  write is in flight and writes reach storage in order.
+  """
+
+  def __init__(self, state_manager: StateManager, coalesce_window_s: float) -> None:
+    self.state_manager = state_manager
+    self.coalesce_window_s = coalesce_window_s
+    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-writer")
+    self._save_requested = False
+    self._task: asyncio.Task[None] | None = None
+    # The write submitted to the writer thread last, which may outlive a cancelled close().
+    self._write_future: Future[list[tuple[str, str, float]]] | None = None
+    # Set on close() to end the current coalescing window early.
+    self._closing = asyncio.Event()
+
+  @property
+  def writing(self) -> bool:
+    """Whether a write is still running on the writer thread."""
+    return self._write_future is not None and not self._write_future.done()
+
+  def request_save(self) -> None:
+    """Ask for the state to be saved; must be called from the event loop."""
+    self._save_requested = True
+    if self._task is None:
+      self._task = asyncio.get_running_loop().create_task(self._run())
+
+  async def _run(self) -> None:
+    """Write state until no save is requested any more."""
+    try:
+      while self._save_requested:
+        try:
+          await asyncio.wait_for(self._closing.wait(), timeout=self.coalesce_window_s)
+        except asyncio.TimeoutError:
+          pass
+        self._save_requested = False
+        await self._write(force=False)
+    finally:
+      self._task = None
+
+  async def _write(self, force: bool) -> None:
+    """Snapshot state on the event loop and write the snapshot on the writer thread."""
+    snapshot = self.state_manager.snapshot(force)
+    if snapshot is None:
+      return
+    self._write_future = self._executor.submit(self.state_manager.write_snapshot, snapshot)
+    try:
+      pruned_entries = await asyncio.wrap_future(self._write_future)
+    except Exception as e:
+      self.state_manager.abandon_save()
+      logger.exception("Failed to save state", exception=e)
+      state_write_failures_total.inc()
+      return
+    self.state_manager.complete_save(pruned_entries)
+
+  async def close(self) -> None:
+    """Finish pending writes, force a final save, and stop the writer thread.
+
+    The final save also writes run bookkeeping, which saves after runs skip on their own.
+    The writer thread is not joined, so the event loop is never blocked on it; if close() is
+    cancelled (e.g. on a shutdown timeout) a write may still be running, as `writing` tells.
+    """
+    logger.debug("Flushing state writer", save_requested=self._save_requested)
+    self._closing.set()
+    if self._task is not None:
+      await self._task
+    try:
+      await self._write(force=True)
+    finally:
+      self._executor.shutdown(wait=False)
+    logger.debug("State writer closed")
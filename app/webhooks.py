@@ -0,0 +1,175 @@
+"""Parsing and validation of *arr webhook notifications."""
+
+import hmac
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+import structlog
+
+from app.config import ArrTarget, ArrType
+from app.handlers import ItemId, MovieId, SeasonId
+from app.metrics import webhook_events_total
+from app.state import ItemResult
+
+logger = structlog.get_logger()
+
+
+class WebhookEventType(StrEnum):
+  """Radarr and Sonarr webhook `eventType` values gatherarr acts on."""
+
+  TEST = "Test"
+  GRAB = "Grab"
+  DOWNLOAD = "Download"
+  MOVIE_ADDED = "MovieAdded"
+  MOVIE_DELETE = "MovieDelete"
+  MOVIE_FILE_DELETE = "MovieFileDelete"
+  SERIES_ADD = "SeriesAdd"
+  SERIES_DELETE = "SeriesDelete"
+  EPISODE_FILE_DELETE = "EpisodeFileDelete"
+
+
+# Events after which the items they name need no further search for now, with the result
+# recorded for those items.
+SATISFYING_RESULTS: dict[WebhookEventType, ItemResult] = {
+  WebhookEventType.GRAB: ItemResult.WEBHOOK_GRAB,
+  WebhookEventType.DOWNLOAD: ItemResult.WEBHOOK_DOWNLOAD,
+}
+# Events that add a record, which should be considered without waiting for the next interval.
+ADDING_EVENTS = frozenset({WebhookEventType.MOVIE_ADDED, WebhookEventType.SERIES_ADD})
+
+
+@dataclass(frozen=True)
+class WebhookEvent:
+  """A webhook notification reduced to what the scheduler applies.
+
+  record_key is the movie or series id whose cached library record is stale; item_ids are
+  the search items (movie, or each season touched) the event is about.
+  """
+
+  event_type: WebhookEventType
+  record_key: int | None
+  item_ids: list[ItemId] = field(default_factory=list)
+
+
+def _payload_object(payload: dict[str, Any], key: str) -> dict[str, Any]:
+  """Return the JSON object under key (empty when missing), raising ValueError otherwise."""
+  value = payload.get(key) or {}
+  if not isinstance(value, dict):
+    raise ValueError(f"{key} is not an object")
+  return value
+
+
+def _payload_int(payload: dict[str, Any], key: str) -> int | None:
+  """Return the integer under key (None when missing), raising ValueError otherwise."""
+  value = payload.get(key)
+  if value is None:
+    return None
+  if isinstance(value, bool) or not isinstance(value, int):
+    raise ValueError(f"{key} is not an integer")
+  number: int = value
+  return number
+
+
+def parse_webhook_event(arr_type: ArrType, payload: dict[str, Any]) -> WebhookEvent | None:
+  """Parse a webhook payload, or return None for event types gatherarr ignores.
+
+  Raises ValueError when eventType is not a string, or when a record the event names is not
+  shaped like an *arr payload.
+  """
+  raw_event_type = payload.get("eventType")
+  if not isinstance(raw_event_type, str):
+    raise ValueError("eventType is not a string")
+  try:
+    event_type = WebhookEventType(raw_event_type)
+  except ValueError:
+    return None
+
+  if arr_type == ArrType.RADARR:
+    movie = _payload_object(payload, "movie")
+    movie_id = _payload_int(movie, "id")
+    if movie_id is None:
+      return WebhookEvent(event_type=event_type, record_key=None)
+    return WebhookEvent(
+      event_type=event_type,
+      record_key=movie_id,
+      item_ids=[MovieId(movie_id=movie_id, movie_name=movie.get("title"))],
+    )
+
+  series = _payload_object(payload, "series")
+  series_id = _payload_int(series, "id")
+  if series_id is None:
+    return WebhookEvent(event_type=event_type, record_key=None)
+  episodes = payload.get("episodes") or []
+  if not isinstance(episodes, list) or not all(isinstance(episode, dict) for episode in episodes):
+    raise ValueError("episodes is not a list of objects")
+  season_numbers = sorted(
+    {
+      season_number
+      for episode in episodes
+      if (season_number := _payload_int(episode, "seasonNumber")) is not None
+    }
+  )
+  return WebhookEvent(
+    event_type=event_type,
+    record_key=series_id,
+    item_ids=[
+      SeasonId(series_id=series_id, season_number=season_number, series_name=series.get("title"))
+      for season_number in season_numbers
+    ],
+  )
+
+
+class WebhookReceiver:
+  """Validate webhook requests in the web server thread and deliver parsed events.
+
+  deliver is called from the web server thread; it must hand the event over to the
+  scheduler's event loop (e.g. with loop.call_soon_threadsafe) rather than apply it directly.
+  """
+
+  def __init__(
+    self,
+    targets: list[ArrTarget],
+    token: str,
+    deliver: Callable[[str, WebhookEvent], None],
+  ) -> None:
+    self._targets_by_name = {target.name: target for target in targets}
+    self._token = token
+    self._deliver = deliver
+
+  def receive(self, target_name: str, payload: Any, token: str | None) -> tuple[int, str]:
+    """Handle one webhook request and return the HTTP status code and response body."""
+    if self._token and not hmac.compare_digest((token or "").encode(), self._token.encode()):
+      logger.warning("Rejected webhook with invalid token", target=target_name)
+      return 401, "Unauthorized"
+    target = self._targets_by_name.get(target_name)
+    if target is None:
+      return 404, "Unknown target"
+    if not isinstance(payload, dict):
+      return 400, "Expected a JSON object"
+
+    try:
+      event = parse_webhook_event(target.arr_type, payload)
+    except ValueError as e:
+      logger.warning("Rejected webhook with invalid payload", error=str(e), **target.logging_ids())
+      return 400, "Invalid payload"
+    event_label = event.event_type.value if event is not None else "ignored"
+    webhook_events_total.labels(
+      target=target.name, type=target.arr_type.value, event=event_label
+    ).inc()
+    if event is None:
+      logger.debug(
+        "Ignoring webhook event", event_type=payload.get("eventType"), **target.logging_ids()
+      )
+      return 202, "Ignored"
+
+    logger.debug(
+      "Received webhook event",
+      event_type=event.event_type.value,
+      record_key=event.record_key,
+      item_count=len(event.item_ids),
+      **target.logging_ids(),
+    )
+    self._deliver(target.name, event)
+    return 202, "Accepted"
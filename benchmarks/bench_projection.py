@@ -0,0 +1,84 @@
+"""Benchmark field-projection decoding of library payloads.
+
+Compares decoding a synthetic Radarr /api/v3/movie body (shaped like MovieResource in
+context/radarr_api.json) with json.loads against streaming it through JsonArrayParser,
+with and without the Radarr projection. Reports decode time and the memory retained by
+the decoded items.
+
+Usage: python -m benchmarks.bench_projection [--count N] [--chunk-size BYTES]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from app.config import ArrType
+from app.json_stream import JsonArrayParser
+from app.projection import LIBRARY_PROJECTIONS, project
+from benchmarks.synthetic import radarr_movies
+
+
+def _decode_full(body: bytes, chunk_size: int) -> list[Any]:
+  return list(json.loads(body))
+
+
+def _stream(body: bytes, chunk_size: int) -> list[Any]:
+  parser = JsonArrayParser()
+  items: list[Any] = []
+  for start in range(0, len(body), chunk_size):
+    items.extend(parser.feed(body[start : start + chunk_size]))
+  parser.close()
+  return items
+
+
+def _stream_projected(body: bytes, chunk_size: int) -> list[Any]:
+  projection = LIBRARY_PROJECTIONS[ArrType.RADARR]
+  parser = JsonArrayParser()
+  items: list[Any] = []
+  for start in range(0, len(body), chunk_size):
+    items.extend(
+      project(item, projection) for item in parser.feed(body[start : start + chunk_size])
+    )
+  parser.close()
+  return items
+
+
+def _measure(
+  decode: Callable[[bytes, int], list[Any]], body: bytes, chunk_size: int
+) -> tuple[float, float, float]:
+  """Return (seconds, retained MiB, peak MiB) for one decode of body."""
+  start = time.perf_counter()
+  decode(body, chunk_size)
+  elapsed = time.perf_counter() - start
+
+  tracemalloc.start()
+  items = decode(body, chunk_size)
+  retained, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  del items
+  return elapsed, retained / 2**20, peak / 2**20
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--count", type=int, default=5000, help="number of synthetic movies")
+  parser.add_argument("--chunk-size", type=int, default=65536, help="stream chunk size in bytes")
+  args = parser.parse_args()
+
+  body = json.dumps(radarr_movies(args.count)).encode()
+  print(f"{args.count} movies, {len(body) / 2**20:.1f} MiB body, {args.chunk_size} B chunks")
+  print(f"{'decoder':<24}{'time (s)':>10}{'retained (MiB)':>16}{'peak (MiB)':>12}")
+  for name, decode in (
+    ("json.loads", _decode_full),
+    ("stream", _stream),
+    ("stream + projection", _stream_projected),
+  ):
+    elapsed, retained, peak = _measure(decode, body, args.chunk_size)
+    print(f"{name:<24}{elapsed:>10.3f}{retained:>16.1f}{peak:>12.1f}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,50 @@
+"""Benchmark encode time, decode time and size of each state codec.
+
+For each item count, serializes a state with that many items in one target and measures
+StateCodec.encode() and decode() of it for the YAML, JSON and binary codecs.
+
+Usage: python -m benchmarks.bench_state_codecs [--counts N,N,...]
+"""
+
+import argparse
+import time
+
+from app.state import FileStateStorage, ItemState, ItemStatus, StateManager
+from app.state_codecs import CODECS
+
+
+def _serialized_state(count: int) -> dict:
+  manager = StateManager(FileStateStorage("unused.yaml"), state_size_cap_bytes=None)
+  target_state = manager.get_target_state("sonarr")
+  for i in range(count):
+    target_state.items[f"series:{i}:season:1"] = ItemState(
+      item_id=f"series:{i}:season:1",
+      last_processed_timestamp=1_700_000_000.0 + i,
+      last_result="search_triggered" if i % 3 else "skipped_recently_processed",
+      last_status=ItemStatus.SUCCESS,
+    )
+  return manager._serialize()
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument(
+    "--counts", default="10000,100000,1000000", help="comma-separated item counts"
+  )
+  args = parser.parse_args()
+
+  print(f"{'items':>10}{'codec':>8}{'size (MB)':>11}{'encode (s)':>12}{'decode (s)':>12}")
+  for count in (int(value) for value in args.counts.split(",")):
+    data = _serialized_state(count)
+    for name, codec in CODECS.items():
+      start = time.perf_counter()
+      payload = codec.encode(data)
+      encoded = time.perf_counter()
+      codec.decode(payload)
+      decode = time.perf_counter() - encoded
+      size_mb = len(payload) / (1024 * 1024)
+      print(f"{count:>10}{name:>8}{size_mb:>11.2f}{encoded - start:>12.3f}{decode:>12.3f}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,85 @@
+"""Benchmark state load time of a YAML state file before and after lazy loading.
+
+For each item count, writes a state file with that many items in a large target plus 100
+items in a small one, then measures the previous load (pure-Python `yaml.safe_load` of the
+whole file and deserialization of every item) against the current one: StateManager.load()
+indexing the target sections with the libyaml loader, followed by the first
+get_target_state() of the small and of the large target.
+
+Usage: python -m benchmarks.bench_state_load [--counts N,N,...]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from app.state import FileStateStorage, ItemState, ItemStatus, StateManager
+
+
+def _write_state(state_path: Path, count: int) -> None:
+  manager = StateManager(FileStateStorage(state_path), state_size_cap_bytes=None)
+  for target_name, target_count in (("sonarr", count), ("radarr", 100)):
+    target_state = manager.get_target_state(target_name)
+    for i in range(target_count):
+      target_state.items[str(i)] = ItemState(
+        item_id=str(i),
+        last_processed_timestamp=1_700_000_000.0 + i,
+        last_result="search_triggered",
+        last_status=ItemStatus.SUCCESS,
+      )
+  # The libyaml dumper lays the file out as FileStateStorage does, only faster.
+  with open(state_path, "w", encoding="utf-8") as f:
+    yaml.dump(
+      manager._serialize(),
+      f,
+      Dumper=yaml.CSafeDumper,
+      default_flow_style=False,
+      sort_keys=False,
+    )
+
+
+def _previous_load(state_path: Path) -> float:
+  start = time.perf_counter()
+  with open(state_path, encoding="utf-8") as f:
+    data = yaml.safe_load(f)
+  StateManager(FileStateStorage(state_path))._deserialize(data)
+  return time.perf_counter() - start
+
+
+def _current_load(state_path: Path) -> tuple[float, float, float]:
+  """Return (load seconds, small target seconds, large target seconds)."""
+  manager = StateManager(FileStateStorage(state_path))
+  start = time.perf_counter()
+  manager.load()
+  loaded = time.perf_counter()
+  manager.get_target_state("radarr")
+  small = time.perf_counter()
+  manager.get_target_state("sonarr")
+  return loaded - start, small - loaded, time.perf_counter() - small
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--counts", default="10000,60000", help="comma-separated item counts")
+  args = parser.parse_args()
+
+  print(f"libyaml loader: {yaml.__with_libyaml__}")
+  print(
+    f"{'items':>10}{'size (MB)':>11}{'previous (s)':>14}{'load (s)':>10}"
+    f"{'small (s)':>11}{'large (s)':>11}"
+  )
+  for count in (int(value) for value in args.counts.split(",")):
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      _write_state(state_path, count)
+      size_mb = state_path.stat().st_size / (1024 * 1024)
+      previous = _previous_load(state_path)
+      load, small, large = _current_load(state_path)
+    print(f"{count:>10}{size_mb:>11.1f}{previous:>14.3f}{load:>10.3f}{small:>11.3f}{large:>11.3f}")
+
+
+if __name__ == "__main__":
+  main()
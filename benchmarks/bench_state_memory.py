@@ -0,0 +1,94 @@
+"""Benchmark memory retained per tracked item state.
+
+Deserializes N items (decoded from JSON, so every string is a distinct object as when
+loading a state file) into the previous item layout (a regular dataclass holding its own
+item_id and result strings) and into the current one (StateManager's deserialization:
+slotted ItemState, ids shared with keys and ItemResult results), and reports the bytes retained
+per item as measured by tracemalloc.
+
+Usage: python -m benchmarks.bench_state_memory [--counts N,N,...]
+"""
+
+import argparse
+import json
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from app.state import InMemoryStateStorage, ItemResult, ItemStatus, StateManager
+
+
+@dataclass
+class _DictItemState:
+  """The previous ItemState layout."""
+
+  item_id: str
+  last_processed_timestamp: float
+  last_result: str
+  last_status: ItemStatus
+  consecutive_failures: int = 0
+
+
+def _state_json(count: int) -> str:
+  results = [result.value for result in ItemResult]
+  items = {
+    str(i): {
+      "item_id": str(i),
+      "last_processed_timestamp": 1_700_000_000.0 + i,
+      "last_result": results[i % len(results)],
+      "last_status": "success",
+      "consecutive_failures": i % 3,
+    }
+    for i in range(count)
+  }
+  return json.dumps({"total_runs": 1, "targets": {"radarr": {"items": items}}})
+
+
+def _load_dict_items(data: dict[str, Any]) -> Any:
+  return {
+    item_id: _DictItemState(
+      item_id=item_data["item_id"],
+      last_processed_timestamp=item_data["last_processed_timestamp"],
+      last_result=item_data["last_result"],
+      last_status=ItemStatus(item_data["last_status"]),
+      consecutive_failures=item_data["consecutive_failures"],
+    )
+    for item_id, item_data in data["targets"]["radarr"]["items"].items()
+  }
+
+
+def _load_current_items(data: dict[str, Any]) -> Any:
+  state = StateManager(InMemoryStateStorage())._deserialize(data)
+  for target_state in state.targets.values():
+    target_state.mark_saved()
+  return state
+
+
+def _bytes_per_item(load: Callable[[dict[str, Any]], Any], count: int) -> float:
+  """Memory still allocated after decoding and loading, once the decoded data is dropped."""
+  state_json = _state_json(count)
+  tracemalloc.start()
+  data = json.loads(state_json)
+  loaded = load(data)
+  del data
+  retained, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  del loaded
+  return retained / count
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--counts", default="10000,100000,1000000", help="comma-separated counts")
+  args = parser.parse_args()
+
+  print(f"{'items':>10}{'dataclass (B/item)':>20}{'slotted + shared (B/item)':>30}")
+  for count in (int(value) for value in args.counts.split(",")):
+    before = _bytes_per_item(_load_dict_items, count)
+    after = _bytes_per_item(_load_current_items, count)
+    print(f"{count:>10}{before:>20.0f}{after:>30.0f}")
+
+
+if __name__ == "__main__":
+  main()
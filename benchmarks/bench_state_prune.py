@@ -0,0 +1,83 @@
+"""Benchmark size-cap pruning of the YAML state.
+
+Builds a state of N items, sets the size cap so that the oldest --prune entries have to go,
+and times StateManager.save() to in-memory storage (which prunes the state) against the
+previous approach of re-serializing the whole state after each pruned entry. Both must
+prune the same entries.
+
+Usage: python -m benchmarks.bench_state_prune [--counts N,N,...] [--prune N]
+"""
+
+import argparse
+import time
+
+import yaml
+
+from app.state import InMemoryStateStorage, ItemState, ItemStatus, StateManager
+
+
+def _build_manager(count: int, cap_bytes: int | None) -> StateManager:
+  manager = StateManager(InMemoryStateStorage(), state_size_cap_bytes=cap_bytes)
+  target_state = manager.get_target_state("radarr")
+  for i in range(count):
+    target_state.items[str(i)] = ItemState(
+      item_id=str(i),
+      last_processed_timestamp=1_700_000_000.0 + (i * 7919) % count,
+      last_result="search_triggered",
+      last_status=ItemStatus.SUCCESS,
+    )
+  return manager
+
+
+def _yaml_size(manager: StateManager) -> int:
+  data = manager._serialize()
+  return len(yaml.safe_dump(data, default_flow_style=False, sort_keys=False).encode("utf-8"))
+
+
+def _prune_one_at_a_time(manager: StateManager, cap_bytes: int) -> None:
+  """The previous pruning: remove the oldest entry, then re-serialize everything."""
+  if _yaml_size(manager) <= cap_bytes:
+    return
+  entries = sorted(
+    (
+      (target_name, item_id, item.last_processed_timestamp)
+      for target_name, target in manager.state.targets.items()
+      for item_id, item in target.items.items()
+    ),
+    key=lambda entry: entry[2],
+  )
+  for target_name, item_id, _ in entries:
+    del manager.state.targets[target_name].items[item_id]
+    if _yaml_size(manager) <= cap_bytes:
+      break
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--counts", default="1000,5000", help="comma-separated item counts")
+  parser.add_argument("--prune", type=int, default=100, help="entries the cap forces out")
+  args = parser.parse_args()
+
+  print(f"{'items':>8}{'pruned':>8}{'one at a time (s)':>20}{'estimate + bisect (s)':>24}")
+  for count in (int(value) for value in args.counts.split(",")):
+    full_size = _yaml_size(_build_manager(count, None))
+    cap_bytes = full_size - (full_size // count) * args.prune
+
+    baseline = _build_manager(count, None)
+    start = time.perf_counter()
+    _prune_one_at_a_time(baseline, cap_bytes)
+    baseline_s = time.perf_counter() - start
+
+    manager = _build_manager(count, cap_bytes)
+    start = time.perf_counter()
+    manager.save()
+    pruning_s = time.perf_counter() - start
+
+    if manager.state.targets != baseline.state.targets:
+      raise SystemExit(f"Pruning outcomes differ for {count} items")
+    pruned = count - len(manager.state.targets["radarr"].items)
+    print(f"{count:>8}{pruned:>8}{baseline_s:>20.3f}{pruning_s:>24.3f}")
+
+
+if __name__ == "__main__":
+  main()
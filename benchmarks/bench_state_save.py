@@ -0,0 +1,84 @@
+"""Benchmark state save latency of the YAML file, journal, sharded and SQLite storages.
+
+For each item count, builds a state with that many items in one target and measures the
+initial save and a steady-state save after ~100 items changed (the typical footprint of a
+run). The state size cap is disabled so large states are saved in full.
+
+Usage: python -m benchmarks.bench_state_save [--counts N,N,...] [--changed N]
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
+
+from app.state import (
+  FileStateStorage,
+  ItemState,
+  ItemStatus,
+  JournalStateStorage,
+  ShardedFileStateStorage,
+  SqliteStateStorage,
+  StateManager,
+  StateStorage,
+)
+
+
+def _build_manager(storage: StateStorage, count: int) -> StateManager:
+  manager = StateManager(storage, state_size_cap_bytes=None)
+  target_state = manager.get_target_state("radarr")
+  for i in range(count):
+    target_state.items[str(i)] = ItemState(
+      item_id=str(i),
+      last_processed_timestamp=1_700_000_000.0 + i,
+      last_result="search_triggered",
+      last_status=ItemStatus.SUCCESS,
+    )
+  return manager
+
+
+def _measure(storage: StateStorage, count: int, changed: int) -> tuple[float, float]:
+  """Return (initial save seconds, steady-state save seconds)."""
+  manager = _build_manager(storage, count)
+  start = time.perf_counter()
+  manager.save()
+  initial = time.perf_counter() - start
+
+  items = manager.get_target_state("radarr").items
+  for i in range(0, count, max(count // changed, 1)):
+    item = items[str(i)]
+    items[str(i)] = replace(item, last_processed_timestamp=item.last_processed_timestamp + 3600)
+  start = time.perf_counter()
+  manager.save()
+  return initial, time.perf_counter() - start
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument(
+    "--counts", default="10000,100000,1000000", help="comma-separated item counts"
+  )
+  parser.add_argument("--changed", type=int, default=100, help="items changed between saves")
+  args = parser.parse_args()
+
+  backends: tuple[tuple[str, Callable[[Path], StateStorage]], ...] = (
+    ("yaml", lambda directory: FileStateStorage(directory / "state.yaml")),
+    ("journal", lambda directory: JournalStateStorage(directory / "state.yaml")),
+    ("sharded", lambda directory: ShardedFileStateStorage(directory / "state.d")),
+    ("sqlite", lambda directory: SqliteStateStorage(directory / "state.sqlite")),
+  )
+  print(f"{'items':>10}{'backend':>10}{'initial (s)':>14}{'steady (s)':>14}")
+  for count in (int(value) for value in args.counts.split(",")):
+    for name, create_storage in backends:
+      with tempfile.TemporaryDirectory() as tmpdir:
+        storage = create_storage(Path(tmpdir))
+        initial, steady = _measure(storage, count, args.changed)
+        if isinstance(storage, SqliteStateStorage):
+          storage.close()
+      print(f"{count:>10}{name:>10}{initial:>14.3f}{steady:>14.3f}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,104 @@
+"""Synthetic *arr payloads generated from the OpenAPI schemas in context/."""
+
+import itertools
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+CONTEXT_DIR = Path(__file__).resolve().parent.parent / "context"
+
+# Array lengths for list fields whose real-world size dominates payload size.
+_ARRAY_LENGTHS = {
+  "alternateTitles": 12,
+  "images": 3,
+  "genres": 4,
+  "keywords": 8,
+  "tags": 2,
+  "seasons": 6,
+}
+_DEFAULT_ARRAY_LENGTH = 2
+_MAX_DEPTH = 4
+
+
+def load_schemas(spec_name: str) -> dict[str, Any]:
+  """Load the component schemas of an OpenAPI spec from context/."""
+  spec = json.loads((CONTEXT_DIR / f"{spec_name}_api.json").read_text())
+  return dict(spec["components"]["schemas"])
+
+
+class PayloadGenerator:
+  """Build example objects for a schema, filling every property with a plausible value."""
+
+  def __init__(self, schemas: dict[str, Any]) -> None:
+    self.schemas = schemas
+    self._counter = itertools.count(1)
+    self._base_date = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+  def build(self, schema_name: str) -> dict[str, Any]:
+    """Return one example object for the named component schema."""
+    result = self._value({"$ref": f"#/components/schemas/{schema_name}"}, "", 0)
+    assert isinstance(result, dict)
+    return result
+
+  def _value(self, schema: dict[str, Any], field: str, depth: int) -> Any:
+    if "$ref" in schema:
+      schema = self.schemas[schema["$ref"].rsplit("/", 1)[-1]]
+    if "enum" in schema:
+      return schema["enum"][0]
+    if "allOf" in schema:
+      return self._value(schema["allOf"][0], field, depth)
+    schema_type = schema.get("type", "object")
+    if schema_type == "object":
+      if depth >= _MAX_DEPTH:
+        return None
+      properties = schema.get("properties", {})
+      return {
+        name: self._value(property_schema, name, depth + 1)
+        for name, property_schema in properties.items()
+      }
+    if schema_type == "array":
+      if depth >= _MAX_DEPTH:
+        return []
+      length = _ARRAY_LENGTHS.get(field, _DEFAULT_ARRAY_LENGTH)
+      return [self._value(schema.get("items", {}), field, depth + 1) for _ in range(length)]
+    if schema_type == "string":
+      if schema.get("format") == "date-time":
+        offset = timedelta(days=next(self._counter) % 3650)
+        return (self._base_date + offset).isoformat().replace("+00:00", "Z")
+      return f"{field}-{next(self._counter)}-lorem-ipsum-dolor-sit-amet"
+    if schema_type == "integer":
+      return next(self._counter)
+    if schema_type == "number":
+      return next(self._counter) / 7
+    if schema_type == "boolean":
+      return True
+    return None
+
+
+def radarr_movies(count: int) -> list[dict[str, Any]]:
+  """Return `count` MovieResource-shaped movies with distinct ids."""
+  generator = PayloadGenerator(load_schemas("radarr"))
+  movies = []
+  for movie_id in range(1, count + 1):
+    movie = generator.build("MovieResource")
+    movie["id"] = movie_id
+    movie["title"] = f"Movie {movie_id}"
+    movie["hasFile"] = movie_id % 3 == 0
+    movie["tags"] = [movie_id % 5]
+    movies.append(movie)
+  return movies
+
+
+def sonarr_series(count: int) -> list[dict[str, Any]]:
+  """Return `count` SeriesResource-shaped series with distinct ids."""
+  generator = PayloadGenerator(load_schemas("sonarr"))
+  series_items = []
+  for series_id in range(1, count + 1):
+    series = generator.build("SeriesResource")
+    series["id"] = series_id
+    series["title"] = f"Series {series_id}"
+    for season_number, season in enumerate(series["seasons"]):
+      season["seasonNumber"] = season_number
+    series_items.append(series)
+  return series_items
@@ -1,6 +1,7 @@
 """Integration tests for Arr interactions, state recovery, and metrics scraping."""
 
 import json
+import socketserver
 import threading
 import time
 from contextlib import contextmanager
@@ -118,19 +119,31 @@ class CapturedRequest:
   body_text: str
 
 
+class ThreadingUnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+  """HTTP server listening on a Unix domain socket."""
+
+  daemon_threads = True
+
+
 class FakeArrServer:
-  """In-process fake Arr HTTP server for integration testing."""
+  """In-process fake Arr HTTP server for integration testing, on TCP or a Unix socket."""
 
   def __init__(
     self,
     api_contract: OpenApiContract,
     responses: dict[RouteKey, list[ResponseSpec]],
+    unix_socket_path: Path | None = None,
   ) -> None:
     self._api_contract = api_contract
     self._responses = {route: list(route_responses) for route, route_responses in responses.items()}
     self._captured_requests: list[CapturedRequest] = []
     self._lock = threading.Lock()
-    self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._build_handler())
+    self.unix_socket_path = unix_socket_path
+    self._server: socketserver.BaseServer
+    if unix_socket_path is not None:
+      self._server = ThreadingUnixHTTPServer(str(unix_socket_path), self._build_handler())
+    else:
+      self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._build_handler())
     self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
     self._validate_configured_contract()
 
@@ -202,7 +215,10 @@ class FakeArrServer:
 
   @property
   def base_url(self) -> str:
-    """Base URL for this fake server."""
+    """Base URL for this fake server (only its Host header matters over a Unix socket)."""
+    if self.unix_socket_path is not None:
+      return "http://localhost:7878"
+    assert isinstance(self._server, ThreadingHTTPServer)
     server_address = self._server.server_address
     raw_host = server_address[0]
     port = server_address[1]
@@ -237,9 +253,10 @@ class FakeArrServer:
 def running_fake_arr_server(
   api_contract: OpenApiContract,
   responses: dict[RouteKey, list[ResponseSpec]],
+  unix_socket_path: Path | None = None,
 ) -> Iterator[FakeArrServer]:
   """Run a fake Arr server for the duration of the context."""
-  server = FakeArrServer(api_contract, responses)
+  server = FakeArrServer(api_contract, responses, unix_socket_path)
   server.start()
   try:
     yield server
@@ -382,6 +399,47 @@ async def test_sonarr_success_flow_with_real_http_stack() -> None:
     }
 
 
+@pytest.mark.asyncio
+async def test_radarr_flow_over_unix_socket(tmp_path: Path) -> None:
+  responses = {
+    ("GET", "/api/v3/movie"): [
+      ResponseSpec(status_code=200, body=[{"id": 12, "title": "Socket Movie"}]),
+    ],
+    ("POST", "/api/v3/command"): [
+      ResponseSpec(status_code=200, body={"id": 502, "status": "queued"}),
+    ],
+  }
+  socket_path = tmp_path / "radarr.sock"
+
+  with running_fake_arr_server(radarr_contract(), responses, socket_path) as fake_server:
+    target = create_target(
+      "integration-radarr-uds", ArrType.RADARR, fake_server.base_url, 1
+    ).model_copy(update={"unix_socket_path": str(socket_path)})
+    http_client = HttpxClient.for_target(target)
+    try:
+      arr_client = ArrClient(
+        target=target,
+        http_client=http_client,
+        max_retries=2,
+        retry_initial_delay_s=0.01,
+        timeout_s=0.5,
+      )
+
+      movies = await arr_client.get_movies({"run_id": "integration-radarr-uds"})
+      assert movies == [{"id": 12, "title": "Socket Movie"}]
+
+      command_result = await arr_client.search_movie(
+        MovieId(movie_id=12, movie_name="Socket Movie"),
+        {"run_id": "integration-radarr-uds"},
+      )
+      assert command_result == {"id": 502, "status": "queued"}
+    finally:
+      await http_client.aclose()
+
+    assert fake_server.request_count("GET", "/api/v3/movie") == 1
+    assert fake_server.request_count("POST", "/api/v3/command") == 1
+
+
 @pytest.mark.asyncio
 async def test_metrics_endpoint_exposes_target_metrics_after_scheduler_run(tmp_path: Path) -> None:
   past_release = (datetime.now(timezone.utc) - timedelta(days=5)).isoformat()
@@ -1,14 +1,20 @@
 """Tests for *arr client module."""
 
 import asyncio
+from collections.abc import AsyncGenerator
 from typing import Any, Mapping
 
 import httpx
 import pytest
 
-from app.arr_client import ArrClient, HttpClient
-from app.config import ArrTarget, ArrType, TargetSettings
-from app.handlers import MovieId, SeasonId
+from app.action_logging import Action
+from app.arr_client import ArrClient, HttpClient, _retry_after_s
+from app.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from app.config import ArrTarget, ArrType, FetchMode, TargetSettings
+from app.handlers import MovieId, SeasonHandler, SeasonId
+from app.metrics import requests_total
+from app.scheduler import Scheduler
+from app.state import InMemoryStateStorage, StateManager
 
 
 class FakeHttpClient(HttpClient):
@@ -39,6 +45,28 @@ class FakeHttpClient(HttpClient):
       raise self.errors[url]
     return self.responses.get(url, {})
 
+  async def stream_json_array(
+    self, url: str, headers: dict[str, str], timeout: float
+  ) -> AsyncGenerator[Any, None]:
+    """Fake streamed GET request."""
+    self.calls.append(("GET", url))
+    if url in self.errors:
+      raise self.errors[url]
+    for element in self.responses.get(url, []):
+      yield element
+
+
+class FakeHttpClientWithBrokenStream(FakeHttpClient):
+  """Fake HTTP client whose streamed response fails after the first element."""
+
+  async def stream_json_array(
+    self, url: str, headers: dict[str, str], timeout: float
+  ) -> AsyncGenerator[Any, None]:
+    """Yield one element, then fail mid-stream."""
+    self.calls.append(("GET", url))
+    yield {"id": 1}
+    raise httpx.RequestError("Connection reset")
+
 
 def radarr_target() -> ArrTarget:
   """Create a test Radarr target."""
@@ -70,6 +98,23 @@ def sonarr_target() -> ArrTarget:
   )
 
 
+def breaker_target(failure_threshold: int, open_s: float = 30.0) -> ArrTarget:
+  """Create a test Radarr target with a circuit breaker."""
+  return ArrTarget(
+    name="breaker",
+    arr_type=ArrType.RADARR,
+    base_url="http://test",
+    api_key="key",
+    settings=TargetSettings(
+      ops_per_interval=10,
+      interval_s=60,
+      item_revisit_s=3600,
+      circuit_failure_threshold=failure_threshold,
+      circuit_open_s=open_s,
+    ),
+  )
+
+
 class TestArrClient:
   def test_get_movies_radarr(self) -> None:
     fake_client = FakeHttpClient(
@@ -90,6 +135,200 @@ class TestArrClient:
     with pytest.raises(ValueError, match="get_movies.*only supported for radarr"):
       asyncio.run(client.get_movies({}))
 
+  def test_get_wanted_movies_pages_and_dedupes(self) -> None:
+    missing = "http://test/api/v3/wanted/missing?page={page}&pageSize=250&monitored=true"
+    cutoff = "http://test/api/v3/wanted/cutoff?page=1&pageSize=250&monitored=true"
+    fake_client = FakeHttpClient(
+      responses={
+        missing.format(page=1): {"totalRecords": 300, "records": [{"id": 1}, {"id": 2}]},
+        missing.format(page=2): {"totalRecords": 300, "records": [{"id": 3}]},
+        cutoff: {"totalRecords": 2, "records": [{"id": 2}, {"id": 4}]},
+      }
+    )
+    client = ArrClient(radarr_target(), fake_client)
+
+    result = asyncio.run(client.get_wanted_movies({}))
+    assert [movie["id"] for movie in result] == [1, 2, 3, 4]
+    assert fake_client.calls == [
+      ("GET", missing.format(page=1)),
+      ("GET", missing.format(page=2)),
+      ("GET", cutoff),
+    ]
+
+  def test_get_wanted_movies_wrong_type(self) -> None:
+    client = ArrClient(sonarr_target(), FakeHttpClient())
+
+    with pytest.raises(ValueError, match="get_wanted_movies.*only supported for radarr"):
+      asyncio.run(client.get_wanted_movies({}))
+
+  def test_get_wanted_seasons_aggregates_episodes(self) -> None:
+    query = "page=1&pageSize=250&monitored=true&includeSeries=true"
+    series_with_stats = {
+      "id": 1,
+      "title": "With Stats",
+      "monitored": True,
+      "tags": [3],
+      "seasons": [
+        {
+          "seasonNumber": 1,
+          "monitored": True,
+          "statistics": {"episodeFileCount": 8, "totalEpisodeCount": 10},
+        }
+      ],
+    }
+    series_without_stats = {"id": 2, "title": "No Stats", "monitored": True, "seasons": []}
+    fake_client = FakeHttpClient(
+      responses={
+        f"http://test/api/v3/wanted/missing?{query}": {
+          "totalRecords": 3,
+          "records": [
+            {"seriesId": 1, "seasonNumber": 1, "hasFile": False, "series": series_with_stats},
+            {
+              "seriesId": 2,
+              "seasonNumber": 3,
+              "hasFile": False,
+              "monitored": True,
+              "airDateUtc": "2024-01-01T00:00:00Z",
+              "series": series_without_stats,
+            },
+            {"seriesId": 1, "seasonNumber": 1, "hasFile": False, "series": series_with_stats},
+          ],
+        },
+        f"http://test/api/v3/wanted/cutoff?{query}": {
+          "totalRecords": 1,
+          "records": [
+            {
+              "seriesId": 2,
+              "seasonNumber": 3,
+              "hasFile": True,
+              "monitored": True,
+              "airDateUtc": "2024-02-01T00:00:00Z",
+              "series": series_without_stats,
+            }
+          ],
+        },
+      }
+    )
+    client = ArrClient(sonarr_target(), fake_client)
+
+    result = asyncio.run(client.get_wanted_seasons({}))
+    assert len(result) == 2
+    assert result[0]["seriesId"] == 1
+    assert result[0]["seasonNumber"] == 1
+    assert result[0]["seriesTags"] == [3]
+    assert result[0]["seasonMonitored"] is True
+    assert result[0]["seasonStatistics"] == {"episodeFileCount": 8, "totalEpisodeCount": 10}
+    assert result[1]["seriesId"] == 2
+    assert result[1]["seasonNumber"] == 3
+    assert result[1]["seasonMonitored"] is True
+    assert result[1]["seasonStatistics"] is None
+
+  def test_wanted_seasons_of_a_series_are_coalesced_into_series_search(self) -> None:
+    query = "page=1&pageSize=250&monitored=true&includeSeries=true"
+    incomplete = {"episodeFileCount": 1, "totalEpisodeCount": 10}
+    series = {
+      "id": 1,
+      "title": "Batched",
+      "monitored": True,
+      "tags": [],
+      "seasons": [
+        {"seasonNumber": 0, "monitored": False, "statistics": incomplete},
+        {"seasonNumber": 1, "monitored": True, "statistics": incomplete},
+        {"seasonNumber": 2, "monitored": True, "statistics": incomplete},
+        {
+          "seasonNumber": 3,
+          "monitored": True,
+          "statistics": {"episodeFileCount": 10, "totalEpisodeCount": 10},
+        },
+      ],
+    }
+    other_series = {
+      "id": 2,
+      "title": "Single",
+      "monitored": True,
+      "tags": [],
+      "seasons": [{"seasonNumber": 1, "monitored": True, "statistics": incomplete}],
+    }
+    fake_client = FakeHttpClient(
+      responses={
+        f"http://test/api/v3/wanted/missing?{query}": {
+          "totalRecords": 3,
+          "records": [
+            {"seriesId": 1, "seasonNumber": 2, "hasFile": False, "series": series},
+            {"seriesId": 2, "seasonNumber": 1, "hasFile": False, "series": other_series},
+            {"seriesId": 1, "seasonNumber": 1, "hasFile": False, "series": series},
+          ],
+        },
+        f"http://test/api/v3/wanted/cutoff?{query}": {
+          "totalRecords": 1,
+          "records": [{"seriesId": 1, "seasonNumber": 2, "hasFile": True, "series": series}],
+        },
+      }
+    )
+    target = sonarr_target()
+    target = target.model_copy(
+      update={
+        "settings": target.settings.model_copy(
+          update={"fetch_mode": FetchMode.WANTED, "series_search_threshold": 2}
+        )
+      }
+    )
+    state_manager = StateManager(InMemoryStateStorage())
+    scheduler = Scheduler([target], state_manager, {target.name: ArrClient(target, fake_client)})
+
+    asyncio.run(scheduler.run_once(target))
+
+    # Series 1's wanted seasons arrive together and cover every monitored season with wanted
+    # episodes (season 3 is complete), so they go out as one SeriesSearch.
+    assert fake_client.post_payloads == [
+      {"name": "SeriesSearch", "seriesId": 1},
+      {"name": "SeasonSearch", "seriesId": 2, "seasonNumber": 1},
+    ]
+    target_state = state_manager.get_target_state(target.name)
+    assert sorted(target_state.items) == ["1:1", "1:2", "2:1"]
+
+  @pytest.mark.parametrize("statistics", [None, {"episodeFileCount": 19, "totalEpisodeCount": 20}])
+  def test_partially_missing_season_is_equally_eligible_in_both_fetch_modes(
+    self, statistics: dict[str, Any] | None
+  ) -> None:
+    """A season missing 1 of 20 episodes must not look 100% missing in wanted mode."""
+    season: dict[str, Any] = {"seasonNumber": 1, "monitored": True}
+    if statistics is not None:
+      season["statistics"] = statistics
+    series = {"id": 1, "title": "Partial", "monitored": True, "tags": [], "seasons": [season]}
+    query = "page=1&pageSize=250&monitored=true&includeSeries=true"
+    missing_episode = {
+      "seriesId": 1,
+      "seasonNumber": 1,
+      "hasFile": False,
+      "monitored": True,
+      "airDateUtc": "2024-01-01T00:00:00Z",
+      "series": series,
+    }
+    fake_client = FakeHttpClient(
+      responses={
+        "http://test/api/v3/series": [series],
+        f"http://test/api/v3/wanted/missing?{query}": {
+          "totalRecords": 1,
+          "records": [missing_episode],
+        },
+        f"http://test/api/v3/wanted/cutoff?{query}": {"totalRecords": 0, "records": []},
+      }
+    )
+    target = sonarr_target()
+    target = target.model_copy(
+      update={"settings": target.settings.model_copy(update={"min_missing_percent": 50.0})}
+    )
+    client = ArrClient(target, fake_client)
+    handler = SeasonHandler(target)
+
+    [library_season] = asyncio.run(client.get_seasons({}))
+    [wanted_season] = asyncio.run(client.get_wanted_seasons({}))
+
+    assert wanted_season["seasonStatistics"] == library_season["seasonStatistics"]
+    assert handler.should_search(wanted_season, {}) is False
+    assert handler.should_search(library_season, {}) is False
+
   def test_get_seasons_sonarr(self) -> None:
     fake_client = FakeHttpClient(
       responses={
@@ -123,6 +362,28 @@ class TestArrClient:
       assert "seasonStatistics" in item
     assert ("GET", "http://test/api/v3/series") in fake_client.calls
 
+  def test_get_seasons_lists_monitored_seasons_of_series(self) -> None:
+    fake_client = FakeHttpClient(
+      responses={
+        "http://test/api/v3/series": [
+          {
+            "id": 1,
+            "title": "Test",
+            "seasons": [
+              {"seasonNumber": 0, "monitored": False},
+              {"seasonNumber": 1, "monitored": True},
+              {"seasonNumber": 2, "monitored": True},
+            ],
+          },
+        ]
+      }
+    )
+    client = ArrClient(sonarr_target(), fake_client)
+
+    result = asyncio.run(client.get_seasons({}))
+
+    assert [item["seriesMonitoredSeasons"] for item in result] == [[1, 2]] * 3
+
   def test_search_movie(self) -> None:
     fake_client = FakeHttpClient(responses={"http://test/api/v3/command": {"id": 1}})
     target = radarr_target()
@@ -133,6 +394,23 @@ class TestArrClient:
     assert result == {"id": 1}
     assert ("POST", "http://test/api/v3/command") in fake_client.calls
 
+  def test_search_movies_sends_one_command(self) -> None:
+    fake_client = FakeHttpClient(responses={"http://test/api/v3/command": {"id": 1}})
+    target = radarr_target()
+    client = ArrClient(target, fake_client)
+
+    movie_ids = [MovieId(movie_id=1, movie_name="A"), MovieId(movie_id=2, movie_name="B")]
+    result = asyncio.run(client.search_movies(movie_ids, {}))
+    assert result == {"id": 1}
+    assert fake_client.calls == [("POST", "http://test/api/v3/command")]
+    assert fake_client.post_payloads[0] == {"name": "MoviesSearch", "movieIds": [1, 2]}
+
+  def test_search_movies_wrong_type(self) -> None:
+    client = ArrClient(sonarr_target(), FakeHttpClient())
+
+    with pytest.raises(ValueError, match="search_movies.*only supported for radarr"):
+      asyncio.run(client.search_movies([MovieId(movie_id=1, movie_name="A")], {}))
+
   def test_search_season(self) -> None:
     fake_client = FakeHttpClient(responses={"http://test/api/v3/command": {"id": 1}})
     target = sonarr_target()
@@ -147,6 +425,70 @@ class TestArrClient:
       "seasonNumber": 3,
     }
 
+  def test_search_series(self) -> None:
+    fake_client = FakeHttpClient(responses={"http://test/api/v3/command": {"id": 1}})
+    client = ArrClient(sonarr_target(), fake_client)
+
+    result = asyncio.run(client.search_series(456, {}))
+    assert result == {"id": 1}
+    assert fake_client.post_payloads[0] == {"name": "SeriesSearch", "seriesId": 456}
+
+  def test_search_series_wrong_type(self) -> None:
+    client = ArrClient(radarr_target(), FakeHttpClient())
+
+    with pytest.raises(ValueError, match="search_series.*only supported for sonarr"):
+      asyncio.run(client.search_series(456, {}))
+
+  def test_get_movie_projects_record(self) -> None:
+    fake_client = FakeHttpClient(
+      responses={"http://test/api/v3/movie/7": {"id": 7, "title": "Test", "overview": "..."}}
+    )
+    client = ArrClient(radarr_target(), fake_client)
+
+    assert asyncio.run(client.get_movie(7, {})) == {"id": 7, "title": "Test"}
+
+  def test_get_movie_returns_none_when_deleted(self) -> None:
+    url = "http://test/api/v3/movie/7"
+    request = httpx.Request("GET", url)
+    response = httpx.Response(404, request=request)
+    errors = {url: httpx.HTTPStatusError("Not found", request=request, response=response)}
+    client = ArrClient(radarr_target(), FakeHttpClient(errors=errors))
+
+    assert asyncio.run(client.get_movie(7, {})) is None
+
+  def test_get_series_seasons(self) -> None:
+    fake_client = FakeHttpClient(
+      responses={
+        "http://test/api/v3/series/3": {
+          "id": 3,
+          "title": "Series",
+          "seasons": [{"seasonNumber": 1}, {"seasonNumber": 2}],
+        }
+      }
+    )
+    client = ArrClient(sonarr_target(), fake_client)
+
+    seasons = asyncio.run(client.get_series_seasons(3, {}))
+    assert [(season["seriesId"], season["seasonNumber"]) for season in seasons] == [(3, 1), (3, 2)]
+
+  def test_get_series_seasons_wrong_type(self) -> None:
+    client = ArrClient(radarr_target(), FakeHttpClient())
+
+    with pytest.raises(ValueError, match="get_series_seasons.*only supported for sonarr"):
+      asyncio.run(client.get_series_seasons(3, {}))
+
+  def test_get_history_since(self) -> None:
+    url = "http://test/api/v3/history/since?date=1970-01-01T00%3A01%3A40%2B00%3A00"
+    fake_client = FakeHttpClient(
+      responses={url: [{"id": 1, "seriesId": 3, "episodeId": 9, "eventType": "grabbed"}]}
+    )
+    client = ArrClient(sonarr_target(), fake_client)
+
+    assert asyncio.run(client.get_history_since(100.0, {})) == [
+      {"seriesId": 3, "eventType": "grabbed"}
+    ]
+    assert fake_client.calls == [("GET", url)]
+
   def test_base_url_stripping(self) -> None:
     fake_client = FakeHttpClient()
     target = ArrTarget(
@@ -196,6 +538,20 @@ class TestArrClient:
 
     assert len([c for c in fake_client.calls if c[0] == "GET"]) == 2
 
+  def test_no_retry_after_stream_started(self) -> None:
+    fake_client = FakeHttpClientWithBrokenStream()
+    client = ArrClient(radarr_target(), fake_client, max_retries=3)
+
+    async def collect() -> list[dict[str, Any]]:
+      movies = []
+      with pytest.raises(httpx.RequestError):
+        async for movie in client.iter_movies({}):
+          movies.append(movie)
+      return movies
+
+    assert asyncio.run(collect()) == [{"id": 1}]
+    assert len([c for c in fake_client.calls if c[0] == "GET"]) == 1
+
   def test_no_retry_on_non_retryable_error(self) -> None:
     request = httpx.Request("GET", "http://test/api/v3/movie")
     response = httpx.Response(404, request=request)
@@ -212,3 +568,96 @@ class TestArrClient:
       asyncio.run(client.get_movies({}))
 
     assert len([c for c in fake_client.calls if c[0] == "GET"]) == 1
+
+
+class TestArrClientCircuitBreaker:
+  def test_unreachable_target_fails_fast_then_probes_status(self) -> None:
+    now = [1000.0]
+    target = breaker_target(failure_threshold=2, open_s=30.0)
+    fake_client = FakeHttpClient(errors={"http://test/api/v3/movie": httpx.ConnectError("down")})
+    client = ArrClient(target, fake_client, max_retries=0)
+    client.circuit_breaker = CircuitBreaker(target, client.get_system_status, clock=lambda: now[0])
+    requests_before = requests_total.labels(
+      target="breaker", type="radarr", operation="get_movies"
+    )._value.get()
+
+    for _ in range(2):
+      with pytest.raises(httpx.ConnectError):
+        asyncio.run(client.get_movies({}))
+    with pytest.raises(CircuitOpenError):
+      asyncio.run(client.get_movies({}))
+    assert fake_client.calls == [("GET", "http://test/api/v3/movie")] * 2
+    requests_after = requests_total.labels(
+      target="breaker", type="radarr", operation="get_movies"
+    )._value.get()
+    assert requests_after - requests_before == 2
+
+    fake_client.errors = {}
+    now[0] += 30
+    assert asyncio.run(client.get_movies({})) == []
+    assert fake_client.calls[2:] == [
+      ("GET", "http://test/api/v3/system/status"),
+      ("GET", "http://test/api/v3/movie"),
+    ]
+    assert client.circuit_breaker.state == CircuitState.CLOSED
+
+  def test_client_errors_do_not_open_breaker(self) -> None:
+    request = httpx.Request("POST", "http://test/api/v3/command")
+    response = httpx.Response(400, request=request)
+    error = httpx.HTTPStatusError("Bad request", request=request, response=response)
+    client = ArrClient(
+      breaker_target(failure_threshold=1),
+      FakeHttpClient(errors={"http://test/api/v3/command": error}),
+      max_retries=0,
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+      asyncio.run(client._request("POST", "http://test/api/v3/command", Action.SEARCH_MOVIE, {}))
+    assert client.circuit_breaker.state == CircuitState.CLOSED
+
+
+def rate_limited_error(retry_after: str | None) -> httpx.HTTPStatusError:
+  request = httpx.Request("GET", "http://test/api/v3/movie")
+  headers = {"Retry-After": retry_after} if retry_after is not None else {}
+  response = httpx.Response(429, request=request, headers=headers)
+  return httpx.HTTPStatusError("Too many requests", request=request, response=response)
+
+
+class TestArrClientRetryAfter:
+  @pytest.mark.parametrize(
+    ("retry_after", "expected"),
+    [
+      ("120", 120.0),
+      ("1.5", 1.5),
+      ("-3", 0.0),
+      ("Wed, 21 Oct 2015 07:28:30 GMT", 30.0),
+      ("Wed, 21 Oct 2015 07:27:00 GMT", 0.0),
+      ("soon", None),
+      (None, None),
+    ],
+  )
+  def test_retry_after_parsing(self, retry_after: str | None, expected: float | None) -> None:
+    now = 1445412480.0  # Wed, 21 Oct 2015 07:28:00 GMT
+    assert _retry_after_s(rate_limited_error(retry_after), lambda: now) == expected
+
+  def test_retry_waits_for_retry_after_and_throttles(self) -> None:
+    fake_client = FakeHttpClient(errors={"http://test/api/v3/movie": rate_limited_error("0")})
+    # Without Retry-After the retry would wait retry_initial_delay_s.
+    client = ArrClient(radarr_target(), fake_client, max_retries=1, retry_initial_delay_s=60.0)
+    client.rate_limiter.initial_interval_s = 0.01
+
+    with pytest.raises(httpx.HTTPStatusError):
+      asyncio.run(client.get_movies({}))
+
+    assert len(fake_client.calls) == 2
+    assert client.rate_limiter.interval_s() > 0
+
+  def test_retry_after_capped_at_max_delay(self) -> None:
+    fake_client = FakeHttpClient(errors={"http://test/api/v3/movie": rate_limited_error("3600")})
+    client = ArrClient(radarr_target(), fake_client, max_retries=1, retry_max_delay_s=0.01)
+    client.rate_limiter.max_interval_s = 0.01
+
+    with pytest.raises(httpx.HTTPStatusError):
+      asyncio.run(client.get_movies({}))
+
+    assert len(fake_client.calls) == 2
@@ -0,0 +1,148 @@
+"""Tests for circuit breaker module."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from app.config import ArrTarget, ArrType, TargetSettings
+from app.metrics import circuit_breaker_state
+
+
+class FakeClock:
+  """Manually advanced clock."""
+
+  def __init__(self) -> None:
+    self.now = 1000.0
+
+  def __call__(self) -> float:
+    return self.now
+
+
+class FakeProbe:
+  """Probe that records its calls and fails while `error` is set."""
+
+  def __init__(self) -> None:
+    self.calls = 0
+    self.error: Exception | None = None
+
+  async def __call__(self) -> None:
+    self.calls += 1
+    await asyncio.sleep(0)
+    if self.error is not None:
+      raise self.error
+
+
+def create_target(
+  failure_threshold: int = 2, open_s: float = 30.0, close_successes: int = 1
+) -> ArrTarget:
+  return ArrTarget(
+    name="breaker",
+    arr_type=ArrType.RADARR,
+    base_url="http://test",
+    api_key="key",
+    settings=TargetSettings(
+      ops_per_interval=1,
+      interval_s=60,
+      item_revisit_s=3600,
+      circuit_failure_threshold=failure_threshold,
+      circuit_open_s=open_s,
+      circuit_close_successes=close_successes,
+    ),
+  )
+
+
+def gauge_value() -> float:
+  return float(circuit_breaker_state.labels(target="breaker", type="radarr")._value.get())
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+  for _ in range(breaker.failure_threshold):
+    breaker.record_failure()
+
+
+class TestCircuitBreaker:
+  def test_opens_after_consecutive_failures(self) -> None:
+    breaker = CircuitBreaker(create_target(failure_threshold=3), FakeProbe(), clock=FakeClock())
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    assert gauge_value() == 0
+
+    breaker.record_failure()
+    assert gauge_value() == 2
+
+  def test_open_breaker_fails_fast_until_open_s_elapses(self) -> None:
+    clock = FakeClock()
+    probe = FakeProbe()
+    breaker = CircuitBreaker(create_target(open_s=30.0), probe, clock=clock)
+    open_breaker(breaker)
+
+    clock.now += 29
+    with pytest.raises(CircuitOpenError) as exc_info:
+      asyncio.run(breaker.before_request())
+    assert exc_info.value.retry_in_s == 1.0
+    assert probe.calls == 0
+
+    clock.now += 1
+    asyncio.run(breaker.before_request())
+    assert probe.calls == 1
+    assert breaker.state == CircuitState.CLOSED
+
+  def test_failed_probe_reopens(self) -> None:
+    clock = FakeClock()
+    probe = FakeProbe()
+    probe.error = httpx.ConnectError("refused")
+    breaker = CircuitBreaker(create_target(open_s=30.0), probe, clock=clock)
+    open_breaker(breaker)
+
+    clock.now += 30
+    with pytest.raises(CircuitOpenError):
+      asyncio.run(breaker.before_request())
+    assert breaker.state == CircuitState.OPEN
+
+    clock.now += 29
+    with pytest.raises(CircuitOpenError):
+      asyncio.run(breaker.before_request())
+    assert probe.calls == 1
+
+  def test_half_open_closes_after_successes_and_reopens_on_failure(self) -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(create_target(close_successes=2), FakeProbe(), clock=clock)
+    open_breaker(breaker)
+
+    clock.now += 30
+    asyncio.run(breaker.before_request())
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert gauge_value() == 1
+    breaker.record_failure()
+    assert gauge_value() == 2
+
+    clock.now += 30
+    asyncio.run(breaker.before_request())
+    breaker.record_success()
+    assert gauge_value() == 0
+
+  def test_concurrent_requests_share_one_probe(self) -> None:
+    clock = FakeClock()
+    probe = FakeProbe()
+    breaker = CircuitBreaker(create_target(), probe, clock=clock)
+    open_breaker(breaker)
+    clock.now += 30
+
+    async def run() -> None:
+      await asyncio.gather(*(breaker.before_request() for _ in range(5)))
+
+    asyncio.run(run())
+    assert probe.calls == 1
+
+  def test_zero_failure_threshold_disables_breaker(self) -> None:
+    breaker = CircuitBreaker(create_target(failure_threshold=0), FakeProbe(), clock=FakeClock())
+    for _ in range(100):
+      breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
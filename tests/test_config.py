@@ -12,6 +12,9 @@ from app.config import (
   ArrTarget,
   ArrType,
   Config,
+  FetchMode,
+  StateBackend,
+  StateFormat,
   TargetSettings,
   load_config,
 )
@@ -215,6 +218,248 @@ class TestLoadConfig:
     assert config.targets[0].settings.http_timeout_s == 15.0
     assert config.targets[1].settings.http_timeout_s == 60.0
 
+  def test_load_config_with_search_concurrency_override(self) -> None:
+    """Test global and per-target search concurrency configuration."""
+    env = {
+      "GTH_STATE_FILE_PATH": "",
+      "GTH_SEARCH_CONCURRENCY": "4",
+      "GTH_ARR_0_TYPE": "radarr",
+      "GTH_ARR_0_NAME": "radarr1",
+      "GTH_ARR_0_BASEURL": "http://radarr1:7878",
+      "GTH_ARR_0_APIKEY": "key1",
+      "GTH_ARR_0_SEARCH_CONCURRENCY": "8",
+      "GTH_ARR_1_TYPE": "sonarr",
+      "GTH_ARR_1_NAME": "sonarr1",
+      "GTH_ARR_1_BASEURL": "http://sonarr1:8989",
+      "GTH_ARR_1_APIKEY": "key2",
+    }
+    config = load_config(env)
+    assert config.search_concurrency == 4
+    assert config.targets[0].settings.search_concurrency == 8
+    assert config.targets[1].settings.search_concurrency == 4
+
+  def test_load_config_rejects_zero_search_concurrency(self) -> None:
+    env = {
+      "GTH_STATE_FILE_PATH": "",
+      "GTH_ARR_0_TYPE": "radarr",
+      "GTH_ARR_0_NAME": "radarr1",
+      "GTH_ARR_0_BASEURL": "http://radarr1:7878",
+      "GTH_ARR_0_APIKEY": "key1",
+      "GTH_ARR_0_SEARCH_CONCURRENCY": "0",
+    }
+    with pytest.raises(ValidationError):
+      load_config(env)
+
+  def test_load_config_with_search_batch_size_override(self) -> None:
+    """Test global and per-target search batch size configuration."""
+    env = {
+      "GTH_STATE_FILE_PATH": "",
+      "GTH_SEARCH_BATCH_SIZE": "10",
+      "GTH_ARR_0_TYPE": "radarr",
+      "GTH_ARR_0_NAME": "radarr1",
+      "GTH_ARR_0_BASEURL": "http://radarr1:7878",
+      "GTH_ARR_0_APIKEY": "key1",
+      "GTH_ARR_0_SEARCH_BATCH_SIZE": "50",
+      "GTH_ARR_1_TYPE": "radarr",
+      "GTH_ARR_1_NAME": "radarr2",
+      "GTH_ARR_1_BASEURL": "http://radarr2:7878",
+      "GTH_ARR_1_APIKEY": "key2",
+    }
+    config = load_config(env)
+    assert config.search_batch_size == 10
+    assert config.targets[0].settings.search_batch_size == 50
+    assert config.targets[1].settings.search_batch_size == 10
+
+  def test_load_config_with_series_search_threshold_override(self) -> None:
+    """Test global and per-target series search threshold configuration."""
+    env = {
+      "GTH_STATE_FILE_PATH": "",
+      "GTH_SERIES_SEARCH_THRESHOLD": "3",
+      "GTH_ARR_0_TYPE": "sonarr",
+      "GTH_ARR_0_NAME": "sonarr1",
+      "GTH_ARR_0_BASEURL": "http://sonarr1:8989",
+      "GTH_ARR_0_APIKEY": "key1",
+      "GTH_ARR_0_SERIES_SEARCH_THRESHOLD": "0",
+      "GTH_ARR_1_TYPE": "sonarr",
+      "GTH_ARR_1_NAME": "sonarr2",
+      "GTH_ARR_1_BASEURL": "http://sonarr2:8989",
+      "GTH_ARR_1_APIKEY": "key2",
+    }
+    config = load_config(env)
+    assert config.series_search_threshold == 3
+    assert config.targets[0].settings.series_search_threshold == 0
+    assert config.targets[1].settings.series_search_threshold == 3
+
+  def test_load_config_with_library_refresh_override(self) -> None:
+    """Test global and per-target library refresh configuration."""
+    env = {
+      "GTH_STATE_FILE_PATH": "",
+      "GTH_LIBRARY_REFRESH_S": "600",
+      "GTH_ARR_0_TYPE": "radarr",
+      "GTH_ARR_0_NAME": "radarr1",
+      "GTH_ARR_0_BASEURL": "http://radarr1:7878",
+      "GTH_ARR_0_APIKEY": "key1",
+      "GTH_ARR_0_LIBRARY_REFRESH_S": "0",
+      "GTH_ARR_1_TYPE": "radarr",
+      "GTH_ARR_1_NAME": "radarr2",
+      "GTH_ARR_1_BASEURL": "http://radarr2:7878",
+      "GTH_ARR_1_APIKEY": "key2",
+    }
+    config = load_config(env)
+    assert config.library_refresh_s == 600
+    assert config.targets[0].settings.library_refresh_s == 0
+    assert config.targets[1].settings.library_refresh_s == 600
+
+  def test_load_config_with_library_reconcile_override(self) -> None:
+    """Test global and per-target library reconcile configuration."""
+    env = {
+      "GTH_STATE_FILE_PATH": "",
+      "GTH_LIBRARY_RECONCILE_S": "86400",
+      "GTH_ARR_0_TYPE": "sonarr",
+      "GTH_ARR_0_NAME": "sonarr1",
+      "GTH_ARR_0_BASEURL": "http://sonarr1:8989",
+      "GTH_ARR_0_APIKEY": "key1",
+      "GTH_ARR_0_LIBRARY_RECONCILE_S": "3600",
+    }
+    config = load_config(env)
+    assert config.library_reconcile_s == 86400
+    assert config.targets[0].settings.library_reconcile_s == 3600
+
+  def test_load_config_with_circuit_breaker_override(self) -> None:
+    """Test global and per-target circuit breaker and throttle configuration."""
+    env = {
+      "GTH_STATE_FILE_PATH": "",
+      "GTH_CIRCUIT_FAILURE_THRESHOLD": "10",
+      "GTH_CIRCUIT_OPEN_S": "120",
+      "GTH_ARR_0_TYPE": "radarr",
+      "GTH_ARR_0_NAME": "radarr1",
+      "GTH_ARR_0_BASEURL": "http://radarr1:7878",
+      "GTH_ARR_0_APIKEY": "key1",
+      "GTH_ARR_0_CIRCUIT_FAILURE_THRESHOLD": "0",
+      "GTH_ARR_0_CIRCUIT_CLOSE_SUCCESSES": "3",
+      "GTH_ARR_0_HTTP_THROTTLE_RECOVERY_S": "0",
+    }
+    config = load_config(env)
+    settings = config.targets[0].settings
+    assert config.circuit_failure_threshold == 10
+    assert settings.circuit_failure_threshold == 0
+    assert settings.circuit_open_s == 120.0
+    assert settings.circuit_close_successes == 3
+    assert config.http_throttle_recovery_s == 300.0
+    assert settings.http_throttle_recovery_s == 0.0
+
+  def test_load_config_with_http_pool_override(self) -> None:
+    """Test global and per-target connection pool configuration."""
+    env = {
+      "GTH_STATE_FILE_PATH": "",
+      "GTH_HTTP_MAX_CONNECTIONS": "4",
+      "GTH_HTTP_CONNECT_TIMEOUT_S": "2.5",
+      "GTH_ARR_0_TYPE": "sonarr",
+      "GTH_ARR_0_NAME": "sonarr1",
+      "GTH_ARR_0_BASEURL": "https://sonarr1:8989",
+      "GTH_ARR_0_APIKEY": "key1",
+      "GTH_ARR_0_HTTP2_ENABLED": "true",
+      "GTH_ARR_0_HTTP_KEEPALIVE_EXPIRY_S": "120",
+      "GTH_ARR_0_HTTP_PREWARM_CONNECTIONS": "0",
+    }
+    config = load_config(env)
+    settings = config.targets[0].settings
+    assert settings.http_max_connections == 4
+    assert settings.http_connect_timeout_s == 2.5
+    assert settings.http_pool_timeout_s == 10.0
+    assert settings.http2_enabled is True
+    assert settings.http_keepalive_expiry_s == 120.0
+    assert settings.http_prewarm_connections == 0
+
+  def test_load_config_with_unix_socket_path(self) -> None:
+    """Test that a target's Unix socket path is read with or without a unix:// prefix."""
+    env = {
+      "GTH_STATE_FILE_PATH": "",
+      "GTH_ARR_0_TYPE": "radarr",
+      "GTH_ARR_0_NAME": "radarr1",
+      "GTH_ARR_0_BASEURL": "http://radarr1:7878",
+      "GTH_ARR_0_APIKEY": "key1",
+      "GTH_ARR_0_UNIX_SOCKET_PATH": "unix:///run/radarr/radarr.sock",
+      "GTH_ARR_1_TYPE": "sonarr",
+      "GTH_ARR_1_NAME": "sonarr1",
+      "GTH_ARR_1_BASEURL": "http://sonarr1:8989",
+      "GTH_ARR_1_APIKEY": "key2",
+    }
+    config = load_config(env)
+    assert config.targets[0].unix_socket_path == "/run/radarr/radarr.sock"
+    assert config.targets[1].unix_socket_path is None
+
+  def test_unix_socket_path_must_be_absolute(self) -> None:
+    """Test that a relative Unix socket path is rejected."""
+    with pytest.raises(ValidationError, match="unix_socket_path must be an absolute path"):
+      ArrTarget(
+        name="radarr1",
+        arr_type=ArrType.RADARR,
+        base_url="http://radarr1:7878",
+        api_key="key1",
+        settings=TargetSettings(ops_per_interval=1, interval_s=60, item_revisit_s=3600),
+        unix_socket_path="radarr.sock",
+      )
+
+  def test_load_config_with_fetch_mode_override(self) -> None:
+    """Test global and per-target fetch mode configuration."""
+    env = {
+      "GTH_STATE_FILE_PATH": "",
+      "GTH_FETCH_MODE": "Wanted",
+      "GTH_ARR_0_TYPE": "radarr",
+      "GTH_ARR_0_NAME": "radarr1",
+      "GTH_ARR_0_BASEURL": "http://radarr1:7878",
+      "GTH_ARR_0_APIKEY": "key1",
+      "GTH_ARR_0_FETCH_MODE": "library",
+      "GTH_ARR_1_TYPE": "sonarr",
+      "GTH_ARR_1_NAME": "sonarr1",
+      "GTH_ARR_1_BASEURL": "http://sonarr1:8989",
+      "GTH_ARR_1_APIKEY": "key2",
+    }
+    config = load_config(env)
+    assert config.fetch_mode == FetchMode.WANTED
+    assert config.targets[0].settings.fetch_mode == FetchMode.LIBRARY
+    assert config.targets[1].settings.fetch_mode == FetchMode.WANTED
+
+  def test_load_config_rejects_invalid_fetch_mode(self) -> None:
+    env = {
+      "GTH_STATE_FILE_PATH": "",
+      "GTH_ARR_0_TYPE": "radarr",
+      "GTH_ARR_0_NAME": "radarr1",
+      "GTH_ARR_0_BASEURL": "http://radarr1:7878",
+      "GTH_ARR_0_APIKEY": "key1",
+      "GTH_ARR_0_FETCH_MODE": "everything",
+    }
+    with pytest.raises(ValueError, match="Invalid fetch mode"):
+      load_config(env)
+
+  def test_config_state_backend(self) -> None:
+    """State backend defaults to YAML and is parsed case-insensitively."""
+    assert Config().state_backend == StateBackend.YAML
+    assert Config.model_validate({"state_backend": "SQLite"}).state_backend == StateBackend.SQLITE
+    with pytest.raises(ValidationError):
+      Config.model_validate({"state_backend": "postgres"})
+
+  def test_config_state_format(self) -> None:
+    """State format defaults to YAML and is parsed case-insensitively."""
+    assert Config().state_format == StateFormat.YAML
+    assert Config.model_validate({"state_format": "Binary"}).state_format == StateFormat.BINARY
+    with pytest.raises(ValidationError):
+      Config.model_validate({"state_format": "toml"})
+
+  def test_config_state_save_coalesce(self) -> None:
+    assert Config().state_save_coalesce_s == 1.0
+    assert Config(state_save_coalesce_s=0.0).state_save_coalesce_s == 0.0
+    with pytest.raises(ValidationError):
+      Config(state_save_coalesce_s=-1.0)
+
+  def test_config_http_coalesce_ttl(self) -> None:
+    """Coalescing caches no results by default; the TTL must not be negative."""
+    assert Config().http_coalesce_ttl_s == 0.0
+    assert Config(http_coalesce_ttl_s=2.5).http_coalesce_ttl_s == 2.5
+    with pytest.raises(ValidationError):
+      Config(http_coalesce_ttl_s=-1.0)
+
   def test_target_overrides_global_config_for_specific_target(self) -> None:
     """Verify GTH_ARR_<n>_* overrides apply to that target; others inherit global values."""
     env = {
@@ -0,0 +1,68 @@
+"""Tests for deadline queue module."""
+
+from app.deadline_queue import DeadlineQueue
+
+
+class TestDeadlineQueue:
+  def test_empty_queue_has_no_deadline(self) -> None:
+    queue = DeadlineQueue()
+    assert queue.next_deadline() is None
+    assert queue.pop_due(1e12) == []
+    assert len(queue) == 0
+
+  def test_pop_due_returns_earliest_first(self) -> None:
+    queue = DeadlineQueue()
+    queue.schedule("b", 20.0)
+    queue.schedule("a", 10.0)
+    queue.schedule("c", 30.0)
+
+    assert queue.next_deadline() == 10.0
+    assert queue.pop_due(25.0) == [("a", 10.0), ("b", 20.0)]
+    assert queue.next_deadline() == 30.0
+    assert "c" in queue
+    assert "a" not in queue
+
+  def test_reschedule_supersedes_previous_deadline(self) -> None:
+    queue = DeadlineQueue()
+    queue.schedule("a", 10.0)
+    queue.schedule("a", 50.0)
+
+    assert queue.pop_due(20.0) == []
+    assert queue.deadline("a") == 50.0
+    assert queue.pop_due(50.0) == [("a", 50.0)]
+    assert len(queue) == 0
+
+  def test_reschedule_earlier_wins(self) -> None:
+    queue = DeadlineQueue()
+    queue.schedule("a", 50.0)
+    queue.schedule("a", 5.0)
+
+    assert queue.next_deadline() == 5.0
+    assert queue.pop_due(5.0) == [("a", 5.0)]
+    assert queue.pop_due(100.0) == []
+
+  def test_remove_discards_deadline(self) -> None:
+    queue = DeadlineQueue()
+    queue.schedule("a", 10.0)
+    queue.schedule("b", 20.0)
+    queue.remove("a")
+
+    assert queue.next_deadline() == 20.0
+    assert queue.pop_due(100.0) == [("b", 20.0)]
+
+  def test_repeated_reschedules_keep_heap_bounded(self) -> None:
+    queue = DeadlineQueue()
+    for i in range(1000):
+      queue.schedule("a", float(i))
+      queue.schedule("b", float(i))
+
+    assert len(queue._heap) <= 5
+    assert [key for key, _ in queue.pop_due(1e12)] == ["a", "b"]
+
+  def test_many_keys(self) -> None:
+    queue = DeadlineQueue()
+    for i in reversed(range(5000)):
+      queue.schedule(f"t{i}", float(i))
+
+    assert [key for key, _ in queue.pop_due(2.0)] == ["t0", "t1", "t2"]
+    assert len(queue) == 4997
@@ -283,3 +283,18 @@ class TestSeasonHandler:
     """Test SeasonId.format_for_state returns composite series/season key."""
     season_id = SeasonId(series_id=123, season_number=4, series_name="Test Series")
     assert season_id.format_for_state() == "123:4"
+
+  def test_can_search_batch_requires_exactly_the_monitored_seasons(self) -> None:
+    """A SeriesSearch covers every monitored season, so the batch must hold all of them."""
+    handler = SeasonHandler(season_target())
+
+    def seasons(numbers: list[int], monitored: list[int] | None) -> list[dict[str, object]]:
+      return [
+        {"seriesId": 1, "seasonNumber": number, "seriesMonitoredSeasons": monitored}
+        for number in numbers
+      ]
+
+    assert handler.can_search_batch(seasons([3, 1, 2], [1, 2, 3]))
+    assert not handler.can_search_batch(seasons([1, 3], [1, 2, 3]))
+    assert not handler.can_search_batch(seasons([0, 1, 2, 3], [1, 2, 3]))
+    assert not handler.can_search_batch(seasons([1, 2, 3], None))
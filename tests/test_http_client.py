@@ -1,11 +1,24 @@
 """Tests for HTTP client implementation."""
 
+import asyncio
+import json as jsonlib
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Any
 
 import httpx
 import pytest
 
+from app.config import ArrTarget, ArrType, TargetSettings
 from app.http_client import HttpxClient
+from app.metrics import (
+  http_connections_total,
+  http_pool_wait_seconds,
+  http_requests_coalesced_total,
+)
+from app.single_flight import SingleFlight
 
 
 class FakeClient:
@@ -17,6 +30,7 @@ class FakeClient:
     self.responses = responses or {}
     self.status_codes = status_codes or {}
     self.calls: list[tuple[str, str, dict[str, Any] | None]] = []
+    self.closed_streams: list[str] = []
 
   async def get(
     self, url: str, headers: dict[str, str] | None = None, timeout: float | None = None
@@ -40,6 +54,22 @@ class FakeClient:
     data = self.responses.get(url, {})
     return FakeResponse(status, data)
 
+  @asynccontextmanager
+  async def stream(
+    self,
+    method: str,
+    url: str,
+    headers: dict[str, str] | None = None,
+    timeout: float | None = None,
+  ) -> AsyncIterator["FakeResponse"]:
+    """Fake streamed request; the body is served in small chunks."""
+    self.calls.append((f"STREAM {method}", url, None))
+    status = self.status_codes.get(url, 200)
+    data = self.responses.get(url, [])
+    response = FakeResponse(status, data)
+    yield response
+    self.closed_streams.append(url)
+
   async def aclose(self) -> None:
     """Fake close."""
     pass
@@ -56,6 +86,12 @@ class FakeResponse:
     """Return JSON data."""
     return self._data
 
+  async def aiter_bytes(self) -> AsyncIterator[bytes]:
+    """Yield the JSON-encoded body in 7-byte chunks."""
+    body = jsonlib.dumps(self._data).encode()
+    for start in range(0, len(body), 7):
+      yield body[start : start + 7]
+
   def raise_for_status(self) -> None:
     """Raise error for non-2xx status."""
     if self.status_code >= 400:
@@ -65,6 +101,102 @@ class FakeResponse:
       raise error
 
 
+class FakeTracingClient(FakeClient):
+  """Fake httpx client that reports connection events to the request's trace callback."""
+
+  def __init__(self, new_connection: bool) -> None:
+    super().__init__()
+    self.new_connection = new_connection
+    self.timeouts: list[Any] = []
+
+  async def get(
+    self,
+    url: str,
+    headers: dict[str, str] | None = None,
+    timeout: Any = None,
+    extensions: dict[str, Any] | None = None,
+  ) -> FakeResponse:
+    """Fake GET request."""
+    self.timeouts.append(timeout)
+    trace = (extensions or {})["trace"]
+    if self.new_connection:
+      await trace("connection.connect_tcp.started", {})
+    await trace("http11.send_request_headers.started", {})
+    return await super().get(url, headers, timeout)
+
+
+class PingServer:
+  """Local HTTP/1.1 keep-alive server answering every request with a JSON body."""
+
+  def __init__(self) -> None:
+    self.connections = 0
+    self.server: asyncio.Server | None = None
+
+  async def start(self) -> str:
+    self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+    port = self.server.sockets[0].getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+  async def start_unix(self, socket_path: Path) -> None:
+    self.server = await asyncio.start_unix_server(self._serve, str(socket_path))
+
+  async def stop(self) -> None:
+    assert self.server is not None
+    self.server.close()
+
+  async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    self.connections += 1
+    body = b'{"status": "OK"}'
+    try:
+      while True:
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+        await writer.drain()
+    except asyncio.IncompleteReadError, ConnectionResetError:
+      pass
+    finally:
+      writer.close()
+
+
+def pooled_target(base_url: str, **settings: Any) -> ArrTarget:
+  return ArrTarget(
+    name="pooled",
+    arr_type=ArrType.RADARR,
+    base_url=base_url,
+    api_key="key",
+    settings=TargetSettings(ops_per_interval=1, interval_s=60, item_revisit_s=3600, **settings),
+  )
+
+
+def connections(connection: str) -> float:
+  counter = http_connections_total.labels(target="pooled", type="radarr", connection=connection)
+  return float(counter._value.get())
+
+
+def pool_waits() -> float:
+  histogram = http_pool_wait_seconds.labels(target="pooled", type="radarr")
+  return float(sum(bucket.get() for bucket in histogram._buckets))
+
+
+def coalesced(source: str) -> float:
+  counter = http_requests_coalesced_total.labels(target="pooled", type="radarr", source=source)
+  return float(counter._value.get())
+
+
+class GatedArrTransport:
+  """Mock transport handler that counts requests and holds responses until released."""
+
+  def __init__(self, body: Any) -> None:
+    self.body = body
+    self.requests: list[tuple[str, str | None]] = []
+    self.release = asyncio.Event()
+
+  async def __call__(self, request: httpx.Request) -> httpx.Response:
+    self.requests.append((str(request.url), request.headers.get("X-Api-Key")))
+    await self.release.wait()
+    return httpx.Response(200, json=self.body)
+
+
 class TestHttpxClient:
   @pytest.mark.asyncio
   async def test_get_success(self) -> None:
@@ -92,3 +224,231 @@ class TestHttpxClient:
 
     with pytest.raises(httpx.HTTPStatusError):
       await client.get("http://test", {}, 30.0)
+
+  @pytest.mark.asyncio
+  async def test_stream_json_array_yields_elements(self) -> None:
+    elements = [{"id": 1, "title": "A [1], {x}"}, {"id": 2, "tags": [1, 2]}, 3, "four"]
+    fake_client = FakeClient(responses={"http://test": elements})
+    client = HttpxClient(fake_client)
+
+    result = [element async for element in client.stream_json_array("http://test", {}, 30.0)]
+
+    assert result == elements
+    assert fake_client.closed_streams == ["http://test"]
+
+  @pytest.mark.asyncio
+  async def test_stream_json_array_rejects_non_array(self) -> None:
+    fake_client = FakeClient(responses={"http://test": {"records": []}})
+    client = HttpxClient(fake_client)
+
+    with pytest.raises(ValueError, match="Expected a JSON array"):
+      async for _ in client.stream_json_array("http://test", {}, 30.0):
+        pass
+
+  @pytest.mark.asyncio
+  async def test_stream_json_array_error_raises(self) -> None:
+    fake_client = FakeClient(status_codes={"http://test": 503})
+    client = HttpxClient(fake_client)
+
+    with pytest.raises(httpx.HTTPStatusError):
+      async for _ in client.stream_json_array("http://test", {}, 30.0):
+        pass
+
+
+class TestHttpxClientPool:
+  @pytest.mark.asyncio
+  async def test_connection_reuse_and_pool_wait_are_exported(self) -> None:
+    labels = {"target": "pooled", "type": "radarr"}
+    client = HttpxClient(FakeTracingClient(new_connection=True), metric_labels=labels)
+    new_before = connections("new")
+    reused_before = connections("reused")
+    wait_count_before = pool_waits()
+
+    await client.get("http://test", {}, 30.0)
+    client.client = FakeTracingClient(new_connection=False)
+    await client.get("http://test", {}, 30.0)
+
+    assert connections("new") - new_before == 1
+    assert connections("reused") - reused_before == 1
+    assert pool_waits() - wait_count_before == 2
+
+  @pytest.mark.asyncio
+  async def test_connect_and_pool_timeouts_apply_per_call(self) -> None:
+    fake_client = FakeTracingClient(new_connection=False)
+    client = HttpxClient(
+      fake_client,
+      metric_labels={"target": "pooled", "type": "radarr"},
+      connect_timeout_s=2.0,
+      pool_timeout_s=3.0,
+    )
+
+    await client.get("http://test", {}, 30.0)
+
+    assert fake_client.timeouts == [httpx.Timeout(30.0, connect=2.0, pool=3.0)]
+
+  @pytest.mark.asyncio
+  async def test_http2_without_h2_falls_back(self) -> None:
+    client = HttpxClient.for_target(pooled_target("http://test", http2_enabled=True))
+    await client.aclose()
+
+  @pytest.mark.asyncio
+  async def test_prewarmed_connections_are_reused(self) -> None:
+    server = PingServer()
+    base_url = await server.start()
+    client = HttpxClient.for_target(
+      pooled_target(base_url, http_max_connections=4, http_keepalive_expiry_s=60.0)
+    )
+    new_before = connections("new")
+    reused_before = connections("reused")
+    try:
+      await client.prewarm(base_url, 2, 5.0)
+      assert server.connections == 2
+
+      await asyncio.gather(*(client.get(f"{base_url}/api", {}, 5.0) for _ in range(2)))
+    finally:
+      await client.aclose()
+      await server.stop()
+
+    assert server.connections == 2
+    assert connections("new") - new_before == 0
+    assert connections("reused") - reused_before == 2
+
+  @pytest.mark.asyncio
+  async def test_requests_over_unix_socket(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      socket_path = Path(tmpdir) / "radarr.sock"
+      server = PingServer()
+      await server.start_unix(socket_path)
+      # The host is only used for the Host header; the socket is what gets connected.
+      target = pooled_target("http://radarr:7878", http_keepalive_expiry_s=60.0).model_copy(
+        update={"unix_socket_path": str(socket_path)}
+      )
+      client = HttpxClient.for_target(target)
+      new_before = connections("new")
+      try:
+        await client.prewarm(target.base_url, 1, 5.0)
+        assert await client.get(f"{target.base_url}/api/v3/system/status", {}, 5.0) == {
+          "status": "OK"
+        }
+      finally:
+        await client.aclose()
+        await server.stop()
+
+    assert server.connections == 1
+    assert connections("new") - new_before == 0
+
+  @pytest.mark.asyncio
+  async def test_transport_override(self) -> None:
+    transport = httpx.MockTransport(
+      lambda request: httpx.Response(200, json={"host": request.url.host})
+    )
+    client = HttpxClient.for_target(pooled_target("http://radarr:7878"), transport=transport)
+    try:
+      assert await client.get("http://radarr:7878/ping", {}, 5.0) == {"host": "radarr"}
+    finally:
+      await client.aclose()
+
+  @pytest.mark.asyncio
+  async def test_prewarm_failure_is_not_raised(self) -> None:
+    client = HttpxClient.for_target(pooled_target("http://127.0.0.1:9", http_connect_timeout_s=1.0))
+    try:
+      await client.prewarm("http://127.0.0.1:9", 2, 1.0)
+    finally:
+      await client.aclose()
+
+
+class TestHttpxClientCoalescing:
+  @pytest.mark.asyncio
+  async def test_identical_gets_from_two_targets_share_one_request(self) -> None:
+    handler = GatedArrTransport({"version": "4"})
+    transport = httpx.MockTransport(handler)
+    single_flight = SingleFlight()
+    first = HttpxClient.for_target(
+      pooled_target("http://sonarr:8989"), transport=transport, single_flight=single_flight
+    )
+    second = HttpxClient.for_target(
+      pooled_target("http://sonarr:8989"), transport=transport, single_flight=single_flight
+    )
+    headers = {"X-Api-Key": "key"}
+    in_flight_before = coalesced("in_flight")
+    try:
+      gets = asyncio.gather(
+        first.get("http://sonarr:8989/api/v3/series", headers, 5.0),
+        second.get("http://sonarr:8989/api/v3/series", headers, 5.0),
+        second.get("http://sonarr:8989/api/v3/series", {"X-Api-Key": "other"}, 5.0),
+      )
+      await asyncio.sleep(0.01)
+      handler.release.set()
+      results = list(await gets)
+    finally:
+      await first.aclose()
+      await second.aclose()
+
+    assert results == [{"version": "4"}] * 3
+    assert sorted(api_key or "" for _, api_key in handler.requests) == ["key", "other"]
+    assert coalesced("in_flight") - in_flight_before == 1
+
+  @pytest.mark.asyncio
+  async def test_get_result_is_reused_within_ttl(self) -> None:
+    handler = GatedArrTransport({"version": "4"})
+    handler.release.set()
+    client = HttpxClient.for_target(
+      pooled_target("http://sonarr:8989"),
+      transport=httpx.MockTransport(handler),
+      single_flight=SingleFlight(ttl_s=60.0),
+    )
+    cache_before = coalesced("cache")
+    try:
+      for _ in range(3):
+        await client.get("http://sonarr:8989/api/v3/system/status", {"X-Api-Key": "key"}, 5.0)
+    finally:
+      await client.aclose()
+
+    assert len(handler.requests) == 1
+    assert coalesced("cache") - cache_before == 2
+
+  @pytest.mark.asyncio
+  async def test_posts_are_not_coalesced(self) -> None:
+    handler = GatedArrTransport({"id": 1})
+    handler.release.set()
+    client = HttpxClient.for_target(
+      pooled_target("http://sonarr:8989"),
+      transport=httpx.MockTransport(handler),
+      single_flight=SingleFlight(ttl_s=60.0),
+    )
+    try:
+      await asyncio.gather(
+        *(client.post("http://sonarr:8989/api/v3/command", {}, 5.0, {}) for _ in range(2))
+      )
+    finally:
+      await client.aclose()
+
+    assert len(handler.requests) == 2
+
+  @pytest.mark.asyncio
+  async def test_identical_streams_share_one_request(self) -> None:
+    handler = GatedArrTransport([{"id": 1}, {"id": 2}])
+    single_flight = SingleFlight()
+    client = HttpxClient.for_target(
+      pooled_target("http://sonarr:8989"),
+      transport=httpx.MockTransport(handler),
+      single_flight=single_flight,
+    )
+    headers = {"X-Api-Key": "key"}
+    in_flight_before = coalesced("in_flight")
+
+    async def stream() -> list[Any]:
+      url = "http://sonarr:8989/api/v3/series"
+      return [element async for element in client.stream_json_array(url, headers, 5.0)]
+
+    try:
+      streams = asyncio.gather(stream(), stream())
+      await asyncio.sleep(0.01)
+      handler.release.set()
+      results = list(await streams)
+    finally:
+      await client.aclose()
+
+    assert results == [[{"id": 1}, {"id": 2}]] * 2
+    assert len(handler.requests) == 1
+    assert coalesced("in_flight") - in_flight_before == 1
@@ -0,0 +1,83 @@
+"""Tests for the incremental JSON array parser."""
+
+import json
+
+import pytest
+
+from app.json_stream import JsonArrayParser
+
+
+def parse_in_chunks(data: bytes, chunk_size: int) -> list:
+  """Feed data to a parser in fixed-size chunks and return every element."""
+  parser = JsonArrayParser()
+  elements = []
+  for start in range(0, len(data), chunk_size):
+    elements.extend(parser.feed(data[start : start + chunk_size]))
+  parser.close()
+  return elements
+
+
+class TestJsonArrayParser:
+  @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 4096])
+  def test_elements_match_json_loads(self, chunk_size: int) -> None:
+    payload = [
+      {"id": 1, "title": 'Quote " and backslash \\\\ and ] } [ {', "tags": [1, 2]},
+      {"nested": {"list": [[], {}, [1, [2, [3]]]]}, "unicode": "caf\u00e9 \u2603"},
+      "plain",
+      42,
+      -1.5e3,
+      True,
+      False,
+      None,
+      [],
+      {},
+    ]
+    data = json.dumps(payload, ensure_ascii=False).encode()
+
+    assert parse_in_chunks(data, chunk_size) == payload
+
+  def test_elements_returned_as_soon_as_complete(self) -> None:
+    parser = JsonArrayParser()
+
+    assert parser.feed(b'[{"id": 1}, {"id"') == [{"id": 1}]
+    assert parser.feed(b": 2}") == [{"id": 2}]
+    assert parser.feed(b", 3") == []
+    assert parser.feed(b"4]") == [34]
+    parser.close()
+
+  def test_escaped_quote_split_across_chunks(self) -> None:
+    parser = JsonArrayParser()
+
+    assert parser.feed(b'["a\\\\') == []
+    assert parser.feed(b'", "b\\') == ["a\\"]
+    assert parser.feed(b'"c"]') == ['b"c']
+    parser.close()
+
+  def test_empty_array_with_whitespace(self) -> None:
+    assert parse_in_chunks(b" \n[ \t]\n", 1) == []
+
+  @pytest.mark.parametrize(
+    "data",
+    [b'{"records": []}', b"[1,]", b"[1,,2]", b"[,1]", b"[1}", b"[1] 2", b"x[1]"],
+  )
+  def test_malformed_input_raises(self, data: bytes) -> None:
+    with pytest.raises(ValueError):
+      parse_in_chunks(data, 1)
+
+  def test_truncated_input_raises_on_close(self) -> None:
+    parser = JsonArrayParser()
+    assert parser.feed(b'[{"id": 1}, {"id": 2') == [{"id": 1}]
+
+    with pytest.raises(ValueError, match="ended before its closing bracket"):
+      parser.close()
+
+  def test_buffer_holds_only_current_element(self) -> None:
+    parser = JsonArrayParser()
+    element = json.dumps({"title": "x" * 1000}).encode()
+    parser.feed(b"[")
+    for _ in range(100):
+      assert parser.feed(element + b",") == [{"title": "x" * 1000}]
+      # Completed elements are dropped from the buffer between chunks.
+      assert len(parser._buffer) == 0
+    assert parser.feed(element[:10]) == []
+    assert len(parser._buffer) == 10
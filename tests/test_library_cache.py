@@ -0,0 +1,263 @@
+"""Tests for library cache module."""
+
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+
+from app.config import ArrTarget, ArrType, TargetSettings
+from app.library_cache import HISTORY_OVERLAP_S, LibraryCache, LibrarySource
+from app.metrics import library_cache_lookups_total, library_snapshot_age_seconds
+from app.state import TargetState
+
+
+class FakeClock:
+  """Manually advanced clock."""
+
+  def __init__(self) -> None:
+    self.now = 1000.0
+
+  def __call__(self) -> float:
+    return self.now
+
+
+class FakeLibrary:
+  """In-memory library of movie records that records how it was fetched."""
+
+  def __init__(self, movies: list[dict[str, Any]], fail_after: int | None = None) -> None:
+    self.movies = {movie["id"]: movie for movie in movies}
+    self.fail_after = fail_after
+    self.fetch_count = 0
+    self.fetched_records: list[Any] = []
+    self.history_queries: list[float] = []
+    self.changed: set[Any] = set()
+
+  async def fetch_all(self) -> AsyncGenerator[dict[str, Any], None]:
+    self.fetch_count += 1
+    for index, movie in enumerate(self.movies.values()):
+      if self.fail_after is not None and index >= self.fail_after:
+        raise RuntimeError("fetch failed")
+      yield movie
+
+  async def fetch_record(self, movie_id: Any) -> list[dict[str, Any]]:
+    self.fetched_records.append(movie_id)
+    movie = self.movies.get(movie_id)
+    return [] if movie is None else [movie]
+
+  async def changed_keys(self, since_timestamp: float) -> set[Any]:
+    self.history_queries.append(since_timestamp)
+    changed, self.changed = self.changed, set()
+    return changed
+
+  def source(self) -> LibrarySource:
+    return LibrarySource(
+      fetch_all=self.fetch_all,
+      record_key=lambda item: item["id"],
+      fetch_record=self.fetch_record,
+      changed_keys=self.changed_keys,
+    )
+
+
+def create_target(library_refresh_s: int, library_reconcile_s: int = 0) -> ArrTarget:
+  return ArrTarget(
+    name="cached",
+    arr_type=ArrType.RADARR,
+    base_url="http://test",
+    api_key="key",
+    settings=TargetSettings(
+      ops_per_interval=1,
+      interval_s=60,
+      item_revisit_s=3600,
+      library_refresh_s=library_refresh_s,
+      library_reconcile_s=library_reconcile_s,
+    ),
+  )
+
+
+async def collect(
+  cache: LibraryCache, target: ArrTarget, target_state: TargetState, library: FakeLibrary
+) -> list[Any]:
+  return [item async for item in cache.iter_items(target, target_state, library.source(), {})]
+
+
+def lookups(result: str) -> float:
+  counter = library_cache_lookups_total.labels(target="cached", type="radarr", result=result)
+  return float(counter._value.get())
+
+
+class TestLibraryCache:
+  @pytest.mark.asyncio
+  async def test_disabled_cache_fetches_every_time(self) -> None:
+    cache = LibraryCache()
+    target = create_target(library_refresh_s=0)
+    target_state = TargetState()
+    library = FakeLibrary([{"id": 1}, {"id": 2}])
+
+    assert await collect(cache, target, target_state, library) == [{"id": 1}, {"id": 2}]
+    assert await collect(cache, target, target_state, library) == [{"id": 1}, {"id": 2}]
+    assert library.fetch_count == 2
+    assert cache.snapshot("cached") is None
+    assert target_state.library_sync_watermark == 0.0
+
+  @pytest.mark.asyncio
+  async def test_snapshot_reused_until_refresh_expires(self) -> None:
+    clock = FakeClock()
+    cache = LibraryCache(clock=clock)
+    target = create_target(library_refresh_s=300)
+    target_state = TargetState()
+    library = FakeLibrary([{"id": 1}])
+    hits_before = lookups("hit")
+    misses_before = lookups("miss")
+
+    await collect(cache, target, target_state, library)
+    assert target_state.library_sync_watermark == 1000.0
+    clock.now += 120
+    assert await collect(cache, target, target_state, library) == [{"id": 1}]
+    assert library.fetch_count == 1
+    assert library_snapshot_age_seconds.labels(target="cached", type="radarr")._value.get() == 120
+
+    clock.now += 180
+    await collect(cache, target, target_state, library)
+    assert library.fetch_count == 2
+    assert lookups("hit") - hits_before == 1
+    assert lookups("miss") - misses_before == 2
+
+  @pytest.mark.asyncio
+  async def test_partially_consumed_miss_stores_full_snapshot(self) -> None:
+    cache = LibraryCache()
+    target = create_target(library_refresh_s=300)
+    library = FakeLibrary([{"id": 1}, {"id": 2}, {"id": 3}])
+
+    items = cache.iter_items(target, TargetState(), library.source(), {})
+    assert await anext(items) == {"id": 1}
+    await items.aclose()
+
+    snapshot = cache.snapshot("cached")
+    assert snapshot is not None
+    assert snapshot.items == ({"id": 1}, {"id": 2}, {"id": 3})
+
+  @pytest.mark.asyncio
+  async def test_failed_fetch_keeps_previous_snapshot(self) -> None:
+    clock = FakeClock()
+    cache = LibraryCache(clock=clock)
+    target = create_target(library_refresh_s=300)
+    target_state = TargetState()
+    await collect(cache, target, target_state, FakeLibrary([{"id": 1}]))
+
+    clock.now += 300
+    with pytest.raises(RuntimeError):
+      await collect(cache, target, target_state, FakeLibrary([{"id": 2}, {"id": 3}], fail_after=1))
+
+    snapshot = cache.snapshot("cached")
+    assert snapshot is not None
+    assert snapshot.items == ({"id": 1},)
+    assert target_state.library_sync_watermark == 1000.0
+
+  @pytest.mark.asyncio
+  async def test_invalidate_forces_refetch(self) -> None:
+    cache = LibraryCache()
+    target = create_target(library_refresh_s=300)
+    target_state = TargetState()
+    library = FakeLibrary([{"id": 1}])
+
+    await collect(cache, target, target_state, library)
+    cache.invalidate("cached")
+    await collect(cache, target, target_state, library)
+
+    assert library.fetch_count == 2
+
+  @pytest.mark.asyncio
+  async def test_marked_record_refetched_before_refresh_expires(self) -> None:
+    clock = FakeClock()
+    cache = LibraryCache(clock=clock)
+    target = create_target(library_refresh_s=300)
+    target_state = TargetState()
+    library = FakeLibrary([{"id": 1}, {"id": 2}])
+    await collect(cache, target, target_state, library)
+
+    library.movies[2] = {"id": 2, "hasFile": True}
+    cache.mark_changed("cached", 2)
+    clock.now += 10
+    items = await collect(cache, target, target_state, library)
+
+    assert items == [{"id": 1}, {"id": 2, "hasFile": True}]
+    assert library.fetch_count == 1
+    assert library.fetched_records == [2]
+    await collect(cache, target, target_state, library)
+    assert library.fetched_records == [2]
+
+  def test_mark_changed_without_snapshot_is_ignored(self) -> None:
+    cache = LibraryCache()
+    cache.mark_changed("cached", 1)
+    assert cache.snapshot("cached") is None
+
+
+class TestLibraryCacheIncrementalSync:
+  @pytest.mark.asyncio
+  async def test_sync_refetches_only_changed_records(self) -> None:
+    clock = FakeClock()
+    cache = LibraryCache(clock=clock)
+    target = create_target(library_refresh_s=60, library_reconcile_s=3600)
+    target_state = TargetState()
+    library = FakeLibrary([{"id": 1, "hasFile": False}, {"id": 2}, {"id": 3}])
+    await collect(cache, target, target_state, library)
+
+    library.movies[1] = {"id": 1, "hasFile": True}
+    del library.movies[3]
+    library.movies[4] = {"id": 4}
+    library.changed = {1, 3, 4}
+    clock.now += 60
+    items = await collect(cache, target, target_state, library)
+
+    assert items == [{"id": 1, "hasFile": True}, {"id": 2}, {"id": 4}]
+    assert library.fetch_count == 1
+    assert sorted(library.fetched_records) == [1, 3, 4]
+    assert library.history_queries == [1000.0 - HISTORY_OVERLAP_S]
+    assert target_state.library_sync_watermark == 1060.0
+
+  @pytest.mark.asyncio
+  async def test_full_reconcile_after_reconcile_interval(self) -> None:
+    clock = FakeClock()
+    cache = LibraryCache(clock=clock)
+    target = create_target(library_refresh_s=60, library_reconcile_s=120)
+    target_state = TargetState()
+    library = FakeLibrary([{"id": 1}])
+    syncs_before = lookups("sync")
+
+    await collect(cache, target, target_state, library)
+    clock.now += 60
+    await collect(cache, target, target_state, library)
+    clock.now += 60
+    await collect(cache, target, target_state, library)
+
+    assert library.fetch_count == 2
+    assert len(library.history_queries) == 1
+    assert lookups("sync") - syncs_before == 1
+
+  @pytest.mark.asyncio
+  async def test_failed_sync_keeps_snapshot_and_watermark(self) -> None:
+    clock = FakeClock()
+    cache = LibraryCache(clock=clock)
+    target = create_target(library_refresh_s=60, library_reconcile_s=3600)
+    target_state = TargetState()
+    library = FakeLibrary([{"id": 1}])
+    await collect(cache, target, target_state, library)
+
+    async def failing_fetch_record(movie_id: Any) -> list[dict[str, Any]]:
+      raise RuntimeError("fetch failed")
+
+    library.changed = {1}
+    source = LibrarySource(
+      fetch_all=library.fetch_all,
+      record_key=lambda item: item["id"],
+      fetch_record=failing_fetch_record,
+      changed_keys=library.changed_keys,
+    )
+    clock.now += 60
+    with pytest.raises(RuntimeError):
+      _ = [item async for item in cache.iter_items(target, target_state, source, {})]
+
+    snapshot = cache.snapshot("cached")
+    assert snapshot is not None
+    assert snapshot.items == ({"id": 1},)
+    assert target_state.library_sync_watermark == 1000.0
@@ -1,7 +1,9 @@
 """Tests for main module."""
 
 import app.main as main_module
+from app.config import ArrTarget, ArrType, TargetSettings
 from app.main import create_web_app, main, setup_logging, start_web_server
+from app.webhooks import WebhookEvent, WebhookReceiver
 
 
 class TestMainModule:
@@ -46,3 +48,32 @@ class TestMainModule:
     client = app.test_client()
     response = client.get("/metrics")
     assert response.status_code == 200
+
+  def test_webhook_endpoint_404_when_disabled(self) -> None:
+    """Webhook endpoint is not served without a webhook receiver."""
+    app = create_web_app(metrics_enabled=False)
+    client = app.test_client()
+    response = client.post("/webhook/radarr", json={"eventType": "Test"})
+    assert response.status_code == 404
+
+  def test_webhook_endpoint_delivers_event(self) -> None:
+    """Webhook endpoint checks the token header and hands parsed events to the receiver."""
+    delivered: list[tuple[str, WebhookEvent]] = []
+    target = ArrTarget(
+      name="radarr",
+      arr_type=ArrType.RADARR,
+      base_url="http://test",
+      api_key="key",
+      settings=TargetSettings(ops_per_interval=1, interval_s=60, item_revisit_s=3600),
+    )
+    receiver = WebhookReceiver(
+      [target], "secret", lambda target_name, event: delivered.append((target_name, event))
+    )
+    client = create_web_app(metrics_enabled=False, webhook_receiver=receiver).test_client()
+    payload = {"eventType": "Download", "movie": {"id": 1}}
+
+    assert client.post("/webhook/radarr", json=payload).status_code == 401
+    response = client.post("/webhook/radarr", json=payload, headers={"X-Gatherarr-Token": "secret"})
+    assert response.status_code == 202
+    assert client.post("/webhook/radarr?token=secret", json=payload).status_code == 202
+    assert [target_name for target_name, _ in delivered] == ["radarr", "radarr"]
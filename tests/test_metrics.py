@@ -7,6 +7,7 @@ from app.metrics import (
   request_errors_total,
   requests_total,
   run_total,
+  scheduling_lag_seconds,
   skips_total,
   state_write_failures_total,
 )
@@ -22,6 +23,7 @@ class TestMetrics:
     assert request_duration_seconds is not None
     assert last_success_timestamp_seconds is not None
     assert state_write_failures_total is not None
+    assert scheduling_lag_seconds is not None
 
   def test_metrics_have_labels(self) -> None:
     run_total.labels(target="test", type="radarr", status="success").inc()
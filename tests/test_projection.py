@@ -0,0 +1,94 @@
+"""Tests for payload field projections."""
+
+from datetime import datetime, timedelta, timezone
+
+from app.config import ArrTarget, ArrType, TargetSettings
+from app.handlers import MovieHandler
+from app.projection import MOVIE_PROJECTION, SERIES_PROJECTION, project
+
+
+def radarr_target() -> ArrTarget:
+  """Create a Radarr target with tag filters so every projected field is exercised."""
+  return ArrTarget(
+    name="test-radarr",
+    arr_type=ArrType.RADARR,
+    base_url="http://test",
+    api_key="key",
+    settings=TargetSettings(
+      ops_per_interval=10,
+      interval_s=60,
+      item_revisit_s=3600,
+      include_tags={"1"},
+    ),
+  )
+
+
+class TestProject:
+  def test_keeps_only_projected_fields(self) -> None:
+    movie = {
+      "id": 1,
+      "title": "Movie",
+      "overview": "A long overview",
+      "images": [{"url": "http://image"}],
+      "movieFile": {"qualityCutoffNotMet": True, "mediaInfo": {"videoCodec": "x265"}},
+    }
+
+    assert project(movie, MOVIE_PROJECTION) == {
+      "id": 1,
+      "title": "Movie",
+      "movieFile": {"qualityCutoffNotMet": True},
+    }
+
+  def test_nested_projection_applies_to_each_list_element(self) -> None:
+    series = {
+      "id": 1,
+      "seasons": [
+        {"seasonNumber": 1, "monitored": True, "images": []},
+        {"seasonNumber": 2, "statistics": {"episodeCount": 3}},
+      ],
+    }
+
+    assert project(series, SERIES_PROJECTION) == {
+      "id": 1,
+      "seasons": [
+        {"seasonNumber": 1, "monitored": True},
+        {"seasonNumber": 2, "statistics": {"episodeCount": 3}},
+      ],
+    }
+
+  def test_null_and_scalar_values_kept_as_is(self) -> None:
+    assert project({"id": 1, "movieFile": None}, MOVIE_PROJECTION) == {"id": 1, "movieFile": None}
+    assert project(42, MOVIE_PROJECTION) == 42
+
+  def test_movie_handler_decisions_unchanged(self) -> None:
+    handler = MovieHandler(radarr_target())
+    past = (datetime.now(timezone.utc) - timedelta(days=5)).isoformat()
+    future = (datetime.now(timezone.utc) + timedelta(days=5)).isoformat()
+    extra = {"overview": "text", "ratings": {"imdb": {"value": 7.1}}, "images": [{"url": "x"}]}
+    movies = [
+      {"id": 1, "title": "A", "monitored": True, "hasFile": False, "tags": [1], **extra},
+      {"id": 2, "title": "B", "monitored": True, "hasFile": False, "tags": [1], "inCinemas": past},
+      {
+        "id": 3,
+        "title": "C",
+        "monitored": True,
+        "hasFile": False,
+        "tags": [1],
+        "digitalRelease": future,
+      },
+      {"id": 4, "title": "D", "monitored": False, "hasFile": False, "tags": [1], "inCinemas": past},
+      {
+        "id": 5,
+        "title": "E",
+        "monitored": True,
+        "hasFile": True,
+        "tags": [1],
+        "movieFile": {"qualityCutoffNotMet": True, "mediaInfo": {}},
+      },
+      {"id": 6, "title": "F", "monitored": True, "hasFile": False, "tags": [2], "inCinemas": past},
+    ]
+
+    for movie in movies:
+      projected = project(movie, MOVIE_PROJECTION)
+      assert handler.should_search(projected, {}) == handler.should_search(movie, {})
+      assert handler.extract_item_id(projected) == handler.extract_item_id(movie)
@@ -0,0 +1,114 @@
+"""Tests for rate limiter module."""
+
+import asyncio
+
+import pytest
+
+from app.config import ArrTarget, ArrType, TargetSettings
+from app.metrics import http_send_interval_seconds
+from app.rate_limiter import AdaptiveRateLimiter
+
+
+class FakeClock:
+  """Manually advanced clock."""
+
+  def __init__(self) -> None:
+    self.now = 1000.0
+
+  def __call__(self) -> float:
+    return self.now
+
+
+class FakeSleep:
+  """Sleep that records its delays and advances the clock instead of waiting."""
+
+  def __init__(self, clock: FakeClock) -> None:
+    self.clock = clock
+    self.delays: list[float] = []
+
+  async def __call__(self, delay: float) -> None:
+    self.delays.append(delay)
+    self.clock.now += delay
+
+
+def create_limiter(clock: FakeClock, recovery_s: float = 100.0) -> AdaptiveRateLimiter:
+  target = ArrTarget(
+    name="throttled",
+    arr_type=ArrType.SONARR,
+    base_url="http://test",
+    api_key="key",
+    settings=TargetSettings(
+      ops_per_interval=1,
+      interval_s=60,
+      item_revisit_s=3600,
+      http_retry_initial_delay_s=1.0,
+      http_retry_max_delay_s=8.0,
+      http_throttle_recovery_s=recovery_s,
+    ),
+  )
+  return AdaptiveRateLimiter(target, clock=clock, sleep=FakeSleep(clock))
+
+
+class TestAdaptiveRateLimiter:
+  def test_unthrottled_sends_do_not_wait(self) -> None:
+    clock = FakeClock()
+    limiter = create_limiter(clock)
+
+    for _ in range(10):
+      asyncio.run(limiter.acquire())
+
+    assert clock.now == 1000.0
+
+  def test_throttle_doubles_interval_up_to_max(self) -> None:
+    limiter = create_limiter(FakeClock())
+
+    intervals = []
+    for _ in range(5):
+      limiter.throttle()
+      intervals.append(limiter.interval_s())
+
+    assert intervals == [1.0, 2.0, 4.0, 8.0, 8.0]
+    gauge = http_send_interval_seconds.labels(target="throttled", type="sonarr")
+    assert gauge._value.get() == 8.0
+
+  def test_sends_are_spaced_by_interval(self) -> None:
+    clock = FakeClock()
+    limiter = create_limiter(clock, recovery_s=1_000_000.0)
+    limiter.throttle()
+    limiter.throttle()
+
+    async def send_three() -> None:
+      await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+
+    asyncio.run(send_three())
+    assert clock.now == pytest.approx(1004.0)
+
+  def test_interval_recovers_linearly(self) -> None:
+    clock = FakeClock()
+    limiter = create_limiter(clock, recovery_s=100.0)
+    limiter.throttle()
+    limiter.throttle()
+
+    clock.now += 50
+    assert limiter.interval_s() == pytest.approx(1.0)
+    clock.now += 50
+    assert limiter.interval_s() == 0.0
+    limiter.throttle()
+    assert limiter.interval_s() == 1.0
+
+  def test_retry_after_holds_sends(self) -> None:
+    clock = FakeClock()
+    limiter = create_limiter(clock)
+    limiter.throttle(retry_after_s=5.0)
+
+    asyncio.run(limiter.acquire())
+    assert clock.now == 1005.0
+
+  def test_zero_recovery_disables_limiter(self) -> None:
+    clock = FakeClock()
+    limiter = create_limiter(clock, recovery_s=0.0)
+    limiter.throttle(retry_after_s=5.0)
+
+    asyncio.run(limiter.acquire())
+    assert limiter.interval_s() == 0.0
+    assert clock.now == 1000.0
@@ -1,15 +1,26 @@
 """Tests for scheduler module."""
 
+import asyncio
 import time
+from collections.abc import AsyncIterator
 from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Any
 
 import pytest
 
 from app.arr_client import ArrClient
-from app.config import ArrTarget, ArrType, TargetSettings
+from app.config import ArrTarget, ArrType, FetchMode, TargetSettings
+from app.handlers import MovieId
+from app.metrics import scheduling_lag_seconds, startup_duration_seconds
 from app.scheduler import Scheduler, _search_backoff_delay_s
-from app.state import InMemoryStateStorage, ItemState, ItemStatus, RunStatus, StateManager
+from app.state import (
+  InMemoryStateStorage,
+  ItemState,
+  ItemStatus,
+  RunStatus,
+  StateManager,
+)
+from app.webhooks import WebhookEvent, WebhookEventType
 
 if TYPE_CHECKING:
   pass
@@ -28,6 +39,7 @@ class FakeArrClient:
     self.search_movie_id: Any | None = None
     self.search_season_series_id: int | None = None
     self.search_season_number: int | None = None
+    self.search_movies_batches: list[list[int]] = []
 
   async def get_movies(self, logging_ids: dict[str, Any]) -> list[dict]:
     self.get_movies_called = True
@@ -66,12 +78,24 @@ class FakeArrClient:
       }
     ]
 
+  async def iter_movies(self, logging_ids: dict[str, Any]) -> AsyncIterator[dict]:
+    for movie in await self.get_movies(logging_ids):
+      yield movie
+
+  async def iter_seasons(self, logging_ids: dict[str, Any]) -> AsyncIterator[dict]:
+    for season in await self.get_seasons(logging_ids):
+      yield season
+
   async def search_movie(self, movie_id: Any, logging_ids: dict[str, Any]) -> dict:
     self.search_movie_called = True
     self.search_movie_calls += 1
     self.search_movie_id = movie_id
     return {"id": 1}
 
+  async def search_movies(self, movie_ids: list[Any], logging_ids: dict[str, Any]) -> dict:
+    self.search_movies_batches.append([movie_id.movie_id for movie_id in movie_ids])
+    return {"id": 1}
+
   async def search_season(self, season_id: Any, logging_ids: dict[str, Any]) -> dict:
     self.search_season_called = True
     self.search_season_series_id = (
@@ -83,12 +107,9 @@ class FakeArrClient:
     return {"id": 1}
 
 
-class FakeClientWithError:
+class FakeClientWithError(FakeArrClient):
   """Fake client that raises errors."""
 
-  def __init__(self, target: ArrTarget) -> None:
-    self.target = target
-
   async def get_movies(self, logging_ids: dict[str, Any]) -> list[dict]:
     raise RuntimeError("API error")
 
@@ -181,6 +202,11 @@ def create_target(
     "search_retry_initial_delay_s",
     "search_retry_backoff_exponent",
     "search_retry_max_delay_s",
+    "search_concurrency",
+    "search_batch_size",
+    "series_search_threshold",
+    "fetch_mode",
+    "library_refresh_s",
   }
   for field in settings_fields:
     if field in overrides:
@@ -380,3 +406,639 @@ class TestScheduler:
     assert fake_client.search_movie_calls == 2
     target_state = state_manager.get_target_state("test-max-attempts")
     assert target_state.items["1"].consecutive_failures == 2
+
+
+class TestSchedulerLoop:
+  @pytest.mark.asyncio
+  async def test_start_runs_due_target_and_stop_wakes_loop(
+    self, state_manager: StateManager
+  ) -> None:
+    target = create_target("test-loop", ArrType.RADARR)
+    fake_client = FakeArrClient(target)
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    task = asyncio.create_task(scheduler.start())
+    await asyncio.sleep(0.05)
+    assert fake_client.get_movies_called
+
+    scheduler.stop()
+    await asyncio.wait_for(task, timeout=1.0)
+
+  @pytest.mark.asyncio
+  async def test_first_run_latency_is_recorded_once(self, state_manager: StateManager) -> None:
+    target = create_target("test-loop", ArrType.RADARR)
+    scheduler = create_scheduler(target, state_manager, FakeArrClient(target))
+    first_run = startup_duration_seconds.labels(phase="first_run")
+    first_run.set(-1.0)
+
+    task = asyncio.create_task(scheduler.start())
+    await asyncio.sleep(0.05)
+    recorded = first_run._value.get()
+    assert recorded >= 0.0
+
+    scheduler.rearm("test-loop")
+    await asyncio.sleep(0.05)
+    assert first_run._value.get() == recorded
+
+    scheduler.stop()
+    await asyncio.wait_for(task, timeout=1.0)
+
+  @pytest.mark.asyncio
+  async def test_start_sleeps_until_deadline(self, state_manager: StateManager) -> None:
+    target = create_target("test-loop", ArrType.RADARR)
+    state_manager.get_target_state("test-loop").last_run_timestamp = time.time()
+    fake_client = FakeArrClient(target)
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    task = asyncio.create_task(scheduler.start())
+    await asyncio.sleep(0.05)
+    assert not fake_client.get_movies_called
+    assert scheduler._deadlines.deadline("test-loop") is not None
+
+    scheduler.stop()
+    await asyncio.wait_for(task, timeout=1.0)
+
+  @pytest.mark.asyncio
+  async def test_rearm_wakes_loop_early(self, state_manager: StateManager) -> None:
+    target = create_target("test-loop", ArrType.RADARR)
+    state_manager.get_target_state("test-loop").last_run_timestamp = time.time()
+    fake_client = FakeArrClient(target)
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    task = asyncio.create_task(scheduler.start())
+    await asyncio.sleep(0.05)
+    scheduler.rearm("test-loop")
+    await asyncio.sleep(0.05)
+    assert fake_client.get_movies_called
+
+    # After the run, the target is re-armed for the next interval.
+    deadline = scheduler._deadlines.deadline("test-loop")
+    assert deadline is not None
+    assert deadline > time.time() + 30
+
+    scheduler.stop()
+    await asyncio.wait_for(task, timeout=1.0)
+
+  def test_rearm_unknown_target_raises(self, state_manager: StateManager) -> None:
+    target = create_target("test-loop", ArrType.RADARR)
+    scheduler = create_scheduler(target, state_manager, FakeArrClient(target))
+
+    with pytest.raises(ValueError, match="Unknown target"):
+      scheduler.rearm("missing")
+
+
+class FakeBlockingClient(FakeClientWithSingleEligibleMovie):
+  """Fake client whose movie fetch blocks until released."""
+
+  def __init__(self, target: ArrTarget) -> None:
+    super().__init__(target)
+    self.release = asyncio.Event()
+    self.fetch_calls = 0
+    self.active_fetches = 0
+    self.max_active_fetches = 0
+
+  async def get_movies(self, logging_ids: dict[str, Any]) -> list[dict]:
+    self.fetch_calls += 1
+    self.active_fetches += 1
+    self.max_active_fetches = max(self.max_active_fetches, self.active_fetches)
+    try:
+      await self.release.wait()
+      return await super().get_movies(logging_ids)
+    finally:
+      self.active_fetches -= 1
+
+
+class TestSchedulerTargetIsolation:
+  @pytest.mark.asyncio
+  async def test_slow_target_does_not_stall_other_targets(
+    self, state_manager: StateManager
+  ) -> None:
+    slow_target = create_target("slow", ArrType.RADARR, interval_s=1)
+    fast_target = create_target("fast", ArrType.RADARR, interval_s=1)
+    slow_client = FakeBlockingClient(slow_target)
+    fast_client = FakeArrClient(fast_target)
+    arr_clients: dict[str, ArrClient] = {"slow": slow_client, "fast": fast_client}  # type: ignore[dict-item]
+    scheduler = Scheduler([slow_target, fast_target], state_manager, arr_clients)
+
+    task = asyncio.create_task(scheduler.start())
+    await asyncio.sleep(1.3)
+    # The fast target completed its first run and was re-armed for its next interval
+    # while the slow target is still blocked.
+    assert fast_client.search_movie_calls >= 2
+    assert slow_client.fetch_calls == 1
+
+    slow_client.release.set()
+    scheduler.stop()
+    await asyncio.wait_for(task, timeout=1.0)
+    assert slow_client.search_movie_calls == 1
+
+  @pytest.mark.asyncio
+  async def test_rearm_during_run_does_not_overlap(self, state_manager: StateManager) -> None:
+    target = create_target("slow", ArrType.RADARR, interval_s=3600)
+    client = FakeBlockingClient(target)
+    scheduler = create_scheduler(target, state_manager, client)
+
+    task = asyncio.create_task(scheduler.start())
+    await asyncio.sleep(0.05)
+    scheduler.rearm("slow")
+    await asyncio.sleep(0.05)
+    assert client.fetch_calls == 1
+
+    client.release.set()
+    await asyncio.sleep(0.05)
+    # The deferred due run starts once the first run finishes, never concurrently.
+    assert client.fetch_calls == 2
+    assert client.max_active_fetches == 1
+
+    scheduler.stop()
+    await asyncio.wait_for(task, timeout=1.0)
+
+  @pytest.mark.asyncio
+  async def test_scheduling_lag_is_recorded(self, state_manager: StateManager) -> None:
+    target = create_target("lag-target", ArrType.RADARR)
+    scheduler = create_scheduler(target, state_manager, FakeArrClient(target))
+
+    task = asyncio.create_task(scheduler.start())
+    await asyncio.sleep(0.05)
+    scheduler.stop()
+    await asyncio.wait_for(task, timeout=1.0)
+
+    metric = scheduling_lag_seconds.labels(target="lag-target", type="radarr")
+    # Target was due at epoch 0 + interval, so the first run reports a large lag.
+    assert metric._sum.get() > 0
+
+
+class FakeClientWithConcurrentSearches(FakeArrClient):
+  """Fake client with many eligible movies whose searches finish out of order."""
+
+  def __init__(self, target: ArrTarget, movie_count: int, failing_ids: set[int]) -> None:
+    super().__init__(target)
+    self.movie_count = movie_count
+    self.failing_ids = failing_ids
+    self.active_searches = 0
+    self.max_active_searches = 0
+    self.searched_ids: list[int] = []
+
+  async def get_movies(self, logging_ids: dict[str, Any]) -> list[dict]:
+    past_release = (datetime.now(timezone.utc) - timedelta(days=5)).isoformat()
+    return [
+      {
+        "id": movie_id,
+        "title": f"Movie {movie_id}",
+        "monitored": True,
+        "hasFile": False,
+        "digitalRelease": past_release,
+      }
+      for movie_id in range(1, self.movie_count + 1)
+    ]
+
+  async def search_movie(self, movie_id: Any, logging_ids: dict[str, Any]) -> dict:
+    self.active_searches += 1
+    self.max_active_searches = max(self.max_active_searches, self.active_searches)
+    try:
+      # Later items finish first.
+      await asyncio.sleep(0.001 * (self.movie_count - movie_id.movie_id + 1))
+      self.searched_ids.append(movie_id.movie_id)
+      if movie_id.movie_id in self.failing_ids:
+        raise RuntimeError("Search error")
+      return {"id": movie_id.movie_id}
+    finally:
+      self.active_searches -= 1
+
+
+class TestSchedulerSearchConcurrency:
+  @pytest.mark.asyncio
+  async def test_default_concurrency_searches_sequentially(
+    self, state_manager: StateManager
+  ) -> None:
+    target = create_target("test", ArrType.RADARR, ops_per_interval=5)
+    fake_client = FakeClientWithConcurrentSearches(target, movie_count=5, failing_ids=set())
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    assert fake_client.max_active_searches == 1
+    assert fake_client.searched_ids == [1, 2, 3, 4, 5]
+
+  @pytest.mark.asyncio
+  async def test_concurrency_is_bounded(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.RADARR, ops_per_interval=20, search_concurrency=4)
+    fake_client = FakeClientWithConcurrentSearches(target, movie_count=20, failing_ids=set())
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    assert fake_client.max_active_searches == 4
+    target_state = state_manager.get_target_state("test")
+    assert len(target_state.items) == 20
+    assert all(item.last_result == "search_triggered" for item in target_state.items.values())
+
+  @pytest.mark.asyncio
+  async def test_ops_limit_exact_with_failures(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.RADARR, ops_per_interval=5, search_concurrency=3)
+    fake_client = FakeClientWithConcurrentSearches(target, movie_count=20, failing_ids={2, 3, 7})
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    target_state = state_manager.get_target_state("test")
+    succeeded = [i for i in target_state.items.values() if i.last_result == "search_triggered"]
+    failed = [i for i in target_state.items.values() if i.last_result == "search_failed"]
+    # Failed searches do not consume ops, so exactly ops_per_interval searches succeed.
+    assert len(succeeded) == 5
+    assert {i.item_id for i in failed} == {"2", "3", "7"}
+    assert all(i.consecutive_failures == 1 for i in failed)
+    assert len(fake_client.searched_ids) == 8
+
+
+class FakeClientWithFailingBatches(FakeClientWithConcurrentSearches):
+  """Fake client whose batch searches always fail."""
+
+  async def search_movies(self, movie_ids: list[Any], logging_ids: dict[str, Any]) -> dict:
+    self.search_movies_batches.append([movie_id.movie_id for movie_id in movie_ids])
+    raise RuntimeError("Batch search error")
+
+
+class TestSchedulerBatchSearch:
+  @pytest.mark.asyncio
+  async def test_movies_grouped_into_batches(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.RADARR, ops_per_interval=7, search_batch_size=3)
+    fake_client = FakeClientWithConcurrentSearches(target, movie_count=10, failing_ids=set())
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    # 7 ops: two full batches of 3, then the remaining op as a single search.
+    assert fake_client.search_movies_batches == [[1, 2, 3], [4, 5, 6]]
+    assert fake_client.searched_ids == [7]
+    target_state = state_manager.get_target_state("test")
+    assert sorted(target_state.items, key=int) == [str(i) for i in range(1, 8)]
+    assert all(item.last_result == "search_triggered" for item in target_state.items.values())
+
+  @pytest.mark.asyncio
+  async def test_default_batch_size_searches_individually(
+    self, state_manager: StateManager
+  ) -> None:
+    target = create_target("test", ArrType.RADARR, ops_per_interval=3)
+    fake_client = FakeClientWithConcurrentSearches(target, movie_count=3, failing_ids=set())
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    assert fake_client.search_movies_batches == []
+    assert fake_client.searched_ids == [1, 2, 3]
+
+  @pytest.mark.asyncio
+  async def test_failed_batch_records_failure_per_item(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.RADARR, ops_per_interval=2, search_batch_size=2)
+    fake_client = FakeClientWithFailingBatches(target, movie_count=4, failing_ids=set())
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    # Failed items do not consume ops, so the next batch is attempted too.
+    assert fake_client.search_movies_batches == [[1, 2], [3, 4]]
+    target_state = state_manager.get_target_state("test")
+    assert len(target_state.items) == 4
+    assert all(item.last_result == "search_failed" for item in target_state.items.values())
+    assert all(item.consecutive_failures == 1 for item in target_state.items.values())
+
+
+class FakeClientWithManySeasons(FakeArrClient):
+  """Fake client returning eligible seasons for several series."""
+
+  def __init__(
+    self,
+    target: ArrTarget,
+    seasons_per_series: dict[int, int],
+    monitored_seasons_known: bool = True,
+  ) -> None:
+    super().__init__(target)
+    self.seasons_per_series = seasons_per_series
+    self.monitored_seasons_known = monitored_seasons_known
+    self.searched_seasons: list[tuple[int, int]] = []
+    self.searched_series: list[int] = []
+
+  async def get_seasons(self, logging_ids: dict[str, Any]) -> list[dict]:
+    return [
+      {
+        "seriesId": series_id,
+        "seriesTitle": f"Series {series_id}",
+        "seasonNumber": season_number,
+        "seriesMonitored": True,
+        "seasonMonitored": True,
+        "seriesTags": [],
+        "seriesStatistics": {"qualityCutoffNotMet": True},
+        "seriesFirstAired": None,
+        "seasonStatistics": {"episodeFileCount": 1, "totalEpisodeCount": 10},
+        "seriesMonitoredSeasons": list(range(1, season_count + 1))
+        if self.monitored_seasons_known
+        else None,
+      }
+      for series_id, season_count in self.seasons_per_series.items()
+      for season_number in range(1, season_count + 1)
+    ]
+
+  async def search_season(self, season_id: Any, logging_ids: dict[str, Any]) -> dict:
+    self.searched_seasons.append((season_id.series_id, season_id.season_number))
+    return {"id": 1}
+
+  async def search_series(self, series_id: int, logging_ids: dict[str, Any]) -> dict:
+    self.searched_series.append(series_id)
+    return {"id": 1}
+
+
+class TestSchedulerSeriesSearch:
+  @pytest.mark.asyncio
+  async def test_seasons_coalesced_into_series_search(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.SONARR, ops_per_interval=10, series_search_threshold=3)
+    fake_client = FakeClientWithManySeasons(target, {1: 4, 2: 2, 3: 3})
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    # Series 1 and 3 reach the threshold; series 2 is searched season by season.
+    assert fake_client.searched_series == [1, 3]
+    assert fake_client.searched_seasons == [(2, 1), (2, 2)]
+    target_state = state_manager.get_target_state("test")
+    assert sorted(target_state.items) == [
+      "1:1",
+      "1:2",
+      "1:3",
+      "1:4",
+      "2:1",
+      "2:2",
+      "3:1",
+      "3:2",
+      "3:3",
+    ]
+    assert all(item.last_result == "search_triggered" for item in target_state.items.values())
+
+  @pytest.mark.asyncio
+  async def test_series_search_disabled_by_default(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.SONARR, ops_per_interval=10)
+    fake_client = FakeClientWithManySeasons(target, {1: 3})
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    assert fake_client.searched_series == []
+    assert fake_client.searched_seasons == [(1, 1), (1, 2), (1, 3)]
+
+  @pytest.mark.asyncio
+  async def test_series_search_respects_ops_limit(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.SONARR, ops_per_interval=3, series_search_threshold=2)
+    fake_client = FakeClientWithManySeasons(target, {1: 5})
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    # The series does not fit in one run, so its seasons are searched one by one instead of
+    # sending a SeriesSearch (which covers all five seasons) for each fragment.
+    assert fake_client.searched_series == []
+    assert fake_client.searched_seasons == [(1, 1), (1, 2), (1, 3)]
+    target_state = state_manager.get_target_state("test")
+    assert sorted(target_state.items) == ["1:1", "1:2", "1:3"]
+
+  @pytest.mark.asyncio
+  async def test_series_with_skipped_season_is_searched_per_season(
+    self, state_manager: StateManager
+  ) -> None:
+    target = create_target("test", ArrType.SONARR, ops_per_interval=10, series_search_threshold=2)
+    fake_client = FakeClientWithManySeasons(target, {1: 3})
+    target_state = state_manager.get_target_state("test")
+    target_state.items["1:2"] = ItemState(
+      item_id="1:2",
+      last_processed_timestamp=time.time(),
+      last_result="search_triggered",
+      last_status=ItemStatus.SUCCESS,
+    )
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    # Season 2 is within its revisit timeout; a SeriesSearch would search it anyway.
+    assert fake_client.searched_series == []
+    assert fake_client.searched_seasons == [(1, 1), (1, 3)]
+
+  @pytest.mark.asyncio
+  async def test_series_with_unknown_monitored_seasons_is_searched_per_season(
+    self, state_manager: StateManager
+  ) -> None:
+    target = create_target("test", ArrType.SONARR, ops_per_interval=10, series_search_threshold=2)
+    fake_client = FakeClientWithManySeasons(target, {1: 2}, monitored_seasons_known=False)
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    assert fake_client.searched_series == []
+    assert fake_client.searched_seasons == [(1, 1), (1, 2)]
+
+
+class FakeClientWithWantedItems(FakeArrClient):
+  """Fake client that records which fetch strategy was used."""
+
+  def __init__(self, target: ArrTarget) -> None:
+    super().__init__(target)
+    self.fetches: list[str] = []
+
+  async def get_movies(self, logging_ids: dict[str, Any]) -> list[dict]:
+    self.fetches.append("library")
+    return await super().get_movies(logging_ids)
+
+  async def get_seasons(self, logging_ids: dict[str, Any]) -> list[dict]:
+    self.fetches.append("library")
+    return await super().get_seasons(logging_ids)
+
+  async def iter_wanted_movies(self, logging_ids: dict[str, Any]) -> AsyncIterator[dict]:
+    self.fetches.append("wanted")
+    for movie in await super().get_movies(logging_ids):
+      yield movie
+
+  async def iter_wanted_seasons(self, logging_ids: dict[str, Any]) -> AsyncIterator[dict]:
+    self.fetches.append("wanted")
+    for season in await super().get_seasons(logging_ids):
+      yield season
+
+
+class TestSchedulerFetchMode:
+  @pytest.mark.asyncio
+  async def test_wanted_mode_radarr(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.RADARR, fetch_mode=FetchMode.WANTED)
+    fake_client = FakeClientWithWantedItems(target)
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    assert fake_client.fetches == ["wanted"]
+    assert fake_client.search_movie_called
+
+  @pytest.mark.asyncio
+  async def test_wanted_mode_sonarr(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.SONARR, fetch_mode=FetchMode.WANTED)
+    fake_client = FakeClientWithWantedItems(target)
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    assert fake_client.fetches == ["wanted"]
+    assert fake_client.search_season_called
+
+  @pytest.mark.asyncio
+  async def test_library_mode_is_default(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.RADARR)
+    fake_client = FakeClientWithWantedItems(target)
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    assert fake_client.fetches == ["library"]
+
+
+class FakeClientWithEndlessMovies(FakeArrClient):
+  """Fake client streaming an unbounded library."""
+
+  def __init__(self, target: ArrTarget) -> None:
+    super().__init__(target)
+    self.yielded = 0
+    self.stream_closed = False
+
+  async def iter_movies(self, logging_ids: dict[str, Any]) -> AsyncIterator[dict]:
+    past_release = (datetime.now(timezone.utc) - timedelta(days=5)).isoformat()
+    try:
+      while True:
+        self.yielded += 1
+        yield {
+          "id": self.yielded,
+          "title": f"Movie {self.yielded}",
+          "monitored": True,
+          "hasFile": False,
+          "digitalRelease": past_release,
+        }
+    finally:
+      self.stream_closed = True
+
+
+class TestSchedulerStreaming:
+  @pytest.mark.asyncio
+  async def test_stream_closed_once_ops_limit_reached(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.RADARR, ops_per_interval=3)
+    fake_client = FakeClientWithEndlessMovies(target)
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+
+    assert fake_client.stream_closed
+    assert fake_client.yielded == 4
+    assert state_manager.get_target_state("test").last_status == RunStatus.SUCCESS
+    assert len(state_manager.get_target_state("test").items) == 3
+
+
+class TestSchedulerLibraryCache:
+  @pytest.mark.asyncio
+  async def test_snapshot_reused_within_refresh_interval(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.RADARR, library_refresh_s=3600)
+    fake_client = FakeClientWithWantedItems(target)
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+    await scheduler.run_once(target)
+
+    assert fake_client.fetches == ["library"]
+    # Item state is still evaluated per run: the movies searched in the first run are
+    # skipped by the revisit timeout in the second.
+    assert fake_client.search_movie_calls == 2
+
+  @pytest.mark.asyncio
+  async def test_library_refetched_every_run_by_default(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.SONARR)
+    fake_client = FakeClientWithWantedItems(target)
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+    await scheduler.run_once(target)
+
+    assert fake_client.fetches == ["library", "library"]
+    assert scheduler.library_cache.snapshot("test") is None
+
+  @pytest.mark.asyncio
+  async def test_wanted_mode_bypasses_cache(self, state_manager: StateManager) -> None:
+    target = create_target(
+      "test", ArrType.RADARR, fetch_mode=FetchMode.WANTED, library_refresh_s=3600
+    )
+    fake_client = FakeClientWithWantedItems(target)
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    await scheduler.run_once(target)
+    await scheduler.run_once(target)
+
+    assert fake_client.fetches == ["wanted", "wanted"]
+
+
+class TestSchedulerWebhookEvents:
+  def test_download_marks_item_satisfied(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.RADARR)
+    scheduler = create_scheduler(target, state_manager, FakeArrClient(target))
+    state_manager.get_target_state("test").items["1"] = ItemState(
+      item_id="1",
+      last_processed_timestamp=0.0,
+      last_result="search_failed",
+      last_status=ItemStatus.ERROR,
+      consecutive_failures=2,
+    )
+
+    scheduler.apply_webhook_event(
+      "test", WebhookEvent(WebhookEventType.DOWNLOAD, 1, [MovieId(1, "Movie 1")])
+    )
+
+    item_state = state_manager.get_target_state("test").items["1"]
+    assert item_state.last_status == ItemStatus.SUCCESS
+    assert item_state.last_result == "webhook_download"
+    assert item_state.consecutive_failures == 0
+    assert "test" not in scheduler._deadlines
+
+  def test_satisfied_item_is_saved(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.RADARR)
+    scheduler = create_scheduler(target, state_manager, FakeArrClient(target))
+
+    scheduler.apply_webhook_event(
+      "test", WebhookEvent(WebhookEventType.GRAB, 1, [MovieId(1, "Movie 1")])
+    )
+
+    data = state_manager.storage.read()
+    assert data is not None
+    assert data["targets"]["test"]["items"]["1"]["last_result"] == "webhook_grab"
+
+  @pytest.mark.asyncio
+  async def test_satisfied_item_not_searched(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.RADARR)
+    fake_client = FakeClientWithSingleEligibleMovie(target)
+    scheduler = create_scheduler(target, state_manager, fake_client)
+
+    scheduler.apply_webhook_event(
+      "test", WebhookEvent(WebhookEventType.GRAB, 1, [MovieId(1, "Movie 1")])
+    )
+    await scheduler.run_once(target)
+
+    assert not fake_client.search_movie_called
+
+  def test_added_record_schedules_immediate_run(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.RADARR)
+    scheduler = create_scheduler(target, state_manager, FakeArrClient(target))
+
+    before = time.time()
+    scheduler.apply_webhook_event(
+      "test", WebhookEvent(WebhookEventType.MOVIE_ADDED, 5, [MovieId(5, None)])
+    )
+
+    deadline = scheduler._deadlines.deadline("test")
+    assert deadline is not None
+    assert before <= deadline <= time.time()
+    assert "5" not in state_manager.get_target_state("test").items
+
+  def test_unknown_target_raises(self, state_manager: StateManager) -> None:
+    target = create_target("test", ArrType.RADARR)
+    scheduler = create_scheduler(target, state_manager, FakeArrClient(target))
+
+    with pytest.raises(ValueError, match="Unknown target"):
+      scheduler.apply_webhook_event("missing", WebhookEvent(WebhookEventType.TEST, None))
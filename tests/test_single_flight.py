@@ -0,0 +1,283 @@
+"""Tests for single flight module."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+
+from app.single_flight import CoalescedFrom, SingleFlight
+
+
+class FakeClock:
+  """Manually advanced clock."""
+
+  def __init__(self) -> None:
+    self.now = 1000.0
+
+  def __call__(self) -> float:
+    return self.now
+
+
+class GatedFetch:
+  """Fetch that counts its calls and blocks until released."""
+
+  def __init__(self, result: Any = None, error: Exception | None = None) -> None:
+    self.result = result
+    self.error = error
+    self.calls = 0
+    self.release = asyncio.Event()
+
+  async def __call__(self) -> Any:
+    self.calls += 1
+    await self.release.wait()
+    if self.error is not None:
+      raise self.error
+    return self.result
+
+
+class GatedStream:
+  """Stream source that counts how often it is opened and blocks before its first element."""
+
+  def __init__(self, elements: list[Any], error: Exception | None = None) -> None:
+    self.elements = elements
+    self.error = error
+    self.opened = 0
+    self.closed = 0
+    self.read = 0
+    self.release = asyncio.Event()
+
+  def __call__(self) -> AsyncGenerator[Any, None]:
+    self.opened += 1
+    return self._elements()
+
+  async def _elements(self) -> AsyncGenerator[Any, None]:
+    try:
+      await self.release.wait()
+      for element in self.elements:
+        self.read += 1
+        yield element
+        await asyncio.sleep(0)
+      if self.error is not None:
+        raise self.error
+    finally:
+      self.closed += 1
+
+
+async def collect(elements: AsyncGenerator[Any, None]) -> list[Any]:
+  return [element async for element in elements]
+
+
+class TestSingleFlightDo:
+  @pytest.mark.asyncio
+  async def test_concurrent_calls_share_one_fetch(self) -> None:
+    single_flight = SingleFlight()
+    fetch = GatedFetch(result={"id": 1})
+
+    calls = [asyncio.create_task(single_flight.do("key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    fetch.release.set()
+    results = await asyncio.gather(*calls)
+
+    assert fetch.calls == 1
+    assert [result for result, _ in results] == [{"id": 1}] * 3
+    assert results[0][0] is results[1][0]
+    assert [coalesced_from for _, coalesced_from in results] == [
+      None,
+      CoalescedFrom.IN_FLIGHT,
+      CoalescedFrom.IN_FLIGHT,
+    ]
+
+  @pytest.mark.asyncio
+  async def test_different_keys_are_fetched_separately(self) -> None:
+    single_flight = SingleFlight()
+    fetch = GatedFetch(result=[])
+    fetch.release.set()
+
+    await asyncio.gather(single_flight.do("a", fetch), single_flight.do("b", fetch))
+
+    assert fetch.calls == 2
+
+  @pytest.mark.asyncio
+  async def test_error_is_shared_and_not_cached(self) -> None:
+    single_flight = SingleFlight(ttl_s=60.0)
+    fetch = GatedFetch(error=RuntimeError("boom"))
+
+    calls = [asyncio.create_task(single_flight.do("key", fetch)) for _ in range(2)]
+    await asyncio.sleep(0)
+    fetch.release.set()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+
+    assert fetch.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    with pytest.raises(RuntimeError):
+      await single_flight.do("key", fetch)
+    assert fetch.calls == 2
+
+  @pytest.mark.asyncio
+  async def test_sequential_calls_fetch_again_without_ttl(self) -> None:
+    single_flight = SingleFlight()
+    fetch = GatedFetch(result=1)
+    fetch.release.set()
+
+    await single_flight.do("key", fetch)
+    assert await single_flight.do("key", fetch) == (1, None)
+
+    assert fetch.calls == 2
+
+  @pytest.mark.asyncio
+  async def test_result_is_reused_within_ttl(self) -> None:
+    clock = FakeClock()
+    single_flight = SingleFlight(ttl_s=5.0, clock=clock)
+    fetch = GatedFetch(result=1)
+    fetch.release.set()
+
+    await single_flight.do("key", fetch)
+    clock.now += 4.9
+    assert await single_flight.do("key", fetch) == (1, CoalescedFrom.CACHE)
+    assert fetch.calls == 1
+
+    clock.now += 0.1
+    assert await single_flight.do("key", fetch) == (1, None)
+    assert fetch.calls == 2
+
+  @pytest.mark.asyncio
+  async def test_cancelled_caller_does_not_cancel_shared_fetch(self) -> None:
+    single_flight = SingleFlight()
+    fetch = GatedFetch(result=1)
+
+    first = asyncio.create_task(single_flight.do("key", fetch))
+    second = asyncio.create_task(single_flight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    fetch.release.set()
+
+    assert await second == (1, CoalescedFrom.IN_FLIGHT)
+    assert first.cancelled()
+    assert fetch.calls == 1
+
+
+class TestSingleFlightStream:
+  @pytest.mark.asyncio
+  async def test_streams_joined_before_first_element_share_one_source(self) -> None:
+    single_flight = SingleFlight()
+    source = GatedStream([1, 2, 3])
+
+    first, first_from = single_flight.stream("key", source)
+    second, second_from = single_flight.stream("key", source)
+    collecting = asyncio.gather(collect(first), collect(second))
+    await asyncio.sleep(0)
+    source.release.set()
+
+    assert list(await collecting) == [[1, 2, 3], [1, 2, 3]]
+    assert (first_from, second_from) == (None, CoalescedFrom.IN_FLIGHT)
+    assert source.opened == 1
+    assert source.closed == 1
+
+  @pytest.mark.asyncio
+  async def test_stream_is_not_joined_after_its_first_element(self) -> None:
+    single_flight = SingleFlight()
+    source = GatedStream([1, 2])
+    source.release.set()
+
+    first, _ = single_flight.stream("key", source)
+    assert await anext(first) == 1
+    second, second_from = single_flight.stream("key", source)
+
+    assert second_from is None
+    assert await collect(second) == [1, 2]
+    assert await collect(first) == [2]
+    assert source.opened == 2
+
+  @pytest.mark.asyncio
+  async def test_stream_error_reaches_every_subscriber(self) -> None:
+    single_flight = SingleFlight()
+    source = GatedStream([1], error=RuntimeError("boom"))
+    source.release.set()
+
+    first, _ = single_flight.stream("key", source)
+    second, _ = single_flight.stream("key", source)
+    results = await asyncio.gather(collect(first), collect(second), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert source.opened == 1
+
+  @pytest.mark.asyncio
+  async def test_subscriber_leaving_early_does_not_end_stream_for_others(self) -> None:
+    single_flight = SingleFlight()
+    source = GatedStream([1, 2, 3])
+    source.release.set()
+
+    first, _ = single_flight.stream("key", source)
+    second, _ = single_flight.stream("key", source)
+    assert await anext(first) == 1
+    await first.aclose()
+
+    assert await collect(second) == [1, 2, 3]
+    assert source.closed == 1
+
+  @pytest.mark.asyncio
+  async def test_cancelled_subscriber_does_not_end_stream_for_others(self) -> None:
+    single_flight = SingleFlight()
+    source = GatedStream([1, 2])
+
+    first, _ = single_flight.stream("key", source)
+    second, _ = single_flight.stream("key", source)
+    first_task = asyncio.create_task(collect(first))
+    second_task = asyncio.create_task(collect(second))
+    await asyncio.sleep(0)
+    first_task.cancel()
+    await asyncio.sleep(0)
+    source.release.set()
+
+    assert await second_task == [1, 2]
+    assert first_task.cancelled()
+    assert source.opened == 1
+
+  @pytest.mark.asyncio
+  async def test_source_is_closed_when_last_subscriber_leaves(self) -> None:
+    single_flight = SingleFlight()
+    source = GatedStream([1, 2, 3])
+
+    first, _ = single_flight.stream("key", source)
+    task = asyncio.create_task(anext(first))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+      await task
+    await first.aclose()
+
+    assert source.closed == 1
+    later, later_from = single_flight.stream("key", source)
+    assert later_from is None
+    source.release.set()
+    assert await collect(later) == [1, 2, 3]
+
+  @pytest.mark.asyncio
+  async def test_slow_subscriber_does_not_slow_down_fast_one(self) -> None:
+    single_flight = SingleFlight(max_stream_buffer=2)
+    source = GatedStream(list(range(10)))
+    source.release.set()
+
+    fast, _ = single_flight.stream("key", source)
+    slow, _ = single_flight.stream("key", source)
+    assert await anext(slow) == 0
+    fast_elements = await asyncio.wait_for(collect(fast), timeout=1.0)
+
+    assert fast_elements == list(range(10))
+    assert await collect(slow) == list(range(1, 10))
+    assert source.opened == 2
+    assert source.closed == 2
+
+  @pytest.mark.asyncio
+  async def test_subscriber_detached_before_reading_gets_whole_stream(self) -> None:
+    single_flight = SingleFlight(max_stream_buffer=3)
+    source = GatedStream(list(range(5)))
+    source.release.set()
+
+    fast, _ = single_flight.stream("key", source)
+    idle, _ = single_flight.stream("key", source)
+
+    assert await collect(fast) == list(range(5))
+    assert await collect(idle) == list(range(5))
+    assert source.opened == 2
@@ -49,6 +49,21 @@ class TestFormatBanner:
     assert REDACTED in banner
     assert "api_key: [REDACTED]" in banner
 
+  def test_banner_redacts_webhook_token(self) -> None:
+    """Banner never displays the webhook token."""
+    env = {
+      "GTH_STATE_FILE_PATH": "",
+      "GTH_WEBHOOK_TOKEN": "hook-secret",
+      "GTH_ARR_0_TYPE": "radarr",
+      "GTH_ARR_0_NAME": "Radarr",
+      "GTH_ARR_0_BASEURL": "http://radarr:7878",
+      "GTH_ARR_0_APIKEY": "key",
+    }
+    config = load_config(env)
+    banner = format_banner(config)
+    assert "hook-secret" not in banner
+    assert "webhook_token: [REDACTED]" in banner
+
   def test_banner_includes_per_target_config(self) -> None:
     """Banner displays per-target configuration with resolved settings."""
     env = {
@@ -72,6 +87,20 @@ class TestFormatBanner:
     assert "interval_s: 300" in banner
     assert "[1] Sonarr (sonarr)" in banner
     assert "base_url: http://sonarr:8989" in banner
+    assert "unix_socket_path" not in banner
+
+  def test_banner_includes_unix_socket_path(self) -> None:
+    """Banner displays the Unix socket a target is reached over."""
+    env = {
+      "GTH_STATE_FILE_PATH": "",
+      "GTH_ARR_0_TYPE": "radarr",
+      "GTH_ARR_0_NAME": "Radarr",
+      "GTH_ARR_0_BASEURL": "http://radarr:7878",
+      "GTH_ARR_0_APIKEY": "key1",
+      "GTH_ARR_0_UNIX_SOCKET_PATH": "/run/radarr.sock",
+    }
+    banner = format_banner(load_config(env))
+    assert "unix_socket_path: /run/radarr.sock" in banner
 
   def test_banner_includes_eligibility_settings(self) -> None:
     """Banner displays eligibility and tag filtering settings."""
@@ -1,20 +1,27 @@
 """Tests for state management module."""
 
 import tempfile
+from dataclasses import replace
 from pathlib import Path
 
 import yaml
 
+from app.metrics import state_saves_total
 from app.state import (
   STATE_SIZE_CAP_BYTES,
   FileStateStorage,
   InMemoryStateStorage,
+  ItemResult,
   ItemState,
   ItemStatus,
+  JournalStateStorage,
   RunStatus,
+  ShardedFileStateStorage,
+  SqliteStateStorage,
   StateManager,
   TargetState,
 )
+from app.state_codecs import BINARY_CODEC, BINARY_MAGIC
 
 
 class TestStateManagerSerialization:
@@ -117,6 +124,41 @@ class TestStateManagerSerialization:
       data = yaml.safe_load(state_path.read_text())
       assert data["total_runs"] == 1
 
+  def test_loaded_items_share_ids_and_results(self) -> None:
+    """Loaded item ids reuse the key string and known results become ItemResult members."""
+    storage = InMemoryStateStorage()
+    storage.write(
+      {
+        "targets": {
+          "radarr": {
+            "items": {
+              "".join(["4", "2"]): {
+                "item_id": "".join(["4", "2"]),
+                "last_processed_timestamp": 500.0,
+                "last_result": "".join(["search_", "triggered"]),
+                "last_status": "success",
+              },
+              "7": {
+                "item_id": "7",
+                "last_processed_timestamp": 600.0,
+                "last_result": "custom_result",
+                "last_status": "success",
+              },
+            }
+          }
+        }
+      }
+    )
+    manager = StateManager(storage)
+    manager.load()
+
+    items = manager.get_target_state("radarr").items
+    item_id, item_state = next(iter(items.items()))
+    assert item_state.item_id is item_id
+    assert item_state.last_result is ItemResult.SEARCH_TRIGGERED
+    assert items["7"].last_result == "custom_result"
+    assert not hasattr(item_state, "__dict__")
+
   def test_load_state_with_consecutive_failures(self) -> None:
     """Test that consecutive_failures is serialized and deserialized correctly."""
     data = yaml.safe_load(
@@ -171,6 +213,18 @@ targets:
 
     target_state = manager.state.targets["test-target"]
     assert target_state.items["42"].consecutive_failures == 0
+    assert target_state.library_sync_watermark == 0.0
+
+  def test_library_sync_watermark_round_trip(self) -> None:
+    """Test that the library sync watermark is persisted and restored."""
+    storage = InMemoryStateStorage()
+    manager = StateManager(storage)
+    manager.get_target_state("test-target").library_sync_watermark = 1234.5
+    manager.save()
+
+    restored = StateManager(storage)
+    restored.load()
+    assert restored.get_target_state("test-target").library_sync_watermark == 1234.5
 
   def test_multiple_targets_serialization(self) -> None:
     """Test serialization with multiple targets."""
@@ -257,6 +311,27 @@ class TestStateManager:
     assert manager.state.targets["target2"].last_run_timestamp == 200.0
 
 
+def yaml_size(manager: StateManager) -> int:
+  return len(yaml.safe_dump(manager._serialize(), default_flow_style=False, sort_keys=False))
+
+
+def build_prune_state(cap: int) -> StateManager:
+  """Two targets with interleaved timestamps, ties and entries of varying size."""
+  manager = StateManager(InMemoryStateStorage(), state_size_cap_bytes=cap)
+  for target_index, target_name in enumerate(("radarr", "sonarr")):
+    target = manager.get_target_state(target_name)
+    for i in range(40):
+      item_id = f"{target_name}-{i}" if i % 3 else f"series:{i}:season:{i % 7}"
+      target.items[item_id] = ItemState(
+        item_id=item_id,
+        last_processed_timestamp=1000.0 + (i // 2) * 2 + target_index,
+        last_result="search_triggered" if i % 4 else "dry_run_search_eligible",
+        last_status=ItemStatus.SUCCESS if i % 5 else ItemStatus.ERROR,
+        consecutive_failures=i % 5,
+      )
+  return manager
+
+
 class TestStateSizeCap:
   """Tests for state size cap pruning."""
 
@@ -336,9 +411,673 @@ class TestStateSizeCap:
       item_count = len(data["targets"]["target1"]["items"])
       assert item_count < 20
 
+  def test_prunes_same_entries_as_one_at_a_time_pruning(self) -> None:
+    """The fewest oldest entries are pruned, as when re-checking the size after each one."""
+    for cap in (300, 2000, 5000, 9000):
+      expected = build_prune_state(cap)
+      while yaml_size(expected) > cap and any(
+        target.items for target in expected.state.targets.values()
+      ):
+        # min() returns the first oldest entry, matching oldest-first pruning with ties
+        # kept in target and insertion order.
+        target_name, item_id, _ = min(
+          (
+            (target_name, item_id, item.last_processed_timestamp)
+            for target_name, target in expected.state.targets.items()
+            for item_id, item in target.items.items()
+          ),
+          key=lambda entry: entry[2],
+        )
+        del expected.state.targets[target_name].items[item_id]
+
+      manager = build_prune_state(cap)
+      manager.save()
+
+      assert manager.state.targets == expected.state.targets
+      assert yaml_size(manager) <= cap or not any(
+        target.items for target in manager.state.targets.values()
+      )
+
+  def test_prunes_everything_when_cap_cannot_be_met(self) -> None:
+    manager = StateManager(InMemoryStateStorage(), state_size_cap_bytes=10)
+    add_items(manager.get_target_state("target1"), 5)
+
+    manager.save()
+
+    assert manager.state.targets["target1"].items == {}
+
+  def test_cap_disabled_with_none(self) -> None:
+    """A cap of None never prunes."""
+    manager = StateManager(InMemoryStateStorage(), state_size_cap_bytes=None)
+    target = manager.get_target_state("target1")
+    for i in range(20):
+      target.items[str(i)] = ItemState(
+        item_id=str(i),
+        last_processed_timestamp=100.0 + i,
+        last_result="ok",
+        last_status=ItemStatus.SUCCESS,
+      )
+
+    manager.save()
+
+    assert len(target.items) == 20
+
   def test_default_cap_is_10_mb(self) -> None:
     """Default state size cap is 10 MB."""
     storage = InMemoryStateStorage()
     manager = StateManager(storage)
     assert manager.state_size_cap_bytes == STATE_SIZE_CAP_BYTES
     assert STATE_SIZE_CAP_BYTES == 10 * 1024 * 1024
+
+
+def add_items(target_state: TargetState, count: int, timestamp: float = 100.0) -> None:
+  for i in range(count):
+    target_state.items[str(i)] = ItemState(
+      item_id=str(i),
+      last_processed_timestamp=timestamp + i,
+      last_result="search_triggered",
+      last_status=ItemStatus.SUCCESS,
+    )
+
+
+class TestSqliteStateStorage:
+  """Tests for the SQLite state storage."""
+
+  def test_save_and_load_round_trip(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      database_path = Path(tmpdir) / "state.sqlite"
+      storage = SqliteStateStorage(database_path)
+      manager = StateManager(storage)
+      target_state = manager.get_target_state("radarr")
+      target_state.last_status = RunStatus.SUCCESS
+      target_state.library_sync_watermark = 50.0
+      add_items(target_state, 3)
+      target_state.items["1"] = replace(
+        target_state.items["1"], last_status=ItemStatus.ERROR, consecutive_failures=2
+      )
+      manager.state.total_runs = 4
+      manager.save()
+      storage.close()
+
+      restored = StateManager(SqliteStateStorage(database_path))
+      restored.load()
+
+      assert restored.state.total_runs == 4
+      assert restored.state.process_start_timestamp == manager.state.process_start_timestamp
+      assert restored.state.targets == manager.state.targets
+
+  def test_only_changed_rows_are_written(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      storage = SqliteStateStorage(Path(tmpdir) / "state.sqlite")
+      manager = StateManager(storage)
+      target_state = manager.get_target_state("radarr")
+      add_items(target_state, 100)
+      manager.save()
+      connection = storage._connect()
+
+      changes_before = connection.total_changes
+      manager.save()
+      assert connection.total_changes == changes_before
+
+      target_state.items["5"] = replace(target_state.items["5"], last_result="search_failed")
+      del target_state.items["6"]
+      manager.save()
+      assert connection.total_changes - changes_before == 2
+      item_ids = {row[0] for row in connection.execute("SELECT item_id FROM items")}
+      assert "6" not in item_ids
+      assert len(item_ids) == 99
+
+  def test_imports_yaml_state_once(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      yaml_path = Path(tmpdir) / "state.yaml"
+      yaml_manager = StateManager(FileStateStorage(yaml_path))
+      add_items(yaml_manager.get_target_state("sonarr"), 5)
+      yaml_manager.state.total_runs = 9
+      yaml_manager.save()
+
+      database_path = Path(tmpdir) / "state.sqlite"
+      manager = StateManager(SqliteStateStorage(database_path, import_path=yaml_path))
+      manager.load()
+
+      assert manager.state.total_runs == 9
+      assert len(manager.get_target_state("sonarr").items) == 5
+      assert not yaml_path.exists()
+      assert (Path(tmpdir) / "state.yaml.imported").exists()
+
+      reloaded = StateManager(SqliteStateStorage(database_path, import_path=yaml_path))
+      reloaded.load()
+      assert reloaded.state.targets == manager.state.targets
+
+  def test_corrupted_database_is_moved_aside(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      database_path = Path(tmpdir) / "state.sqlite"
+      database_path.write_bytes(b"not a sqlite database" * 100)
+
+      manager = StateManager(SqliteStateStorage(database_path))
+      manager.load()
+
+      assert manager.state.total_runs == 0
+      assert not database_path.exists()
+      assert list(Path(tmpdir).glob(".corrupt.*"))
+
+
+class RecordingStorage:
+  """Incremental storage that records the writes it receives."""
+
+  def __init__(self) -> None:
+    self.writes: list[dict] = []
+    self.partial_writes: list[tuple[dict, dict[str, set[str]]]] = []
+
+  def read(self) -> dict | None:
+    return None
+
+  def write(self, data: dict) -> None:
+    self.writes.append(data)
+
+  def write_changes(self, data: dict, removed_items: dict[str, set[str]]) -> None:
+    self.partial_writes.append((data, removed_items))
+
+  def needs_full_write(self) -> bool:
+    return False
+
+  def move_corrupted(self) -> None:
+    pass
+
+
+def saves(result: str) -> float:
+  return float(state_saves_total.labels(result=result)._value.get())
+
+
+class TestStateManagerDirtyTracking:
+  """Tests for skipping saves of unchanged state and writing only changed items."""
+
+  def create_loaded_manager(self) -> tuple[StateManager, RecordingStorage]:
+    storage = RecordingStorage()
+    manager = StateManager(storage)
+    manager.load()
+    add_items(manager.get_target_state("radarr"), 3)
+    manager.save()
+    return manager, storage
+
+  def test_first_save_writes_without_load(self) -> None:
+    storage = RecordingStorage()
+    manager = StateManager(storage)
+
+    manager.save()
+
+    assert len(storage.writes) == 1
+
+  def test_bookkeeping_only_changes_skip_save(self) -> None:
+    manager, storage = self.create_loaded_manager()
+    target_state = manager.get_target_state("radarr")
+    skipped_before = saves("skipped")
+
+    manager.state.total_runs += 1
+    target_state.last_run_timestamp = 2000.0
+    target_state.last_success_timestamp = 2001.0
+    target_state.library_sync_watermark = 2002.0
+    target_state.last_status = RunStatus.UNKNOWN
+    target_state.consecutive_failures = 0
+    manager.save()
+
+    assert not manager.has_changes()
+    assert len(storage.partial_writes) == 1
+    assert saves("skipped") - skipped_before == 1
+
+  def test_forced_save_writes_bookkeeping(self) -> None:
+    manager, storage = self.create_loaded_manager()
+    manager.state.total_runs = 7
+
+    manager.save(force=True)
+
+    data, removed_items = storage.partial_writes[-1]
+    assert data["total_runs"] == 7
+    assert data["targets"]["radarr"]["items"] == {}
+    assert removed_items == {}
+
+  def test_status_change_triggers_save(self) -> None:
+    manager, storage = self.create_loaded_manager()
+    written_before = saves("written")
+
+    manager.get_target_state("radarr").last_status = RunStatus.ERROR
+    manager.save()
+
+    assert len(storage.partial_writes) == 2
+    assert saves("written") - written_before == 1
+
+  def test_new_target_triggers_save(self) -> None:
+    manager, storage = self.create_loaded_manager()
+
+    manager.get_target_state("sonarr")
+    manager.save()
+
+    assert set(storage.partial_writes[-1][0]["targets"]) == {"radarr", "sonarr"}
+
+  def test_only_changed_items_are_written(self) -> None:
+    manager, storage = self.create_loaded_manager()
+    items = manager.get_target_state("radarr").items
+
+    items["1"] = replace(items["1"], last_result="search_failed")
+    del items["2"]
+    manager.save()
+
+    data, removed_items = storage.partial_writes[-1]
+    assert list(data["targets"]["radarr"]["items"]) == ["1"]
+    assert data["targets"]["radarr"]["items"]["1"]["last_result"] == "search_failed"
+    assert removed_items == {"radarr": {"2"}}
+    assert not manager.has_changes()
+
+  def test_state_loaded_from_storage_is_unchanged(self) -> None:
+    storage = InMemoryStateStorage()
+    manager = StateManager(storage)
+    add_items(manager.get_target_state("radarr"), 3)
+    manager.save()
+
+    reloaded = StateManager(storage)
+    reloaded.load()
+
+    assert not reloaded.has_changes()
+
+  def test_sqlite_partial_writes_round_trip(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      database_path = Path(tmpdir) / "state.sqlite"
+      storage = SqliteStateStorage(database_path)
+      manager = StateManager(storage)
+      manager.load()
+      target_state = manager.get_target_state("radarr")
+      add_items(target_state, 5)
+      manager.save()
+
+      target_state.items["0"] = replace(target_state.items["0"], consecutive_failures=4)
+      del target_state.items["3"]
+      manager.state.total_runs = 2
+      manager.save()
+      storage.close()
+
+      restored = StateManager(SqliteStateStorage(database_path))
+      restored.load()
+      assert restored.state.total_runs == 2
+      assert restored.state.targets == manager.state.targets
+
+
+class TestJournalStateStorage:
+  """Tests for the journaled state storage."""
+
+  def create_manager(self, state_path: Path, threshold: int = 1024 * 1024) -> StateManager:
+    manager = StateManager(JournalStateStorage(state_path, compact_threshold_bytes=threshold))
+    manager.load()
+    return manager
+
+  def test_changes_are_appended_and_replayed(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      manager = self.create_manager(state_path)
+      target_state = manager.get_target_state("radarr")
+      add_items(target_state, 3)
+      target_state.last_status = RunStatus.SUCCESS
+      manager.save()
+      lines_after_first_save = len(Path(f"{state_path}.journal").read_text().splitlines())
+
+      target_state.items["1"] = replace(target_state.items["1"], last_result="search_failed")
+      del target_state.items["2"]
+      manager.get_target_state("sonarr")
+      manager.save()
+
+      journal_lines = Path(f"{state_path}.journal").read_text().splitlines()
+      # Header, meta, target header and three items, then one item set, one removed and
+      # the new target's header.
+      assert lines_after_first_save == 6
+      assert len(journal_lines) == lines_after_first_save + 3
+      assert not state_path.exists()
+
+      restored = self.create_manager(state_path)
+      assert restored.state.targets == manager.state.targets
+      assert restored.state.process_start_timestamp == manager.state.process_start_timestamp
+
+  def test_snapshot_is_written_with_codec(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      storage = JournalStateStorage(state_path, compact_threshold_bytes=100, codec=BINARY_CODEC)
+      manager = StateManager(storage)
+      manager.load()
+      target_state = manager.get_target_state("radarr")
+      add_items(target_state, 3)
+      manager.save()
+      target_state.items["0"] = replace(target_state.items["0"], consecutive_failures=1)
+      manager.save()
+
+      assert state_path.read_bytes().startswith(BINARY_MAGIC)
+      restored = self.create_manager(state_path)
+      assert restored.state.targets == manager.state.targets
+
+  def test_size_cap_compacts_and_prunes_journal(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      storage = JournalStateStorage(state_path)
+      manager = StateManager(storage, state_size_cap_bytes=1500)
+      manager.load()
+      target_state = manager.get_target_state("radarr")
+      add_items(target_state, 40)
+      manager.save()
+      assert storage.stored_bytes() > 1500
+
+      target_state.items["39"] = replace(target_state.items["39"], consecutive_failures=1)
+      manager.save()
+
+      assert state_path.stat().st_size <= 1500
+      assert storage.stored_bytes() <= 1500 + 100
+      assert 0 < len(target_state.items) < 40
+      assert target_state.items["39"].consecutive_failures == 1
+      assert "0" not in target_state.items
+      restored = self.create_manager(state_path)
+      assert restored.state.targets == manager.state.targets
+
+  def test_journal_is_compacted_past_threshold(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      manager = self.create_manager(state_path, threshold=500)
+      target_state = manager.get_target_state("radarr")
+      add_items(target_state, 10)
+      manager.save()
+      assert manager.storage.needs_full_write()  # type: ignore[attr-defined]
+
+      target_state.items["0"] = replace(target_state.items["0"], consecutive_failures=1)
+      manager.save()
+
+      assert state_path.exists()
+      assert Path(f"{state_path}.journal").read_text() == '{"sequence":1}\n'
+      restored = self.create_manager(state_path)
+      assert restored.state.targets == manager.state.targets
+
+  def test_torn_final_record_is_tolerated(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      journal_path = Path(f"{state_path}.journal")
+      manager = self.create_manager(state_path)
+      target_state = manager.get_target_state("radarr")
+      add_items(target_state, 3)
+      manager.save()
+      with open(journal_path, "a", encoding="utf-8") as f:
+        f.write('{"t":"radarr","i":"9","v":[1.0,"sear')
+
+      restored = self.create_manager(state_path)
+      assert restored.state.targets == manager.state.targets
+
+      restored_target = restored.get_target_state("radarr")
+      add_items(restored_target, 4, timestamp=500.0)
+      restored.save()
+      assert self.create_manager(state_path).state.targets == restored.state.targets
+
+  def test_stale_journal_after_interrupted_compaction_is_ignored(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      journal_path = Path(f"{state_path}.journal")
+      manager = self.create_manager(state_path)
+      target_state = manager.get_target_state("radarr")
+      add_items(target_state, 3)
+      manager.save()
+      stale_journal = journal_path.read_bytes()
+
+      # Compact, then put back the journal as if the crash came before it was replaced.
+      del target_state.items["0"]
+      manager.storage.write(manager._serialize())
+      journal_path.write_bytes(stale_journal)
+
+      restored = self.create_manager(state_path)
+      assert set(restored.get_target_state("radarr").items) == {"1", "2"}
+
+
+class TestShardedFileStateStorage:
+  """Tests for the per-target sharded state storage."""
+
+  def create_manager(self, directory: Path, import_path: Path | None = None) -> StateManager:
+    manager = StateManager(ShardedFileStateStorage(directory, import_path=import_path), None)
+    manager.load()
+    return manager
+
+  def test_save_and_load_round_trip(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      directory = Path(tmpdir) / "state.d"
+      manager = self.create_manager(directory)
+      add_items(manager.get_target_state("radarr"), 3)
+      add_items(manager.get_target_state("sonarr/4k"), 2)
+      manager.state.total_runs = 5
+      manager.save()
+
+      assert (directory / "global.yaml").exists()
+      assert sorted(path.name for path in (directory / "targets").iterdir()) == [
+        "radarr.yaml",
+        "sonarr%2F4k.yaml",
+      ]
+      restored = self.create_manager(directory)
+      assert restored.state.targets == manager.state.targets
+      assert restored.state.total_runs == 5
+
+  def test_shards_are_written_with_codec(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      directory = Path(tmpdir) / "state.d"
+      manager = StateManager(ShardedFileStateStorage(directory, codec=BINARY_CODEC), None)
+      add_items(manager.get_target_state("radarr"), 3)
+      manager.state.total_runs = 5
+      manager.save()
+
+      assert (directory / "targets" / "radarr.yaml").read_bytes().startswith(BINARY_MAGIC)
+      assert (directory / "global.yaml").read_bytes().startswith(BINARY_MAGIC)
+      restored = self.create_manager(directory)
+      assert restored.last_run_timestamp("radarr") == 0.0
+      assert restored.state.targets == manager.state.targets
+      assert restored.state.total_runs == 5
+
+  def test_size_cap_applies_to_each_shard(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      directory = Path(tmpdir) / "state.d"
+      manager = StateManager(ShardedFileStateStorage(directory), state_size_cap_bytes=1000)
+      add_items(manager.get_target_state("radarr"), 20)
+      add_items(manager.get_target_state("sonarr"), 3)
+      manager.save()
+
+      radarr_path = directory / "targets" / "radarr.yaml"
+      assert radarr_path.stat().st_size <= 1000
+      radarr_items = manager.state.targets["radarr"].items
+      assert 0 < len(radarr_items) < 20
+      assert "19" in radarr_items
+      assert "0" not in radarr_items
+      assert len(manager.state.targets["sonarr"].items) == 3
+      restored = self.create_manager(directory)
+      assert restored.state.targets == manager.state.targets
+
+  def test_only_changed_target_shards_are_written(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      directory = Path(tmpdir) / "state.d"
+      manager = self.create_manager(directory)
+      add_items(manager.get_target_state("radarr"), 3)
+      sonarr_state = manager.get_target_state("sonarr")
+      add_items(sonarr_state, 3)
+      manager.save()
+      radarr_path = directory / "targets" / "radarr.yaml"
+      sonarr_path = directory / "targets" / "sonarr.yaml"
+      radarr_inode = radarr_path.stat().st_ino
+      sonarr_inode = sonarr_path.stat().st_ino
+
+      sonarr_state.items["0"] = replace(sonarr_state.items["0"], consecutive_failures=1)
+      manager.save()
+
+      # Atomic replacement gives a rewritten shard a new inode.
+      assert radarr_path.stat().st_ino == radarr_inode
+      assert sonarr_path.stat().st_ino != sonarr_inode
+      assert self.create_manager(directory).state.targets == manager.state.targets
+
+      manager.save(force=True)
+      assert radarr_path.stat().st_ino != radarr_inode
+
+  def test_removed_target_shard_is_deleted(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      directory = Path(tmpdir) / "state.d"
+      manager = self.create_manager(directory)
+      add_items(manager.get_target_state("radarr"), 1)
+      add_items(manager.get_target_state("sonarr"), 1)
+      manager.save()
+
+      del manager.state.targets["sonarr"]
+      manager.save()
+
+      assert not (directory / "targets" / "sonarr.yaml").exists()
+      assert set(self.create_manager(directory).state.targets) == {"radarr"}
+
+  def test_unparsable_shard_resets_only_its_target(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      directory = Path(tmpdir) / "state.d"
+      manager = self.create_manager(directory)
+      add_items(manager.get_target_state("radarr"), 2)
+      add_items(manager.get_target_state("sonarr"), 2)
+      manager.save()
+      (directory / "targets" / "sonarr.yaml").write_text("items: [unclosed\n")
+
+      restored = self.create_manager(directory)
+
+      assert restored.state.targets == {"radarr": manager.state.targets["radarr"]}
+      assert len(list((directory / "targets").glob("sonarr.yaml.corrupt.*"))) == 1
+
+  def test_invalid_shard_resets_only_its_target(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      directory = Path(tmpdir) / "state.d"
+      manager = self.create_manager(directory)
+      add_items(manager.get_target_state("radarr"), 2)
+      manager.get_target_state("sonarr")
+      manager.save()
+      (directory / "targets" / "sonarr.yaml").write_text("items:\n  '1': {item_id: '1'}\n")
+
+      restored = self.create_manager(directory)
+
+      assert restored.state.targets == {"radarr": manager.state.targets["radarr"]}
+      assert not (directory / "targets" / "sonarr.yaml").exists()
+      assert len(list((directory / "targets").glob("sonarr.yaml.corrupt.*"))) == 1
+
+  def test_imports_yaml_state_once(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      yaml_manager = StateManager(FileStateStorage(state_path))
+      add_items(yaml_manager.get_target_state("radarr"), 2)
+      yaml_manager.save()
+
+      directory = Path(tmpdir) / "state.d"
+      manager = self.create_manager(directory, import_path=state_path)
+
+      assert manager.state.targets == yaml_manager.state.targets
+      assert not state_path.exists()
+      assert (Path(tmpdir) / "state.yaml.imported").exists()
+      assert (directory / "targets" / "radarr.yaml").exists()
+
+
+class TestLazyStateLoading:
+  """Tests for loading target items on first use."""
+
+  def save_targets(self, state_path: Path) -> StateManager:
+    manager = StateManager(FileStateStorage(state_path))
+    radarr_state = manager.get_target_state("radarr")
+    radarr_state.last_run_timestamp = 500.0
+    add_items(radarr_state, 3)
+    add_items(manager.get_target_state("sonarr: 4k"), 2, timestamp=200.0)
+    manager.save()
+    return manager
+
+  def test_items_are_loaded_on_first_access(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      saved = self.save_targets(state_path)
+
+      manager = StateManager(FileStateStorage(state_path))
+      manager.load()
+
+      assert manager.state.targets.loaded == {}
+      assert manager.last_run_timestamp("radarr") == 500.0
+      assert manager.last_run_timestamp("missing") == 0.0
+      assert not manager.has_changes()
+      assert manager.get_target_state("sonarr: 4k") == saved.state.targets["sonarr: 4k"]
+      assert set(manager.state.targets.loaded) == {"sonarr: 4k"}
+      assert not manager.has_changes()
+      assert manager.state.targets == saved.state.targets
+      assert not manager.has_changes()
+
+  def test_save_keeps_unloaded_targets(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      saved = self.save_targets(state_path)
+      manager = StateManager(FileStateStorage(state_path))
+      manager.load()
+
+      radarr_state = manager.get_target_state("radarr")
+      radarr_state.last_status = RunStatus.SUCCESS
+      manager.save()
+
+      restored = StateManager(FileStateStorage(state_path))
+      restored.load()
+      assert restored.get_target_state("radarr") == radarr_state
+      assert restored.get_target_state("sonarr: 4k") == saved.state.targets["sonarr: 4k"]
+
+  def test_corrupted_target_is_dropped_on_load(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      saved = self.save_targets(state_path)
+      state_path.write_text(
+        state_path.read_text().replace("last_processed_timestamp", "processed_at", 1)
+      )
+      manager = StateManager(FileStateStorage(state_path))
+      manager.load()
+
+      assert manager.state.targets == {"sonarr: 4k": saved.state.targets["sonarr: 4k"]}
+      assert manager.has_changes()
+      manager.save()
+
+      restored = StateManager(FileStateStorage(state_path))
+      restored.load()
+      assert set(restored.state.targets) == {"sonarr: 4k"}
+
+  def test_unindexable_layout_is_parsed_whole(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      state_path.write_text(
+        "total_runs: 3\n"
+        "targets: {radarr: {last_run_timestamp: 5.0, items: {'1': {item_id: '1',"
+        " last_processed_timestamp: 1.0, last_result: search_triggered}}}}\n"
+      )
+      manager = StateManager(FileStateStorage(state_path))
+      manager.load()
+
+      assert manager.state.total_runs == 3
+      assert manager.last_run_timestamp("radarr") == 5.0
+      assert manager.get_target_state("radarr").items["1"].last_processed_timestamp == 1.0
+
+  def test_corrupted_section_resets_only_its_target(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      saved = self.save_targets(state_path)
+      state_path.write_text(
+        state_path.read_text().replace("last_processed_timestamp: 200.0", "last_processed: 1")
+      )
+      manager = StateManager(FileStateStorage(state_path))
+      manager.load()
+
+      assert manager.get_target_state("sonarr: 4k") == TargetState()
+      assert manager.get_target_state("radarr") == saved.state.targets["radarr"]
+
+  def test_sharded_save_leaves_unloaded_shards_alone(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      directory = Path(tmpdir) / "state.d"
+      saved = StateManager(ShardedFileStateStorage(directory))
+      add_items(saved.get_target_state("radarr"), 2)
+      add_items(saved.get_target_state("sonarr"), 2)
+      saved.save()
+      sonarr_path = directory / "targets" / "sonarr.yaml"
+      sonarr_inode = sonarr_path.stat().st_ino
+
+      manager = StateManager(ShardedFileStateStorage(directory))
+      manager.load()
+      manager.get_target_state("radarr").last_status = RunStatus.SUCCESS
+      manager.save(force=True)
+
+      assert sonarr_path.stat().st_ino == sonarr_inode
+      assert set(manager.state.targets.loaded) == {"radarr"}
+      restored = StateManager(ShardedFileStateStorage(directory))
+      restored.load()
+      assert restored.get_target_state("sonarr") == saved.state.targets["sonarr"]
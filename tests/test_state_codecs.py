@@ -0,0 +1,164 @@
+"""Tests for state codecs module."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from app.state import FileStateStorage, ItemState, ItemStatus, StateManager, TargetState
+from app.state_codecs import (
+  BINARY_CODEC,
+  CODECS,
+  JSON_CODEC,
+  YAML_CODEC,
+  StateCodec,
+  StateDecodeError,
+  detect_codec,
+)
+
+
+def serialized_state() -> dict:
+  return {
+    "process_start_timestamp": 1000.5,
+    "total_runs": 7,
+    "targets": {
+      "radarr": {
+        "last_run_timestamp": 900.0,
+        "last_success_timestamp": 899.0,
+        "last_status": "success",
+        "consecutive_failures": 0,
+        "library_sync_watermark": 0.0,
+        "items": {
+          "movie:1": {
+            "item_id": "movie:1",
+            "last_processed_timestamp": 100.25,
+            "last_result": "search_triggered",
+            "last_status": "success",
+            "consecutive_failures": 0,
+          },
+          "movie:2": {
+            "item_id": "movie:2-renamed",
+            "last_processed_timestamp": 200.0,
+            "last_result": "custom result",
+            "last_status": "error",
+            "consecutive_failures": 3,
+          },
+        },
+      },
+      "sonarr: 4k": {"last_status": "unknown", "items": {}},
+    },
+  }
+
+
+ALL_CODECS = pytest.mark.parametrize("codec", list(CODECS.values()), ids=list(CODECS))
+
+
+class TestStateCodecs:
+  @ALL_CODECS
+  def test_round_trip(self, codec: StateCodec) -> None:
+    data = serialized_state()
+    assert codec.decode(codec.encode(data)) == data
+
+  @ALL_CODECS
+  def test_format_detected_from_header(self, codec: StateCodec) -> None:
+    assert detect_codec(codec.encode(serialized_state())) is codec
+
+  def test_empty_file_is_yaml(self) -> None:
+    assert detect_codec(b"") is YAML_CODEC
+    assert YAML_CODEC.decode(b"") is None
+
+  @pytest.mark.parametrize("codec", [JSON_CODEC, BINARY_CODEC], ids=["json", "binary"])
+  def test_truncated_payload_raises(self, codec: StateCodec) -> None:
+    payload = codec.encode(serialized_state())
+    with pytest.raises(StateDecodeError):
+      codec.decode(payload[: len(payload) - 5])
+
+  @pytest.mark.parametrize("failure_count", [-1, 2**32, 1.5])
+  def test_binary_rejects_failure_count_outside_u32(self, failure_count: object) -> None:
+    data = serialized_state()
+    data["targets"]["radarr"]["items"]["movie:1"]["consecutive_failures"] = failure_count
+    with pytest.raises(ValueError, match="consecutive_failures of target radarr"):
+      BINARY_CODEC.encode(data)
+
+  def test_invalid_yaml_raises(self) -> None:
+    with pytest.raises(StateDecodeError):
+      YAML_CODEC.decode(b"targets: [unclosed\n")
+
+  def test_binary_is_smallest(self) -> None:
+    data = serialized_state()
+    data["targets"]["radarr"]["items"] = {
+      f"movie:{i}": {
+        "item_id": f"movie:{i}",
+        "last_processed_timestamp": 1_700_000_000.0 + i,
+        "last_result": "search_triggered",
+        "last_status": "success",
+        "consecutive_failures": 0,
+      }
+      for i in range(100)
+    }
+    sizes = {name: len(codec.encode(data)) for name, codec in CODECS.items()}
+    assert sizes["binary"] < sizes["json"] < sizes["yaml"]
+
+  @ALL_CODECS
+  def test_entry_size_estimates_encoded_growth(self, codec: StateCodec) -> None:
+    data = serialized_state()
+    items = data["targets"]["radarr"]["items"]
+    # Reuses movie:1's result and status, which binary state stores once.
+    item = {**items["movie:1"], "item_id": "movie:3"}
+    size_without = len(codec.encode(data))
+    items["movie:3"] = item
+
+    growth = len(codec.encode(data)) - size_without
+    assert abs(codec.entry_size("movie:3", item) - growth) <= 2
+
+
+class TestFileStateStorageCodecs:
+  @ALL_CODECS
+  def test_state_migrates_on_next_save(self, codec: StateCodec) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      old = StateManager(FileStateStorage(state_path))
+      old.get_target_state("radarr").last_run_timestamp = 500.0
+      old.save()
+
+      manager = StateManager(FileStateStorage(state_path, codec))
+      manager.load()
+      assert manager.get_target_state("radarr").last_run_timestamp == 500.0
+      manager.get_target_state("sonarr")
+      manager.save()
+
+      assert detect_codec(state_path.read_bytes()) is codec
+      restored = StateManager(FileStateStorage(state_path))
+      restored.load()
+      assert restored.get_target_state("radarr").last_run_timestamp == 500.0
+      assert restored.get_target_state("sonarr") == TargetState()
+
+  def test_corrupted_binary_state_is_moved_aside(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.yaml"
+      manager = StateManager(FileStateStorage(state_path, BINARY_CODEC))
+      manager.get_target_state("radarr").last_run_timestamp = 500.0
+      manager.save()
+      state_path.write_bytes(state_path.read_bytes()[:-3])
+
+      restored = StateManager(FileStateStorage(state_path, BINARY_CODEC))
+      restored.load()
+
+      assert restored.state.targets == {}
+      assert not state_path.exists()
+      assert list(Path(tmpdir).glob(".corrupt.*"))
+
+  def test_size_cap_measures_encoded_size(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      state_path = Path(tmpdir) / "state.json"
+      manager = StateManager(FileStateStorage(state_path, JSON_CODEC), state_size_cap_bytes=2000)
+      target_state = manager.get_target_state("radarr")
+      for i in range(100):
+        target_state.items[str(i)] = ItemState(
+          str(i), float(i), "search_triggered", ItemStatus.SUCCESS
+        )
+      manager.save()
+
+      assert state_path.stat().st_size <= 2000
+      assert 0 < len(target_state.items) < 100
+      assert "0" not in target_state.items
@@ -0,0 +1,167 @@
+"""Tests for state writer module."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.metrics import state_write_failures_total
+from app.state import InMemoryStateStorage, ItemState, ItemStatus, StateManager
+from app.state_writer import StateWriter
+
+
+class RecordingStorage(InMemoryStateStorage):
+  """In-memory storage that records the thread of each write and can fail writes."""
+
+  def __init__(self) -> None:
+    super().__init__()
+    self.write_threads: list[int] = []
+    self.fail = False
+    self.write_delay_s = 0.0
+    self.writing = threading.Event()
+
+  def write(self, data: dict) -> None:
+    self.write_threads.append(threading.get_ident())
+    self.writing.set()
+    time.sleep(self.write_delay_s)
+    if self.fail:
+      raise OSError("disk full")
+    super().write(data)
+
+
+def add_item(manager: StateManager, item_id: str, timestamp: float = 100.0) -> None:
+  manager.get_target_state("radarr").items[item_id] = ItemState(
+    item_id=item_id,
+    last_processed_timestamp=timestamp,
+    last_result="search_triggered",
+    last_status=ItemStatus.SUCCESS,
+  )
+
+
+def create_manager(cap_bytes: int | None = None) -> tuple[StateManager, RecordingStorage]:
+  storage = RecordingStorage()
+  manager = StateManager(storage, state_size_cap_bytes=cap_bytes)
+  manager.load()
+  return manager, storage
+
+
+class TestStateWriter:
+  @pytest.mark.asyncio
+  async def test_requests_within_window_are_coalesced(self) -> None:
+    manager, storage = create_manager()
+    writer = StateWriter(manager, coalesce_window_s=0.05)
+
+    for i in range(5):
+      add_item(manager, str(i))
+      writer.request_save()
+    await asyncio.sleep(0.2)
+
+    assert len(storage.write_threads) == 1
+    data = storage.read()
+    assert data is not None
+    assert len(data["targets"]["radarr"]["items"]) == 5
+    await writer.close()
+
+  @pytest.mark.asyncio
+  async def test_writes_run_off_the_event_loop_thread(self) -> None:
+    manager, storage = create_manager()
+    writer = StateWriter(manager, coalesce_window_s=0.0)
+
+    add_item(manager, "1")
+    writer.request_save()
+    await writer.close()
+
+    assert storage.write_threads
+    assert threading.get_ident() not in storage.write_threads
+
+  @pytest.mark.asyncio
+  async def test_request_during_write_starts_another_write(self) -> None:
+    manager, storage = create_manager()
+    writer = StateWriter(manager, coalesce_window_s=0.0)
+
+    add_item(manager, "1")
+    writer.request_save()
+    await asyncio.sleep(0)
+    add_item(manager, "2")
+    writer.request_save()
+    await asyncio.sleep(0.1)
+
+    data = storage.read()
+    assert data is not None
+    assert set(data["targets"]["radarr"]["items"]) == {"1", "2"}
+    await writer.close()
+
+  @pytest.mark.asyncio
+  async def test_close_flushes_without_waiting_for_window(self) -> None:
+    manager, storage = create_manager()
+    writer = StateWriter(manager, coalesce_window_s=60.0)
+
+    add_item(manager, "1")
+    writer.request_save()
+    manager.state.total_runs = 3
+    await asyncio.wait_for(writer.close(), timeout=5.0)
+
+    data = storage.read()
+    assert data is not None
+    assert "1" in data["targets"]["radarr"]["items"]
+    assert data["total_runs"] == 3
+
+  @pytest.mark.asyncio
+  async def test_close_cancelled_during_write_reports_it_running(self) -> None:
+    manager, storage = create_manager()
+    writer = StateWriter(manager, coalesce_window_s=60.0)
+    storage.write_delay_s = 0.2
+
+    add_item(manager, "1")
+    started = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+      await asyncio.wait_for(writer.close(), timeout=0.05)
+
+    assert time.monotonic() - started < 0.15
+    assert storage.writing.is_set()
+    assert writer.writing
+    while writer.writing:
+      await asyncio.sleep(0.01)
+    data = storage.read()
+    assert data is not None
+    assert "1" in data["targets"]["radarr"]["items"]
+
+  @pytest.mark.asyncio
+  async def test_failed_write_is_counted_and_retried_in_full(self) -> None:
+    manager, storage = create_manager()
+    writer = StateWriter(manager, coalesce_window_s=0.0)
+    failures_before = state_write_failures_total._value.get()
+
+    storage.fail = True
+    add_item(manager, "1")
+    writer.request_save()
+    await asyncio.sleep(0.1)
+
+    assert state_write_failures_total._value.get() - failures_before == 1
+    assert manager.has_changes()
+
+    storage.fail = False
+    writer.request_save()
+    await writer.close()
+    data = storage.read()
+    assert data is not None
+    assert "1" in data["targets"]["radarr"]["items"]
+
+  @pytest.mark.asyncio
+  async def test_entries_pruned_while_writing_are_dropped_from_state(self) -> None:
+    manager, storage = create_manager(cap_bytes=450)
+    writer = StateWriter(manager, coalesce_window_s=0.0)
+    for i in range(5):
+      add_item(manager, str(i), timestamp=100.0 + i)
+
+    writer.request_save()
+    await writer.close()
+
+    items = manager.get_target_state("radarr").items
+    data = storage.read()
+    assert data is not None
+    assert "0" not in items
+    assert "4" in items
+    assert set(items) == set(data["targets"]["radarr"]["items"])
+    assert not manager.has_changes()
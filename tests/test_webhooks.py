@@ -0,0 +1,117 @@
+"""Tests for webhooks module."""
+
+from typing import Any
+
+import pytest
+
+from app.config import ArrTarget, ArrType, TargetSettings
+from app.handlers import MovieId, SeasonId
+from app.webhooks import WebhookEvent, WebhookEventType, WebhookReceiver, parse_webhook_event
+
+
+def create_target(name: str, arr_type: ArrType) -> ArrTarget:
+  return ArrTarget(
+    name=name,
+    arr_type=arr_type,
+    base_url="http://test",
+    api_key="key",
+    settings=TargetSettings(ops_per_interval=1, interval_s=60, item_revisit_s=3600),
+  )
+
+
+class TestParseWebhookEvent:
+  def test_radarr_download(self) -> None:
+    payload = {"eventType": "Download", "movie": {"id": 7, "title": "Movie"}}
+
+    event = parse_webhook_event(ArrType.RADARR, payload)
+
+    assert event == WebhookEvent(
+      event_type=WebhookEventType.DOWNLOAD,
+      record_key=7,
+      item_ids=[MovieId(movie_id=7, movie_name="Movie")],
+    )
+
+  def test_sonarr_grab_lists_each_season_once(self) -> None:
+    payload = {
+      "eventType": "Grab",
+      "series": {"id": 3, "title": "Series"},
+      "episodes": [{"seasonNumber": 2}, {"seasonNumber": 1}, {"seasonNumber": 2}],
+    }
+
+    event = parse_webhook_event(ArrType.SONARR, payload)
+
+    assert event is not None
+    assert event.record_key == 3
+    assert event.item_ids == [
+      SeasonId(series_id=3, season_number=1, series_name="Series"),
+      SeasonId(series_id=3, season_number=2, series_name="Series"),
+    ]
+
+  def test_series_add_has_no_items(self) -> None:
+    event = parse_webhook_event(ArrType.SONARR, {"eventType": "SeriesAdd", "series": {"id": 3}})
+
+    assert event == WebhookEvent(event_type=WebhookEventType.SERIES_ADD, record_key=3)
+
+  def test_unhandled_event_type_is_ignored(self) -> None:
+    assert parse_webhook_event(ArrType.RADARR, {"eventType": "Health"}) is None
+
+  @pytest.mark.parametrize(
+    ("arr_type", "payload"),
+    [
+      (ArrType.RADARR, {"movie": {"id": 7}}),
+      (ArrType.RADARR, {"eventType": ["Grab"], "movie": {"id": 7}}),
+      (ArrType.RADARR, {"eventType": "Grab", "movie": 1}),
+      (ArrType.RADARR, {"eventType": "Grab", "movie": {"id": "7"}}),
+      (ArrType.SONARR, {"eventType": "Grab", "series": [3]}),
+      (ArrType.SONARR, {"eventType": "Grab", "series": {"id": 3}, "episodes": {"id": 1}}),
+      (ArrType.SONARR, {"eventType": "Grab", "series": {"id": 3}, "episodes": [2]}),
+      (
+        ArrType.SONARR,
+        {"eventType": "Grab", "series": {"id": 3}, "episodes": [{"seasonNumber": [1]}]},
+      ),
+    ],
+  )
+  def test_malformed_record_is_rejected(self, arr_type: ArrType, payload: dict[str, Any]) -> None:
+    with pytest.raises(ValueError):
+      parse_webhook_event(arr_type, payload)
+
+
+class TestWebhookReceiver:
+  def create_receiver(self, token: str = "") -> tuple[WebhookReceiver, list[Any]]:
+    delivered: list[tuple[str, WebhookEvent]] = []
+    receiver = WebhookReceiver(
+      [create_target("radarr", ArrType.RADARR)],
+      token,
+      lambda target_name, event: delivered.append((target_name, event)),
+    )
+    return receiver, delivered
+
+  def test_delivers_parsed_event(self) -> None:
+    receiver, delivered = self.create_receiver()
+
+    status, _ = receiver.receive("radarr", {"eventType": "MovieAdded", "movie": {"id": 1}}, None)
+
+    assert status == 202
+    assert delivered == [
+      ("radarr", WebhookEvent(WebhookEventType.MOVIE_ADDED, 1, [MovieId(1, None)]))
+    ]
+
+  def test_rejects_wrong_token(self) -> None:
+    receiver, delivered = self.create_receiver(token="secret")
+
+    assert receiver.receive("radarr", {"eventType": "Test"}, "wrong")[0] == 401
+    assert receiver.receive("radarr", {"eventType": "Test"}, None)[0] == 401
+    assert receiver.receive("radarr", {"eventType": "Test"}, "secret")[0] == 202
+    assert len(delivered) == 1
+
+  def test_unknown_target_and_invalid_payload(self) -> None:
+    receiver, delivered = self.create_receiver()
+
+    assert receiver.receive("other", {"eventType": "Test"}, None)[0] == 404
+    assert receiver.receive("radarr", None, None)[0] == 400
+    assert receiver.receive("radarr", {"eventType": "Grab", "movie": 1}, None) == (
+      400,
+      "Invalid payload",
+    )
+    assert receiver.receive("radarr", {"eventType": "Health"}, None)[0] == 202
+    assert delivered == []